@@ -0,0 +1,278 @@
+"""Time the reconciliation engines, writers and month-end on synthetic data.
+
+    PYTHONPATH=src python -m benchmarks.run --scales 10k,100k --output outputs/benchmarks/latest.json
+    PYTHONPATH=src python -m benchmarks.run --baseline outputs/benchmarks/baseline.json --threshold 0.2
+
+Exits non-zero when any case's median is more than ``threshold`` slower than the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from finance_ai_pack import cli
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.fixture_store import convert_fixtures
+from finance_ai_pack.connectors.odoo.fixtures_adapter import statement_line
+from finance_ai_pack.connectors.odoo.pool import reset_pools
+from finance_ai_pack.connectors.odoo.standin import OdooStandin, StandinConfig
+from finance_ai_pack.fx import RateTable
+from finance_ai_pack.money import from_cents
+from finance_ai_pack.outputs.writers import write_csv, write_html, write_json, write_xlsx
+from finance_ai_pack.recon.bank.service import reconcile
+from finance_ai_pack.recon.vat.service import reconcile_vat
+from finance_ai_pack.synthetic import SyntheticSpec, iter_statement_lines, synthetic_journals, write_fixtures
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+STANDIN_MAX_LINES = 100_000
+
+
+def parse_scales(value: str) -> list[tuple[str, int]]:
+    scales = []
+    for label in (part.strip().lower() for part in value.split(",") if part.strip()):
+        if label in SCALES:
+            scales.append((label, SCALES[label]))
+        elif label.isdigit():
+            scales.append((label, int(label)))
+        else:
+            raise ValueError(f"Unknown scale '{label}'. Use {', '.join(SCALES)} or a line count.")
+    return scales
+
+
+def _measure(fn, repeat: int) -> list[float]:
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        runs.append(round((time.perf_counter() - started) * 1000, 3))
+    return runs
+
+
+@contextmanager
+def _cli_dirs(fixtures_dir: Path, outputs_dir: Path):
+    # run_month_end reads the module-level directories; point them at the synthetic tree.
+    saved = cli.FIXTURES, cli.OUTPUTS_DIR
+    cli.FIXTURES, cli.OUTPUTS_DIR = fixtures_dir, outputs_dir
+    try:
+        yield
+    finally:
+        cli.FIXTURES, cli.OUTPUTS_DIR = saved
+
+
+def _cases(spec: SyntheticSpec, fixtures_dir: Path, outputs_dir: Path, standin_url: str | None) -> dict:
+    settings = Settings(fixture_mode=True)
+    indexed = Settings(fixture_mode=True, fixture_store="indexed")
+    period = spec.period
+    rows = [
+        {"journal": journal["journal"], **line}
+        for idx, journal in enumerate(synthetic_journals(spec))
+        for line in iter_statement_lines(spec, idx)
+    ]
+    bank_result = reconcile(period, fixtures_dir, settings)
+    statement_lines = [statement_line(row["journal"], row) for row in rows]
+
+    def money_sum_float() -> None:
+        # The pre-cents aggregation: re-parse every amount and round the total.
+        round(sum(float(line.get("amount", 0.0)) for line in statement_lines), 2)
+
+    def money_sum_cents() -> None:
+        from_cents(sum(line["amount_cents"] for line in statement_lines))
+
+    # One rate per day of the month, as a daily rate feed would give; all lines treated as USD.
+    fx = RateTable.from_rows(
+        "TZS", [{"currency": "USD", "date": f"{period}-{day:02d}", "rate": 0.0004 + day * 1e-7} for day in range(1, 29)]
+    )
+
+    def fx_convert_lines() -> None:
+        fx.convert_lines("USD", statement_lines)
+
+    def month_end() -> None:
+        with _cli_dirs(fixtures_dir, outputs_dir):
+            cli.run_month_end(period, settings=settings)
+
+    def cli_startup() -> None:
+        # Fresh interpreter per run: what a cron-launched `run` pays before doing any work.
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        subprocess.run([sys.executable, "-c", "import finance_ai_pack.cli"], env=env, check=True)
+
+    cases = {
+        "cli_startup": cli_startup,
+        "bank_reconcile": lambda: reconcile(period, fixtures_dir, settings),
+        "vat_reconcile": lambda: reconcile_vat(period, period, fixtures_dir, settings),
+        "bank_reconcile_indexed": lambda: reconcile(period, fixtures_dir, indexed),
+        "vat_reconcile_indexed": lambda: reconcile_vat(period, period, fixtures_dir, indexed),
+        "money_sum_float": money_sum_float,
+        "money_sum_cents": money_sum_cents,
+        "fx_convert_lines": fx_convert_lines,
+        "write_json": lambda: write_json(bank_result, outputs_dir / "bench.json"),
+        "write_csv": lambda: write_csv(rows, outputs_dir / "bench.csv"),
+        "write_xlsx": lambda: write_xlsx(rows, outputs_dir / "bench.xlsx"),
+        "write_html": lambda: write_html("Benchmark", {"Banks": bank_result["banks"]}, outputs_dir / "bench.html"),
+        "run_month_end": month_end,
+    }
+    if standin_url:
+        live = Settings(
+            fixture_mode=False, odoo_url=standin_url, odoo_db="bench", odoo_username="bench", odoo_password="x"
+        )
+        cases["bank_reconcile_standin"] = lambda: reconcile(period, fixtures_dir, live)
+        cases["vat_reconcile_standin"] = lambda: reconcile_vat(period, period, fixtures_dir, live)
+    return cases
+
+
+def run_benchmarks(
+    scales: list[tuple[str, int]],
+    journals: int = 10,
+    repeat: int = 3,
+    seed: int = 42,
+    workdir: Path | None = None,
+    standin: bool = False,
+    latency_ms: float = 0.0,
+    only: set[str] | None = None,
+) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for label, lines in scales:
+            spec = SyntheticSpec(lines=lines, journals=journals, seed=seed)
+            fixtures_dir = Path(tmp) / label / "fixtures"
+            outputs_dir = Path(tmp) / label / "outputs"
+            outputs_dir.mkdir(parents=True)
+            started = time.perf_counter()
+            write_fixtures(spec, fixtures_dir)
+            generate_ms = round((time.perf_counter() - started) * 1000, 3)
+            started = time.perf_counter()
+            convert_fixtures(fixtures_dir)
+            convert_ms = round((time.perf_counter() - started) * 1000, 3)
+
+            server = None
+            if standin and lines <= STANDIN_MAX_LINES:
+                server = OdooStandin.from_spec(
+                    spec, db_path=Path(tmp) / label / "odoo.sqlite3", config=StandinConfig(latency_ms=latency_ms)
+                )
+                server.start()
+            try:
+                for name, fn in _cases(spec, fixtures_dir, outputs_dir, server.url if server else None).items():
+                    if only and name not in only:
+                        continue
+                    runs = _measure(fn, repeat)
+                    results.append(
+                        {
+                            "case": name,
+                            "scale": label,
+                            "lines": lines,
+                            "runs_ms": runs,
+                            "min_ms": min(runs),
+                            "median_ms": round(statistics.median(runs), 3),
+                        }
+                    )
+            finally:
+                if server is not None:
+                    server.stop()
+                    reset_pools()
+            for name, elapsed_ms in (("generate_fixtures", generate_ms), ("convert_fixtures", convert_ms)):
+                results.append(
+                    {
+                        "case": name,
+                        "scale": label,
+                        "lines": lines,
+                        "runs_ms": [elapsed_ms],
+                        "min_ms": elapsed_ms,
+                        "median_ms": elapsed_ms,
+                        # Timed once per scale as setup; too noisy to gate on.
+                        "single_run": True,
+                    }
+                )
+
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "journals": journals,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Cases whose median is more than ``threshold`` (a fraction) slower than the baseline median.
+
+    Single-run setup timings (``single_run``) are reported but never flagged.
+    """
+    previous = {(row["case"], row["scale"]): row["median_ms"] for row in baseline.get("results", [])}
+    regressions = []
+    for row in current.get("results", []):
+        before = previous.get((row["case"], row["scale"]))
+        if not before or row.get("single_run"):
+            continue
+        ratio = row["median_ms"] / before
+        if ratio > 1 + threshold:
+            regressions.append(
+                {
+                    "case": row["case"],
+                    "scale": row["scale"],
+                    "baseline_ms": before,
+                    "median_ms": row["median_ms"],
+                    "slowdown_pct": round((ratio - 1) * 100, 1),
+                }
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Finance AI Pack benchmarks")
+    parser.add_argument("--scales", default="10k", help="comma-separated: 10k,100k,1m or explicit line counts")
+    parser.add_argument("--journals", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cases", help="comma-separated subset of case names")
+    parser.add_argument(
+        "--standin",
+        action="store_true",
+        help=f"also time the live adapter on the Odoo stand-in (<= {STANDIN_MAX_LINES} lines)",
+    )
+    parser.add_argument("--latency_ms", type=float, default=0.0, help="per-call stand-in latency")
+    parser.add_argument("--workdir", type=Path, help="where synthetic fixtures are generated (default: system temp)")
+    parser.add_argument("--output", type=Path, default=cli.OUTPUTS_DIR / "benchmarks" / "latest.json")
+    parser.add_argument("--baseline", type=Path, help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown vs baseline, e.g. 0.2 = 20%%")
+    args = parser.parse_args(argv)
+
+    payload = run_benchmarks(
+        parse_scales(args.scales),
+        journals=args.journals,
+        repeat=args.repeat,
+        seed=args.seed,
+        workdir=args.workdir,
+        standin=args.standin,
+        latency_ms=args.latency_ms,
+        only={name.strip() for name in args.cases.split(",")} if args.cases else None,
+    )
+    if args.baseline:
+        payload["baseline"] = str(args.baseline)
+        payload["threshold"] = args.threshold
+        payload["regressions"] = compare(payload, json.loads(args.baseline.read_text()), args.threshold)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(payload, indent=2))
+    for row in payload["results"]:
+        print(f"{row['case']:<26} {row['scale']:>6} median {row['median_ms']:>12.3f} ms")
+    print(f"results written to {args.output}")
+    if payload.get("regressions"):
+        for item in payload["regressions"]:
+            print(f"REGRESSION {item['case']} @ {item['scale']}: +{item['slowdown_pct']}%", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,20 +1,35 @@
 from __future__ import annotations
 
 import argparse
+import contextvars
+import functools
 import json
+import os
 import re
+import time
+from dataclasses import replace
 from pathlib import Path
 
+from finance_ai_pack import telemetry
 from finance_ai_pack.config import Settings
-from finance_ai_pack.outputs.writers import write_csv, write_html, write_json, write_xlsx
-from finance_ai_pack.recon.bank.service import reconcile as bank_reconcile
-from finance_ai_pack.recon.vat.service import reconcile_vat
-from finance_ai_pack.rules.month_end_gating import can_proceed, evaluate
+from finance_ai_pack.outputs.writers import (
+    ArtifactWriter,
+    write_csv,
+    write_html,
+    write_json,
+    write_json_rows,
+    write_xlsx,
+)
+
+# Engines, group fan-out and gating are imported inside the command that needs them, so a
+# cron run of one subcommand only loads that subcommand's modules (tests/test_startup.py).
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 FIXTURES = BASE_DIR / "fixtures"
 OUTPUTS_DIR = BASE_DIR / "outputs"
 OVERRIDES_FILE = FIXTURES / "overrides" / "month_end_overrides.json"
+SCHEDULER_DB = OUTPUTS_DIR / ".scheduler" / "jobs.sqlite3"
+DISTRIBUTED_DB = OUTPUTS_DIR / ".distributed" / "shards.sqlite3"
 
 PERIOD_PATTERN = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
 
@@ -25,23 +40,122 @@ def validate_period(period: str) -> str:
     return period
 
 
-def _artifact_prefix(command: str, period: str) -> Path:
-    return OUTPUTS_DIR / f"{command}_{period}"
+def _outputs_dir(settings: Settings) -> Path:
+    if settings.company_id is None:
+        return OUTPUTS_DIR
+    return OUTPUTS_DIR / f"company_{settings.company_id}"
+
+
+# Derived from OUTPUTS_DIR when called, so a run pointed at another outputs tree (benchmarks,
+# tests) keeps its rollups, rate tables and warehouse there too.
+def _rollups_db() -> Path:
+    return OUTPUTS_DIR / ".rollups" / "rollups.sqlite3"
+
+
+def _fx_cache_dir(settings: Settings) -> Path:
+    return Path(settings.fx_cache_dir) if settings.fx_cache_dir else OUTPUTS_DIR / ".fx"
+
+
+def _warehouse_dir() -> Path:
+    return OUTPUTS_DIR / "warehouse"
+
+
+def _artifact_prefix(command: str, period: str, settings: Settings) -> Path:
+    return _outputs_dir(settings) / f"{command}_{period}"
+
+
+def _write(writer: ArtifactWriter | None, fn, *args, **kwargs) -> None:
+    if writer is None:
+        fn(*args, **kwargs)
+    else:
+        writer.submit(fn, *args, **kwargs)
+
+
+def _timed(fn, *args, **kwargs) -> tuple[dict, float]:
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, round((time.perf_counter() - started) * 1000, 3)
+
+
+def _instrumented(fn):
+    """Collect telemetry for a command run and attach the summary as ``result["telemetry"]``."""
 
+    @functools.wraps(fn)
+    def wrapper(*args, settings: Settings | None = None, **kwargs):
+        settings = settings or Settings.from_env()
+        with telemetry.collect(settings) as collector:
+            with telemetry.span(fn.__name__.removeprefix("run_"), "command"):
+                result = fn(*args, settings=settings, **kwargs)
+            if collector is not None:
+                trace_file = telemetry.trace_path(settings)
+                result["telemetry"] = {**collector.summary(), "trace_file": str(trace_file) if trace_file else None}
+        return result
 
-def run_bank_recon(period: str, settings: Settings | None = None) -> dict:
+    return wrapper
+
+
+def _rollups(db_path: Path | None = None):
+    from finance_ai_pack.rollups import RollupStore
+
+    return RollupStore(db_path or _rollups_db())
+
+
+def _export_columnar(writer: ArtifactWriter | None, dataset: str, rows, settings: Settings, periods: list[str]) -> dict:
+    """Queue a typed columnar export of ``rows`` when COLUMNAR_EXPORT is set; returns its artifact entry."""
+    if not settings.columnar_export:
+        return {}
+    from finance_ai_pack.outputs.columnar import SCHEMAS, export_rows, resolve_format
+
+    fmt = resolve_format(settings.columnar_export)
+    entity = "default" if settings.company_id is None else f"company_{settings.company_id}"
+    warehouse = _warehouse_dir()
+    _write(writer, export_rows, SCHEMAS[dataset], rows, warehouse, fmt, entity, periods=periods)
+    return {f"{dataset}_{fmt}": str(warehouse / dataset)}
+
+
+def _in_context(fn):
+    # Bind a copy of the caller's context now, so stage spans land in the run's collector.
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+def _statement_notes(sources: dict[str, str]) -> str:
+    files = [f"{journal} from {source}" for journal, source in sources.items() if source != "odoo"]
+    if not files:
+        return "No PDF parsing in v1; Odoo statement lines only."
+    odoo = "; Odoo statement lines for the rest" if len(files) < len(sources) else ""
+    return f"No PDF parsing in v1; statement files used for {', '.join(files)}{odoo}."
+
+
+@_instrumented
+def run_bank_recon(
+    period: str,
+    settings: Settings | None = None,
+    writer: ArtifactWriter | None = None,
+    statements: dict[str, str] | None = None,
+) -> dict:
     validate_period(period)
     settings = settings or Settings.from_env()
-    result = bank_reconcile(period=period, fixtures_dir=FIXTURES, settings=settings)
+    from finance_ai_pack.recon.bank.service import reconcile as bank_reconcile
+
+    with telemetry.span("bank_reconcile"):
+        result = bank_reconcile(
+            period=period,
+            fixtures_dir=FIXTURES,
+            settings=settings,
+            fx_cache_dir=_fx_cache_dir(settings),
+            statement_files=statements,
+        )
     result.update(
         {
             "command": "bank_recon",
             "auto_posting": False,
-            "notes": "No PDF parsing in v1; statement lines only.",
+            "notes": _statement_notes(result["statement_sources"]),
         }
     )
+    open_lines = result.pop("open_lines")
 
-    prefix = _artifact_prefix("bank_recon", period)
+    prefix = _artifact_prefix("bank_recon", period, settings)
+    lines_file = prefix.parent / f"{prefix.name}_lines.csv"
     rows = [
         {
             "period": period,
@@ -55,10 +169,13 @@ def run_bank_recon(period: str, settings: Settings | None = None) -> dict:
         }
         for bank in result["banks"]
     ]
-    write_json(result, prefix.with_suffix(".json"))
-    write_csv(rows, prefix.with_suffix(".csv"))
-    write_xlsx(rows, prefix.with_suffix(".xlsx"))
-    write_html(
+    _write(writer, write_json, dict(result), prefix.with_suffix(".json"))
+    _write(writer, write_csv, rows, prefix.with_suffix(".csv"))
+    _write(writer, write_csv, open_lines, lines_file)
+    _write(writer, write_xlsx, rows, prefix.with_suffix(".xlsx"))
+    _write(
+        writer,
+        write_html,
         title=f"Bank Reconciliation {period}",
         sections={"Summary": result.get("bank_controls_rollup", {}), "Banks": result.get("banks", [])},
         output_file=prefix.with_suffix(".html"),
@@ -66,52 +183,145 @@ def run_bank_recon(period: str, settings: Settings | None = None) -> dict:
     result["artifacts"] = {
         "json": str(prefix.with_suffix(".json")),
         "csv": str(prefix.with_suffix(".csv")),
+        "lines_csv": str(lines_file),
         "xlsx": str(prefix.with_suffix(".xlsx")),
         "html": str(prefix.with_suffix(".html")),
+        **_export_columnar(writer, "bank_recon", rows, settings, [period]),
+        **_export_columnar(writer, "bank_lines", open_lines, settings, [period]),
     }
+    with telemetry.span("rollup_upsert"):
+        _rollups().upsert_bank(period, result["banks"], settings)
     return result
 
 
+@_instrumented
+def run_bank_recon_range(
+    period_from: str,
+    period_to: str,
+    settings: Settings | None = None,
+    writer: ArtifactWriter | None = None,
+    statements: dict[str, str] | None = None,
+) -> dict:
+    validate_period(period_from)
+    validate_period(period_to)
+    settings = settings or Settings.from_env()
+    from finance_ai_pack.recon.bank.service import reconcile_range as bank_reconcile_range
+
+    with telemetry.span("bank_reconcile_range"):
+        result = bank_reconcile_range(
+            period_from=period_from,
+            period_to=period_to,
+            fixtures_dir=FIXTURES,
+            settings=settings,
+            fx_cache_dir=_fx_cache_dir(settings),
+            statement_files=statements,
+        )
+    result.update(
+        {
+            "command": "bank_recon",
+            "auto_posting": False,
+            "notes": _statement_notes(result["statement_sources"]),
+        }
+    )
+
+    prefix = _artifact_prefix("bank_recon", f"{period_from}_{period_to}", settings)
+    rows = [
+        {
+            "period": month["period"],
+            "bank": bank["display_name"],
+            "journal": bank["journal"],
+            "currency": bank["currency"],
+            "line_count": bank["statement_line_count"],
+            "reconciled_count": bank["reconciled_count"],
+            "reconciled_pct": bank["reconciled_pct"],
+            "carried_forward_unreconciled_count": bank.get("carried_forward_unreconciled_count", 0),
+            "difference": bank["tie_out"]["difference"],
+        }
+        for month in result["months"]
+        for bank in month["banks"]
+    ]
+    roll_forward_file = prefix.parent / f"{prefix.name}_roll_forward.csv"
+    _write(writer, write_json, dict(result), prefix.with_suffix(".json"))
+    _write(writer, write_csv, rows, prefix.with_suffix(".csv"))
+    _write(writer, write_csv, result["roll_forward"], roll_forward_file)
+    _write(writer, write_xlsx, rows, prefix.with_suffix(".xlsx"))
+    _write(
+        writer,
+        write_html,
+        title=f"Bank Reconciliation {period_from} to {period_to}",
+        sections={
+            "Summary": result["bank_controls_rollup"],
+            "Roll-forward": result["roll_forward"],
+            "Months": result["months"],
+        },
+        output_file=prefix.with_suffix(".html"),
+    )
+    result["artifacts"] = {
+        "json": str(prefix.with_suffix(".json")),
+        "csv": str(prefix.with_suffix(".csv")),
+        "roll_forward_csv": str(roll_forward_file),
+        "xlsx": str(prefix.with_suffix(".xlsx")),
+        "html": str(prefix.with_suffix(".html")),
+        **_export_columnar(writer, "bank_recon", rows, settings, [month["period"] for month in result["months"]]),
+    }
+    with telemetry.span("rollup_upsert"):
+        store = _rollups()
+        for month in result["months"]:
+            store.upsert_bank(month["period"], month["banks"], settings)
+    return result
+
+
+@_instrumented
 def run_vat_pack(
     period_from: str,
     period_to: str | None = None,
     settings: Settings | None = None,
     tra_file: Path | None = None,
+    writer: ArtifactWriter | None = None,
 ) -> dict:
     validate_period(period_from)
     period_to = period_to or period_from
     validate_period(period_to)
     settings = settings or Settings.from_env()
+    from finance_ai_pack.periods import iter_periods
+    from finance_ai_pack.recon.vat.service import reconcile_vat
 
-    result = reconcile_vat(
-        period_from=period_from,
-        period_to=period_to,
-        fixtures_dir=FIXTURES,
-        settings=settings,
-        tra_file=tra_file,
-    )
+    with telemetry.span("vat_reconcile"):
+        result = reconcile_vat(
+            period_from=period_from,
+            period_to=period_to,
+            fixtures_dir=FIXTURES,
+            settings=settings,
+            tra_file=tra_file,
+        )
 
-    prefix = OUTPUTS_DIR / "vat_monthly_summary"
-    write_json({"monthly_summary": result["monthly_summary"]}, prefix.with_suffix(".json"))
-    write_csv(result["monthly_summary"], prefix.with_suffix(".csv"))
-    write_xlsx(result["monthly_summary"], prefix.with_suffix(".xlsx"))
+    outputs_dir = _outputs_dir(settings)
+    prefix = outputs_dir / "vat_monthly_summary"
+    _write(writer, write_json, {"monthly_summary": result["monthly_summary"]}, prefix.with_suffix(".json"))
+    _write(writer, write_csv, result["monthly_summary"], prefix.with_suffix(".csv"))
+    _write(writer, write_xlsx, result["monthly_summary"], prefix.with_suffix(".xlsx"))
 
-    exceptions_prefix = OUTPUTS_DIR / "vat_exception_register"
-    write_json({"exception_register": result["exception_register"]}, exceptions_prefix.with_suffix(".json"))
-    write_csv(result["exception_register"], exceptions_prefix.with_suffix(".csv"))
-    write_xlsx(result["exception_register"], exceptions_prefix.with_suffix(".xlsx"))
+    # The register is an ExceptionSink: each writer streams its own merged pass over it.
+    register = result["exception_register"]
+    exceptions_prefix = outputs_dir / "vat_exception_register"
+    _write(writer, write_json_rows, "exception_register", register, exceptions_prefix.with_suffix(".json"))
+    _write(writer, write_csv, register, exceptions_prefix.with_suffix(".csv"), fieldnames=register.fieldnames)
+    _write(writer, write_xlsx, register, exceptions_prefix.with_suffix(".xlsx"), fieldnames=register.fieldnames)
 
-    report_file = OUTPUTS_DIR / "vat_pack_report.html"
-    write_html(
+    report_file = outputs_dir / "vat_pack_report.html"
+    _write(
+        writer,
+        write_html,
         title=f"VAT Pack {period_from} to {period_to}",
         sections={
             "Narrative": {"text": result["narrative"]},
             "Monthly Summary": result["monthly_summary"],
-            "Exception Register": result["exception_register"],
+            "Exception Register": register,
         },
         output_file=report_file,
     )
 
+    periods = iter_periods(period_from, period_to)
     result["artifacts"] = {
         "vat_monthly_summary_json": str(prefix.with_suffix(".json")),
         "vat_monthly_summary_csv": str(prefix.with_suffix(".csv")),
@@ -120,30 +330,196 @@ def run_vat_pack(
         "vat_exception_register_csv": str(exceptions_prefix.with_suffix(".csv")),
         "vat_exception_register_xlsx": str(exceptions_prefix.with_suffix(".xlsx")),
         "vat_pack_report_html": str(report_file),
+        **_export_columnar(writer, "vat_monthly_summary", result["monthly_summary"], settings, periods),
+        **_export_columnar(writer, "vat_exception_register", register, settings, periods),
     }
+    with telemetry.span("rollup_upsert"):
+        _rollups().upsert_vat(result["monthly_summary"], register, settings)
+    # The payload carries the register only while it fits the buffer; the artifacts always have all of it.
+    result["exception_register"] = register.head(settings.exception_buffer_rows)
+    result["exception_register_truncated"] = len(register) > settings.exception_buffer_rows
     return result
 
 
-def run_month_end(period: str, settings: Settings | None = None, tra_file: Path | None = None) -> dict:
+@_instrumented
+def run_ledger_recon(
+    period: str,
+    settings: Settings | None = None,
+    writer: ArtifactWriter | None = None,
+    rebuild: bool = False,
+) -> dict:
     validate_period(period)
     settings = settings or Settings.from_env()
-    bank = run_bank_recon(period, settings=settings)
-    vat = run_vat_pack(period_from=period, period_to=period, settings=settings, tra_file=tra_file)
-
-    rollup = bank["bank_controls_rollup"]
-    unmatched_transactions = rollup["total_statement_lines"] - rollup["total_reconciled_lines"]
-    unexplained_amount = float(sum(abs(b["tie_out"]["difference"]) for b in bank["banks"]))
-    vat_monthly_differences = [
-        max(abs(float(row["input_difference"])), abs(float(row["output_difference"]))) for row in vat["monthly_summary"]
-    ]
+    from finance_ai_pack.recon.ledger.service import reconcile as ledger_reconcile
+
+    with telemetry.span("ledger_reconcile"):
+        result = ledger_reconcile(
+            period=period,
+            fixtures_dir=FIXTURES,
+            state_dir=_outputs_dir(settings) / "ledger",
+            settings=settings,
+            rebuild=rebuild,
+        )
+    result.update({"command": "ledger_recon", "auto_posting": False})
 
-    status = evaluate(
-        unmatched_transactions=unmatched_transactions,
-        unexplained_amount=unexplained_amount,
-        vat_monthly_differences=vat_monthly_differences,
+    prefix = _artifact_prefix("ledger_recon", period, settings)
+    _write(writer, write_json, dict(result), prefix.with_suffix(".json"))
+    _write(writer, write_csv, result["trial_balance"], prefix.with_suffix(".csv"))
+    _write(writer, write_xlsx, result["trial_balance"], prefix.with_suffix(".xlsx"))
+    _write(
+        writer,
+        write_html,
+        title=f"Ledger Reconciliation {period}",
+        sections={
+            "Totals": result["totals"],
+            "Control Accounts": result["control_accounts"],
+            "Exceptions": result["exceptions"],
+            "Trial Balance": result["trial_balance"],
+        },
+        output_file=prefix.with_suffix(".html"),
     )
-    proceed = can_proceed(status=status, overrides_file=OVERRIDES_FILE)
-    return {
+    result["artifacts"] = {
+        "json": str(prefix.with_suffix(".json")),
+        "csv": str(prefix.with_suffix(".csv")),
+        "xlsx": str(prefix.with_suffix(".xlsx")),
+        "html": str(prefix.with_suffix(".html")),
+    }
+    return result
+
+
+@_instrumented
+def run_petty_cash(period: str, settings: Settings | None = None, writer: ArtifactWriter | None = None) -> dict:
+    validate_period(period)
+    settings = settings or Settings.from_env()
+    from finance_ai_pack.recon.petty_cash.service import review as petty_cash_review
+
+    with telemetry.span("petty_cash_review"):
+        result = petty_cash_review(period=period, fixtures_dir=FIXTURES, settings=settings)
+    result.update({"command": "petty_cash", "auto_posting": False})
+
+    prefix = _artifact_prefix("petty_cash", period, settings)
+    exceptions_file = prefix.parent / f"{prefix.name}_exceptions.csv"
+    _write(writer, write_json, dict(result), prefix.with_suffix(".json"))
+    _write(writer, write_csv, result["journals"], prefix.with_suffix(".csv"))
+    _write(writer, write_csv, result["exceptions"], exceptions_file)
+    _write(
+        writer,
+        write_html,
+        title=f"Petty Cash Review {period}",
+        sections={"Metrics": result["metrics"], "Journals": result["journals"], "Exceptions": result["exceptions"]},
+        output_file=prefix.with_suffix(".html"),
+    )
+    result["artifacts"] = {
+        "json": str(prefix.with_suffix(".json")),
+        "csv": str(prefix.with_suffix(".csv")),
+        "exceptions_csv": str(exceptions_file),
+        "html": str(prefix.with_suffix(".html")),
+    }
+    return result
+
+
+@_instrumented
+def run_intercompany(period: str, settings: Settings | None = None, writer: ArtifactWriter | None = None) -> dict:
+    validate_period(period)
+    settings = settings or Settings.from_env()
+    from finance_ai_pack.recon.intercompany.service import reconcile as intercompany_reconcile
+
+    with telemetry.span("intercompany_reconcile"):
+        result = intercompany_reconcile(period=period, fixtures_dir=FIXTURES, settings=settings)
+    result.update({"command": "intercompany", "auto_posting": False})
+
+    prefix = _artifact_prefix("intercompany", period, settings)
+    mismatches_file = prefix.parent / f"{prefix.name}_mismatches.csv"
+    _write(writer, write_json, dict(result), prefix.with_suffix(".json"))
+    _write(writer, write_csv, result["pairs"], prefix.with_suffix(".csv"))
+    _write(writer, write_csv, result["mismatches"], mismatches_file)
+    _write(
+        writer,
+        write_html,
+        title=f"Intercompany Matching {period}",
+        sections={
+            "Summary": result["intercompany_controls_rollup"],
+            "Pairs": result["pairs"],
+            "Mismatches": result["mismatches"],
+        },
+        output_file=prefix.with_suffix(".html"),
+    )
+    result["artifacts"] = {
+        "json": str(prefix.with_suffix(".json")),
+        "csv": str(prefix.with_suffix(".csv")),
+        "mismatches_csv": str(mismatches_file),
+        "html": str(prefix.with_suffix(".html")),
+    }
+    return result
+
+
+@_instrumented
+def run_month_end(
+    period: str,
+    settings: Settings | None = None,
+    tra_file: Path | None = None,
+    stage_results: dict | None = None,
+) -> dict:
+    """Run the close stages and gate the month.
+
+    ``stage_results`` maps a stage name to the ``(result, ms)`` of an earlier run; those stages are
+    reused instead of re-run (their artifacts are already on disk) and fresh ones are stored back.
+    """
+    validate_period(period)
+    settings = settings or Settings.from_env()
+    from concurrent.futures import ThreadPoolExecutor
+
+    from finance_ai_pack.rules.month_end_gating import can_proceed, evaluate
+
+    started = time.perf_counter()
+    stage_results = {} if stage_results is None else stage_results
+    reused = set(stage_results)
+    stage_calls = {
+        "bank_recon": (run_bank_recon, {"period": period}),
+        "vat_pack": (run_vat_pack, {"period_from": period, "period_to": period, "tra_file": tra_file}),
+        "petty_cash": (run_petty_cash, {"period": period}),
+        "intercompany": (run_intercompany, {"period": period}),
+    }
+
+    # The stages are independent until gating: run them side by side and let the
+    # artifact writer drain to disk while gating is evaluated.
+    with ArtifactWriter() as writer:
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix="month-end-stage") as stages:
+            futures = {
+                name: stages.submit(_in_context(_timed), runner, settings=settings, writer=writer, **params)
+                for name, (runner, params) in stage_calls.items()
+                if name not in stage_results
+            }
+            for name, future in futures.items():
+                stage_results[name] = future.result()
+        bank, bank_ms = stage_results["bank_recon"]
+        vat, vat_ms = stage_results["vat_pack"]
+        petty_cash, petty_cash_ms = stage_results["petty_cash"]
+        intercompany, intercompany_ms = stage_results["intercompany"]
+
+        gating_started = time.perf_counter()
+        with telemetry.span("gating"):
+            rollup = bank["bank_controls_rollup"]
+            unmatched_transactions = rollup["total_statement_lines"] - rollup["total_reconciled_lines"]
+            unexplained_amount = rollup["unexplained_amount"]
+            vat_monthly_differences = [
+                max(abs(row["input_difference"]), abs(row["output_difference"])) for row in vat["monthly_summary"]
+            ]
+
+            status = evaluate(
+                unmatched_transactions=unmatched_transactions,
+                unexplained_amount=unexplained_amount,
+                vat_monthly_differences=vat_monthly_differences,
+                petty_cash_exceptions=petty_cash["metrics"]["exception_count"],
+                intercompany_mismatches=intercompany["intercompany_controls_rollup"]["mismatch_count"],
+            )
+            proceed = can_proceed(status=status, overrides_file=OVERRIDES_FILE)
+        gating_ms = round((time.perf_counter() - gating_started) * 1000, 3)
+
+        with telemetry.span("artifact_flush"):
+            _, artifacts_ms = _timed(writer.wait)
+
+    result = {
         "command": "month_end",
         "period": period,
         "mode": bank["mode"],
@@ -154,46 +530,598 @@ def run_month_end(period: str, settings: Settings | None = None, tra_file: Path
         "vat_controls_rollup": {
             "months": len(vat["monthly_summary"]),
             "max_abs_vat_difference": max(vat_monthly_differences) if vat_monthly_differences else 0.0,
-            "exception_count": len(vat["exception_register"]),
+            "exception_count": vat["metrics"]["exception_count"],
         },
+        "petty_cash_controls_rollup": petty_cash["metrics"],
+        "intercompany_controls_rollup": intercompany["intercompany_controls_rollup"],
+        "artifacts": {
+            "bank_recon": bank.get("artifacts", {}),
+            "vat_pack": vat.get("artifacts", {}),
+            "petty_cash": petty_cash.get("artifacts", {}),
+            "intercompany": intercompany.get("artifacts", {}),
+        },
+        "timings_ms": {
+            # A reused stage cost nothing this run.
+            "bank_recon": 0.0 if "bank_recon" in reused else bank_ms,
+            "vat_pack": 0.0 if "vat_pack" in reused else vat_ms,
+            "petty_cash": 0.0 if "petty_cash" in reused else petty_cash_ms,
+            "intercompany": 0.0 if "intercompany" in reused else intercompany_ms,
+            "gating": gating_ms,
+            "artifact_flush": artifacts_ms,
+            "total": round((time.perf_counter() - started) * 1000, 3),
+        },
+    }
+    with telemetry.span("rollup_upsert"):
+        _rollups().upsert_close(result, settings)
+    return result
+
+
+RUNNERS = {"bank_recon": run_bank_recon, "vat_pack": run_vat_pack, "month_end": run_month_end}
+
+
+def run_group(
+    command: str,
+    companies: str = "all",
+    settings: Settings | None = None,
+    max_companies: int = 4,
+    executor: str = "thread",
+    **params,
+) -> dict:
+    """Fan ``command`` out across companies and consolidate a group-level rollup."""
+    settings = settings or Settings.from_env()
+    from finance_ai_pack.group import CONSOLIDATORS, fan_out, resolve_companies
+
+    selected = resolve_companies(companies, settings, FIXTURES)
+    results = fan_out(
+        runner_for(command, params), selected, settings, max_workers=max_companies, executor=executor, **params
+    )
+    period_label = params.get("period") or f"{params['period_from']}_{params['period_to']}"
+    return {**_write_group(command, period_label, results, settings, CONSOLIDATORS[command]), "companies": results}
+
+
+def _write_group(command: str, period_label: str, results: list[dict], settings: Settings, consolidate) -> dict:
+    group_rollup = consolidate(results)
+    prefix = OUTPUTS_DIR / "group" / f"{command}_{period_label}"
+    rows = [
+        {
+            "company_id": result["company"]["id"],
+            "company": result["company"]["name"],
+            **_group_row(command, result),
+        }
+        for result in results
+    ]
+    summary = {
+        "command": command,
+        "scope": "group",
+        "period": period_label,
+        "mode": "fixture-only" if settings.fixture_mode else "live-odoo",
+        "auto_posting": False,
+        "group_rollup": group_rollup,
+    }
+    write_json({**summary, "companies": rows}, prefix.with_suffix(".json"))
+    write_csv(rows, prefix.with_suffix(".csv"))
+    return {
+        **summary,
+        "artifacts": {"json": str(prefix.with_suffix(".json")), "csv": str(prefix.with_suffix(".csv"))},
+    }
+
+
+def run_distributed(
+    command: str,
+    period_from: str,
+    period_to: str | None = None,
+    companies: str = "all",
+    settings: Settings | None = None,
+    workers: int = 2,
+    db_path: Path | None = None,
+    max_attempts: int = 3,
+    timeout: float | None = None,
+    tra_file: Path | None = None,
+) -> dict:
+    """Shard ``command`` into (company, period) jobs, let workers drain them and merge the group artifacts.
+
+    ``workers`` local processes are started for the run; workers on other hosts that share
+    the queue file join in with ``run distributed worker``.
+    """
+    settings = settings or Settings.from_env()
+    from finance_ai_pack.distributed import ShardQueue, merge_run, spawn_local_workers
+    from finance_ai_pack.group import CONSOLIDATORS, resolve_companies
+    from finance_ai_pack.periods import iter_periods
+
+    periods = [validate_period(period) for period in iter_periods(period_from, period_to or period_from)]
+    if workers < 0:
+        raise ValueError("workers must be >= 0")
+    queue = ShardQueue(db_path or DISTRIBUTED_DB)
+    selected = resolve_companies(companies, settings, FIXTURES)
+    run_id = queue.create_run(
+        command, periods, selected, settings, params={"tra_file": tra_file}, max_attempts=max_attempts
+    )
+
+    started = time.perf_counter()
+    pool = None
+    if workers:
+        pool, futures = spawn_local_workers(queue.db_path, settings, run_id, min(workers, len(periods) * len(selected)))
+    try:
+        run = queue.wait(run_id, timeout=timeout)
+        if pool is not None:
+            for future in futures:
+                future.result()
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    merged = merge_run(queue, run_id)
+    incomplete = {shard["period"] for shard in merged["failed_shards"]}
+    groups = []
+    for period in periods:
+        results = merged["periods"].get(period, [])
+        group = _write_group(command, period, results, settings, CONSOLIDATORS[command])
+        group["complete"] = period not in incomplete
+        if command == "month_end" and not group["complete"]:
+            # A company that did not report cannot be signed off.
+            group["group_rollup"]["proceed"] = False
+        groups.append(group)
+    return {
+        "command": command,
+        "scope": "distributed",
+        "run_id": run_id,
+        "mode": "fixture-only" if settings.fixture_mode else "live-odoo",
+        "auto_posting": False,
+        "periods": periods,
+        "company_count": len(selected),
+        "shards": run["shards"],
+        "failed_shards": merged["failed_shards"],
+        "groups": groups,
+        "elapsed_ms": elapsed_ms,
+        "queue": str(queue.db_path),
+    }
+
+
+def run_watch(
+    period: str,
+    settings: Settings | None = None,
+    tra_file: Path | None = None,
+    debounce: float = 0.5,
+    poll_interval: float = 0.25,
+    max_runs: int | None = None,
+    emit=None,
+) -> int:
+    """Run month-end, then rerun only the stages whose inputs change (fixture or replay mode)."""
+    validate_period(period)
+    settings = settings or Settings.from_env()
+    if not settings.fixture_mode:
+        raise ValueError("run watch follows fixture or replay inputs; set FIXTURE_MODE=true or pass --replay")
+    from finance_ai_pack.connectors.odoo.cache import extract_cache
+    from finance_ai_pack.recon.bank.service import REGISTRY_FILE
+    from finance_ai_pack.recon.petty_cash.service import RULES_FILE as PETTY_CASH_RULES_FILE
+    from finance_ai_pack.rules.month_end_gating import RULES_FILE
+    from finance_ai_pack.watch import Watcher, WatchInputs
+
+    inputs = WatchInputs(
+        fixtures_dir=FIXTURES,
+        registry_file=REGISTRY_FILE,
+        rules_file=RULES_FILE,
+        overrides_file=OVERRIDES_FILE,
+        tra_file=tra_file.resolve() if tra_file else None,
+        replay_dir=Path(settings.replay_dir).resolve() if settings.replay_dir else None,
+        petty_cash_rules_file=PETTY_CASH_RULES_FILE,
+    )
+
+    def clear_extracts() -> None:
+        # Warm extracts would hide the edit that triggered the rerun.
+        if settings.extract_cache_ttl > 0:
+            extract_cache(settings.extract_cache_ttl).clear()
+
+    watcher = Watcher(
+        inputs,
+        lambda stage_results: run_month_end(period, settings=settings, tra_file=tra_file, stage_results=stage_results),
+        debounce=debounce,
+        poll_interval=poll_interval,
+        before_run=clear_extracts,
+    )
+    return watcher.watch(
+        emit or (lambda summary: print(json.dumps({"period": period, **summary}), flush=True)), max_runs
+    )
+
+
+def run_diff(run_a: Path, run_b: Path, output: Path | None = None, max_rows: int = 200_000) -> dict:
+    """Keyed diff of two runs' bank and VAT artifacts: a JSON-lines delta plus a summary."""
+    from finance_ai_pack.diff import diff_runs
+
+    run_a, run_b = Path(run_a), Path(run_b)
+    prefix = output or OUTPUTS_DIR / "diff" / f"diff_{run_a.stem or 'a'}_{run_b.stem or 'b'}"
+    summary = diff_runs(run_a, run_b, prefix.parent / f"{prefix.name}.jsonl", max_rows=max_rows)
+    summary["command"] = "diff"
+    write_json(summary, prefix.with_suffix(".json"))
+    summary["artifacts"] = {"json": str(prefix.with_suffix(".json")), "delta_jsonl": summary["delta_file"]}
+    return summary
+
+
+def runner_for(command: str, params: dict):
+    """The ``run_*`` function for ``command``; a bank recon with ``period_from`` runs the range."""
+    if command == "bank_recon" and "period_from" in params:
+        return run_bank_recon_range
+    return RUNNERS[command]
+
+
+def _group_row(command: str, result: dict) -> dict:
+    if command == "bank_recon":
+        rollup = result["bank_controls_rollup"]
+        return {
+            "bank_count": rollup["bank_count"],
+            "line_count": rollup["total_statement_lines"],
+            "reconciled_count": rollup["total_reconciled_lines"],
+            "reconciled_pct": rollup["overall_reconciled_pct"],
+            "exception_count": rollup["exception_count"],
+        }
+    if command == "vat_pack":
+        return {
+            "months": result["metrics"]["months"],
+            "exception_count": result["metrics"]["exception_count"],
+            "aggregate_net_vat_difference_abs": result["metrics"]["aggregate_net_vat_difference_abs"],
+        }
+    return {
+        "status": result["status"],
+        "proceed": result["proceed"],
+        "unmatched_transactions": result["bank_controls_rollup"]["total_statement_lines"]
+        - result["bank_controls_rollup"]["total_reconciled_lines"],
+        "max_abs_vat_difference": result["vat_controls_rollup"]["max_abs_vat_difference"],
+        "petty_cash_exception_count": result["petty_cash_controls_rollup"]["exception_count"],
     }
 
 
+def _add_company_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--companies", help="'all' or comma-separated res.company ids")
+    parser.add_argument("--max_companies", type=int, default=4, help="companies reconciled concurrently")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+
+
+def _command_params(args: argparse.Namespace, parser: argparse.ArgumentParser) -> dict:
+    tra_file = Path(args.tra_file) if getattr(args, "tra_file", None) else None
+    if args.command == "bank_recon":
+        if args.period and (args.period_from or args.period_to):
+            parser.error("bank_recon accepts either --period or --period_from/--period_to, not both")
+        statements = {}
+        for spec in getattr(args, "statement", None) or []:
+            journal, _, path = spec.partition("=")
+            if not journal or not path:
+                parser.error(f"--statement expects JOURNAL=FILE, got {spec!r}")
+            statements[journal] = str(Path(path).resolve())
+        extra = {"statements": statements} if statements else {}
+        if args.period:
+            return {"period": args.period, **extra}
+        if not args.period_from:
+            parser.error("bank_recon requires --period or --period_from")
+        return {"period_from": args.period_from, "period_to": args.period_to or args.period_from, **extra}
+    if args.command == "vat_pack":
+        return {"period_from": args.period_from, "period_to": args.period_to or args.period_from, "tra_file": tra_file}
+    return {"period": args.period, "tra_file": tra_file}
+
+
+def _add_job_command_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("job_command", choices=sorted(RUNNERS))
+    parser.add_argument("--period")
+    parser.add_argument("--period_from")
+    parser.add_argument("--period_to")
+    parser.add_argument("--tra_file")
+    parser.add_argument("--companies")
+
+
+def _run_jobs(args: argparse.Namespace, parser: argparse.ArgumentParser, settings: Settings) -> dict | list:
+    from finance_ai_pack.scheduler import JobScheduler, run_or_attach, run_worker
+
+    scheduler = JobScheduler(
+        Path(args.db) if args.db else SCHEDULER_DB,
+        coalesce_seconds=args.coalesce_seconds,
+    )
+    if args.jobs_command in {"submit", "run"}:
+        job_args = argparse.Namespace(**{**vars(args), "command": args.job_command})
+        if args.job_command == "month_end" and not args.period:
+            parser.error("month_end requires --period")
+        if args.job_command == "vat_pack" and not args.period_from:
+            parser.error("vat_pack requires --period_from")
+        params = _command_params(job_args, parser)
+        if args.jobs_command == "submit":
+            job = scheduler.submit(args.job_command, params, settings, companies=args.companies)
+            return scheduler.wait(job["job_id"], timeout=args.timeout) if args.wait else job
+        return run_or_attach(
+            scheduler,
+            args.job_command,
+            params,
+            settings,
+            companies=args.companies,
+            max_per_database=args.max_per_db,
+            timeout=args.timeout,
+        )
+    if args.jobs_command == "worker":
+        processed = run_worker(
+            scheduler, settings, concurrency=args.concurrency, max_per_database=args.max_per_db, once=args.once
+        )
+        return {"processed": processed}
+    if args.jobs_command == "wait":
+        return scheduler.wait(args.job_id, timeout=args.timeout)
+    if args.jobs_command == "status":
+        return scheduler.get(args.job_id)
+    return scheduler.list_jobs(limit=args.limit)
+
+
+def _run_distributed(args: argparse.Namespace, parser: argparse.ArgumentParser, settings: Settings) -> dict:
+    db_path = Path(args.db) if args.db else DISTRIBUTED_DB
+    if args.distributed_command == "start":
+        try:
+            return run_distributed(
+                args.shard_command,
+                args.period_from,
+                args.period_to,
+                companies=args.companies,
+                settings=settings,
+                workers=args.workers,
+                db_path=db_path,
+                max_attempts=args.max_attempts,
+                timeout=args.timeout,
+                tra_file=Path(args.tra_file).resolve() if args.tra_file else None,
+            )
+        except ValueError as exc:
+            parser.error(str(exc))
+    from finance_ai_pack.distributed import ShardQueue, run_shard_worker
+    from finance_ai_pack.scheduler import FAILED
+
+    if args.distributed_command == "worker":
+        processed = run_shard_worker(db_path, settings, run_id=args.run, once=args.once)
+        return {"processed": processed}
+    queue = ShardQueue(db_path)
+    return {**queue.get_run(args.run_id), "failed": [s for s in queue.shards(args.run_id) if s["status"] == FAILED]}
+
+
+def _run_command(args: argparse.Namespace, params: dict, settings: Settings) -> dict:
+    if args.command == "ledger_recon":
+        return run_ledger_recon(args.period, settings=settings, rebuild=args.rebuild)
+    if args.command == "petty_cash":
+        return run_petty_cash(args.period, settings=settings)
+    if args.command == "intercompany":
+        return run_intercompany(args.period, settings=settings)
+    if args.companies:
+        return run_group(
+            args.command,
+            companies=args.companies,
+            settings=settings,
+            max_companies=args.max_companies,
+            executor=args.executor,
+            **params,
+        )
+    return runner_for(args.command, params)(settings=settings, **params)
+
+
+def _profile_stem(command: str, params: dict) -> str:
+    if "period" in params:
+        return f"{command}_{params['period']}"
+    if params["period_from"] == params["period_to"]:
+        return f"{command}_{params['period_from']}"
+    return f"{command}_{params['period_from']}_{params['period_to']}"
+
+
 def main() -> None:
     settings = Settings.from_env()
 
     parser = argparse.ArgumentParser(prog="run")
+    parser.add_argument("--telemetry", action="store_true", help='add spans and RPC counters as "telemetry"')
+    parser.add_argument("--trace_file", help="export spans as a Chrome trace (.json) or JSON lines (.jsonl)")
+    parser.add_argument(
+        "--profile",
+        choices=["cprofile", "tracemalloc", "sampling"],
+        help=f"profile the command; artifacts are written to {OUTPUTS_DIR}",
+    )
+    parser.add_argument("--record", metavar="DIR", help="record every live Odoo extract into a replayable dataset")
+    parser.add_argument("--replay", metavar="DIR", help="serve extracts from a recorded dataset instead of Odoo")
+    parser.add_argument(
+        "--columnar",
+        choices=["auto", "parquet", "ndjson"],
+        help=f"also export typed, partitioned bank and VAT datasets under {_warehouse_dir()}",
+    )
+    parser.add_argument("--profile_top", type=int, default=20, help="hot functions / allocation sites to report")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     bank_sub = subparsers.add_parser("bank_recon")
-    bank_sub.add_argument("--period", required=True)
+    bank_sub.add_argument("--period")
+    bank_sub.add_argument("--period_from")
+    bank_sub.add_argument("--period_to")
+    bank_sub.add_argument(
+        "--statement",
+        action="append",
+        metavar="JOURNAL=FILE",
+        help="read a journal's statement lines from a CAMT.053, MT940 or CSV file (journal name or code; repeatable)",
+    )
+    _add_company_arguments(bank_sub)
 
     vat_sub = subparsers.add_parser("vat_pack")
     vat_sub.add_argument("--period_from", required=True)
     vat_sub.add_argument("--period_to")
     vat_sub.add_argument("--tra_file")
+    _add_company_arguments(vat_sub)
 
     month_end_sub = subparsers.add_parser("month_end")
     month_end_sub.add_argument("--period", required=True)
     month_end_sub.add_argument("--tra_file")
+    _add_company_arguments(month_end_sub)
+
+    petty_cash_sub = subparsers.add_parser("petty_cash")
+    petty_cash_sub.add_argument("--period", required=True)
+
+    intercompany_sub = subparsers.add_parser("intercompany", help="match open balances between companies")
+    intercompany_sub.add_argument("--period", required=True)
+
+    ledger_sub = subparsers.add_parser("ledger_recon")
+    ledger_sub.add_argument("--period", required=True)
+    ledger_sub.add_argument("--rebuild", action="store_true", help="ignore the carried-forward trial balance")
+
+    serve_sub = subparsers.add_parser("serve", help="long-running HTTP/JSON API with warm connections")
+    serve_sub.add_argument("--host", default="127.0.0.1")
+    serve_sub.add_argument("--port", type=int, default=8080)
+    serve_sub.add_argument("--workers", type=int, default=4)
+    serve_sub.add_argument("--queue_size", type=int, default=32)
+    serve_sub.add_argument("--cache_ttl", type=float, default=300.0, help="seconds to keep Odoo extracts warm")
+
+    jobs_sub = subparsers.add_parser("jobs", help="SQLite-backed job scheduler with deduplication")
+    jobs_sub.add_argument("--db", help=f"scheduler database (default {SCHEDULER_DB})")
+    jobs_sub.add_argument("--coalesce_seconds", type=float, default=5.0)
+    jobs_sub.add_argument("--max_per_db", type=int, default=1, help="concurrent jobs per Odoo database")
+    jobs_sub.add_argument("--timeout", type=float)
+    jobs_commands = jobs_sub.add_subparsers(dest="jobs_command", required=True)
+    submit_sub = jobs_commands.add_parser("submit", help="queue a job (or attach to an identical one)")
+    _add_job_command_arguments(submit_sub)
+    submit_sub.add_argument("--wait", action="store_true")
+    run_sub = jobs_commands.add_parser("run", help="queue a job and run it here unless one is already in flight")
+    _add_job_command_arguments(run_sub)
+    worker_sub = jobs_commands.add_parser("worker")
+    worker_sub.add_argument("--concurrency", type=int, default=2)
+    worker_sub.add_argument("--once", action="store_true", help="exit when no job is claimable")
+    wait_sub = jobs_commands.add_parser("wait")
+    wait_sub.add_argument("job_id")
+    status_sub = jobs_commands.add_parser("status")
+    status_sub.add_argument("job_id")
+    list_sub = jobs_commands.add_parser("list")
+    list_sub.add_argument("--limit", type=int, default=20)
+
+    distributed_sub = subparsers.add_parser("distributed", help="shard company x period runs across worker processes")
+    distributed_sub.add_argument("--db", help=f"shared shard queue (default {DISTRIBUTED_DB})")
+    distributed_commands = distributed_sub.add_subparsers(dest="distributed_command", required=True)
+    start_sub = distributed_commands.add_parser("start", help="enqueue shards, run local workers and merge")
+    start_sub.add_argument("shard_command", choices=sorted(RUNNERS))
+    start_sub.add_argument("--period_from", required=True)
+    start_sub.add_argument("--period_to")
+    start_sub.add_argument("--companies", default="all", help="'all' or comma-separated res.company ids")
+    start_sub.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="local worker processes (0: none)")
+    start_sub.add_argument("--max_attempts", type=int, default=3, help="tries per shard before it is marked failed")
+    start_sub.add_argument("--timeout", type=float)
+    start_sub.add_argument("--tra_file")
+    shard_worker_sub = distributed_commands.add_parser("worker", help="pull shards from the shared queue")
+    shard_worker_sub.add_argument("--run", help="only serve this run and exit when it is done")
+    shard_worker_sub.add_argument("--once", action="store_true", help="exit when no shard is claimable")
+    distributed_status_sub = distributed_commands.add_parser("status")
+    distributed_status_sub.add_argument("run_id")
+
+    diff_sub = subparsers.add_parser("diff", help="keyed diff of two runs' artifacts (files or output directories)")
+    diff_sub.add_argument("run_a")
+    diff_sub.add_argument("run_b")
+    diff_sub.add_argument("--output", help="artifact prefix (default outputs/diff/diff_<a>_<b>)")
+    diff_sub.add_argument("--max_rows", type=int, default=200_000, help="rows sorted in memory before spilling")
+
+    watch_sub = subparsers.add_parser("watch", help="rerun month-end stages as fixture, TRA and rule files change")
+    watch_sub.add_argument("--period", required=True)
+    watch_sub.add_argument("--tra_file")
+    watch_sub.add_argument("--debounce", type=float, default=0.5, help="seconds of quiet before a rerun")
+    watch_sub.add_argument("--poll_interval", type=float, default=0.25, help="seconds between input scans")
+
+    trends_sub = subparsers.add_parser("trends", help="per-period series from the materialized rollup store")
+    trends_sub.add_argument(
+        "--metric",
+        default="bank_reconciled_pct",
+        help="bank_reconciled_pct, bank_difference, bank_line_count, bank_reconciled_count, bank_exception_count, "
+        "vat_input_difference, vat_output_difference, vat_net_vat_difference, vat_exception_count or close_status",
+    )
+    trends_sub.add_argument("--months", type=int, default=24)
+    trends_sub.add_argument("--period_to", help="last month of the window (default: latest stored period)")
+    trends_sub.add_argument("--bank", help="one bank's display name")
+    trends_sub.add_argument("--company_id", type=int, help="res.company id the runs were scoped to")
+    trends_sub.add_argument("--db", help=f"rollup database (default {_rollups_db()})")
 
     args = parser.parse_args()
+    if args.telemetry or args.trace_file:
+        settings = replace(settings, telemetry=True, trace_file=args.trace_file or settings.trace_file)
+    if args.columnar:
+        from finance_ai_pack.outputs.columnar import resolve_format
 
-    if args.command == "bank_recon":
-        payload = run_bank_recon(args.period, settings=settings)
-    elif args.command == "vat_pack":
-        payload = run_vat_pack(
-            period_from=args.period_from,
-            period_to=args.period_to,
+        try:
+            resolve_format(args.columnar)
+        except ValueError as exc:
+            parser.error(str(exc))
+        settings = replace(settings, columnar_export=args.columnar)
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+    if args.record:
+        if settings.fixture_mode:
+            parser.error("--record captures live Odoo extracts; set FIXTURE_MODE=false")
+        settings = replace(settings, record_dir=args.record)
+    if args.replay:
+        settings = replace(settings, fixture_mode=True, replay_dir=args.replay)
+    if args.profile and args.command in {"jobs", "serve", "trends", "distributed", "diff", "watch"}:
+        parser.error(f"--profile does not apply to {args.command}")
+    if args.command == "diff":
+        try:
+            payload = run_diff(
+                Path(args.run_a), Path(args.run_b), Path(args.output) if args.output else None, args.max_rows
+            )
+        except ValueError as exc:
+            parser.error(str(exc))
+        print(json.dumps(payload, indent=2))
+        return
+    if args.command == "watch":
+        tra_file = Path(args.tra_file) if args.tra_file else None
+        try:
+            run_watch(args.period, settings, tra_file, debounce=args.debounce, poll_interval=args.poll_interval)
+        except ValueError as exc:
+            parser.error(str(exc))
+        except KeyboardInterrupt:
+            pass
+        return
+    if args.command == "jobs":
+        print(json.dumps(_run_jobs(args, parser, settings), indent=2))
+        return
+    if args.command == "distributed":
+        print(json.dumps(_run_distributed(args, parser, settings), indent=2))
+        return
+    if args.command == "trends":
+        if args.company_id is not None:
+            settings = replace(settings, company_id=args.company_id)
+        try:
+            if args.period_to:
+                validate_period(args.period_to)
+            trends = _rollups(Path(args.db) if args.db else None).trends(
+                args.metric,
+                settings,
+                months=args.months,
+                period_to=args.period_to,
+                bank=args.bank,
+            )
+        except ValueError as exc:
+            parser.error(str(exc))
+        print(json.dumps(trends, indent=2))
+        return
+    if args.command == "serve":
+        from finance_ai_pack.server import serve
+
+        serve(
+            host=args.host,
+            port=args.port,
             settings=settings,
-            tra_file=Path(args.tra_file) if args.tra_file else None,
+            workers=args.workers,
+            queue_size=args.queue_size,
+            cache_ttl=args.cache_ttl,
         )
+        return
+
+    if args.command in {"ledger_recon", "petty_cash", "intercompany"}:
+        params = {"period": args.period}
     else:
-        payload = run_month_end(
-            args.period,
-            settings=settings,
-            tra_file=Path(args.tra_file) if args.tra_file else None,
-        )
+        params = _command_params(args, parser)
+
+    if args.profile:
+        from finance_ai_pack.profiling import profile
+
+        stem = OUTPUTS_DIR / _profile_stem(args.command, params)
+        with profile(args.profile, stem, top=args.profile_top) as report:
+            payload = _run_command(args, params, settings)
+        payload["profile"] = report
+    else:
+        payload = _run_command(args, params, settings)
+
+    if settings.record_dir:
+        from finance_ai_pack.connectors.odoo.recording import shared_recorder
+
+        recorder = shared_recorder(settings.record_dir)
+        recorder.flush()
+        payload["recording"] = {"dataset_dir": str(recorder.dataset_dir), **recorder.stats}
 
     print(json.dumps(payload, indent=2))
     print("no auto-posting performed")
@@ -7,10 +7,23 @@ from dataclasses import dataclass
 @dataclass(frozen=True)
 class Settings:
     fixture_mode: bool = True
+    fixture_store: str = "json"
     odoo_url: str = ""
     odoo_db: str = ""
     odoo_username: str = ""
     odoo_password: str = ""
+    company_id: int | None = None
+    extract_cache_ttl: float = 0.0
+    telemetry: bool = False
+    trace_file: str = ""
+    record_dir: str = ""
+    replay_dir: str = ""
+    odoo_max_concurrency: int = 16
+    odoo_max_retries: int = 3
+    fx_cache_ttl: float = 21600.0
+    fx_cache_dir: str = ""
+    exception_buffer_rows: int = 100_000
+    columnar_export: str = ""
 
     @property
     def odoo_user(self) -> str:
@@ -20,10 +33,24 @@ class Settings:
     @staticmethod
     def from_env() -> "Settings":
         fixture_mode = os.getenv("FIXTURE_MODE", "true").lower() in {"1", "true", "yes"}
+        company_id = os.getenv("ODOO_COMPANY_ID", "").strip()
         return Settings(
             fixture_mode=fixture_mode,
+            fixture_store=os.getenv("FIXTURE_STORE", "json").strip().lower() or "json",
             odoo_url=os.getenv("ODOO_URL", ""),
             odoo_db=os.getenv("ODOO_DB", ""),
             odoo_username=os.getenv("ODOO_USERNAME", os.getenv("ODOO_USER", "")),
             odoo_password=os.getenv("ODOO_PASSWORD", ""),
+            company_id=int(company_id) if company_id else None,
+            extract_cache_ttl=float(os.getenv("EXTRACT_CACHE_TTL", "0") or 0),
+            telemetry=os.getenv("TELEMETRY", "false").lower() in {"1", "true", "yes"},
+            trace_file=os.getenv("TELEMETRY_TRACE_FILE", ""),
+            record_dir=os.getenv("ODOO_RECORD_DIR", ""),
+            replay_dir=os.getenv("ODOO_REPLAY_DIR", ""),
+            odoo_max_concurrency=int(os.getenv("ODOO_MAX_CONCURRENCY", "16") or 16),
+            odoo_max_retries=int(os.getenv("ODOO_MAX_RETRIES", "3") or 3),
+            fx_cache_ttl=float(os.getenv("FX_CACHE_TTL", "21600") or 0),
+            fx_cache_dir=os.getenv("FX_CACHE_DIR", ""),
+            exception_buffer_rows=int(os.getenv("EXCEPTION_BUFFER_ROWS", "100000") or 100_000),
+            columnar_export=os.getenv("COLUMNAR_EXPORT", "").strip().lower(),
         )
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+
+class ExtractCache:
+    """Thread-safe TTL cache for adapter extracts, bounded to ``max_entries`` (LRU eviction)."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key: tuple, loader: Callable[[], object]) -> object:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = loader()
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class CachingAdapter:
+    """Wraps an adapter so repeated extracts with the same arguments are served from an ``ExtractCache``.
+
+    Every call gets its own deep copy of the cached value, so a caller that annotates or sorts
+    the rows it was given cannot change what the next caller sees.
+    """
+
+    def __init__(self, adapter, cache: ExtractCache, namespace: tuple) -> None:
+        self.adapter = adapter
+        self.cache = cache
+        self.namespace = namespace
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.adapter, name)
+        if name.startswith(("_", "iter_")) or not callable(attr):
+            # Streaming extracts are generators and cannot be replayed from a cache.
+            return attr
+
+        def cached(*args, **kwargs):
+            key = (*self.namespace, name, json.dumps([args, kwargs], sort_keys=True, default=str))
+            return copy.deepcopy(self.cache.get_or_load(key, lambda: attr(*args, **kwargs)))
+
+        return cached
+
+
+_CACHES: dict[float, ExtractCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def extract_cache(ttl_seconds: float) -> ExtractCache:
+    with _CACHES_LOCK:
+        cache = _CACHES.get(ttl_seconds)
+        if cache is None:
+            cache = ExtractCache(ttl_seconds)
+            _CACHES[ttl_seconds] = cache
+        return cache
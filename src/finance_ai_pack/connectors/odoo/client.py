@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import socket
 import ssl
+import time
+from collections.abc import Iterator
 from urllib.parse import urlparse
-from xmlrpc.client import Fault, ProtocolError, ServerProxy
+from xmlrpc.client import Fault, GzipDecodedResponse, ProtocolError, SafeTransport, ServerProxy, Transport
 
+from finance_ai_pack import telemetry
 from finance_ai_pack.config import Settings
 
 
@@ -12,12 +15,50 @@ class OdooConnectionError(RuntimeError):
     """Raised when live Odoo cannot be reached or authenticated."""
 
 
+class _CountingMixin:
+    """Remember the size of the last request and response body for RPC telemetry."""
+
+    last_request_bytes = 0
+    last_response_bytes = 0
+
+    def send_request(self, host, handler, request_body, debug):
+        self.last_request_bytes = len(request_body)
+        self.last_response_bytes = 0
+        return super().send_request(host, handler, request_body, debug)
+
+    def parse_response(self, response):
+        stream = GzipDecodedResponse(response) if response.getheader("Content-Encoding", "") == "gzip" else response
+        data = stream.read()
+        if stream is not response:
+            stream.close()
+        self.last_response_bytes = len(data)
+        parser, unmarshaller = self.getparser()
+        parser.feed(data)
+        parser.close()
+        return unmarshaller.close()
+
+
+class CountingTransport(_CountingMixin, Transport):
+    pass
+
+
+class CountingSafeTransport(_CountingMixin, SafeTransport):
+    pass
+
+
 class OdooClient:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, controller=None) -> None:
+        from finance_ai_pack.connectors.odoo.throttle import CallController
+
         self.settings = settings
+        # Shared per database by OdooClientPool, so the concurrency limit spans every worker thread.
+        self.controller = controller or CallController(
+            max_concurrency=settings.odoo_max_concurrency, max_retries=settings.odoo_max_retries
+        )
         self._uid: int | None = None
         self._common: ServerProxy | None = None
         self._models: ServerProxy | None = None
+        self._transport: CountingTransport | CountingSafeTransport | None = None
 
     def is_live_enabled(self) -> bool:
         return (
@@ -53,8 +94,7 @@ class OdooClient:
             if not parsed.scheme or not parsed.netloc:
                 raise OdooConnectionError("ODOO_URL must include scheme and host, e.g. https://odoo.example.com")
 
-            common = ServerProxy(f"{base_url}/xmlrpc/2/common", allow_none=True)
-            models = ServerProxy(f"{base_url}/xmlrpc/2/object", allow_none=True)
+            common, models = self._proxies(base_url)
             uid = common.authenticate(
                 self.settings.odoo_db,
                 self.settings.odoo_username,
@@ -83,6 +123,25 @@ class OdooClient:
         self._common = common
         self._models = models
 
+    def attach(self, uid: int) -> None:
+        """Reuse a uid authenticated by another client instead of authenticating again."""
+        if self._uid is not None and self._models is not None:
+            return
+        self._validate_required()
+        self._common, self._models = self._proxies(self.settings.odoo_url.rstrip("/"))
+        self._uid = uid
+
+    @property
+    def uid(self) -> int | None:
+        return self._uid
+
+    def _proxies(self, base_url: str) -> tuple[ServerProxy, ServerProxy]:
+        self._transport = CountingSafeTransport() if base_url.startswith("https") else CountingTransport()
+        return (
+            ServerProxy(f"{base_url}/xmlrpc/2/common", allow_none=True),
+            ServerProxy(f"{base_url}/xmlrpc/2/object", allow_none=True, transport=self._transport),
+        )
+
     def search_read(
         self,
         model: str,
@@ -91,6 +150,7 @@ class OdooClient:
         limit: int | None = None,
         offset: int = 0,
         order: str | None = None,
+        context: dict | None = None,
     ) -> list[dict]:
         self.connect()
         kwargs: dict = {"offset": offset}
@@ -100,16 +160,83 @@ class OdooClient:
             kwargs["limit"] = limit
         if order:
             kwargs["order"] = order
+        if context:
+            kwargs["context"] = context
         return self._execute(model, "search_read", [domain], kwargs)
 
-    def read(self, model: str, ids: list[int], fields: list[str] | None = None) -> list[dict]:
+    def search_read_paged(
+        self,
+        model: str,
+        domain: list,
+        fields: list[str] | None = None,
+        order: str = "id asc",
+        page_size: int = 2000,
+        context: dict | None = None,
+    ) -> Iterator[dict]:
+        """Yield every matching record, fetching ``page_size`` rows per call in a stable order."""
+        offset = 0
+        while True:
+            page = self.search_read(
+                model, domain, fields=fields, limit=page_size, offset=offset, order=order, context=context
+            )
+            yield from page
+            if len(page) < page_size:
+                return
+            offset += page_size
+
+    def read_group(
+        self,
+        model: str,
+        domain: list,
+        fields: list[str],
+        groupby: list[str],
+        lazy: bool = False,
+        context: dict | None = None,
+    ) -> list[dict]:
+        """Aggregate server-side; ``fields`` use Odoo's ``name:agg`` syntax, e.g. ``balance:sum``."""
         self.connect()
-        kwargs = {"fields": fields} if fields is not None else {}
+        kwargs: dict = {"lazy": lazy}
+        if context:
+            kwargs["context"] = context
+        return self._execute(model, "read_group", [domain, fields, groupby], kwargs)
+
+    def read(
+        self, model: str, ids: list[int], fields: list[str] | None = None, context: dict | None = None
+    ) -> list[dict]:
+        self.connect()
+        kwargs: dict = {"fields": fields} if fields is not None else {}
+        if context:
+            kwargs["context"] = context
         return self._execute(model, "read", [ids], kwargs)
 
     def _execute(self, model: str, method: str, args: list, kwargs: dict | None = None) -> list[dict]:
         if self._models is None or self._uid is None:
             raise OdooConnectionError("Odoo client is not connected.")
+        return self.controller.call(model, method, lambda: self._attempt(model, method, args, kwargs))
+
+    def _attempt(self, model: str, method: str, args: list, kwargs: dict | None) -> list[dict]:
+        collector = telemetry.current()
+        if collector is None:
+            return self._call(model, method, args, kwargs)
+        started = time.perf_counter_ns()
+        failed = True
+        try:
+            result = self._call(model, method, args, kwargs)
+            failed = False
+            return result
+        finally:
+            transport = self._transport
+            collector.record_rpc(
+                model,
+                method,
+                started,
+                time.perf_counter_ns(),
+                transport.last_request_bytes if transport else 0,
+                transport.last_response_bytes if transport else 0,
+                error=failed,
+            )
+
+    def _call(self, model: str, method: str, args: list, kwargs: dict | None) -> list[dict]:
         try:
             return self._models.execute_kw(
                 self.settings.odoo_db,
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from finance_ai_pack import telemetry
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.cache import CachingAdapter, extract_cache
+from finance_ai_pack.connectors.odoo.fixtures_adapter import FixturesAdapter
+
+
+def build_adapter(settings: Settings, fixtures_dir: Path):
+    if settings.fixture_mode and settings.replay_dir:
+        from finance_ai_pack.connectors.odoo.recording import ReplayAdapter
+
+        adapter = ReplayAdapter(Path(settings.replay_dir), company_id=settings.company_id)
+        namespace: tuple = ("replay", settings.replay_dir, settings.company_id)
+    elif settings.fixture_mode:
+        if settings.fixture_store == "indexed":
+            from finance_ai_pack.connectors.odoo.fixture_store import IndexedFixturesAdapter
+
+            adapter = IndexedFixturesAdapter(fixtures_dir, company_id=settings.company_id)
+        elif settings.fixture_store == "json":
+            adapter = FixturesAdapter(fixtures_dir, company_id=settings.company_id)
+        else:
+            raise ValueError("fixture_store must be 'json' or 'indexed'")
+        namespace = ("fixtures", settings.fixture_store, str(fixtures_dir), settings.company_id)
+    else:
+        # Live modules pull in xmlrpc, http.client and ssl; fixture runs never need them.
+        from finance_ai_pack.connectors.odoo.live_adapter import LiveOdooAdapter
+        from finance_ai_pack.connectors.odoo.pool import shared_pool
+
+        adapter = LiveOdooAdapter(shared_pool(settings).client(), company_id=settings.company_id)
+        if settings.record_dir:
+            from finance_ai_pack.connectors.odoo.recording import RecordingAdapter, shared_recorder
+
+            adapter = RecordingAdapter(adapter, shared_recorder(settings.record_dir), settings.company_id)
+        namespace = (
+            "live",
+            settings.odoo_url.rstrip("/"),
+            settings.odoo_db,
+            settings.odoo_username,
+            settings.company_id,
+        )
+    if settings.extract_cache_ttl > 0:
+        adapter = CachingAdapter(adapter, extract_cache(settings.extract_cache_ttl), namespace)
+    if telemetry.current() is not None:
+        adapter = telemetry.InstrumentedAdapter(adapter)
+    return adapter
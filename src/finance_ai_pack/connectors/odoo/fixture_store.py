@@ -0,0 +1,230 @@
+"""Memory-mapped JSON-lines fixture store with a sidecar offset index.
+
+    PYTHONPATH=src python -m finance_ai_pack.connectors.odoo.fixture_store fixtures/
+
+Each dataset is ``store/<dataset>.jsonl`` with its rows grouped into contiguous slices, plus
+``store/<dataset>.idx.json`` mapping a slice key to ``[offset, length, rows]``. Readers map the
+data file and decode only the slice they ask for, so one journal-month of a multi-GB replay costs
+what that slice costs. Select it with ``FIXTURE_STORE=indexed``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import re
+import threading
+import weakref
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from finance_ai_pack.connectors.odoo.fixtures_adapter import FixturesAdapter, statement_line, vat_line
+
+STORE_DIR = "store"
+INDEX_VERSION = 1
+DATASETS = {"statement_lines": ("journal", "period"), "vat_lines": ("period", "tax_type")}
+CHUNK_BYTES = 4 << 20
+PERIOD_SUFFIX = re.compile(r"_(\d{4}-\d{2})$")
+
+
+def _key(parts: Iterable[str]) -> str:
+    return "|".join(parts)
+
+
+class SliceWriter:
+    """Appends a dataset slice by slice; every row of a slice must be written in one call."""
+
+    def __init__(self, store_dir: Path, dataset: str) -> None:
+        if dataset not in DATASETS:
+            raise ValueError(f"dataset must be one of: {', '.join(DATASETS)}")
+        store_dir.mkdir(parents=True, exist_ok=True)
+        self.dataset = dataset
+        self.data_file = store_dir / f"{dataset}.jsonl"
+        self.index_file = store_dir / f"{dataset}.idx.json"
+        self.slices: dict[str, list[int]] = {}
+        self._tmp_data = self.data_file.with_suffix(".jsonl.tmp")
+        self._handle = self._tmp_data.open("wb")
+
+    def write_slice(self, key: tuple[str, ...], rows: Iterable[dict]) -> int:
+        if len(key) != len(DATASETS[self.dataset]):
+            raise ValueError(f"{self.dataset} slices are keyed by {DATASETS[self.dataset]}")
+        name = _key(key)
+        if name in self.slices:
+            raise ValueError(f"slice {name!r} already written")
+        offset = self._handle.tell()
+        count = 0
+        for row in rows:
+            self._handle.write(json.dumps(row, separators=(",", ":")).encode())
+            self._handle.write(b"\n")
+            count += 1
+        self.slices[name] = [offset, self._handle.tell() - offset, count]
+        return count
+
+    def close(self) -> None:
+        self._handle.close()
+        index = {
+            "version": INDEX_VERSION,
+            "dataset": self.dataset,
+            "keys": list(DATASETS[self.dataset]),
+            "rows": sum(entry[2] for entry in self.slices.values()),
+            "slices": self.slices,
+        }
+        tmp_index = self.index_file.with_suffix(".json.tmp")
+        tmp_index.write_text(json.dumps(index, indent=1, sort_keys=True))
+        # Data first: a reader holding the new index must never see the old data file.
+        os.replace(self._tmp_data, self.data_file)
+        os.replace(tmp_index, self.index_file)
+
+    def __enter__(self) -> "SliceWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._handle.close()
+            self._tmp_data.unlink(missing_ok=True)
+
+
+class FixtureStore:
+    """Read side of the store: one lazily opened, read-only mapping per dataset.
+
+    ``close()`` (or leaving a ``with`` block) unmaps every dataset; a later read maps it again.
+    """
+
+    def __init__(self, store_dir: Path) -> None:
+        self.store_dir = store_dir
+        self._datasets: dict[str, tuple[dict, mmap.mmap | None]] = {}
+        self._lock = threading.Lock()
+
+    def _open(self, dataset: str) -> tuple[dict, mmap.mmap | None]:
+        with self._lock:
+            if dataset not in self._datasets:
+                index_file = self.store_dir / f"{dataset}.idx.json"
+                if not index_file.exists():
+                    raise ValueError(
+                        f"No indexed fixture store at {self.store_dir}; convert the JSON fixtures with "
+                        "python -m finance_ai_pack.connectors.odoo.fixture_store"
+                    )
+                index = json.loads(index_file.read_text())
+                if index.get("version") != INDEX_VERSION:
+                    raise ValueError(f"{index_file} has index version {index.get('version')}, expected {INDEX_VERSION}")
+                mapped = None
+                with (self.store_dir / f"{dataset}.jsonl").open("rb") as handle:
+                    # mmap keeps its own descriptor; an empty file cannot be mapped and has no slices.
+                    if os.fstat(handle.fileno()).st_size:
+                        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                self._datasets[dataset] = (index, mapped)
+            return self._datasets[dataset]
+
+    def index(self, dataset: str) -> dict:
+        return self._open(dataset)[0]
+
+    def iter_slice(self, dataset: str, *key: str) -> Iterator[dict]:
+        index, mapped = self._open(dataset)
+        entry = index["slices"].get(_key(key))
+        if entry is None or mapped is None:
+            return
+        position, length, _ = entry
+        end = position + length
+        while position < end:
+            # Decode newline-aligned chunks as one JSON array: far fewer json.loads calls than one
+            # per row, while memory stays bounded by CHUNK_BYTES rather than the slice size.
+            stop = end if end - position <= CHUNK_BYTES else mapped.find(b"\n", position + CHUNK_BYTES, end) + 1
+            if stop <= position:
+                stop = end
+            chunk = mapped[position:stop].rstrip(b"\n")
+            yield from json.loads(b"[" + chunk.replace(b"\n", b",") + b"]")
+            position = stop
+
+    def close(self) -> None:
+        with self._lock:
+            for _, mapped in self._datasets.values():
+                if mapped is not None:
+                    mapped.close()
+            self._datasets.clear()
+
+    def __enter__(self) -> "FixtureStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class IndexedFixturesAdapter(FixturesAdapter):
+    """``FixturesAdapter`` that reads statement and VAT lines from the indexed store.
+
+    Journals, ledger snapshots and petty cash still come from the JSON fixture tree. The store's
+    mappings are released by ``close()``, at the end of a ``with`` block, or when the adapter is
+    garbage collected, since runs build an adapter and drop it without closing it.
+    """
+
+    def __init__(self, fixtures_dir: Path, company_id: int | None = None) -> None:
+        super().__init__(fixtures_dir, company_id=company_id)
+        self.store = FixtureStore(self.fixtures_dir / STORE_DIR)
+        self._finalizer = weakref.finalize(self, self.store.close)
+
+    def close(self) -> None:
+        self._finalizer()
+
+    def __enter__(self) -> "IndexedFixturesAdapter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_statement_lines(self, journal: dict, period: str) -> list[dict]:
+        code = journal["code"]
+        return [statement_line(code, row) for row in self.store.iter_slice("statement_lines", code, period)]
+
+    def get_vat_tax_lines(self, period: str, vat_type: str) -> list[dict]:
+        return [vat_line(period, row) for row in self.store.iter_slice("vat_lines", period, vat_type)]
+
+
+def _periods(directory: Path, prefix: str) -> list[tuple[str, Path]]:
+    found = []
+    for path in sorted(directory.glob(f"{prefix}_*.json")):
+        match = PERIOD_SUFFIX.search(path.stem)
+        # "nmb_*.json" also matches "nmb_tzs_2025-01.json"; the prefix must be the whole remainder.
+        if match and path.stem[: match.start()] == prefix:
+            found.append((match.group(1), path))
+    return found
+
+
+def convert_fixtures(fixtures_dir: Path, store_dir: Path | None = None) -> dict:
+    """Convert one fixture tree's statement and VAT line files into an indexed store."""
+    store_dir = store_dir or fixtures_dir / STORE_DIR
+    summary: dict = {"store_dir": str(store_dir)}
+
+    banks_file = fixtures_dir / "odoo_statement_lines" / "banks.json"
+    banks = json.loads(banks_file.read_text()) if banks_file.exists() else []
+    with SliceWriter(store_dir, "statement_lines") as writer:
+        for bank in banks:
+            for period, path in _periods(fixtures_dir / "odoo_statement_lines", bank["code"]):
+                writer.write_slice((bank["code"], period), json.loads(path.read_text()))
+    summary["statement_lines"] = {"slices": len(writer.slices), "rows": sum(e[2] for e in writer.slices.values())}
+
+    with SliceWriter(store_dir, "vat_lines") as writer:
+        for period, path in _periods(fixtures_dir / "vat", "odoo_vat_lines"):
+            by_type: dict[str, list[dict]] = {}
+            for row in json.loads(path.read_text()):
+                by_type.setdefault(row.get("tax_type", ""), []).append(row)
+            for tax_type, rows in by_type.items():
+                writer.write_slice((period, tax_type), rows)
+    summary["vat_lines"] = {"slices": len(writer.slices), "rows": sum(e[2] for e in writer.slices.values())}
+    return summary
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Convert JSON fixtures into the indexed fixture store")
+    parser.add_argument("fixtures_dir", type=Path)
+    args = parser.parse_args(argv)
+
+    trees = [args.fixtures_dir, *sorted(path for path in (args.fixtures_dir / "companies").glob("*") if path.is_dir())]
+    print(json.dumps([convert_fixtures(tree) for tree in trees], indent=2))
+
+
+if __name__ == "__main__":
+    main()
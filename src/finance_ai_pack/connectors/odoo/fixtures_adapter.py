@@ -1,12 +1,69 @@
 from __future__ import annotations
 
+import heapq
 import json
+from collections.abc import Iterator
 from pathlib import Path
 
+from finance_ai_pack.money import from_cents, to_cents
+from finance_ai_pack.periods import iter_periods
+
+DEFAULT_COMPANY = {"id": 1, "name": "Fixture Company", "currency": ""}
+
+
+def company_fixtures_dir(fixtures_dir: Path, company_id: int | None) -> Path:
+    """Company-specific fixtures live under ``fixtures/companies/<id>``; fall back to the shared tree."""
+    if company_id is None:
+        return fixtures_dir
+    candidate = fixtures_dir / "companies" / str(company_id)
+    return candidate if candidate.is_dir() else fixtures_dir
+
+
+def statement_line(code: str, row: dict) -> dict:
+    """A fixture statement row in the adapters' line shape (integer ``amount_cents`` included)."""
+    cents = to_cents(row.get("amount", 0))
+    return {
+        "id": f"{code}:{row.get('reference', 'line')}:{row.get('date', '')}",
+        "date": row.get("date"),
+        "amount": cents / 100,
+        "amount_cents": cents,
+        "reference": row.get("reference", ""),
+        "payment_ref": row.get("reference", ""),
+        "is_reconciled": bool(row.get("is_reconciled", False)),
+        "move_line_count": int(row.get("move_line_count", 0)),
+    }
+
+
+def vat_line(period: str, row: dict) -> dict:
+    """A fixture VAT row in the adapters' line shape (integer ``vat_amount_cents`` included)."""
+    cents = to_cents(row.get("vat_amount", 0))
+    return {
+        "period": period,
+        "tax_type": row.get("tax_type", ""),
+        "vat_amount": cents / 100,
+        "vat_amount_cents": cents,
+        "document_ref": row.get("document_ref", ""),
+        "move_type": row.get("move_type", ""),
+        "source_period": row.get("source_period", period),
+        "exception_hint": row.get("exception_hint", ""),
+        "notes": row.get("notes", ""),
+    }
+
 
 class FixturesAdapter:
-    def __init__(self, fixtures_dir: Path) -> None:
-        self.fixtures_dir = fixtures_dir
+    def __init__(self, fixtures_dir: Path, company_id: int | None = None) -> None:
+        self.root_dir = fixtures_dir
+        self.company_id = company_id
+        self.fixtures_dir = company_fixtures_dir(fixtures_dir, company_id)
+
+    def discover_companies(self) -> list[dict]:
+        companies_file = self.root_dir / "companies.json"
+        if not companies_file.exists():
+            return [dict(DEFAULT_COMPANY)]
+        return [
+            {"id": int(row["id"]), "name": row.get("name", f"Company {row['id']}"), "currency": row.get("currency", "")}
+            for row in json.loads(companies_file.read_text())
+        ]
 
     def discover_bank_journals(self) -> list[dict]:
         payload = json.loads((self.fixtures_dir / "odoo_statement_lines" / "banks.json").read_text())
@@ -29,62 +86,169 @@ class FixturesAdapter:
         fixture_file = self.fixtures_dir / "odoo_statement_lines" / f"{code}_{period}.json"
         if not fixture_file.exists():
             return []
-        lines = json.loads(fixture_file.read_text())
-        enriched = []
-        for row in lines:
-            amount = float(row.get("amount", 0))
-            enriched.append(
-                {
-                    "id": f"{code}:{row.get('reference', 'line')}:{row.get('date', '')}",
-                    "date": row.get("date"),
-                    "amount": amount,
-                    "reference": row.get("reference", ""),
-                    "payment_ref": row.get("reference", ""),
-                    "is_reconciled": bool(row.get("is_reconciled", False)),
-                    "move_line_count": int(row.get("move_line_count", 0)),
-                }
-            )
-        return enriched
+        return [statement_line(code, row) for row in json.loads(fixture_file.read_text())]
+
+    def get_statement_lines_range(self, journal: dict, period_from: str, period_to: str) -> list[dict]:
+        return [
+            line
+            for period in iter_periods(period_from, period_to)
+            for line in self.get_statement_lines(journal, period)
+        ]
+
+    def get_currency_rates(self) -> list[dict]:
+        rates_file = self.fixtures_dir / "fx" / "currency_rates.json"
+        if not rates_file.exists():
+            return []
+        return json.loads(rates_file.read_text())
+
+    def get_intercompany_balances(self, period: str) -> list[dict]:
+        # Intercompany balances span every company, so they always come from the shared tree.
+        fixture_file = self.root_dir / "intercompany" / f"ic_balances_{period}.json"
+        if not fixture_file.exists():
+            return []
+        return [
+            {
+                "company_id": int(row["company_id"]),
+                "partner_company_id": int(row["partner_company_id"]),
+                "currency": row.get("currency", ""),
+                "reference": row.get("reference", ""),
+                "account_type": row.get("account_type", ""),
+                "amount_cents": to_cents(row.get("amount", 0)),
+            }
+            for row in json.loads(fixture_file.read_text())
+        ]
 
     def get_journal_balance(self, journal: dict, period: str) -> float:
         _ = period
         _ = journal
         return 0.0
 
+    def get_journal_balances(self, journal: dict, periods: list[str]) -> dict[str, float]:
+        return {period: self.get_journal_balance(journal, period) for period in periods}
+
     def get_vat_tax_lines(self, period: str, vat_type: str) -> list[dict]:
         fixture_file = self.fixtures_dir / "vat" / f"odoo_vat_lines_{period}.json"
         if not fixture_file.exists():
             return []
         rows = json.loads(fixture_file.read_text())
-        return [
-            {
-                "period": period,
-                "tax_type": row.get("tax_type", ""),
-                "vat_amount": float(row.get("vat_amount", 0.0)),
-                "document_ref": row.get("document_ref", ""),
-                "move_type": row.get("move_type", ""),
-                "source_period": row.get("source_period", period),
-                "exception_hint": row.get("exception_hint", ""),
-                "notes": row.get("notes", ""),
-            }
-            for row in rows
-            if row.get("tax_type") == vat_type
-        ]
+        return [vat_line(period, row) for row in rows if row.get("tax_type") == vat_type]
 
     def get_vat_control_balance(self, period: str) -> dict:
         lines = [
             *self.get_vat_tax_lines(period=period, vat_type="input"),
             *self.get_vat_tax_lines(period=period, vat_type="output"),
         ]
-        closing_balance = sum(float(row.get("vat_amount", 0.0)) for row in lines)
+        cents = [row["vat_amount_cents"] for row in lines]
         return {
             "opening_balance": 0.0,
-            "debits": round(
-                sum(float(r.get("vat_amount", 0.0)) for r in lines if float(r.get("vat_amount", 0.0)) < 0), 2
-            ),
-            "credits": round(
-                sum(float(r.get("vat_amount", 0.0)) for r in lines if float(r.get("vat_amount", 0.0)) >= 0), 2
-            ),
-            "closing_balance": round(closing_balance, 2),
+            "debits": from_cents(sum(amount for amount in cents if amount < 0)),
+            "credits": from_cents(sum(amount for amount in cents if amount >= 0)),
+            "closing_balance": from_cents(sum(cents)),
             "assumption": "Fixture tie-out approximates VAT control using summed VAT tax lines only.",
         }
+
+    def _ledger_snapshot(self, period: str) -> dict:
+        snapshot_file = self.fixtures_dir / "ledger" / f"ledger_snapshot_{period}.json"
+        if not snapshot_file.exists():
+            return {}
+        return json.loads(snapshot_file.read_text())
+
+    def get_accounts(self) -> list[dict]:
+        accounts: dict[str, dict] = {}
+        for snapshot_file in sorted((self.fixtures_dir / "ledger").glob("ledger_snapshot_*.json")):
+            for row in json.loads(snapshot_file.read_text()).get("accounts", []):
+                accounts[row["code"]] = {
+                    "id": row.get("id", row["code"]),
+                    "code": row["code"],
+                    "name": row.get("name", row["code"]),
+                    "account_type": row.get("account_type", ""),
+                }
+        return [accounts[code] for code in sorted(accounts)]
+
+    def get_period_movements(self, period: str, partner_only: bool = False) -> dict[str, dict]:
+        movements: dict[str, dict] = {}
+        for row in self._ledger_snapshot(period).get("entries", []):
+            if partner_only and not row.get("partner"):
+                continue
+            debit, credit = float(row.get("debit", 0.0)), float(row.get("credit", 0.0))
+            totals = movements.setdefault(row["account_code"], {"debit": 0.0, "credit": 0.0, "balance": 0.0})
+            totals["debit"] += debit
+            totals["credit"] += credit
+            totals["balance"] += debit - credit
+        return movements
+
+    def get_balances_before(self, period: str, partner_only: bool = False) -> dict[str, float]:
+        balances: dict[str, float] = {}
+        for row in self._ledger_snapshot(period).get("opening_balances", []):
+            if partner_only and not row.get("partner"):
+                continue
+            balances[row["account_code"]] = balances.get(row["account_code"], 0.0) + float(row.get("balance", 0.0))
+        return balances
+
+    def get_unbalanced_moves(self, period: str, tolerance: float = 0.005) -> list[dict]:
+        moves: dict[str, dict] = {}
+        for row in self._ledger_snapshot(period).get("entries", []):
+            totals = moves.setdefault(row["move"], {"move": row["move"], "debit": 0.0, "credit": 0.0})
+            totals["debit"] += float(row.get("debit", 0.0))
+            totals["credit"] += float(row.get("credit", 0.0))
+        return [
+            {**totals, "imbalance": round(totals["debit"] - totals["credit"], 2)}
+            for totals in moves.values()
+            if abs(totals["debit"] - totals["credit"]) > tolerance
+        ]
+
+    def get_statement_movements(self, period: str) -> list[dict]:
+        return list(self._ledger_snapshot(period).get("statement_movements", []))
+
+    def get_statement_balances_before(self, period: str) -> list[dict]:
+        return list(self._ledger_snapshot(period).get("opening_statement_balances", []))
+
+    def discover_cash_journals(self) -> list[dict]:
+        journals_file = self.fixtures_dir / "petty_cash" / "cash_journals.json"
+        if not journals_file.exists():
+            return []
+        return [
+            {
+                "id": idx,
+                "name": row.get("journal", row["code"]),
+                "code": row["code"],
+                "currency": row.get("currency", ""),
+            }
+            for idx, row in enumerate(json.loads(journals_file.read_text()), start=1)
+        ]
+
+    def get_cash_opening_balances(self, period: str) -> dict[str, float]:
+        """Opening cash per journal name from ``petty_cash/opening_balances_<period>.json`` (``{code: amount}``)."""
+        balances_file = self.fixtures_dir / "petty_cash" / f"opening_balances_{period}.json"
+        if not balances_file.exists():
+            return {}
+        amounts = json.loads(balances_file.read_text())
+        return {
+            journal["name"]: float(amounts[journal["code"]])
+            for journal in self.discover_cash_journals()
+            if journal["code"] in amounts
+        }
+
+    def _iter_cash_file(self, journal: dict, period: str) -> Iterator[dict]:
+        fixture_file = self.fixtures_dir / "petty_cash" / f"{journal['code']}_{period}.jsonl"
+        if not fixture_file.exists():
+            return
+        with fixture_file.open() as handle:
+            for line_no, raw in enumerate(handle, start=1):
+                if not raw.strip():
+                    continue
+                row = json.loads(raw)
+                yield {
+                    "id": f"{journal['code']}:{line_no}",
+                    "journal": journal["name"],
+                    "date": row.get("date", ""),
+                    "amount": float(row.get("amount", 0.0)),
+                    "voucher_ref": row.get("voucher_ref", ""),
+                    "payee": row.get("payee", ""),
+                    "custodian": row.get("custodian", ""),
+                }
+
+    def iter_cash_lines(self, period: str) -> Iterator[dict]:
+        """Stream every cash journal's lines for the period as one date-ordered sequence."""
+        streams = [self._iter_cash_file(journal, period) for journal in self.discover_cash_journals()]
+        return heapq.merge(*streams, key=lambda row: row["date"])
@@ -1,16 +1,71 @@
 from __future__ import annotations
 
-from datetime import datetime
+from collections import Counter
+from collections.abc import Iterator
 
 from finance_ai_pack.connectors.odoo.client import OdooClient
+from finance_ai_pack.money import from_cents, to_cents
+from finance_ai_pack.periods import month_bounds, range_bounds
 
 
 class LiveOdooAdapter:
-    def __init__(self, client: OdooClient) -> None:
+    def __init__(self, client: OdooClient, company_id: int | None = None) -> None:
         self.client = client
+        self.company_id = company_id
+        self._account_codes: dict[int, str] | None = None
+
+    def _scoped(self, domain: list) -> list:
+        if self.company_id is None:
+            return domain
+        return [*domain, ["company_id", "=", self.company_id]]
+
+    def _context(self) -> dict | None:
+        return {"allowed_company_ids": [self.company_id]} if self.company_id is not None else None
+
+    def _search_read(self, model: str, domain: list, **kwargs) -> list[dict]:
+        return self.client.search_read(model, self._scoped(domain), context=self._context(), **kwargs)
+
+    def _search_read_all(self, model: str, domain: list, **kwargs) -> list[dict]:
+        return list(self.client.search_read_paged(model, self._scoped(domain), context=self._context(), **kwargs))
+
+    def _read_group(self, model: str, domain: list, fields: list[str], groupby: list[str]) -> list[dict]:
+        return self.client.read_group(model, self._scoped(domain), fields, groupby, context=self._context())
+
+    def discover_companies(self) -> list[dict]:
+        companies = self.client.search_read("res.company", [], fields=["id", "name", "currency_id"], order="id asc")
+        return [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "currency": row["currency_id"][1] if isinstance(row.get("currency_id"), list) else "",
+            }
+            for row in companies
+        ]
+
+    def get_currency_rates(self) -> list[dict]:
+        # Rates are shared (no company) or per company; a company-scoped run sees both.
+        domain = []
+        if self.company_id is not None:
+            domain = ["|", ["company_id", "=", False], ["company_id", "=", self.company_id]]
+        rows = self.client.search_read_paged(
+            "res.currency.rate",
+            domain,
+            fields=["name", "rate", "currency_id", "company_id"],
+            order="name asc,id asc",
+            context=self._context(),
+        )
+        return [
+            {
+                "currency": row["currency_id"][1] if isinstance(row.get("currency_id"), list) else "",
+                "date": str(row["name"]),
+                "rate": float(row.get("rate") or 0.0),
+                "company_id": row["company_id"][0] if isinstance(row.get("company_id"), list) else None,
+            }
+            for row in rows
+        ]
 
     def discover_bank_journals(self) -> list[dict]:
-        journals = self.client.search_read(
+        journals = self._search_read(
             "account.journal",
             [["active", "=", True], ["type", "in", ["bank", "cash"]]],
             fields=["id", "name", "type", "currency_id"],
@@ -34,14 +89,11 @@ class LiveOdooAdapter:
         return normalized
 
     def get_statement_lines(self, journal: dict, period: str) -> list[dict]:
-        start = f"{period}-01"
-        start_dt = datetime.strptime(start, "%Y-%m-%d")
-        if start_dt.month == 12:
-            end = f"{start_dt.year + 1}-01-01"
-        else:
-            end = f"{start_dt.year}-{start_dt.month + 1:02d}-01"
-
-        lines = self.client.search_read(
+        return self.get_statement_lines_range(journal, period, period)
+
+    def get_statement_lines_range(self, journal: dict, period_from: str, period_to: str) -> list[dict]:
+        start, end = range_bounds(period_from, period_to)
+        lines = self._search_read_all(
             "account.bank.statement.line",
             [
                 ["journal_id", "=", journal["id"]],
@@ -61,29 +113,32 @@ class LiveOdooAdapter:
             order="date asc,id asc",
         )
 
+        # One batched lookup for the linked move lines instead of a query per statement line.
+        move_ids = sorted(
+            {row["move_id"][0] for row in lines if isinstance(row.get("move_id"), list) and row["move_id"]}
+        )
+        move_line_counts: Counter = Counter()
+        for chunk_start in range(0, len(move_ids), 1000):
+            move_lines = self._search_read_all(
+                "account.move.line",
+                [["move_id", "in", move_ids[chunk_start : chunk_start + 1000]]],
+                fields=["move_id"],
+            )
+            move_line_counts.update(row["move_id"][0] for row in move_lines if row.get("move_id"))
+
         for row in lines:
-            move_linked = 0
             move_id = row.get("move_id")
-            if isinstance(move_id, list) and move_id:
-                move_lines = self.client.search_read(
-                    "account.move.line",
-                    [["move_id", "=", move_id[0]]],
-                    fields=["id"],
-                    limit=200,
-                )
-                move_linked = len(move_lines)
+            row["amount_cents"] = to_cents(row.get("amount"))
             row["reference"] = row.get("payment_ref") or row.get("ref") or ""
-            row["move_line_count"] = move_linked
+            row["move_line_count"] = move_line_counts[move_id[0]] if isinstance(move_id, list) and move_id else 0
         return lines
 
     def get_journal_balance(self, journal: dict, period: str) -> float:
-        start = f"{period}-01"
-        start_dt = datetime.strptime(start, "%Y-%m-%d")
-        if start_dt.month == 12:
-            end = f"{start_dt.year + 1}-01-01"
-        else:
-            end = f"{start_dt.year}-{start_dt.month + 1:02d}-01"
-        lines = self.client.search_read(
+        return self.get_journal_balances(journal, [period])[period]
+
+    def get_journal_balances(self, journal: dict, periods: list[str]) -> dict[str, float]:
+        start, end = range_bounds(periods[0], periods[-1])
+        lines = self._search_read_all(
             "account.move.line",
             [
                 ["journal_id", "=", journal["id"]],
@@ -91,43 +146,46 @@ class LiveOdooAdapter:
                 ["date", "<", end],
                 ["parent_state", "=", "posted"],
             ],
-            fields=["balance"],
-            limit=5000,
+            fields=["date", "balance"],
         )
-        return float(sum(float(row.get("balance", 0.0)) for row in lines))
+        balances = dict.fromkeys(periods, 0)
+        for row in lines:
+            period = str(row.get("date", ""))[:7]
+            if period in balances:
+                balances[period] += to_cents(row.get("balance"))
+        return {period: from_cents(cents) for period, cents in balances.items()}
 
     def get_vat_tax_lines(self, period: str, vat_type: str) -> list[dict]:
-        start = f"{period}-01"
-        start_dt = datetime.strptime(start, "%Y-%m-%d")
-        if start_dt.month == 12:
-            end = f"{start_dt.year + 1}-01-01"
-        else:
-            end = f"{start_dt.year}-{start_dt.month + 1:02d}-01"
+        start, end = month_bounds(period)
 
         tax_use = "purchase" if vat_type == "input" else "sale"
-        lines = self.client.search_read(
+        lines = self.client.search_read_paged(
             "account.move.line",
-            [
-                ["date", ">=", start],
-                ["date", "<", end],
-                ["parent_state", "=", "posted"],
-                ["tax_line_id", "!=", False],
-                ["tax_line_id.type_tax_use", "=", tax_use],
-            ],
+            self._scoped(
+                [
+                    ["date", ">=", start],
+                    ["date", "<", end],
+                    ["parent_state", "=", "posted"],
+                    ["tax_line_id", "!=", False],
+                    ["tax_line_id.type_tax_use", "=", tax_use],
+                ]
+            ),
             fields=["id", "date", "balance", "move_id", "ref", "name", "tax_line_id", "move_type"],
-            limit=10000,
             order="date asc,id asc",
+            context=self._context(),
         )
         normalized = []
         for row in lines:
             move_ref = ""
             if isinstance(row.get("move_id"), list) and row["move_id"]:
                 move_ref = row["move_id"][1]
+            cents = abs(to_cents(row.get("balance")))
             normalized.append(
                 {
                     "period": period,
                     "tax_type": vat_type,
-                    "vat_amount": round(abs(float(row.get("balance", 0.0))), 2),
+                    "vat_amount": from_cents(cents),
+                    "vat_amount_cents": cents,
                     "document_ref": row.get("ref") or move_ref or row.get("name", ""),
                     "move_type": row.get("move_type", ""),
                     "source_period": period,
@@ -138,29 +196,223 @@ class LiveOdooAdapter:
         return normalized
 
     def get_vat_control_balance(self, period: str) -> dict:
-        start = f"{period}-01"
-        start_dt = datetime.strptime(start, "%Y-%m-%d")
-        if start_dt.month == 12:
-            end = f"{start_dt.year + 1}-01-01"
-        else:
-            end = f"{start_dt.year}-{start_dt.month + 1:02d}-01"
-
-        lines = self.client.search_read(
+        start, end = month_bounds(period)
+
+        lines = self.client.search_read_paged(
             "account.move.line",
-            [
-                ["date", ">=", start],
-                ["date", "<", end],
-                ["parent_state", "=", "posted"],
-                ["tax_line_id", "!=", False],
-            ],
+            self._scoped(
+                [
+                    ["date", ">=", start],
+                    ["date", "<", end],
+                    ["parent_state", "=", "posted"],
+                    ["tax_line_id", "!=", False],
+                ]
+            ),
             fields=["balance"],
-            limit=10000,
+            context=self._context(),
         )
-        balances = [float(x.get("balance", 0.0)) for x in lines]
+        balances = [to_cents(x.get("balance")) for x in lines]
         return {
             "opening_balance": 0.0,
-            "debits": round(sum(x for x in balances if x < 0), 2),
-            "credits": round(sum(x for x in balances if x >= 0), 2),
-            "closing_balance": round(sum(balances), 2),
+            "debits": from_cents(sum(x for x in balances if x < 0)),
+            "credits": from_cents(sum(x for x in balances if x >= 0)),
+            "closing_balance": from_cents(sum(balances)),
             "assumption": "Best-effort VAT control uses posted tax line balances when dedicated control account mapping is unavailable.",
         }
+
+    def get_accounts(self) -> list[dict]:
+        accounts = self._search_read_all(
+            "account.account", [], fields=["id", "code", "name", "account_type"], order="code asc"
+        )
+        self._account_codes = {row["id"]: row["code"] for row in accounts}
+        return [
+            {"id": row["id"], "code": row["code"], "name": row["name"], "account_type": row.get("account_type", "")}
+            for row in accounts
+        ]
+
+    def _account_code(self, account_id) -> str:
+        if self._account_codes is None:
+            self.get_accounts()
+        if isinstance(account_id, list) and account_id:
+            return self._account_codes.get(account_id[0], str(account_id[1]).split(" ", 1)[0])
+        return ""
+
+    def _grouped_movements(self, domain: list) -> dict[str, dict]:
+        rows = self._read_group(
+            "account.move.line",
+            [["parent_state", "=", "posted"], *domain],
+            ["debit:sum", "credit:sum", "balance:sum"],
+            ["account_id"],
+        )
+        return {
+            self._account_code(row.get("account_id")): {
+                "debit": float(row.get("debit") or 0.0),
+                "credit": float(row.get("credit") or 0.0),
+                "balance": float(row.get("balance") or 0.0),
+            }
+            for row in rows
+        }
+
+    def get_period_movements(self, period: str, partner_only: bool = False) -> dict[str, dict]:
+        start, end = month_bounds(period)
+        domain = [["date", ">=", start], ["date", "<", end]]
+        if partner_only:
+            domain.append(["partner_id", "!=", False])
+        return self._grouped_movements(domain)
+
+    def get_balances_before(self, period: str, partner_only: bool = False) -> dict[str, float]:
+        start, _ = month_bounds(period)
+        domain = [["date", "<", start]]
+        if partner_only:
+            domain.append(["partner_id", "!=", False])
+        return {code: row["balance"] for code, row in self._grouped_movements(domain).items()}
+
+    def get_unbalanced_moves(self, period: str, tolerance: float = 0.005) -> list[dict]:
+        start, end = month_bounds(period)
+        rows = self._read_group(
+            "account.move.line",
+            [["parent_state", "=", "posted"], ["date", ">=", start], ["date", "<", end]],
+            ["debit:sum", "credit:sum", "balance:sum"],
+            ["move_id"],
+        )
+        return [
+            {
+                "move": row["move_id"][1] if isinstance(row.get("move_id"), list) else "",
+                "debit": float(row.get("debit") or 0.0),
+                "credit": float(row.get("credit") or 0.0),
+                "imbalance": round(float(row.get("balance") or 0.0), 2),
+            }
+            for row in rows
+            if abs(float(row.get("balance") or 0.0)) > tolerance
+        ]
+
+    def get_intercompany_balances(self, period: str) -> list[dict]:
+        """Open receivable/payable residuals between companies, in transaction currency.
+
+        One ``read_group`` covers every company pair: move lines whose partner is another
+        company's partner, grouped by company, partner, currency and document. Residuals are the
+        current state, so a line settled after ``period`` no longer shows as open.
+        """
+        companies = self.client.search_read("res.company", [], fields=["id", "partner_id"], order="id asc")
+        partner_company = {
+            row["partner_id"][0]: row["id"] for row in companies if isinstance(row.get("partner_id"), list)
+        }
+        if len(partner_company) < 2:
+            return []
+        _, end = month_bounds(period)
+        groups = self.client.read_group(
+            "account.move.line",
+            [
+                ["parent_state", "=", "posted"],
+                ["account_type", "in", ["asset_receivable", "liability_payable"]],
+                ["partner_id", "in", sorted(partner_company)],
+                ["reconciled", "=", False],
+                ["date", "<", end],
+            ],
+            ["amount_residual_currency:sum"],
+            ["company_id", "partner_id", "currency_id", "account_type", "move_name", "ref"],
+            context={"allowed_company_ids": sorted(partner_company.values())},
+        )
+        balances = []
+        for group in groups:
+            company_id = group["company_id"][0] if isinstance(group.get("company_id"), list) else None
+            partner_id = group["partner_id"][0] if isinstance(group.get("partner_id"), list) else None
+            partner_company_id = partner_company.get(partner_id)
+            if company_id is None or partner_company_id is None or partner_company_id == company_id:
+                continue
+            # A customer invoice is known by its number; the matching vendor bill carries it as ``ref``.
+            move_name, ref = group.get("move_name") or "", group.get("ref") or ""
+            receivable = group.get("account_type") == "asset_receivable"
+            balances.append(
+                {
+                    "company_id": company_id,
+                    "partner_company_id": partner_company_id,
+                    "currency": group["currency_id"][1] if isinstance(group.get("currency_id"), list) else "",
+                    "reference": move_name if receivable else (ref or move_name),
+                    "account_type": group.get("account_type") or "",
+                    "amount_cents": to_cents(group.get("amount_residual_currency") or 0.0),
+                }
+            )
+        return balances
+
+    def _bank_accounts(self) -> dict[int, dict]:
+        journals = self._search_read(
+            "account.journal",
+            [["type", "in", ["bank", "cash"]]],
+            fields=["id", "name", "default_account_id"],
+        )
+        return {
+            row["id"]: {"journal": row["name"], "account_code": self._account_code(row.get("default_account_id"))}
+            for row in journals
+        }
+
+    def _statement_totals(self, domain: list) -> list[dict]:
+        journals = self._bank_accounts()
+        rows = self._read_group("account.bank.statement.line", domain, ["amount:sum"], ["journal_id"])
+        totals = []
+        for row in rows:
+            journal_id = row["journal_id"][0] if isinstance(row.get("journal_id"), list) else None
+            if journal_id in journals:
+                totals.append({**journals[journal_id], "amount": float(row.get("amount") or 0.0)})
+        return totals
+
+    def get_statement_movements(self, period: str) -> list[dict]:
+        start, end = month_bounds(period)
+        return self._statement_totals([["date", ">=", start], ["date", "<", end]])
+
+    def get_statement_balances_before(self, period: str) -> list[dict]:
+        start, _ = month_bounds(period)
+        return self._statement_totals([["date", "<", start]])
+
+    def discover_cash_journals(self) -> list[dict]:
+        journals = self._search_read(
+            "account.journal",
+            [["active", "=", True], ["type", "=", "cash"]],
+            fields=["id", "name", "currency_id"],
+            order="name asc",
+        )
+        return [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "code": str(row["id"]),
+                "currency": row["currency_id"][1] if isinstance(row.get("currency_id"), list) else "",
+            }
+            for row in journals
+        ]
+
+    def get_cash_opening_balances(self, period: str) -> dict[str, float]:
+        """Cash on hand per cash journal name at the start of ``period``: the sum of its earlier statement lines."""
+        start, _ = month_bounds(period)
+        rows = self._read_group(
+            "account.bank.statement.line",
+            [["journal_id.type", "=", "cash"], ["date", "<", start]],
+            ["amount:sum"],
+            ["journal_id"],
+        )
+        return {
+            row["journal_id"][1]: float(row.get("amount") or 0.0)
+            for row in rows
+            if isinstance(row.get("journal_id"), list)
+        }
+
+    def iter_cash_lines(self, period: str) -> Iterator[dict]:
+        """Stream cash-journal statement lines page by page, ordered by date across all branches."""
+        start, end = month_bounds(period)
+        rows = self.client.search_read_paged(
+            "account.bank.statement.line",
+            self._scoped([["journal_id.type", "=", "cash"], ["date", ">=", start], ["date", "<", end]]),
+            fields=["id", "date", "amount", "payment_ref", "ref", "partner_id", "journal_id", "create_uid"],
+            order="date asc,id asc",
+            context=self._context(),
+        )
+        for row in rows:
+            yield {
+                "id": row["id"],
+                "journal": row["journal_id"][1] if isinstance(row.get("journal_id"), list) else "",
+                "date": str(row.get("date") or ""),
+                "amount": float(row.get("amount") or 0.0),
+                "voucher_ref": row.get("payment_ref") or row.get("ref") or "",
+                "payee": row["partner_id"][1] if isinstance(row.get("partner_id"), list) else "",
+                "custodian": row["create_uid"][1] if isinstance(row.get("create_uid"), list) else "",
+            }
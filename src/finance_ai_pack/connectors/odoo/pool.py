@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import replace
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.client import OdooClient
+from finance_ai_pack.connectors.odoo.throttle import CallController
+
+_POOLS: dict[tuple, "OdooClientPool"] = {}
+_POOLS_LOCK = threading.Lock()
+_CONTROLLERS: dict[tuple, CallController] = {}
+_CONTROLLERS_LOCK = threading.Lock()
+
+
+class OdooClientPool:
+    """Authenticates once per Odoo database and gives every worker thread its own XML-RPC proxy.
+
+    ``ServerProxy`` is not safe to share across threads, but the authenticated uid is, so
+    threads attach to the uid obtained by the first connection instead of logging in again.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = replace(settings, company_id=None)
+        self._lock = threading.Lock()
+        self._uid: int | None = None
+        self._local = threading.local()
+        self.controller = shared_controller(settings)
+
+    def client(self) -> OdooClient:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = OdooClient(self.settings, controller=self.controller)
+            with self._lock:
+                if self._uid is None:
+                    client.connect()
+                    self._uid = client.uid
+                else:
+                    client.attach(self._uid)
+            self._local.client = client
+        return client
+
+
+def _pool_key(settings: Settings) -> tuple:
+    return (settings.odoo_url.rstrip("/"), settings.odoo_db, settings.odoo_username, settings.odoo_password)
+
+
+def shared_controller(settings: Settings) -> CallController:
+    """One concurrency limit and circuit breaker per Odoo database, whichever user connects."""
+    key = (settings.odoo_url.rstrip("/"), settings.odoo_db)
+    with _CONTROLLERS_LOCK:
+        controller = _CONTROLLERS.get(key)
+        if controller is None:
+            controller = CallController(
+                max_concurrency=settings.odoo_max_concurrency, max_retries=settings.odoo_max_retries
+            )
+            _CONTROLLERS[key] = controller
+        return controller
+
+
+def shared_pool(settings: Settings) -> OdooClientPool:
+    key = _pool_key(settings)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = OdooClientPool(settings)
+            _POOLS[key] = pool
+        return pool
+
+
+def reset_pools() -> None:
+    with _POOLS_LOCK:
+        _POOLS.clear()
+    with _CONTROLLERS_LOCK:
+        _CONTROLLERS.clear()
@@ -0,0 +1,281 @@
+"""Record live adapter responses into a replayable dataset, and replay them offline.
+
+A dataset directory holds one gzip JSON-lines file per distinct call,
+``<method>/<sha1 of company, args and kwargs>.jsonl.gz``. The first line is a header
+(method, company, args, kwargs, kind); the rest is the return value, or one line per item for
+streaming ``iter_*`` extracts. ``manifest.json`` lists every recorded call.
+
+Values round-trip with their types: tuples (Odoo's many2one ``(id, name)`` pairs), dicts with
+non-string keys, dates and decimals are written as tagged JSON objects and rebuilt on replay, so
+a replayed response compares equal to the live one.
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import hashlib
+import json
+import queue
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+MANIFEST = "manifest.json"
+QUEUE_SIZE = 1024
+_STOP = object()
+_TAG = "__recorded__"
+
+
+def encode_value(value):
+    """``value`` as plain JSON data, with the types JSON would lose tagged for ``decode_object``."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, list):
+        return [encode_value(item) for item in value]
+    if isinstance(value, dict):
+        if _TAG not in value and all(type(key) is str for key in value):
+            return {key: encode_value(item) for key, item in value.items()}
+        return {_TAG: "dict", "items": [[encode_value(key), encode_value(item)] for key, item in value.items()]}
+    if isinstance(value, tuple):
+        return {_TAG: "tuple", "items": [encode_value(item) for item in value]}
+    if isinstance(value, datetime):
+        return {_TAG: "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {_TAG: "date", "value": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {_TAG: "decimal", "value": str(value)}
+    raise TypeError(f"cannot record a {type(value).__name__} value")
+
+
+def decode_object(obj: dict):
+    """``json.loads`` object hook that rebuilds the values ``encode_value`` tagged."""
+    tag = obj.get(_TAG)
+    if tag is None:
+        return obj
+    if tag == "tuple":
+        return tuple(obj["items"])
+    if tag == "dict":
+        return {key: item for key, item in obj["items"]}
+    if tag == "datetime":
+        return datetime.fromisoformat(obj["value"])
+    if tag == "date":
+        return date.fromisoformat(obj["value"])
+    if tag == "decimal":
+        return Decimal(obj["value"])
+    raise ValueError(f"unknown recorded type {tag!r}")
+
+
+def call_key(company_id: int | None, method: str, args: tuple, kwargs: dict) -> tuple[str, str]:
+    """Relative path of a call's file plus the canonical JSON it was derived from."""
+    canonical = json.dumps([company_id, list(args), kwargs], sort_keys=True, default=str)
+    return f"{method}/{hashlib.sha1(canonical.encode()).hexdigest()}.jsonl.gz", canonical
+
+
+class Recorder:
+    """Serializes and compresses responses on a background thread behind a bounded queue.
+
+    Callers only pay for a queue put: values are serialized later, so they must not be mutated
+    after they are returned (adapter results are already treated as read-only, see
+    ``CachingAdapter``). A full queue blocks the caller rather than dropping a response.
+    """
+
+    def __init__(self, dataset_dir: Path, queue_size: int = QUEUE_SIZE, compresslevel: int = 1) -> None:
+        self.dataset_dir = dataset_dir
+        self.compresslevel = compresslevel
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._manifest: dict[str, dict] = {}
+        self._error: BaseException | None = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "items": 0, "bytes_written": 0, "queue_full_waits": 0}
+        self._thread = threading.Thread(target=self._run, name="odoo-recorder", daemon=True)
+        self._thread.start()
+
+    def _put(self, message: tuple) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"recorder for {self.dataset_dir} failed") from self._error
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            with self._lock:
+                self.stats["queue_full_waits"] += 1
+            self._queue.put(message)
+
+    def record(self, company_id: int | None, method: str, args: tuple, kwargs: dict, value) -> None:
+        self._put(("value", company_id, method, args, kwargs, value))
+
+    def open_stream(self, company_id: int | None, method: str, args: tuple, kwargs: dict) -> object:
+        token = object()
+        self._put(("open", token, company_id, method, args, kwargs))
+        return token
+
+    def stream_item(self, token: object, item) -> None:
+        self._put(("item", token, item))
+
+    def close_stream(self, token: object) -> None:
+        self._put(("close", token))
+
+    def _open_file(self, company_id, method, args, kwargs, kind):
+        relative, _ = call_key(company_id, method, args, kwargs)
+        path = self.dataset_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle = gzip.open(path, "wt", compresslevel=self.compresslevel)
+        header = {"method": method, "company_id": company_id, "args": list(args), "kwargs": kwargs, "kind": kind}
+        handle.write(json.dumps(header, default=str) + "\n")
+        self._manifest[relative] = {"method": method, "company_id": company_id, "kind": kind}
+        self.stats["calls"] += 1
+        return path, handle
+
+    def _finish(self, path: Path, handle) -> None:
+        handle.close()
+        self.stats["bytes_written"] += path.stat().st_size
+
+    def _run(self) -> None:
+        streams: dict[object, tuple[Path, object]] = {}
+        while True:
+            message = self._queue.get()
+            try:
+                if message is _STOP:
+                    return
+                if self._error is not None:
+                    continue
+                kind = message[0]
+                if kind == "value":
+                    _, company_id, method, args, kwargs, value = message
+                    path, handle = self._open_file(company_id, method, args, kwargs, "value")
+                    handle.write(json.dumps(encode_value(value)) + "\n")
+                    self._finish(path, handle)
+                elif kind == "open":
+                    _, token, company_id, method, args, kwargs = message
+                    streams[token] = self._open_file(company_id, method, args, kwargs, "stream")
+                elif kind == "item":
+                    streams[message[1]][1].write(json.dumps(encode_value(message[2])) + "\n")
+                    self.stats["items"] += 1
+                else:
+                    self._finish(*streams.pop(message[1]))
+            except BaseException as exc:  # surfaced to callers on their next put and on close()
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Wait until everything queued so far is on disk and the manifest is current."""
+        self._queue.join()
+        if self._error is not None:
+            raise RuntimeError(f"recorder for {self.dataset_dir} failed") from self._error
+        manifest = {
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "calls": dict(sorted(self._manifest.items())),
+            "stats": dict(self.stats),
+        }
+        self.dataset_dir.mkdir(parents=True, exist_ok=True)
+        (self.dataset_dir / MANIFEST).write_text(json.dumps(manifest, indent=2))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self.flush()
+        finally:
+            self._queue.put(_STOP)
+            self._thread.join()
+
+
+class RecordingAdapter:
+    """Passes every call through to ``adapter`` and hands the response to a ``Recorder``."""
+
+    def __init__(self, adapter, recorder: Recorder, company_id: int | None = None) -> None:
+        self.adapter = adapter
+        self.recorder = recorder
+        self.company_id = company_id
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.adapter, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        if name.startswith("iter_"):
+
+            def streamed(*args, **kwargs):
+                token = self.recorder.open_stream(self.company_id, name, args, kwargs)
+                try:
+                    for item in attr(*args, **kwargs):
+                        self.recorder.stream_item(token, item)
+                        yield item
+                finally:
+                    self.recorder.close_stream(token)
+
+            return streamed
+
+        def recorded(*args, **kwargs):
+            value = attr(*args, **kwargs)
+            self.recorder.record(self.company_id, name, args, kwargs, value)
+            return value
+
+        return recorded
+
+
+class ReplayAdapter:
+    """Serves responses from a recorded dataset; a call that was never recorded raises ``ValueError``."""
+
+    def __init__(self, dataset_dir: Path, company_id: int | None = None) -> None:
+        if not (dataset_dir / MANIFEST).exists():
+            raise ValueError(f"{dataset_dir} is not a recorded dataset (no {MANIFEST})")
+        self.dataset_dir = dataset_dir
+        self.company_id = company_id
+
+    def _load(self, name: str, args: tuple, kwargs: dict) -> tuple[dict, list]:
+        relative, canonical = call_key(self.company_id, name, args, kwargs)
+        path = self.dataset_dir / relative
+        if not path.exists():
+            raise ValueError(f"No recorded response for {name} with {canonical} in {self.dataset_dir}")
+        with gzip.open(path, "rt") as handle:
+            header = json.loads(handle.readline())
+            return header, [json.loads(line, object_hook=decode_object) for line in handle]
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name.startswith("iter_"):
+
+            def streamed(*args, **kwargs):
+                _, items = self._load(name, args, kwargs)
+                yield from items
+
+            return streamed
+
+        def replayed(*args, **kwargs):
+            _, lines = self._load(name, args, kwargs)
+            return lines[0]
+
+        return replayed
+
+
+_RECORDERS: dict[str, Recorder] = {}
+_RECORDERS_LOCK = threading.Lock()
+
+
+def shared_recorder(dataset_dir: str) -> Recorder:
+    """One recorder per dataset directory for the whole process, flushed at exit."""
+    key = str(Path(dataset_dir).resolve())
+    with _RECORDERS_LOCK:
+        recorder = _RECORDERS.get(key)
+        if recorder is None:
+            recorder = Recorder(Path(key))
+            _RECORDERS[key] = recorder
+        return recorder
+
+
+def close_recorders() -> None:
+    with _RECORDERS_LOCK:
+        recorders = list(_RECORDERS.values())
+        _RECORDERS.clear()
+    for recorder in recorders:
+        recorder.close()
+
+
+atexit.register(close_recorders)
@@ -0,0 +1,524 @@
+"""In-process Odoo stand-in for load and latency testing.
+
+Speaks ``/xmlrpc/2/common`` and ``/xmlrpc/2/object`` over HTTP and answers ``search_read``,
+``read`` and ``read_group`` from a SQLite database (usually filled by ``finance_ai_pack.synthetic``).
+Latency, jitter and faults are injected per call and every call is counted per ``model.method``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from xmlrpc.client import Fault, dumps, loads
+
+FAULT_KINDS = ("fault", "unavailable", "drop")
+RELATIONS = {
+    "account_id": "account.account",
+    "company_id": "res.company",
+    "currency_id": "res.currency",
+    "default_account_id": "account.account",
+    "journal_id": "account.journal",
+    "move_id": "account.move",
+    "partner_id": "res.partner",
+    "tax_line_id": "account.tax",
+}
+COMPARISONS = {"=": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">=", "like": "LIKE", "ilike": "LIKE"}
+AGGREGATES = {"sum": "SUM", "min": "MIN", "max": "MAX", "avg": "AVG", "count": "COUNT"}
+INSERT_BATCH = 5000
+STAT_KEYS = ("calls", "rows", "errors", "injected_faults", "request_bytes", "response_bytes", "total_ms")
+
+
+def _field_kind(name: str, value) -> str:
+    if isinstance(value, list) or (value is False and name.endswith("_id")):
+        return "many2one"
+    if isinstance(value, bool):
+        return "boolean"
+    return "value"
+
+
+def build_database(records: Iterable[tuple[str, dict]], db_path: Path) -> Path:
+    """Load ``(model, values)`` records into one table per model, replacing any existing file.
+
+    Many2one values ``[id, name]`` are stored as ``<field>`` and ``<field>__name`` columns; field
+    kinds come from each model's first record.
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    db_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE _fields (model TEXT, field TEXT, kind TEXT, PRIMARY KEY (model, field))")
+    layouts: dict[str, tuple[list[tuple[str, str]], str]] = {}
+    pending: dict[str, list[tuple]] = {}
+
+    def _flush(model: str) -> None:
+        if pending.get(model):
+            conn.executemany(layouts[model][1], pending[model])
+            pending[model] = []
+
+    for model, values in records:
+        if model not in layouts:
+            fields = [(name, _field_kind(name, value)) for name, value in values.items()]
+            columns = []
+            for name, kind in fields:
+                columns.append(f'"{name}"' + (" INTEGER PRIMARY KEY" if name == "id" else ""))
+                if kind == "many2one":
+                    columns.append(f'"{name}__name"')
+            conn.execute(f'CREATE TABLE "{model}" ({", ".join(columns)})')
+            conn.executemany("INSERT INTO _fields VALUES (?, ?, ?)", [(model, name, kind) for name, kind in fields])
+            placeholders = ", ".join("?" for _ in columns)
+            layouts[model] = (fields, f'INSERT INTO "{model}" VALUES ({placeholders})')
+            pending[model] = []
+        fields = layouts[model][0]
+        if len(values) != len(fields):
+            raise ValueError(f"Inconsistent fields for {model}: {sorted(values)}")
+        row: list = []
+        for name, kind in fields:
+            value = values[name]
+            if kind == "many2one":
+                row.extend(value if isinstance(value, list) and value else (None, None))
+            else:
+                row.append(None if value is False and kind != "boolean" else value)
+        pending[model].append(tuple(row))
+        if len(pending[model]) >= INSERT_BATCH:
+            _flush(model)
+
+    for model in layouts:
+        _flush(model)
+        for name, kind in layouts[model][0]:
+            if kind == "many2one" or name == "date":
+                conn.execute(f'CREATE INDEX "{model}__{name}" ON "{model}" ("{name}")')
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@dataclass
+class StandinConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    fault_rate: float = 0.0
+    fault_kinds: tuple[str, ...] = ("fault",)
+    fault_methods: frozenset[str] | None = None
+    password: str | None = None
+    seed: int = 0
+
+
+class OdooStandin:
+    """Serve a SQLite database as an Odoo XML-RPC endpoint on a background thread.
+
+    ``fault_methods`` limits random faults to names like ``search_read`` or
+    ``account.move.line.read_group``; ``fail_next`` queues deterministic faults for tests.
+    """
+
+    def __init__(self, db_path: Path, config: StandinConfig | None = None, uid: int = 2) -> None:
+        self.db_path = db_path
+        self.config = config or StandinConfig()
+        self.uid = uid
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._queued_faults: list[tuple[str, str | None]] = []
+        self._stats: dict[str, dict] = {}
+        self._fields = self._load_fields()
+        self._server: ThreadingHTTPServer | None = None
+
+    @classmethod
+    def from_spec(cls, spec, db_path: Path | None = None, config: StandinConfig | None = None) -> "OdooStandin":
+        from finance_ai_pack.synthetic import iter_odoo_records
+
+        db_path = db_path or Path(tempfile.mkdtemp(prefix="odoo-standin-")) / "odoo.sqlite3"
+        return cls(build_database(iter_odoo_records(spec), db_path), config=config)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def _load_fields(self) -> dict[str, dict[str, str]]:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute("SELECT model, field, kind FROM _fields").fetchall()
+        finally:
+            conn.close()
+        fields: dict[str, dict[str, str]] = {}
+        for model, field, kind in rows:
+            fields.setdefault(model, {})[field] = kind
+        return fields
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="odoo-standin", daemon=True).start()
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Stand-in is not running.")
+        return f"http://{self._server.server_address[0]}:{self._server.server_address[1]}"
+
+    def __enter__(self) -> "OdooStandin":
+        if self._server is None:
+            self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {name: dict(entry) for name, entry in sorted(self._stats.items())}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def fail_next(self, count: int = 1, kind: str = "fault", method: str | None = None) -> None:
+        if kind not in FAULT_KINDS:
+            raise ValueError(f"kind must be one of: {', '.join(FAULT_KINDS)}")
+        with self._lock:
+            self._queued_faults.extend([(kind, method)] * count)
+
+    def _record(self, name: str, started: float, rows: int, request_bytes: int, response_bytes: int, **flags) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(name, dict.fromkeys(STAT_KEYS, 0))
+            entry["calls"] += 1
+            entry["rows"] += rows
+            entry["request_bytes"] += request_bytes
+            entry["response_bytes"] += response_bytes
+            entry["total_ms"] = round(entry["total_ms"] + (time.perf_counter() - started) * 1000, 3)
+            entry["errors"] += int(flags.get("error", False))
+            entry["injected_faults"] += int(flags.get("injected", False))
+
+    def _pick_fault(self, name: str) -> str | None:
+        model_method = name.rsplit(".", 1)[-1]
+        with self._lock:
+            for idx, (kind, method) in enumerate(self._queued_faults):
+                if method is None or method in {name, model_method}:
+                    del self._queued_faults[idx]
+                    return kind
+            methods = self.config.fault_methods
+            if self.config.fault_rate <= 0 or (methods is not None and not methods & {name, model_method}):
+                return None
+            if self._rng.random() >= self.config.fault_rate:
+                return None
+            return self._rng.choice(self.config.fault_kinds)
+
+    def _delay(self) -> None:
+        if self.config.latency_ms <= 0 and self.config.jitter_ms <= 0:
+            return
+        with self._lock:
+            jitter = self._rng.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+        time.sleep(max(0.0, self.config.latency_ms + jitter) / 1000)
+
+    def authenticate(self, db, login, password, user_agent_env=None):
+        if self.config.password is not None and password != self.config.password:
+            return False
+        return self.uid
+
+    def version(self) -> dict:
+        return {"server_version": "18.0", "server_serie": "18.0", "protocol_version": 1}
+
+    def execute_kw(self, db, uid, password, model, method, args, kwargs=None):
+        kwargs = kwargs or {}
+        if model not in self._fields:
+            raise Fault(2, f"KeyError: model '{model}' does not exist")
+        if method == "search_read":
+            domain = args[0] if args else kwargs.get("domain", [])
+            return self.search_read(
+                model,
+                domain,
+                fields=kwargs.get("fields"),
+                offset=kwargs.get("offset", 0),
+                limit=kwargs.get("limit"),
+                order=kwargs.get("order"),
+            )
+        if method == "read":
+            return self.read(model, args[0], fields=kwargs.get("fields"))
+        if method == "read_group":
+            domain, fields, groupby = (list(args) + [None, None, None])[:3]
+            return self.read_group(
+                model,
+                domain or kwargs.get("domain", []),
+                fields or kwargs.get("fields", []),
+                groupby or kwargs.get("groupby", []),
+            )
+        raise Fault(2, f"Stand-in does not implement {model}.{method}")
+
+    def _column(self, model: str, field: str) -> str:
+        if field not in self._fields[model]:
+            raise Fault(2, f"ValueError: Invalid field '{field}' on model '{model}'")
+        return f'"{field}"'
+
+    def _term(self, model: str, term) -> tuple[str, list]:
+        path, operator, value = term
+        field, _, related = path.partition(".")
+        column = self._column(model, field)
+        if related:
+            target = RELATIONS.get(field)
+            if target not in self._fields:
+                raise Fault(2, f"ValueError: cannot follow '{path}' on model '{model}'")
+            inner, params = self._term(target, [related, operator, value])
+            return f'{column} IN (SELECT id FROM "{target}" WHERE {inner})', params
+        if operator in {"in", "not in"}:
+            values = [item for item in value if item is not False]
+            negate = operator == "not in"
+            if not values:
+                return ("1" if negate else "0"), []
+            return f"{column} {'NOT IN' if negate else 'IN'} ({', '.join('?' for _ in values)})", values
+        if operator not in COMPARISONS:
+            raise Fault(2, f"ValueError: Invalid domain operator '{operator}'")
+        kind = self._fields[model][field]
+        if value is False and kind != "boolean":
+            if operator == "=":
+                return f"{column} IS NULL", []
+            if operator == "!=":
+                return f"{column} IS NOT NULL", []
+        if operator in {"like", "ilike"}:
+            value = f"%{value}%"
+        return f"{column} {COMPARISONS[operator]} ?", [value]
+
+    def _where(self, model: str, domain: list) -> tuple[str, list]:
+        """Translate an Odoo prefix-notation domain; adjacent terms are implicitly AND-ed."""
+        items = list(domain)
+        position = 0
+
+        def expression() -> tuple[str, list]:
+            nonlocal position
+            item = items[position]
+            position += 1
+            if item in ("&", "|"):
+                left, left_params = expression()
+                right, right_params = expression()
+                return f"({left} {'AND' if item == '&' else 'OR'} {right})", left_params + right_params
+            if item == "!":
+                inner, params = expression()
+                return f"NOT ({inner})", params
+            return self._term(model, item)
+
+        clauses, params = [], []
+        while position < len(items):
+            clause, clause_params = expression()
+            clauses.append(clause)
+            params.extend(clause_params)
+        return (" AND ".join(clauses) or "1"), params
+
+    def _order(self, model: str, order: str | None) -> str:
+        parts = []
+        for clause in (order or "id").split(","):
+            name, _, direction = clause.strip().partition(" ")
+            direction = direction.strip().upper() or "ASC"
+            if direction not in {"ASC", "DESC"}:
+                raise Fault(2, f"ValueError: Invalid order '{order}'")
+            parts.append(f"{self._column(model, name)} {direction}")
+        return ", ".join(parts)
+
+    def _select(self, model: str, fields: list[str] | None) -> list[str]:
+        names = list(fields) if fields else list(self._fields[model])
+        if "id" not in names:
+            names.insert(0, "id")
+        for name in names:
+            self._column(model, name)
+        return names
+
+    def _columns(self, model: str, names: list[str]) -> str:
+        columns = []
+        for name in names:
+            columns.append(f'"{name}"')
+            if self._fields[model][name] == "many2one":
+                columns.append(f'"{name}__name"')
+        return ", ".join(columns)
+
+    def _decode(self, model: str, names: list[str], row: tuple) -> dict:
+        record, idx = {}, 0
+        kinds = self._fields[model]
+        for name in names:
+            if kinds[name] == "many2one":
+                record[name] = [row[idx], row[idx + 1]] if row[idx] is not None else False
+                idx += 2
+            else:
+                value = row[idx]
+                record[name] = bool(value) if kinds[name] == "boolean" else (False if value is None else value)
+                idx += 1
+        return record
+
+    def search_read(
+        self,
+        model: str,
+        domain: list,
+        fields: list[str] | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+        order: str | None = None,
+    ) -> list[dict]:
+        names = self._select(model, fields)
+        where, params = self._where(model, domain)
+        sql = f'SELECT {self._columns(model, names)} FROM "{model}" WHERE {where} ORDER BY {self._order(model, order)}'
+        sql += " LIMIT ? OFFSET ?"
+        rows = self._connection().execute(sql, [*params, -1 if limit is None else int(limit), int(offset or 0)])
+        return [self._decode(model, names, row) for row in rows]
+
+    def read(self, model: str, ids: list[int], fields: list[str] | None = None) -> list[dict]:
+        return self.search_read(model, [["id", "in", list(ids)]], fields=fields)
+
+    def read_group(self, model: str, domain: list, fields: list[str], groupby: list[str] | str) -> list[dict]:
+        groupby = [groupby] if isinstance(groupby, str) else list(groupby)
+        for name in groupby:
+            self._column(model, name)
+        group_columns = self._columns(model, groupby)
+        aggregates = []
+        for spec in fields:
+            name, _, function = spec.partition(":")
+            if name in groupby:
+                continue
+            function = (function or "sum").lower()
+            if function not in AGGREGATES:
+                raise Fault(2, f"ValueError: Invalid aggregate '{spec}'")
+            aggregates.append((name, f"{AGGREGATES[function]}({self._column(model, name)})"))
+        where, params = self._where(model, domain)
+        select = ", ".join(part for part in (group_columns, *[sql for _, sql in aggregates], "COUNT(*)") if part)
+        sql = f'SELECT {select} FROM "{model}" WHERE {where}'
+        if groupby:
+            sql += f" GROUP BY {group_columns} ORDER BY {group_columns}"
+        results = []
+        for row in self._connection().execute(sql, params):
+            group = self._decode(model, groupby, row)
+            offset = len(row) - len(aggregates) - 1
+            for idx, (name, _) in enumerate(aggregates):
+                group[name] = row[offset + idx] if row[offset + idx] is not None else 0.0
+            group["__count"] = row[-1]
+            results.append(group)
+        return results
+
+
+def _handler_for(standin: OdooStandin) -> type[BaseHTTPRequestHandler]:
+    class StandinRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        server_version = "odoo-standin"
+
+        def log_message(self, format, *args) -> None:
+            return
+
+        def _send(self, status: int, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "text/xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:
+            started = time.perf_counter()
+            data = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.path not in {"/xmlrpc/2/common", "/xmlrpc/2/object"}:
+                self._send(404, b"")
+                return
+            try:
+                params, method = loads(data, use_builtin_types=True)
+            except Exception:  # pragma: no cover - malformed request bodies
+                self._send(400, b"")
+                return
+
+            if self.path.endswith("/object") and method == "execute_kw":
+                name = f"{params[3]}.{params[4]}"
+            else:
+                name = f"common.{method}"
+            standin._delay()
+
+            fault = standin._pick_fault(name) if self.path.endswith("/object") else None
+            if fault == "drop":
+                standin._record(name, started, 0, len(data), 0, error=True, injected=True)
+                self.close_connection = True
+                return
+            if fault == "unavailable":
+                standin._record(name, started, 0, len(data), 0, error=True, injected=True)
+                self._send(503, b"Service Unavailable")
+                return
+            if fault == "fault":
+                body = dumps(Fault(1, f"Injected fault for {name}"), methodresponse=True, allow_none=True)
+                standin._record(name, started, 0, len(data), len(body), error=True, injected=True)
+                self._send(200, body.encode())
+                return
+
+            rows, error = 0, False
+            try:
+                handler = {
+                    "authenticate": standin.authenticate,
+                    "login": lambda db, login, password: standin.authenticate(db, login, password),
+                    "version": standin.version,
+                    "execute_kw": standin.execute_kw,
+                }.get(method)
+                if handler is None:
+                    raise Fault(1, f"Unknown method {method}")
+                result = handler(*params)
+                rows = len(result) if isinstance(result, list) else 0
+                body = dumps((result,), methodresponse=True, allow_none=True)
+            except Fault as exc:
+                error = True
+                body = dumps(exc, methodresponse=True, allow_none=True)
+            except Exception as exc:
+                error = True
+                body = dumps(Fault(1, f"{type(exc).__name__}: {exc}"), methodresponse=True, allow_none=True)
+            payload = body.encode()
+            standin._record(name, started, rows, len(data), len(payload), error=error)
+            self._send(200, payload)
+
+    return StandinRequestHandler
+
+
+def main(argv: list[str] | None = None) -> None:
+    from finance_ai_pack.synthetic import SyntheticSpec
+
+    parser = argparse.ArgumentParser(description="Serve synthetic data as a local Odoo XML-RPC endpoint")
+    parser.add_argument("--lines", type=int, default=10_000)
+    parser.add_argument("--journals", type=int, default=10)
+    parser.add_argument("--period", default="2025-01")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", type=Path, help="reuse or create this SQLite file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8069)
+    parser.add_argument("--latency_ms", type=float, default=0.0)
+    parser.add_argument("--jitter_ms", type=float, default=0.0)
+    parser.add_argument("--fault_rate", type=float, default=0.0)
+    parser.add_argument("--fault_kinds", default="fault", help=f"comma-separated: {', '.join(FAULT_KINDS)}")
+    args = parser.parse_args(argv)
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        fault_rate=args.fault_rate,
+        fault_kinds=tuple(kind.strip() for kind in args.fault_kinds.split(",") if kind.strip()),
+        seed=args.seed,
+    )
+    spec = SyntheticSpec(lines=args.lines, journals=args.journals, period=args.period, seed=args.seed)
+    if args.db and args.db.exists():
+        standin = OdooStandin(args.db, config=config)
+    else:
+        standin = OdooStandin.from_spec(spec, db_path=args.db, config=config)
+    url = standin.start(args.host, args.port)
+    print(f"Odoo stand-in on {url} (db: {standin.db_path})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
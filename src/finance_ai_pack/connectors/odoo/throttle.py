@@ -0,0 +1,266 @@
+"""Adaptive concurrency, retries and circuit breaking around Odoo XML-RPC calls.
+
+One ``CallController`` is shared by every client of an Odoo database (see ``OdooClientPool``):
+
+- ``AdaptiveLimiter`` caps calls in flight with AIMD: the limit grows by one slot per limit's worth
+  of healthy calls while it is the bottleneck, and halves on a transport error or when latency
+  climbs past ``latency_tolerance`` times the fastest seen for that model/method.
+- Idempotent reads that fail with a transient transport error (connection reset, timeout,
+  429/502/503/504) are retried with full-jitter exponential backoff. Odoo faults are never retried.
+- ``CircuitBreaker`` fails calls fast with ``OdooConnectionError`` after consecutive transport
+  failures, then lets a single probe through once ``reset_seconds`` have passed.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Callable
+from http.client import HTTPException
+from xmlrpc.client import ProtocolError
+
+from finance_ai_pack import telemetry
+from finance_ai_pack.connectors.odoo.client import OdooConnectionError
+
+IDEMPOTENT_METHODS = frozenset({"search_read", "read", "read_group", "search", "search_count", "fields_get"})
+RETRYABLE_STATUS = frozenset({429, 502, 503, 504})
+MIN_DECREASE_INTERVAL = 0.1
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, ProtocolError):
+        return exc.errcode in RETRYABLE_STATUS
+    return isinstance(exc, (OSError, HTTPException))
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        max_limit: int = 16,
+        initial: int = 4,
+        min_limit: int = 1,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.2,
+    ) -> None:
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("concurrency limits must satisfy 1 <= min_limit <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._baselines: dict[str, float] = {}
+        self._ratio = 1.0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> float:
+        """Block until a slot is free; returns the seconds spent waiting."""
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                return 0.0
+            started = time.perf_counter()
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            return time.perf_counter() - started
+
+    def release(self, key: str, latency: float, ok: bool) -> str | None:
+        """Free a slot and adapt the limit; returns ``"increase"``/``"decrease"`` when it moved a whole slot."""
+        with self._cond:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            before = int(self.limit)
+            if ok:
+                baseline = self._baselines.get(key, latency)
+                # Track the fastest response per call shape, drifting up slowly so a permanently
+                # slower server (or bigger pages) does not read as overload forever.
+                baseline = latency if latency < baseline else baseline + (latency - baseline) * 0.01
+                self._baselines[key] = baseline
+                ratio = latency / baseline if baseline > 0 else 1.0
+                self._ratio += (ratio - self._ratio) * self.smoothing
+            if not ok or self._ratio > self.latency_tolerance:
+                now = time.monotonic()
+                # At most one decrease per interval: one overload episode fails many calls at once.
+                if now - self._last_decrease >= MIN_DECREASE_INTERVAL:
+                    self._last_decrease = now
+                    self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+                    self._ratio = 1.0
+            elif saturated:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            self._cond.notify_all()
+            after = int(self.limit)
+            if after == before:
+                return None
+            return "increase" if after > before else "decrease"
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0, clock=time.monotonic) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """Admit a call or raise ``OdooConnectionError``; returns True when the call is the half-open probe."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+            if self.state == self.OPEN and self.clock() - self._opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            retry_in = max(0.0, self.reset_seconds - (self.clock() - self._opened_at))
+        raise OdooConnectionError(
+            f"Odoo circuit breaker is open after {self.failures} consecutive transport failures; "
+            f"retry in {retry_in:.0f}s."
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def end_probe(self) -> None:
+        """Let the next call probe if this one ended without closing or reopening the breaker."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+
+    def record_failure(self) -> bool:
+        """Count a transport failure; returns True when this failure opened the breaker."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self._opened_at = self.clock()
+                self._probing = False
+                return True
+            return False
+
+
+class CallController:
+    """Runs each RPC attempt under the limiter and breaker, retrying transient failures of reads."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        max_retries: int = 3,
+        backoff_base: float = 0.2,
+        backoff_cap: float = 5.0,
+        limiter: AdaptiveLimiter | None = None,
+        breaker: CircuitBreaker | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.limiter = limiter or AdaptiveLimiter(max_limit=max_concurrency, initial=min(4, max_concurrency))
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.sleep = sleep
+        self._rng = random.Random()
+        self.stats = {"calls": 0, "retries": 0, "throttled": 0, "breaker_opened": 0, "breaker_rejected": 0}
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt: int) -> float:
+        return self._rng.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+    def _event(self, event: str | None, stat: str | None = None) -> None:
+        if stat is not None:
+            with self._lock:
+                self.stats[stat] += 1
+        collector = telemetry.current()
+        if collector is not None:
+            collector.record_concurrency(int(self.limiter.limit), self.limiter.in_flight, event)
+
+    def call(self, model: str, method: str, attempt: Callable[[], object]):
+        key = f"{model}.{method}"
+        retries = 0
+        while True:
+            try:
+                probe = self.breaker.before_call()
+            except OdooConnectionError:
+                self._event("breaker_rejected", "breaker_rejected")
+                raise
+            waited = self.limiter.acquire()
+            if waited:
+                self._event("throttled", "throttled")
+                collector = telemetry.current()
+                if collector is not None:
+                    end = time.perf_counter_ns()
+                    collector.add_span("concurrency_wait", "throttle", end - int(waited * 1e9), end)
+            else:
+                self._event(None)
+            with self._lock:
+                self.stats["calls"] += 1
+            started = time.perf_counter()
+            try:
+                result = attempt()
+            except BaseException as exc:
+                transient = is_transient(exc)
+                self._event(self.limiter.release(key, time.perf_counter() - started, ok=not transient))
+                if not transient:
+                    if isinstance(exc, Exception):
+                        # A fault, or any other error that is not a transport failure, is an answer
+                        # from a reachable server.
+                        self.breaker.record_success()
+                    elif probe:
+                        # An interrupted probe says nothing about the server; let the next call probe.
+                        self.breaker.end_probe()
+                    raise
+                if self.breaker.record_failure():
+                    self._event("breaker_opened", "breaker_opened")
+                if (
+                    method not in IDEMPOTENT_METHODS
+                    or retries >= self.max_retries
+                    or self.breaker.state != CircuitBreaker.CLOSED
+                ):
+                    raise OdooConnectionError(
+                        f"Odoo transport error calling {key} after {retries + 1} attempt(s): {_describe(exc)}"
+                    ) from exc
+                delay = self.backoff(retries)
+                retries += 1
+                self._event("retry", "retries")
+                with telemetry.span("backoff", "throttle", model_method=key, attempt=retries):
+                    self.sleep(delay)
+                continue
+            self._event(self.limiter.release(key, time.perf_counter() - started, ok=True))
+            self.breaker.record_success()
+            return result
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        return {
+            **stats,
+            "limit": int(self.limiter.limit),
+            "in_flight": self.limiter.in_flight,
+            "peak_in_flight": self.limiter.peak_in_flight,
+            "breaker": self.breaker.state,
+        }
+
+
+def _describe(exc: BaseException) -> str:
+    if isinstance(exc, ProtocolError):
+        return f"HTTP {exc.errcode} {exc.errmsg}"
+    return f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
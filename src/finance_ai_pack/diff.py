@@ -0,0 +1,229 @@
+"""Keyed diff between two runs' artifacts, streamed through an external sort and a merge-join.
+
+Each side is read row by row, sorted on ``(key, row)`` in memory-bounded runs that spill to
+temporary files, and k-way merged back. Walking the two sorted streams together
+finds added, removed and changed rows in one pass, so memory is bounded by ``max_rows`` and
+by the changed rows that share one key, never by the size of the registers.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from finance_ai_pack.outputs.runs import merge_runs, spill_run
+
+
+@dataclass(frozen=True)
+class ArtifactKind:
+    name: str
+    pattern: re.Pattern
+    keys: tuple[str, ...]
+    rows: Callable[[Path], Iterator[dict]]
+
+
+def _csv_rows(path: Path) -> Iterator[dict]:
+    with path.open(newline="") as handle:
+        yield from csv.DictReader(handle)
+
+
+def _bank_rollup_rows(path: Path) -> Iterator[dict]:
+    # Per-bank rows are one per journal and month, so the artifact itself is small.
+    payload = json.loads(path.read_text())
+    months = payload.get("months") or [{"period": payload.get("period", ""), "banks": payload.get("banks", [])}]
+    for month in months:
+        for bank in month["banks"]:
+            yield {
+                "period": month["period"],
+                "bank": bank["code"],
+                "currency": bank["currency"],
+                "statement_line_count": bank["statement_line_count"],
+                "reconciled_count": bank["reconciled_count"],
+                "reconciled_pct": bank["reconciled_pct"],
+                "difference": bank["tie_out"]["difference"],
+                "exception_types": ",".join(sorted(item["type"] for item in bank["exceptions"])),
+            }
+
+
+KINDS = (
+    ArtifactKind("bank_lines", re.compile(r"^bank_recon_\d{4}-\d{2}_lines\.csv$"), ("bank", "line_id"), _csv_rows),
+    ArtifactKind(
+        "bank_rollup",
+        re.compile(r"^bank_recon_\d{4}-\d{2}(_\d{4}-\d{2})?\.json$"),
+        ("period", "bank"),
+        _bank_rollup_rows,
+    ),
+    ArtifactKind("vat_exceptions", re.compile(r"^vat_exception_register\.csv$"), ("document_ref", "period"), _csv_rows),
+)
+
+
+def kind_for(path: Path) -> ArtifactKind | None:
+    return next((kind for kind in KINDS if kind.pattern.match(path.name)), None)
+
+
+# One shared encoder: json.dumps with keyword arguments builds a new encoder on every call.
+_canonical = json.JSONEncoder(sort_keys=True, default=str, separators=(",", ":")).encode
+
+
+def _sort_item(kind: ArtifactKind, row: dict) -> tuple[tuple[str, ...], str]:
+    return tuple([str(row.get(key, "")) for key in kind.keys]), _canonical(row)
+
+
+def external_sort(
+    items: Iterable[tuple[tuple[str, ...], str]], spill_dir: Path, max_rows: int = 200_000
+) -> tuple[Iterator[tuple[tuple[str, ...], str]], int]:
+    """Sort ``(key, canonical row)`` items, spilling sorted runs of ``max_rows`` to ``spill_dir``.
+
+    Returns the merged stream and the number of runs spilled (0 when everything fit in memory).
+    """
+    buffer: list[tuple[tuple[str, ...], str]] = []
+    runs: list[Path] = []
+    for item in items:
+        buffer.append(item)
+        if len(buffer) >= max_rows:
+            runs.append(spill_run(buffer, spill_dir, prefix=f"run{len(runs)}_"))
+            buffer = []
+    buffer.sort()
+    if not runs:
+        return iter(buffer), 0
+    if buffer:
+        runs.append(spill_run(buffer, spill_dir, prefix=f"run{len(runs)}_"))
+    return merge_runs(runs), len(runs)
+
+
+def _field_changes(before: dict, after: dict) -> dict:
+    return {
+        field: [before.get(field), after.get(field)]
+        for field in sorted(before.keys() | after.keys())
+        if before.get(field) != after.get(field)
+    }
+
+
+def merge_join(
+    kind: ArtifactKind,
+    left: Iterator[tuple[tuple[str, ...], str]],
+    right: Iterator[tuple[tuple[str, ...], str]],
+    emit: Callable[[dict], None],
+) -> dict:
+    """Walk two ``(key, row)``-sorted streams and ``emit`` a delta per added, removed or changed row.
+
+    Identical rows cancel as they meet. The rows left over for one key are paired in order as
+    changes; the surplus on either side is added or removed.
+    """
+    counts = {"left_rows": 0, "right_rows": 0, "unchanged": 0, "added": 0, "removed": 0, "changed": 0}
+    changed_fields: dict[str, int] = {}
+    pending_left: list[dict] = []
+    pending_right: list[dict] = []
+    current: tuple[str, ...] | None = None
+
+    def flush() -> None:
+        if not (pending_left or pending_right):
+            return
+        key = dict(zip(kind.keys, current, strict=True))
+        for before, after in zip(pending_left, pending_right, strict=False):
+            changes = _field_changes(before, after)
+            for field in changes:
+                changed_fields[field] = changed_fields.get(field, 0) + 1
+            emit({"artifact": kind.name, "change": "changed", "key": key, "fields": changes})
+        counts["changed"] += min(len(pending_left), len(pending_right))
+        for row in pending_left[len(pending_right) :]:
+            emit({"artifact": kind.name, "change": "removed", "key": key, "row": row})
+            counts["removed"] += 1
+        for row in pending_right[len(pending_left) :]:
+            emit({"artifact": kind.name, "change": "added", "key": key, "row": row})
+            counts["added"] += 1
+        pending_left.clear()
+        pending_right.clear()
+
+    a, b = next(left, None), next(right, None)
+    while a is not None or b is not None:
+        if a is not None and b is not None and a == b:
+            item, side = a, None
+        elif b is None or (a is not None and a < b):
+            item, side = a, pending_left
+        else:
+            item, side = b, pending_right
+        if item[0] != current:
+            flush()
+            current = item[0]
+        if side is None:
+            counts["unchanged"] += 1
+        else:
+            side.append(json.loads(item[1]))
+        if side is not pending_right:
+            counts["left_rows"] += 1
+            a = next(left, None)
+        if side is not pending_left:
+            counts["right_rows"] += 1
+            b = next(right, None)
+    flush()
+    return {**counts, "changed_fields": dict(sorted(changed_fields.items()))}
+
+
+def diff_artifacts(
+    kind: ArtifactKind, left: Path, right: Path, emit: Callable[[dict], None], max_rows: int = 200_000
+) -> dict:
+    with tempfile.TemporaryDirectory(prefix="finance-diff-") as spill:
+        left_sorted, left_runs = external_sort(
+            (_sort_item(kind, row) for row in kind.rows(left)), Path(spill), max_rows
+        )
+        right_sorted, right_runs = external_sort(
+            (_sort_item(kind, row) for row in kind.rows(right)), Path(spill), max_rows
+        )
+        summary = merge_join(kind, left_sorted, right_sorted, emit)
+    return {
+        "artifact": kind.name,
+        "left": str(left),
+        "right": str(right),
+        **summary,
+        "spilled_runs": left_runs + right_runs,
+    }
+
+
+def pair_artifacts(run_a: Path, run_b: Path) -> list[tuple[ArtifactKind, Path, Path]]:
+    """Artifacts to compare: two files directly, or every known artifact both run directories hold."""
+    if run_a.is_file() and run_b.is_file():
+        kind = kind_for(run_a)
+        if kind is None or kind is not kind_for(run_b):
+            raise ValueError(f"Cannot diff {run_a.name} against {run_b.name}: not the same known artifact kind")
+        return [(kind, run_a, run_b)]
+    if not (run_a.is_dir() and run_b.is_dir()):
+        raise ValueError("run diff compares two artifact files or two run directories")
+    pairs = []
+    for left in sorted(run_a.rglob("*")):
+        kind = kind_for(left)
+        right = run_b / left.relative_to(run_a)
+        if kind is not None and right.is_file():
+            pairs.append((kind, left, right))
+    if not pairs:
+        raise ValueError(f"No bank_recon or vat_exception_register artifacts in common between {run_a} and {run_b}")
+    return pairs
+
+
+def diff_runs(run_a: Path, run_b: Path, delta_file: Path, max_rows: int = 200_000) -> dict:
+    """Diff every paired artifact, streaming deltas to ``delta_file`` as JSON lines."""
+    pairs = pair_artifacts(run_a, run_b)
+    delta_file.parent.mkdir(parents=True, exist_ok=True)
+    registers = []
+    with delta_file.open("w") as handle:
+
+        def emit(delta: dict) -> None:
+            handle.write(json.dumps(delta, default=str))
+            handle.write("\n")
+
+        for kind, left, right in pairs:
+            registers.append(diff_artifacts(kind, left, right, emit, max_rows=max_rows))
+    return {
+        "run_a": str(run_a),
+        "run_b": str(run_b),
+        "registers": registers,
+        "totals": {
+            change: sum(register[change] for register in registers) for change in ("added", "removed", "changed")
+        },
+        "delta_file": str(delta_file),
+    }
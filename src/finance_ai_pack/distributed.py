@@ -0,0 +1,380 @@
+"""Coordinator/worker mode: (company, period, command) shards pulled from a shared SQLite queue.
+
+The coordinator enqueues one shard per company and period; any number of worker processes,
+on this host or on others that see the same database file, claim shards, run them and store
+a partial rollup on the shard row. Failed shards go back on the queue with backoff until
+``max_attempts``; a shard whose worker died is claimable again once its lease expires.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.scheduler import (
+    FAILED,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    JobTimeout,
+    LeaseHeartbeat,
+    database_key,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY,
+    command TEXT NOT NULL,
+    params TEXT NOT NULL,
+    odoo_db TEXT NOT NULL,
+    max_attempts INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shards (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    company_id INTEGER NOT NULL,
+    company_name TEXT NOT NULL,
+    company_currency TEXT NOT NULL,
+    period TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL,
+    lease_until REAL,
+    worker TEXT,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS shards_claim ON shards (status, not_before, id);
+CREATE INDEX IF NOT EXISTS shards_run ON shards (run_id, status);
+"""
+
+# What the coordinator needs from each shard to consolidate and write the group rows.
+PARTIAL_KEYS = {
+    "bank_recon": ("bank_controls_rollup",),
+    "vat_pack": ("monthly_summary", "metrics"),
+    "month_end": (
+        "status",
+        "proceed",
+        "bank_controls_rollup",
+        "vat_controls_rollup",
+        "petty_cash_controls_rollup",
+        "intercompany_controls_rollup",
+    ),
+}
+
+
+def shard_params(command: str, period: str, params: dict) -> dict:
+    if command == "vat_pack":
+        return {**params, "period_from": period, "period_to": period}
+    return {**params, "period": period}
+
+
+def partial_rollup(command: str, result: dict) -> dict:
+    return {key: result[key] for key in PARTIAL_KEYS[command] if key in result}
+
+
+class ShardQueue:
+    def __init__(self, db_path: Path, lease_seconds: float = 1800.0, retry_delay: float = 5.0) -> None:
+        self.db_path = Path(db_path)
+        self.lease_seconds = lease_seconds
+        self.retry_delay = retry_delay
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def create_run(
+        self,
+        command: str,
+        periods: list[str],
+        companies: list[dict],
+        settings: Settings,
+        params: dict | None = None,
+        max_attempts: int = 3,
+    ) -> str:
+        if command not in PARTIAL_KEYS:
+            raise ValueError(f"command must be one of: {', '.join(sorted(PARTIAL_KEYS))}")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        run_id, now = uuid.uuid4().hex, time.time()
+        params = {k: str(v) if isinstance(v, Path) else v for k, v in (params or {}).items() if v is not None}
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO runs (id, command, params, odoo_db, max_attempts, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, command, json.dumps(params), database_key(settings), max_attempts, now),
+            )
+            conn.executemany(
+                "INSERT INTO shards (run_id, company_id, company_name, company_currency, period, status, not_before)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, company["id"], company["name"], company.get("currency", ""), period, QUEUED, now)
+                    for period in periods
+                    for company in companies
+                ],
+            )
+        return run_id
+
+    def claim(self, worker: str, odoo_db: str, run_id: str | None = None) -> dict | None:
+        """Claim the oldest ready shard for this worker's Odoo database.
+
+        A running shard whose lease expired counts as a failed attempt: it is claimed again, or
+        marked failed once it has used up its attempts.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            candidates = conn.execute(
+                "SELECT shards.id, shards.attempts, runs.max_attempts FROM shards JOIN runs ON runs.id = shards.run_id"
+                " WHERE ((shards.status = ? AND shards.not_before <= ?) OR (shards.status = ? AND shards.lease_until < ?))"
+                " AND runs.odoo_db = ? AND (? IS NULL OR shards.run_id = ?)"
+                " ORDER BY shards.id",
+                (QUEUED, now, RUNNING, now, odoo_db, run_id, run_id),
+            ).fetchall()
+            for candidate in candidates:
+                if candidate["attempts"] >= candidate["max_attempts"]:
+                    conn.execute(
+                        "UPDATE shards SET status = ?, finished_at = ?, lease_until = NULL,"
+                        " error = COALESCE(error, 'worker lease expired') WHERE id = ?",
+                        (FAILED, now, candidate["id"]),
+                    )
+                    continue
+                conn.execute(
+                    "UPDATE shards SET status = ?, worker = ?, attempts = attempts + 1, started_at = ?,"
+                    " lease_until = ? WHERE id = ?",
+                    (RUNNING, worker, now, now + self.lease_seconds, candidate["id"]),
+                )
+                claimed = candidate["id"]
+                break
+            else:
+                return None
+        return self.get(claimed)
+
+    def heartbeat(self, shard_id: int, worker: str) -> bool:
+        """Extend ``worker``'s lease on a running shard; ``False`` once it was re-claimed or finished."""
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE shards SET lease_until = ? WHERE id = ? AND worker = ? AND status = ?",
+                (time.time() + self.lease_seconds, shard_id, worker, RUNNING),
+            ).rowcount
+        return bool(updated)
+
+    def complete(self, shard_id: int, worker: str, partial: dict) -> bool:
+        """Store the partial rollup; ``False`` when the lease was lost to another worker."""
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE shards SET status = ?, finished_at = ?, lease_until = NULL, result = ?, error = NULL"
+                " WHERE id = ? AND worker = ? AND status = ?",
+                (SUCCEEDED, time.time(), json.dumps(partial, default=str), shard_id, worker, RUNNING),
+            ).rowcount
+        return bool(updated)
+
+    def fail(self, shard_id: int, worker: str, error: str) -> bool:
+        """Requeue with exponential backoff, or mark failed once the run's attempts are used up."""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT shards.attempts, runs.max_attempts FROM shards JOIN runs ON runs.id = shards.run_id"
+                " WHERE shards.id = ? AND shards.worker = ? AND shards.status = ?",
+                (shard_id, worker, RUNNING),
+            ).fetchone()
+            if row is None:
+                return False
+            if row["attempts"] >= row["max_attempts"]:
+                conn.execute(
+                    "UPDATE shards SET status = ?, finished_at = ?, lease_until = NULL, error = ? WHERE id = ?",
+                    (FAILED, now, error, shard_id),
+                )
+            else:
+                conn.execute(
+                    "UPDATE shards SET status = ?, not_before = ?, lease_until = NULL, error = ? WHERE id = ?",
+                    (QUEUED, now + self.retry_delay * 2 ** (row["attempts"] - 1), error, shard_id),
+                )
+        return True
+
+    def get(self, shard_id: int) -> dict:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT shards.*, runs.command, runs.params FROM shards JOIN runs ON runs.id = shards.run_id"
+                " WHERE shards.id = ?",
+                (shard_id,),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            raise ValueError(f"Unknown shard id: {shard_id}")
+        return _row_to_shard(row)
+
+    def get_run(self, run_id: str) -> dict:
+        conn = self._connect()
+        try:
+            run = conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+            counts = conn.execute(
+                "SELECT status, COUNT(*) AS n FROM shards WHERE run_id = ? GROUP BY status", (run_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+        if run is None:
+            raise ValueError(f"Unknown run id: {run_id}")
+        shard_counts = {status: 0 for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)}
+        shard_counts.update({row["status"]: row["n"] for row in counts})
+        return {
+            "run_id": run["id"],
+            "command": run["command"],
+            "params": json.loads(run["params"]),
+            "odoo_db": run["odoo_db"],
+            "max_attempts": run["max_attempts"],
+            "created_at": run["created_at"],
+            "shards": shard_counts,
+            "done": shard_counts[QUEUED] == 0 and shard_counts[RUNNING] == 0,
+        }
+
+    def shards(self, run_id: str) -> list[dict]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT shards.*, runs.command, runs.params FROM shards JOIN runs ON runs.id = shards.run_id"
+                " WHERE shards.run_id = ? ORDER BY shards.period, shards.company_id",
+                (run_id,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [_row_to_shard(row) for row in rows]
+
+    def wait(self, run_id: str, timeout: float | None = None, poll_interval: float = 0.5) -> dict:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            run = self.get_run(run_id)
+            if run["done"]:
+                return run
+            if deadline is not None and time.monotonic() >= deadline:
+                raise JobTimeout(f"Timed out waiting for run {run_id} ({run['shards']}).")
+            time.sleep(poll_interval)
+
+
+def _row_to_shard(row: sqlite3.Row) -> dict:
+    shard = {
+        "shard_id": row["id"],
+        "run_id": row["run_id"],
+        "command": row["command"],
+        "params": json.loads(row["params"]),
+        "company": {"id": row["company_id"], "name": row["company_name"], "currency": row["company_currency"]},
+        "period": row["period"],
+        "status": row["status"],
+        "attempts": row["attempts"],
+        "worker": row["worker"],
+        "started_at": row["started_at"],
+        "finished_at": row["finished_at"],
+        "error": row["error"],
+    }
+    if row["result"] is not None:
+        shard["result"] = json.loads(row["result"])
+    return shard
+
+
+def execute_shard(shard: dict, settings: Settings) -> dict:
+    from finance_ai_pack import cli
+
+    params = shard_params(shard["command"], shard["period"], shard["params"])
+    if params.get("tra_file"):
+        params["tra_file"] = Path(params["tra_file"])
+    result = cli.runner_for(shard["command"], params)(
+        settings=replace(settings, company_id=shard["company"]["id"]), **params
+    )
+    return partial_rollup(shard["command"], result)
+
+
+def run_shard_worker(
+    db_path: Path,
+    settings: Settings,
+    run_id: str | None = None,
+    once: bool = False,
+    poll_interval: float = 1.0,
+    retry_delay: float = 5.0,
+    lease_seconds: float = 1800.0,
+) -> int:
+    """Claim and run shards until ``run_id`` is done, or (with ``once``) until nothing is claimable.
+
+    Without ``run_id`` and ``once`` the worker serves every run for its Odoo database forever.
+    """
+    queue = ShardQueue(db_path, lease_seconds=lease_seconds, retry_delay=retry_delay)
+    worker = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    odoo_db = database_key(settings)
+    processed = 0
+    while True:
+        shard = queue.claim(worker, odoo_db, run_id=run_id)
+        if shard is None:
+            if (run_id is not None and queue.get_run(run_id)["done"]) or (run_id is None and once):
+                return processed
+            time.sleep(poll_interval)
+            continue
+        shard_id = shard["shard_id"]
+        # Renew well inside the lease so a long month_end shard is never re-claimed and run twice.
+        with LeaseHeartbeat(functools.partial(queue.heartbeat, shard_id, worker), queue.lease_seconds / 3):
+            try:
+                partial = execute_shard(shard, settings)
+            except Exception as exc:
+                queue.fail(shard_id, worker, f"{type(exc).__name__}: {exc}")
+            else:
+                queue.complete(shard_id, worker, partial)
+        processed += 1
+
+
+def spawn_local_workers(db_path: Path, settings: Settings, run_id: str, workers: int, **kwargs):
+    """Start ``workers`` processes on this host for one run; returns the executor and their futures."""
+    import concurrent.futures
+    import multiprocessing
+
+    # Spawned, not forked: the coordinator may already hold threads and open Odoo connections.
+    pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    futures = [pool.submit(run_shard_worker, db_path, settings, run_id=run_id, **kwargs) for _ in range(workers)]
+    return pool, futures
+
+
+def merge_run(queue: ShardQueue, run_id: str) -> dict:
+    """Group succeeded shards' partial rollups by period, ready for the group consolidators."""
+    by_period: dict[str, list[dict]] = {}
+    failed = []
+    for shard in queue.shards(run_id):
+        if shard["status"] == SUCCEEDED:
+            by_period.setdefault(shard["period"], []).append({**shard["result"], "company": shard["company"]})
+        else:
+            failed.append(
+                {
+                    "company_id": shard["company"]["id"],
+                    "period": shard["period"],
+                    "status": shard["status"],
+                    "attempts": shard["attempts"],
+                    "error": shard["error"],
+                }
+            )
+    return {"periods": by_period, "failed_shards": failed}
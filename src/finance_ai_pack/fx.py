@@ -0,0 +1,146 @@
+"""Company-currency conversion for bank tie-outs, from Odoo's ``res.currency.rate``.
+
+Odoo stores a rate as units of the foreign currency per one unit of the company currency, so a
+statement amount converts as ``amount / rate``, using the latest rate dated on or before the line
+(or the oldest rate when the line predates them all, as Odoo does). The rate table is read once
+per run into one sorted date array per currency and looked up with ``bisect``; live runs also keep
+it on disk for ``fx_cache_ttl`` seconds so back-to-back runs skip the extract.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from bisect import bisect_right
+from collections.abc import Iterable
+from pathlib import Path
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.money import HALF, amount_cents
+
+
+def convert_cents(cents: int, rate: float) -> int:
+    """Foreign-currency cents to company-currency cents, rounded half away from zero."""
+    value = cents / rate
+    return int(value + (HALF if value >= 0 else -HALF))
+
+
+class RateTable:
+    def __init__(self, company_currency: str, rates: dict[str, tuple[list[str], list[float]]] | None = None) -> None:
+        self.company_currency = company_currency
+        self.rates = rates or {}
+
+    @classmethod
+    def from_rows(cls, company_currency: str, rows: Iterable[dict]) -> "RateTable":
+        """Build from ``{"currency", "date", "rate", "company_id"}`` rows; company-specific rates win over shared ones."""
+        by_currency: dict[str, dict[str, tuple[bool, float]]] = {}
+        for row in rows:
+            rate = float(row.get("rate") or 0.0)
+            if rate <= 0 or not row.get("currency") or not row.get("date"):
+                continue
+            dates = by_currency.setdefault(row["currency"], {})
+            day = str(row["date"])[:10]
+            specific = bool(row.get("company_id"))
+            if day not in dates or specific >= dates[day][0]:
+                dates[day] = (specific, rate)
+        rates = {}
+        for currency, dates in by_currency.items():
+            ordered = sorted(dates)
+            rates[currency] = (ordered, [dates[day][1] for day in ordered])
+        return cls(company_currency, rates)
+
+    def needs_conversion(self, currency: str) -> bool:
+        return bool(currency) and bool(self.company_currency) and currency != self.company_currency
+
+    def has(self, currency: str) -> bool:
+        return currency in self.rates
+
+    def rate_on(self, currency: str, on_date: str) -> float:
+        dates, rates = self.rates[currency]
+        index = bisect_right(dates, str(on_date)[:10]) - 1
+        return rates[max(index, 0)]
+
+    def convert_lines(self, currency: str, lines: list[dict]) -> int:
+        """Company-currency cents for one journal's lines, each converted at its own date's rate.
+
+        Lines arrive in date order, so the bisect only runs when the date changes.
+        """
+        if not self.needs_conversion(currency):
+            return sum(amount_cents(line) for line in lines)
+        total = 0
+        last_date = None
+        rate = 1.0
+        for line in lines:
+            line_date = line.get("date") or ""
+            if line_date != last_date:
+                rate = self.rate_on(currency, line_date)
+                last_date = line_date
+            cents = line.get("amount_cents")
+            # convert_cents inlined: this loop runs once per statement line.
+            value = (amount_cents(line) if cents is None else cents) / rate
+            total += int(value + (HALF if value >= 0 else -HALF))
+        return total
+
+    def to_dict(self) -> dict:
+        return {
+            "company_currency": self.company_currency,
+            "rates": {currency: [dates, rates] for currency, (dates, rates) in self.rates.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "RateTable":
+        rates = {currency: (list(dates), list(values)) for currency, (dates, values) in payload["rates"].items()}
+        return cls(payload.get("company_currency", ""), rates)
+
+
+def _company_currency(adapter, settings: Settings) -> str:
+    companies = adapter.discover_companies()
+    for company in companies:
+        if company["id"] == settings.company_id:
+            return company.get("currency", "")
+    return companies[0].get("currency", "") if companies else ""
+
+
+def cache_file(cache_dir: Path, settings: Settings) -> Path:
+    from finance_ai_pack.scheduler import database_key
+
+    digest = hashlib.sha1(f"{database_key(settings)}|{settings.company_id or 0}".encode()).hexdigest()[:16]
+    return cache_dir / f"rates_{digest}.json"
+
+
+def load_rate_table(adapter, settings: Settings, cache_dir: Path | None = None) -> RateTable:
+    """The run's rate table; live runs reuse the on-disk copy while it is younger than ``fx_cache_ttl``."""
+    use_cache = cache_dir is not None and not settings.fixture_mode and settings.fx_cache_ttl > 0
+    path = cache_file(cache_dir, settings) if use_cache else None
+    if path is not None and path.exists():
+        try:
+            payload = json.loads(path.read_text())
+            if time.time() - payload["fetched_at"] < settings.fx_cache_ttl:
+                return RateTable.from_dict(payload)
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    table = RateTable.from_rows(_company_currency(adapter, settings), adapter.get_currency_rates())
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        prune_cache(path.parent, settings.fx_cache_ttl)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"fetched_at": time.time(), **table.to_dict()}))
+        os.replace(tmp, path)
+    return table
+
+
+def prune_cache(cache_dir: Path, ttl: float) -> int:
+    """Delete rate tables (and abandoned temp files) older than ``ttl``; returns the number removed."""
+    cutoff = time.time() - ttl
+    removed = 0
+    for stale in cache_dir.glob("rates_*"):
+        try:
+            if stale.stat().st_mtime < cutoff:
+                stale.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import concurrent.futures
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.factory import build_adapter
+from finance_ai_pack.money import from_cents, to_cents
+from finance_ai_pack.rules.month_end_gating import AMBER, GREEN, RED
+
+# Resolved by name: concurrent.futures imports the process pool (and multiprocessing) on first access.
+EXECUTORS = {"thread": "ThreadPoolExecutor", "process": "ProcessPoolExecutor"}
+STATUS_RANK = {GREEN: 0, AMBER: 1, RED: 2}
+
+
+def resolve_companies(selector: str, settings: Settings, fixtures_dir: Path) -> list[dict]:
+    """Discover ``res.company`` once and select ``all`` or a comma-separated list of ids."""
+    companies = build_adapter(replace(settings, company_id=None), fixtures_dir).discover_companies()
+    if selector.strip().lower() == "all":
+        return companies
+    try:
+        wanted = {int(token) for token in selector.split(",") if token.strip()}
+    except ValueError as exc:
+        raise ValueError("companies must be 'all' or a comma-separated list of company ids") from exc
+    selected = [company for company in companies if company["id"] in wanted]
+    missing = wanted - {company["id"] for company in selected}
+    if missing:
+        raise ValueError(f"Unknown company ids: {', '.join(str(x) for x in sorted(missing))}")
+    return selected
+
+
+def fan_out(
+    runner: Callable[..., dict],
+    companies: list[dict],
+    settings: Settings,
+    max_workers: int = 4,
+    executor: str = "thread",
+    **kwargs,
+) -> list[dict]:
+    """Run ``runner`` once per company with at most ``max_workers`` companies in flight.
+
+    Threads share the process-wide authenticated client pool. Processes suit CPU-heavy
+    fixture or replay runs; each worker process authenticates once and reuses its pool
+    for every company it picks up.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of: {', '.join(sorted(EXECUTORS))}")
+    if not companies:
+        return []
+
+    pool_class = getattr(concurrent.futures, EXECUTORS[executor])
+    with pool_class(max_workers=min(max_workers, len(companies))) as pool:
+        futures = [
+            pool.submit(runner, settings=replace(settings, company_id=company["id"]), **kwargs) for company in companies
+        ]
+        results = [future.result() for future in futures]
+
+    for company, result in zip(companies, results, strict=True):
+        result["company"] = {"id": company["id"], "name": company["name"], "currency": company.get("currency", "")}
+    return results
+
+
+def worst_status(statuses: list[str]) -> str:
+    return max(statuses, key=lambda status: STATUS_RANK.get(status, 0), default=GREEN)
+
+
+def consolidate_bank(results: list[dict]) -> dict:
+    total_lines = sum(r["bank_controls_rollup"]["total_statement_lines"] for r in results)
+    total_reconciled = sum(r["bank_controls_rollup"]["total_reconciled_lines"] for r in results)
+    return {
+        "company_count": len(results),
+        "bank_count": sum(r["bank_controls_rollup"]["bank_count"] for r in results),
+        "total_statement_lines": total_lines,
+        "total_reconciled_lines": total_reconciled,
+        "overall_reconciled_pct": round((total_reconciled / total_lines * 100) if total_lines else 100.0, 2),
+        "exception_count": sum(r["bank_controls_rollup"]["exception_count"] for r in results),
+        "unexplained_amount_by_currency": _by_currency(results),
+    }
+
+
+def _by_currency(results: list[dict]) -> dict[str, float]:
+    # Companies book in different currencies; their tie-out differences only add up per currency.
+    cents: dict[str, int] = {}
+    for r in results:
+        rollup = r["bank_controls_rollup"]
+        currency = rollup.get("company_currency", "")
+        cents[currency] = cents.get(currency, 0) + to_cents(rollup["unexplained_amount"])
+    return {currency: from_cents(total) for currency, total in sorted(cents.items())}
+
+
+def consolidate_vat(results: list[dict]) -> dict:
+    differences = [
+        max(abs(row["input_difference"]), abs(row["output_difference"]))
+        for r in results
+        for row in r["monthly_summary"]
+    ]
+    return {
+        "company_count": len(results),
+        "months": max((len(r["monthly_summary"]) for r in results), default=0),
+        "max_abs_vat_difference": max(differences, default=0.0),
+        "exception_count": sum(r["metrics"]["exception_count"] for r in results),
+    }
+
+
+def consolidate_month_end(results: list[dict]) -> dict:
+    """A group can only proceed once every company can: the group status is the worst company status."""
+    return {
+        "company_count": len(results),
+        "status": worst_status([r["status"] for r in results]),
+        "proceed": all(r["proceed"] for r in results),
+        "status_counts": {status: sum(1 for r in results if r["status"] == status) for status in (GREEN, AMBER, RED)},
+        "total_statement_lines": sum(r["bank_controls_rollup"]["total_statement_lines"] for r in results),
+        "total_reconciled_lines": sum(r["bank_controls_rollup"]["total_reconciled_lines"] for r in results),
+        "max_abs_vat_difference": max(
+            (r["vat_controls_rollup"]["max_abs_vat_difference"] for r in results), default=0.0
+        ),
+        "petty_cash_exception_count": sum(r["petty_cash_controls_rollup"]["exception_count"] for r in results),
+        "blocked_companies": [r["company"]["id"] for r in results if not r["proceed"]],
+    }
+
+
+CONSOLIDATORS = {
+    "bank_recon": consolidate_bank,
+    "vat_pack": consolidate_vat,
+    "month_end": consolidate_month_end,
+}
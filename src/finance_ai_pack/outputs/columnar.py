@@ -0,0 +1,251 @@
+"""Typed, partitioned columnar exports for warehouse loads.
+
+Each dataset has an explicit schema and is written Hive-style under
+``<root>/<dataset>/period=YYYY-MM/entity=<company>/part-00000.<ext>``: Parquet (zstd) when pyarrow is
+installed, otherwise gzip-compressed NDJSON. Rows are streamed into one writer per partition
+and flushed every ``row_group_rows`` rows (one Parquet row group each), so a register is never
+held in memory whole. Partition columns live in the path, not in the files. ``_schema.json``
+next to the partitions records the column types for loaders that cannot read them from the files.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from finance_ai_pack.telemetry import span
+
+FORMATS = ("parquet", "ndjson")
+EXTENSIONS = {"parquet": ".parquet", "ndjson": ".ndjson.gz"}
+# Amounts are exported as exact decimals: NUMERIC(18, 2) in the warehouse.
+DECIMAL_PRECISION, DECIMAL_SCALE = 18, 2
+_CENT = Decimal(1).scaleb(-DECIMAL_SCALE)
+
+
+@dataclass(frozen=True)
+class ColumnarSchema:
+    name: str
+    columns: tuple[tuple[str, str], ...]
+    partition_by: tuple[str, ...] = ("period", "entity")
+
+    @property
+    def data_columns(self) -> list[tuple[str, str]]:
+        return [(name, kind) for name, kind in self.columns if name not in self.partition_by]
+
+
+SCHEMAS = {
+    schema.name: schema
+    for schema in (
+        ColumnarSchema(
+            "bank_recon",
+            (
+                ("period", "string"),
+                ("bank", "string"),
+                ("journal", "string"),
+                ("currency", "string"),
+                ("line_count", "int64"),
+                ("reconciled_count", "int64"),
+                ("reconciled_pct", "float64"),
+                ("carried_forward_unreconciled_count", "int64"),
+                ("difference", "decimal"),
+            ),
+        ),
+        ColumnarSchema(
+            "bank_lines",
+            (
+                ("period", "string"),
+                ("bank", "string"),
+                ("line_id", "string"),
+                ("date", "date"),
+                ("reference", "string"),
+                ("amount", "decimal"),
+                ("aging_bucket", "string"),
+            ),
+        ),
+        ColumnarSchema(
+            "vat_monthly_summary",
+            (
+                ("period", "string"),
+                ("odoo_input_vat", "decimal"),
+                ("tra_input_vat", "decimal"),
+                ("input_difference", "decimal"),
+                ("odoo_output_vat", "decimal"),
+                ("tra_output_vat", "decimal"),
+                ("output_difference", "decimal"),
+                ("net_vat_difference", "decimal"),
+                ("vat_control_balance", "decimal"),
+                ("vat_control_assumption", "string"),
+            ),
+        ),
+        ColumnarSchema(
+            "vat_exception_register",
+            (
+                ("period", "string"),
+                ("category", "string"),
+                ("document_ref", "string"),
+                ("tax_type", "string"),
+                ("source_period", "string"),
+                ("vat_amount", "decimal"),
+                ("notes", "string"),
+            ),
+        ),
+    )
+}
+
+
+def resolve_format(choice: str) -> str:
+    """``auto`` picks Parquet when pyarrow is installed and gzip NDJSON otherwise."""
+    import importlib.util
+
+    has_pyarrow = importlib.util.find_spec("pyarrow") is not None
+    if choice == "auto":
+        return "parquet" if has_pyarrow else "ndjson"
+    if choice not in FORMATS:
+        raise ValueError("columnar export must be 'auto', 'parquet' or 'ndjson'")
+    if choice == "parquet" and not has_pyarrow:
+        raise ValueError("Parquet export needs pyarrow (pip install pyarrow); use 'ndjson' or 'auto' without it")
+    return choice
+
+
+def _coerce(value: object, kind: str) -> object:
+    if value is None or (value == "" and kind != "string"):
+        return None
+    if kind == "string":
+        return str(value)
+    if kind == "int64":
+        return int(value)
+    if kind == "float64":
+        return float(value)
+    if kind == "decimal":
+        # str() first: the float 0.1 would otherwise carry its binary expansion into the decimal.
+        return Decimal(str(value)).quantize(_CENT)
+    if kind == "date":
+        return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+    raise ValueError(f"unknown column type {kind!r}")
+
+
+def _arrow_schema(schema: ColumnarSchema):
+    import pyarrow as pa
+
+    types = {
+        "string": pa.string(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "decimal": pa.decimal128(DECIMAL_PRECISION, DECIMAL_SCALE),
+        "date": pa.date32(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in schema.data_columns])
+
+
+class _ParquetPart:
+    def __init__(self, path: Path, schema: ColumnarSchema) -> None:
+        import pyarrow.parquet as pq
+
+        self.arrow_schema = _arrow_schema(schema)
+        self.columns = [name for name, _ in schema.data_columns]
+        self.writer = pq.ParquetWriter(str(path), self.arrow_schema, compression="zstd")
+
+    def write(self, batch: list[list]) -> None:
+        import pyarrow as pa
+
+        columns = list(zip(*batch, strict=True))
+        self.writer.write_table(
+            pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, self.arrow_schema, strict=True)],
+                schema=self.arrow_schema,
+            )
+        )
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _NdjsonPart:
+    def __init__(self, path: Path, schema: ColumnarSchema) -> None:
+        import gzip
+
+        self.columns = [name for name, _ in schema.data_columns]
+        self.handle = gzip.open(path, "wt", encoding="utf-8")
+        self.encode = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+    def write(self, batch: list[list]) -> None:
+        # Decimals and dates serialise as strings ("-150.00", "2025-01-10"); _schema.json types them.
+        self.handle.writelines(self.encode(dict(zip(self.columns, values, strict=True))) + "\n" for values in batch)
+
+    def close(self) -> None:
+        self.handle.close()
+
+
+def export_rows(
+    schema: ColumnarSchema,
+    rows: Iterable[dict],
+    root: Path,
+    fmt: str,
+    entity: str,
+    periods: Iterable[str] = (),
+    row_group_rows: int = 65_536,
+) -> list[str]:
+    """Stream ``rows`` into ``schema``'s partitions under ``root``; returns the files written.
+
+    ``periods`` is the run's range: its partitions for ``entity`` are cleared up front, so a month
+    that now has no rows loses its old file and a rerun never leaves stale or duplicate rows.
+    Rows without a ``period`` column land in the partition of a single-month run.
+    """
+    if row_group_rows < 1:
+        raise ValueError("row_group_rows must be >= 1")
+    periods = list(periods)
+    default_period = periods[0] if len(periods) == 1 else ""
+    part_class = _ParquetPart if fmt == "parquet" else _NdjsonPart
+    dataset_dir = root / schema.name
+    data_columns = schema.data_columns
+    parts: dict[str, tuple[_ParquetPart | _NdjsonPart, list[list]]] = {}
+    files = []
+
+    def clear(period: str) -> Path:
+        partition = dataset_dir / f"period={period}" / f"entity={entity}"
+        partition.mkdir(parents=True, exist_ok=True)
+        for stale in partition.glob("part-*"):
+            stale.unlink()
+        return partition
+
+    with span("export_columnar", "writer"):
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+        cleared = {period: clear(period) for period in periods}
+        try:
+            for row in rows:
+                row_period = str(row.get("period") or default_period)
+                if not row_period:
+                    raise ValueError(f"{schema.name} rows without a period need a single-month export")
+                part = parts.get(row_period)
+                if part is None:
+                    partition = cleared.get(row_period) or clear(row_period)
+                    files.append(partition / f"part-00000{EXTENSIONS[fmt]}")
+                    part = parts[row_period] = (part_class(files[-1], schema), [])
+                writer, batch = part
+                batch.append([_coerce(row.get(name), kind) for name, kind in data_columns])
+                if len(batch) >= row_group_rows:
+                    writer.write(batch)
+                    batch.clear()
+            for writer, batch in parts.values():
+                if batch:
+                    writer.write(batch)
+        finally:
+            for writer, _ in parts.values():
+                writer.close()
+        (dataset_dir / "_schema.json").write_text(
+            json.dumps(
+                {
+                    "dataset": schema.name,
+                    "format": fmt,
+                    "columns": [{"name": name, "type": kind} for name, kind in data_columns],
+                    "partition_by": list(schema.partition_by),
+                    "decimal": {"precision": DECIMAL_PRECISION, "scale": DECIMAL_SCALE},
+                },
+                indent=2,
+            )
+        )
+    return [str(path) for path in files]
@@ -0,0 +1,36 @@
+"""Sorted runs spilled to scratch files and k-way merged back, for the external sorts."""
+
+from __future__ import annotations
+
+import heapq
+import marshal
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+
+def spill_run(buffer: list[tuple], spill_dir: str | Path, prefix: str = "run") -> Path:
+    """Sort ``buffer`` in place and write it to a new run file in ``spill_dir``."""
+    buffer.sort()
+    fd, name = tempfile.mkstemp(prefix=prefix, suffix=".run", dir=spill_dir)
+    with os.fdopen(fd, "wb") as handle:
+        for item in buffer:
+            marshal.dump(item, handle)
+    return Path(name)
+
+
+def read_run(path: Path) -> Iterator[tuple]:
+    # Runs are this process's own scratch files, so marshal (the fastest codec for tuples of
+    # plain values) is safe to read back.
+    with path.open("rb") as handle:
+        while True:
+            try:
+                yield marshal.load(handle)
+            except EOFError:
+                return
+
+
+def merge_runs(runs: Iterable[Path], *sorted_tails: Iterable[tuple]) -> Iterator[tuple]:
+    """Merge the spilled runs with any already-sorted in-memory items."""
+    return heapq.merge(*(read_run(run) for run in runs), *sorted_tails)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+import threading
+import weakref
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from finance_ai_pack.outputs.runs import merge_runs, spill_run
+
+
+class ExceptionSink:
+    """Exception rows kept in sort order, in memory up to ``max_rows`` and in spilled runs beyond it.
+
+    Every full buffer is sorted and written to a temporary run file; iterating k-way merges the
+    runs with the in-memory tail, so each writer streams the register in the same order whatever
+    the size of the register or the order the rows arrived in. Ties keep arrival order. The sink
+    can be iterated any number of times, from several writer threads at once.
+    """
+
+    def __init__(self, sort_key: Callable[[dict], tuple], max_rows: int = 100_000) -> None:
+        if max_rows < 1:
+            raise ValueError("max_rows must be >= 1")
+        self.sort_key = sort_key
+        self.max_rows = max_rows
+        self.fields: set[str] = set()
+        self._buffer: list[tuple[tuple, int, dict]] = []
+        self._runs: list[Path] = []
+        self._count = 0
+        self._spill_dir: str | None = None
+        self._sorted = False
+        self._lock = threading.Lock()
+
+    def add(self, row: dict) -> None:
+        self.fields.update(row)
+        self._buffer.append((self.sort_key(row), self._count, row))
+        self._count += 1
+        self._sorted = False
+        if len(self._buffer) >= self.max_rows:
+            self._spill()
+
+    def _spill(self) -> None:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="finance-exceptions-")
+            weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+        self._runs.append(spill_run(self._buffer, self._spill_dir))
+        self._buffer = []
+
+    @property
+    def spilled_runs(self) -> int:
+        return len(self._runs)
+
+    @property
+    def fieldnames(self) -> list[str]:
+        return sorted(self.fields)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[dict]:
+        with self._lock:
+            if not self._sorted:
+                self._buffer.sort()
+                self._sorted = True
+            runs, buffer = list(self._runs), self._buffer
+        if not runs:
+            return (row for _, _, row in buffer)
+        return (row for _, _, row in merge_runs(runs, buffer))
+
+    def head(self, limit: int) -> list[dict]:
+        rows = []
+        for row in self:
+            if len(rows) >= limit:
+                break
+            rows.append(row)
+        return rows
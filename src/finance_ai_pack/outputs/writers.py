@@ -1,20 +1,114 @@
 from __future__ import annotations
 
-import csv
+import contextvars
+import functools
 import json
+from html import escape
 from pathlib import Path
-from xml.sax.saxutils import escape
-from zipfile import ZIP_DEFLATED, ZipFile
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
 
+from finance_ai_pack.telemetry import span
 
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+# csv, zipfile and concurrent.futures are imported where they are used: the CLI imports this
+# module for every command. html.escape stands in for xml.sax.saxutils.escape, which pulls in
+# urllib.request, http.client and ssl.
+
+
+class ArtifactWriter:
+    """Runs artifact writes on a small background pool so callers stay off the disk I/O path."""
+
+    def __init__(self, max_workers: int = 4) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifact-writer")
+        self._futures: list[Future] = []
+
+    def submit(self, fn: Callable[..., None], *args, **kwargs) -> None:
+        # Run in a copy of the caller's context so writes report into the caller's telemetry.
+        self._futures.append(self._executor.submit(contextvars.copy_context().run, fn, *args, **kwargs))
+
+    def wait(self) -> None:
+        """Block until every submitted write has finished, re-raising the first failure."""
+        try:
+            for future in self._futures:
+                future.result()
+        finally:
+            self._futures.clear()
+
+    def close(self) -> None:
+        """Finish every pending write, then shut the pool down; re-raises the first write failure."""
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ArtifactWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is None:
+            self.close()
+            return
+        # The block already failed: still finish the writes, and record a write failure on the
+        # block's exception instead of replacing it.
+        try:
+            self.close()
+        except Exception as write_error:
+            exc.add_note(f"artifact write also failed: {type(write_error).__name__}: {write_error}")
+
+
+def _traced(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with span(fn.__name__, "writer"):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+@_traced
 def write_json(data: dict, output_file: Path) -> None:
     output_file.parent.mkdir(parents=True, exist_ok=True)
     output_file.write_text(json.dumps(data, indent=2))
 
 
-def write_csv(rows: list[dict], output_file: Path) -> None:
+def _iter_json_array(rows: Iterable[dict], level: int = 0) -> Iterator[str]:
+    """``json.dumps(list(rows), indent=2)`` nested ``level`` deep, produced one row at a time."""
+    pad = "  " * (level + 1)
+    first = True
+    for row in rows:
+        yield ("[\n" if first else ",\n") + pad + json.dumps(row, indent=2).replace("\n", "\n" + pad)
+        first = False
+    yield "[]" if first else "\n" + "  " * level + "]"
+
+
+def _streamed(value: object) -> bool:
+    # Streamed registers (outputs.sink.ExceptionSink) are iterables rather than lists.
+    return hasattr(value, "__iter__") and not isinstance(value, (dict, list, tuple, str))
+
+
+@_traced
+def write_json_rows(key: str, rows: Iterable[dict], output_file: Path) -> None:
+    """Write ``{key: rows}`` as ``write_json`` would, without holding the rows in memory."""
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    fieldnames = sorted({key for row in rows for key in row.keys()})
+    with output_file.open("w") as handle:
+        handle.write(f"{{\n  {json.dumps(key)}: ")
+        handle.writelines(_iter_json_array(rows, level=1))
+        handle.write("\n}")
+
+
+@_traced
+def write_csv(rows: Iterable[dict], output_file: Path, fieldnames: list[str] | None = None) -> None:
+    """Write rows as CSV; pass ``fieldnames`` to stream rows that are not a list."""
+    import csv
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    if fieldnames is None:
+        rows = rows if isinstance(rows, list) else list(rows)
+        fieldnames = sorted({key for row in rows for key in row.keys()})
     with output_file.open("w", newline="") as handle:
         writer = csv.DictWriter(handle, fieldnames=fieldnames)
         writer.writeheader()
@@ -22,19 +116,29 @@ def write_csv(rows: list[dict], output_file: Path) -> None:
             writer.writerow(row)
 
 
+@_traced
 def write_html(title: str, sections: dict[str, object], output_file: Path) -> None:
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    body = [f"<h1>{escape(title)}</h1>"]
-    for key, value in sections.items():
-        body.append(f"<h2>{escape(key)}</h2>")
-        body.append(f"<pre>{escape(json.dumps(value, indent=2))}</pre>")
-    output_file.write_text("\n".join(["<html><body>", *body, "</body></html>"]))
+    with output_file.open("w") as handle:
+        handle.write(f"<html><body>\n<h1>{escape(title, quote=False)}</h1>")
+        for key, value in sections.items():
+            handle.write(f"\n<h2>{escape(key, quote=False)}</h2>\n<pre>")
+            chunks = _iter_json_array(value) if _streamed(value) else [json.dumps(value, indent=2)]
+            handle.writelines(escape(chunk, quote=False) for chunk in chunks)
+            handle.write("</pre>")
+        handle.write("\n</body></html>")
 
 
-def write_xlsx(rows: list[dict], output_file: Path) -> None:
-    """Write a minimal single-sheet XLSX without external dependencies."""
+@_traced
+def write_xlsx(rows: Iterable[dict], output_file: Path, fieldnames: list[str] | None = None) -> None:
+    """Write a minimal single-sheet XLSX without external dependencies; the sheet is streamed row by row."""
+    from zipfile import ZIP_DEFLATED, ZipFile
+
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    headers = sorted({key for row in rows for key in row.keys()})
+    if fieldnames is None:
+        rows = rows if isinstance(rows, list) else list(rows)
+        fieldnames = sorted({key for row in rows for key in row.keys()})
+    headers = fieldnames
 
     def _cell_ref(col_idx: int, row_idx: int) -> str:
         letters = ""
@@ -44,21 +148,17 @@ def write_xlsx(rows: list[dict], output_file: Path) -> None:
             letters = chr(65 + rem) + letters
         return f"{letters}{row_idx}"
 
-    sheet_rows = []
-    all_rows = [headers, *[[str(row.get(h, "")) for h in headers] for row in rows]]
-    for r_idx, row in enumerate(all_rows, start=1):
-        cells = []
-        for c_idx, value in enumerate(row):
-            ref = _cell_ref(c_idx, r_idx)
-            cells.append(f'<c r="{ref}" t="inlineStr"><is><t>{escape(value)}</t></is></c>')
-        sheet_rows.append(f"<row r=\"{r_idx}\">{''.join(cells)}</row>")
-
-    sheet_xml = (
-        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
-        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
-        f"<sheetData>{''.join(sheet_rows)}</sheetData>"
-        "</worksheet>"
-    )
+    columns = [_cell_ref(c_idx, 0)[:-1] for c_idx in range(len(headers))]
+
+    def _sheet_rows() -> Iterator[str]:
+        all_rows = (headers, *([str(row.get(h, "")) for h in headers] for row in rows))
+        for r_idx, row in enumerate(all_rows, start=1):
+            cells = "".join(
+                f'<c r="{column}{r_idx}" t="inlineStr"><is><t>{escape(value, quote=False)}</t></is></c>'
+                for column, value in zip(columns, row, strict=True)
+            )
+            yield f'<row r="{r_idx}">{cells}</row>'
+
     with ZipFile(output_file, "w", compression=ZIP_DEFLATED) as zf:
         zf.writestr(
             "[Content_Types].xml",
@@ -92,4 +192,11 @@ def write_xlsx(rows: list[dict], output_file: Path) -> None:
             '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
             "</Relationships>",
         )
-        zf.writestr("xl/worksheets/sheet1.xml", sheet_xml)
+        with zf.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            for sheet_row in _sheet_rows():
+                sheet.write(sheet_row.encode())
+            sheet.write(b"</sheetData></worksheet>")
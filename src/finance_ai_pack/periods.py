@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+
+def _next_month(cursor: datetime) -> datetime:
+    if cursor.month == 12:
+        return datetime(cursor.year + 1, 1, 1)
+    return datetime(cursor.year, cursor.month + 1, 1)
+
+
+def iter_periods(period_from: str, period_to: str) -> list[str]:
+    start = datetime.strptime(f"{period_from}-01", "%Y-%m-%d")
+    end = datetime.strptime(f"{period_to}-01", "%Y-%m-%d")
+    if start > end:
+        raise ValueError("period_from must be <= period_to")
+
+    periods = []
+    cursor = start
+    while cursor <= end:
+        periods.append(cursor.strftime("%Y-%m"))
+        cursor = _next_month(cursor)
+    return periods
+
+
+def previous_period(period: str) -> str:
+    start = datetime.strptime(f"{period}-01", "%Y-%m-%d")
+    if start.month == 1:
+        return f"{start.year - 1}-12"
+    return f"{start.year}-{start.month - 1:02d}"
+
+
+def month_bounds(period: str) -> tuple[str, str]:
+    """Return ``(first day, first day of next month)`` as ISO dates for a ``YYYY-MM`` period."""
+    start = datetime.strptime(f"{period}-01", "%Y-%m-%d")
+    return start.strftime("%Y-%m-%d"), _next_month(start).strftime("%Y-%m-%d")
+
+
+def range_bounds(period_from: str, period_to: str) -> tuple[str, str]:
+    return month_bounds(period_from)[0], month_bounds(period_to)[1]
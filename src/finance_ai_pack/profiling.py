@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from finance_ai_pack.outputs.writers import write_csv
+
+MODES = ("cprofile", "tracemalloc", "sampling")
+SAMPLE_INTERVAL = 0.005
+TRACEMALLOC_FRAMES = 16
+# From 3.12 cProfile sits on sys.monitoring: one profiler is active per process, a second
+# enable() raises, and the one enabled profiler already sees every thread.
+PER_THREAD_CPROFILE = sys.version_info < (3, 12)
+
+
+def _peak_rss_bytes() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _frame_label(code) -> str:
+    return f"{Path(code.co_filename).name}:{code.co_firstlineno}({code.co_name})"
+
+
+class _ThreadProfiles:
+    """cProfile for the calling thread plus every thread started while profiling.
+
+    Up to 3.11 ``cProfile.Profile`` only sees the thread that enabled it, and month_end does its
+    work on stage and writer pools; ``threading.setprofile`` hands each new thread its own profiler
+    and the stats are merged at the end. From 3.12 the single process-wide profiler is used alone.
+    """
+
+    def __init__(self) -> None:
+        self.profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def _start_thread(self, frame, event, arg) -> None:
+        sys.setprofile(None)
+        profiler = cProfile.Profile()
+        with self._lock:
+            self.profiles.append(profiler)
+        profiler.enable()
+
+    def start(self) -> None:
+        main = cProfile.Profile()
+        self.profiles.append(main)
+        if PER_THREAD_CPROFILE:
+            threading.setprofile(self._start_thread)
+        main.enable()
+
+    def stop(self) -> pstats.Stats:
+        if PER_THREAD_CPROFILE:
+            threading.setprofile(None)
+        self.profiles[0].disable()
+        with self._lock:
+            profiles = list(self.profiles)
+        for profiler in profiles:
+            profiler.create_stats()
+        stats = pstats.Stats(profiles[0])
+        for profiler in profiles[1:]:
+            if profiler.stats:
+                stats.add(profiler)
+        return stats
+
+
+class _Sampler(threading.Thread):
+    """Samples every other thread's stack on an interval and counts collapsed stacks."""
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def _cprofile_top(stats: pstats.Stats, top: int) -> list[dict]:
+    rows = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        if filename == "~" or Path(filename).name == Path(__file__).name:
+            continue
+        rows.append(
+            {
+                "function": f"{Path(filename).name}:{line}({name})",
+                "calls": calls,
+                "self_ms": round(tottime * 1000, 3),
+                "cumulative_ms": round(cumtime * 1000, 3),
+            }
+        )
+    rows.sort(key=lambda row: row["self_ms"], reverse=True)
+    return rows[:top]
+
+
+def _sampling_top(stacks: Counter[str], top: int) -> list[dict]:
+    # Every tick samples each live thread, so percentages are of thread samples, not ticks.
+    samples = sum(stacks.values())
+    own: Counter[str] = Counter()
+    total: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        # Thread name is the root frame; it is not a function.
+        frames = stack.split(";")[1:]
+        if not frames:
+            continue
+        own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+    return [
+        {
+            "function": function,
+            "self_samples": count,
+            "total_samples": total[function],
+            "self_pct": round(100 * count / samples, 1) if samples else 0.0,
+        }
+        for function, count in own.most_common(top)
+    ]
+
+
+@contextmanager
+def profile(mode: str, output_stem: Path, top: int = 20, interval: float = SAMPLE_INTERVAL):
+    """Profile the enclosed block and fill the yielded dict with the summary on exit.
+
+    Artifacts are written next to ``output_stem``: ``<stem>_profile.pstats`` (cprofile),
+    ``<stem>_allocations.csv`` (tracemalloc) or ``<stem>_stacks.folded`` (sampling; feed it to
+    ``flamegraph.pl`` or speedscope).
+    """
+    if mode not in MODES:
+        raise ValueError(f"profile mode must be one of {', '.join(MODES)}")
+    output_stem.parent.mkdir(parents=True, exist_ok=True)
+    report: dict = {"mode": mode}
+
+    if mode == "cprofile":
+        profiler = _ThreadProfiles()
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            yield report
+        finally:
+            stats = profiler.stop()
+            wall = time.perf_counter() - started
+            artifact = output_stem.with_name(f"{output_stem.name}_profile.pstats")
+            stats.dump_stats(artifact)
+            report.update(
+                artifacts=[str(artifact)],
+                top_functions=_cprofile_top(stats, top),
+                peak_memory_bytes=_peak_rss_bytes(),
+                peak_memory_source="rss",
+                wall_ms=round(wall * 1000, 3),
+            )
+        return
+
+    if mode == "tracemalloc":
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield report
+        finally:
+            wall = time.perf_counter() - started
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+            )
+            _, peak = tracemalloc.get_traced_memory()
+            if not already_tracing:
+                tracemalloc.stop()
+            sites = [
+                {
+                    "file": stat.traceback[0].filename,
+                    "line": stat.traceback[0].lineno,
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[: max(top, 100)]
+            ]
+            artifact = output_stem.with_name(f"{output_stem.name}_allocations.csv")
+            write_csv(sites, artifact)
+            report.update(
+                artifacts=[str(artifact)],
+                top_allocations=[{**site, "file": Path(site["file"]).name} for site in sites[:top]],
+                peak_memory_bytes=peak,
+                peak_memory_source="tracemalloc",
+                wall_ms=round(wall * 1000, 3),
+            )
+        return
+
+    sampler = _Sampler(interval)
+    started = time.perf_counter()
+    sampler.start()
+    try:
+        yield report
+    finally:
+        sampler.stop()
+        wall = time.perf_counter() - started
+        artifact = output_stem.with_name(f"{output_stem.name}_stacks.folded")
+        with artifact.open("w") as handle:
+            for stack, count in sorted(sampler.stacks.items()):
+                handle.write(f"{stack} {count}\n")
+        report.update(
+            artifacts=[str(artifact)],
+            samples=sampler.samples,
+            interval_ms=interval * 1000,
+            top_functions=_sampling_top(sampler.stacks, top),
+            peak_memory_bytes=_peak_rss_bytes(),
+            peak_memory_source="rss",
+            wall_ms=round(wall * 1000, 3),
+        )
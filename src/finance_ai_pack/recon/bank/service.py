@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
 
 from finance_ai_pack.config import Settings
-from finance_ai_pack.connectors.odoo.client import OdooClient
-from finance_ai_pack.connectors.odoo.fixtures_adapter import FixturesAdapter
-from finance_ai_pack.connectors.odoo.live_adapter import LiveOdooAdapter
+from finance_ai_pack.connectors.odoo.factory import build_adapter
+from finance_ai_pack.fx import RateTable, load_rate_table
+from finance_ai_pack.money import amount_cents, from_cents, sum_cents, to_cents
+from finance_ai_pack.periods import iter_periods
 
 
 @dataclass
@@ -38,11 +41,18 @@ def _line_aging_bucket(line_date: str | None, period: str) -> str:
     return "61_plus"
 
 
-def _load_registry(registry_file: Path) -> dict:
+def load_registry(registry_file: Path) -> dict:
+    """The bank registry, parsed once per version of ``registry_file``."""
     if not registry_file.exists():
         return {"default_profile": {"code": "default", "display_name": "Default", "currency": ""}, "profiles": {}}
-    payload = json.loads(registry_file.read_text() or "{}")
-    return payload
+    return _parse_registry(str(registry_file), registry_file.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _parse_registry(registry_file: str, mtime_ns: int) -> dict:
+    # Keyed on mtime so long-running processes pick up registry edits without re-parsing every run.
+    _ = mtime_ns
+    return json.loads(Path(registry_file).read_text() or "{}")
 
 
 def _profile_for_journal(journal_name: str, journal_currency: str, registry: dict) -> BankProfile:
@@ -65,92 +75,292 @@ def _profile_for_journal(journal_name: str, journal_currency: str, registry: dic
     )
 
 
-def _build_adapter(settings: Settings, fixtures_dir: Path):
-    if settings.fixture_mode:
-        return FixturesAdapter(fixtures_dir)
-    return LiveOdooAdapter(OdooClient(settings))
+REGISTRY_FILE = Path(__file__).resolve().parents[2] / "rules" / "bank_registry.yml"
 
 
-def reconcile(period: str, fixtures_dir: Path, settings: Settings | None = None) -> dict:
-    settings = settings or Settings.from_env()
-    adapter = _build_adapter(settings, fixtures_dir)
-    registry = _load_registry(Path(__file__).resolve().parents[2] / "rules" / "bank_registry.yml")
+def _bank_payload(
+    journal: dict,
+    profile: BankProfile,
+    lines: list[dict],
+    ledger_cents: int,
+    period: str,
+    carried_forward: list[dict] | None = None,
+    fx: RateTable | None = None,
+) -> dict:
+    carried_forward = carried_forward or []
+    # Odoo lines a statement file does not contain are reported, not counted as statement lines.
+    not_in_statement = [line for line in lines if line.get("in_statement") is False]
+    if not_in_statement:
+        lines = [line for line in lines if line.get("in_statement") is not False]
+    reconciled_count = sum(1 for line in lines if line.get("is_reconciled"))
+    unreconciled = [line for line in lines if not line.get("is_reconciled")]
+    open_items = [*carried_forward, *unreconciled]
 
-    journals = adapter.discover_bank_journals()
-    banks = []
-    total_lines = 0
-    total_reconciled = 0
-    all_exceptions: list[dict] = []
+    aging = {"0_30": 0, "31_60": 0, "61_plus": 0, "unknown": 0}
+    for line in open_items:
+        aging[_line_aging_bucket(line.get("date"), period)] += 1
 
-    for journal in journals:
-        profile = _profile_for_journal(journal["name"], journal.get("currency", ""), registry)
-        lines = adapter.get_statement_lines(journal, period)
-        reconciled_count = sum(1 for line in lines if line.get("is_reconciled"))
-        unreconciled = [line for line in lines if not line.get("is_reconciled")]
+    # The ledger balance is in company currency, so foreign statement lines convert before comparing.
+    currency = journal.get("currency") or profile.currency
+    statement_cents = sum_cents(lines)
+    company_cents = statement_cents
+    converted = fx is not None and fx.needs_conversion(currency) and fx.has(currency)
+    if converted:
+        company_cents = fx.convert_lines(currency, lines)
+    difference = from_cents(company_cents - ledger_cents)
 
-        aging = {"0_30": 0, "31_60": 0, "61_plus": 0, "unknown": 0}
-        for line in unreconciled:
-            aging[_line_aging_bucket(line.get("date"), period)] += 1
+    exceptions = []
+    if fx is not None and fx.needs_conversion(currency) and not converted:
+        exceptions.append(
+            {
+                "type": "FX_RATE_MISSING",
+                "message": f"No {currency} rate against {fx.company_currency}; tie-out compares unconverted amounts.",
+            }
+        )
+    if unreconciled:
+        exceptions.append(
+            {
+                "type": "UNRECONCILED_LINES",
+                "message": f"{len(unreconciled)} unreconciled statement lines.",
+                "sample_refs": [line.get("reference") for line in unreconciled[:5]],
+            }
+        )
+    not_imported = [line for line in lines if line.get("in_odoo") is False]
+    if not_imported:
+        exceptions.append(
+            {
+                "type": "NOT_IMPORTED",
+                "message": f"{len(not_imported)} statement file lines have no matching Odoo statement line.",
+                "sample_refs": [line.get("reference") for line in not_imported[:5]],
+            }
+        )
+    if not_in_statement:
+        exceptions.append(
+            {
+                "type": "NOT_IN_STATEMENT",
+                "message": f"{len(not_in_statement)} Odoo statement lines have no matching line in the statement file.",
+                "sample_refs": [line.get("reference") for line in not_in_statement[:5]],
+            }
+        )
+    if carried_forward:
+        exceptions.append(
+            {
+                "type": "CARRIED_FORWARD_UNRECONCILED",
+                "message": f"{len(carried_forward)} unreconciled statement lines carried over from earlier months.",
+                "sample_refs": [line.get("reference") for line in carried_forward[:5]],
+            }
+        )
+    if abs(company_cents - ledger_cents) > 1:
+        exceptions.append(
+            {
+                "type": "TIE_OUT_DIFFERENCE",
+                "message": "Statement vs ledger tie-out difference exceeds tolerance.",
+                "difference": difference,
+            }
+        )
 
-        statement_ending_balance = float(sum(float(line.get("amount", 0.0)) for line in lines))
-        ledger_balance = float(adapter.get_journal_balance(journal, period))
+    payload = {
+        "code": profile.code,
+        "display_name": profile.display_name,
+        "journal": journal["name"],
+        "journal_id": journal["id"],
+        "journal_type": journal.get("type", "bank"),
+        "currency": profile.currency,
+        "statement_line_count": len(lines),
+        "reconciled_count": reconciled_count,
+        "reconciled_pct": round((reconciled_count / len(lines) * 100) if lines else 100.0, 2),
+        "unreconciled_aging_buckets": aging,
+        "exceptions": [{"bank": profile.display_name, **item} for item in exceptions],
+        "tie_out": {
+            "statement_ending_balance": from_cents(statement_cents),
+            "ledger_balance": from_cents(ledger_cents),
+            "difference": difference,
+            "assumption": "Best-effort tie-out uses sum of statement line amounts vs posted journal move-line balances for the period.",
+        },
+    }
+    if converted:
+        payload["tie_out"].update(
+            {
+                "company_currency": fx.company_currency,
+                "statement_balance_company": from_cents(company_cents),
+                "fx_basis": "Each line converted at the latest res.currency.rate on or before its date.",
+            }
+        )
+    if carried_forward:
+        payload["carried_forward_unreconciled_count"] = len(carried_forward)
+    return payload
 
-        exceptions = []
-        if unreconciled:
-            exceptions.append(
-                {
-                    "type": "UNRECONCILED_LINES",
-                    "message": f"{len(unreconciled)} unreconciled statement lines.",
-                    "sample_refs": [line.get("reference") for line in unreconciled[:5]],
-                }
-            )
-        if abs(statement_ending_balance - ledger_balance) > 0.01:
-            exceptions.append(
-                {
-                    "type": "TIE_OUT_DIFFERENCE",
-                    "message": "Statement vs ledger tie-out difference exceeds tolerance.",
-                    "difference": round(statement_ending_balance - ledger_balance, 2),
-                }
-            )
 
-        bank_payload = {
-            "code": profile.code,
-            "display_name": profile.display_name,
-            "journal": journal["name"],
-            "journal_id": journal["id"],
-            "journal_type": journal.get("type", "bank"),
-            "currency": profile.currency,
-            "statement_line_count": len(lines),
-            "reconciled_count": reconciled_count,
-            "reconciled_pct": round((reconciled_count / len(lines) * 100) if lines else 100.0, 2),
-            "unreconciled_aging_buckets": aging,
-            "exceptions": exceptions,
-            "tie_out": {
-                "statement_ending_balance": statement_ending_balance,
-                "ledger_balance": ledger_balance,
-                "difference": round(statement_ending_balance - ledger_balance, 2),
-                "assumption": "Best-effort tie-out uses sum of statement line amounts vs posted journal move-line balances for the period.",
-            },
+def _open_line_rows(profile: BankProfile, lines: list[dict], period: str) -> list[dict]:
+    """Unreconciled statement lines keyed by Odoo line id (file-only lines by reference), for ``run diff``."""
+    return [
+        {
+            "bank": profile.code,
+            "line_id": str(line.get("id") or line.get("reference") or ""),
+            "date": line.get("date") or "",
+            "reference": line.get("reference") or "",
+            "amount": from_cents(amount_cents(line)),
+            "aging_bucket": _line_aging_bucket(line.get("date"), period),
         }
-        banks.append(bank_payload)
-        all_exceptions.extend({"bank": profile.display_name, **item} for item in exceptions)
-        total_lines += len(lines)
-        total_reconciled += reconciled_count
+        for line in lines
+        if not line.get("is_reconciled") and line.get("in_statement") is not False
+    ]
+
 
-    rollup = {
+def _rollup(banks: list[dict], company_currency: str = "") -> dict:
+    total_lines = sum(bank["statement_line_count"] for bank in banks)
+    total_reconciled = sum(bank["reconciled_count"] for bank in banks)
+    return {
         "bank_count": len(banks),
         "total_statement_lines": total_lines,
         "total_reconciled_lines": total_reconciled,
         "overall_reconciled_pct": round((total_reconciled / total_lines * 100) if total_lines else 100.0, 2),
-        "exception_count": len(all_exceptions),
-        "exceptions": all_exceptions,
+        "exception_count": sum(len(bank["exceptions"]) for bank in banks),
+        # Tie-out differences are all in company currency, so they add up across banks.
+        "company_currency": company_currency,
+        "unexplained_amount": from_cents(sum(abs(to_cents(bank["tie_out"]["difference"])) for bank in banks)),
     }
 
+
+def _all_exceptions(banks: Iterable[dict]) -> list[dict]:
+    # The flat list shares each bank's exception dicts rather than copying them.
+    return [item for bank in banks for item in bank["exceptions"]]
+
+
+def _statement_adapter(adapter, statement_files: dict[str, str] | None):
+    if not statement_files:
+        return adapter
+    from finance_ai_pack.recon.bank.statements import StatementFileAdapter
+
+    return StatementFileAdapter(adapter, statement_files)
+
+
+def _statement_sources(adapter, journals: list[dict], statement_files: dict[str, str] | None) -> dict[str, str]:
+    # Per journal: the statement file its lines were read from, or "odoo" for Odoo's statement lines.
+    if not statement_files:
+        return {journal["name"]: "odoo" for journal in journals}
+    return {journal["name"]: adapter.statement_source(journal) for journal in journals}
+
+
+def reconcile(
+    period: str,
+    fixtures_dir: Path,
+    settings: Settings | None = None,
+    fx_cache_dir: Path | None = None,
+    statement_files: dict[str, str] | None = None,
+) -> dict:
+    """Reconcile one month; ``statement_files`` maps a journal name or code to a CAMT.053/MT940/CSV file."""
+    settings = settings or Settings.from_env()
+    adapter = _statement_adapter(build_adapter(settings, fixtures_dir), statement_files)
+    registry = load_registry(REGISTRY_FILE)
+    fx = load_rate_table(adapter, settings, fx_cache_dir)
+
+    journals = adapter.discover_bank_journals()
+    banks = []
+    open_lines = []
+    for journal in journals:
+        profile = _profile_for_journal(journal["name"], journal.get("currency", ""), registry)
+        lines = adapter.get_statement_lines(journal, period)
+        ledger_cents = to_cents(adapter.get_journal_balance(journal, period))
+        banks.append(_bank_payload(journal, profile, lines, ledger_cents, period, fx=fx))
+        open_lines.extend(_open_line_rows(profile, lines, period))
+
+    rollup = _rollup(banks, fx.company_currency)
     return {
         "period": period,
         "mode": "fixture-only" if settings.fixture_mode else "live-odoo",
+        "company_currency": fx.company_currency,
         "banks": banks,
         "proposed_journals": [journal["name"] for journal in journals],
-        "exceptions": all_exceptions,
+        "statement_sources": _statement_sources(adapter, journals, statement_files),
+        "exceptions": _all_exceptions(banks),
         "bank_controls_rollup": rollup,
+        "open_lines": open_lines,
+    }
+
+
+def _open_amount(lines: list[dict]) -> float:
+    return from_cents(sum_cents(lines))
+
+
+def reconcile_range(
+    period_from: str,
+    period_to: str,
+    fixtures_dir: Path,
+    settings: Settings | None = None,
+    fx_cache_dir: Path | None = None,
+    statement_files: dict[str, str] | None = None,
+) -> dict:
+    """Reconcile every month in a range with one journal discovery and one statement pass per journal.
+
+    Lines still unreconciled at month end roll forward into later months so aging covers
+    items carried over from earlier periods. Reconciliation state is the current Odoo state,
+    so a line matched after the range still counts as reconciled in every month.
+    """
+    settings = settings or Settings.from_env()
+    adapter = _statement_adapter(build_adapter(settings, fixtures_dir), statement_files)
+    registry = load_registry(REGISTRY_FILE)
+    periods = iter_periods(period_from, period_to)
+    fx = load_rate_table(adapter, settings, fx_cache_dir)
+
+    journals = adapter.discover_bank_journals()
+    banks_by_period: dict[str, list[dict]] = {period: [] for period in periods}
+    roll_forward = []
+
+    for journal in journals:
+        profile = _profile_for_journal(journal["name"], journal.get("currency", ""), registry)
+        lines_by_period: dict[str, list[dict]] = {period: [] for period in periods}
+        for line in adapter.get_statement_lines_range(journal, period_from, period_to):
+            period = str(line.get("date") or "")[:7]
+            if period in lines_by_period:
+                lines_by_period[period].append(line)
+        ledger_balances = adapter.get_journal_balances(journal, periods)
+
+        carried: list[dict] = []
+        for period in periods:
+            lines = lines_by_period[period]
+            new_unreconciled = [
+                line for line in lines if not line.get("is_reconciled") and line.get("in_statement") is not False
+            ]
+            banks_by_period[period].append(
+                _bank_payload(journal, profile, lines, to_cents(ledger_balances[period]), period, carried, fx)
+            )
+            closing = [*carried, *new_unreconciled]
+            roll_forward.append(
+                {
+                    "period": period,
+                    "bank": profile.display_name,
+                    "journal_id": journal["id"],
+                    "opening_unreconciled_count": len(carried),
+                    "opening_unreconciled_amount": _open_amount(carried),
+                    "new_unreconciled_count": len(new_unreconciled),
+                    "new_unreconciled_amount": _open_amount(new_unreconciled),
+                    "closing_unreconciled_count": len(closing),
+                    "closing_unreconciled_amount": _open_amount(closing),
+                }
+            )
+            carried = closing
+
+    months = []
+    for period in periods:
+        rollup = _rollup(banks_by_period[period], fx.company_currency)
+        months.append({"period": period, "banks": banks_by_period[period], "bank_controls_rollup": rollup})
+
+    range_rollup = _rollup([bank for month in months for bank in month["banks"]], fx.company_currency)
+    range_rollup["bank_count"] = len(journals)
+    range_rollup["months"] = len(periods)
+    range_rollup["closing_unreconciled_count"] = sum(
+        row["closing_unreconciled_count"] for row in roll_forward if row["period"] == periods[-1]
+    )
+    return {
+        "period_from": period_from,
+        "period_to": period_to,
+        "mode": "fixture-only" if settings.fixture_mode else "live-odoo",
+        "company_currency": fx.company_currency,
+        "months": months,
+        "roll_forward": roll_forward,
+        "proposed_journals": [journal["name"] for journal in journals],
+        "statement_sources": _statement_sources(adapter, journals, statement_files),
+        "exceptions": _all_exceptions(bank for month in months for bank in month["banks"]),
+        "bank_controls_rollup": range_rollup,
     }
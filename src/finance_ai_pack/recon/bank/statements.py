@@ -0,0 +1,372 @@
+"""Streaming parsers for bank statement files: CAMT.053 XML, SWIFT MT940 and bank CSV exports.
+
+Each parser is a generator over one file (optionally ``.gz``) that yields statement lines in the
+shape the adapters return, so a yearly export of several hundred MB is read in constant memory:
+CAMT.053 goes through ``iterparse`` and drops every ``<Ntry>`` once it has been read, MT940 and
+CSV are read line by line. ``StatementFileAdapter`` puts a file in front of a journal's Odoo
+statement lines for ``reconcile`` and ``reconcile_range``.
+"""
+
+from __future__ import annotations
+
+import gzip
+import re
+from collections.abc import Iterator
+from datetime import date, datetime
+from pathlib import Path
+
+from finance_ai_pack.money import to_cents
+from finance_ai_pack.periods import range_bounds
+
+FORMATS = ("camt053", "mt940", "csv")
+SKIPPED_CAMT_STATUS = frozenset({"PDNG", "INFO"})
+MT940_LINE = re.compile(
+    r"^(?P<value_date>\d{6})(?P<entry_date>\d{4})?(?P<mark>R?[CD])[A-Z]?(?P<amount>\d+(?:,\d*)?)"
+    r"[NSF][A-Z0-9]{3}(?P<customer_ref>[^/]*)(?://(?P<bank_ref>.*))?$"
+)
+MT940_BALANCE = re.compile(r"^[CD]\d{6}(?P<currency>[A-Z]{3})")
+CSV_COLUMNS = {
+    "date": ("date", "booking date", "transaction date", "posting date", "value date"),
+    "amount": ("amount", "transaction amount"),
+    "debit": ("debit", "withdrawal", "withdrawals", "paid out"),
+    "credit": ("credit", "deposit", "deposits", "paid in"),
+    "reference": ("reference", "ref", "transaction reference", "bank reference"),
+    "description": ("description", "narrative", "details", "particulars", "memo"),
+    "currency": ("currency", "ccy"),
+}
+CSV_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%Y/%m/%d")
+
+
+def _open(path: Path, mode: str = "rt"):
+    if path.suffix == ".gz":
+        return gzip.open(path, mode, encoding="utf-8-sig", newline="") if "t" in mode else gzip.open(path, mode)
+    return path.open(mode, encoding="utf-8-sig", newline="") if "t" in mode else path.open(mode)
+
+
+def detect_format(path: Path) -> str:
+    with _open(path) as handle:
+        head = handle.read(4096).lstrip()
+    if head.startswith("<"):
+        return "camt053"
+    if head.startswith((":20:", "{1:")) or "\n:20:" in head:
+        return "mt940"
+    return "csv"
+
+
+def _line(source: str, index: int, line_date: str, cents: int, reference: str, narrative: str, **extra) -> dict:
+    return {
+        "id": f"{source}:{index}",
+        "date": line_date,
+        "amount": cents / 100,
+        "amount_cents": cents,
+        "reference": reference,
+        "payment_ref": narrative or reference,
+        "is_reconciled": False,
+        "move_line_count": 0,
+        **extra,
+    }
+
+
+def iter_camt053(path: Path) -> Iterator[dict]:
+    """Booked ``<Ntry>`` elements of every ``<Stmt>`` in a CAMT.053 file, signed by ``CdtDbtInd``."""
+    from xml.etree.ElementTree import iterparse
+
+    tags: dict = {}
+    account = currency = ""
+    statements = stmt = None
+    index = 0
+    with _open(path, "rb") as handle:
+        for event, elem in iterparse(handle, events=("start", "end")):
+            if event == "start":
+                if not tags:
+                    # Tags and paths carry the document's namespace (camt.053.001.02, .08, ...).
+                    ns = elem.tag[: elem.tag.index("}") + 1] if elem.tag.startswith("{") else ""
+                    tags = {name: ns + name for name in ("BkToCstmrStmt", "Stmt", "Acct", "Ntry")}
+                    tags.update(_camt_paths(ns))
+                elif elem.tag == tags["Stmt"]:
+                    stmt = elem
+                elif elem.tag == tags["BkToCstmrStmt"]:
+                    statements = elem
+                continue
+            if elem.tag == tags["Ntry"]:
+                index += 1
+                line = _camt_entry(elem, tags, path.name, index, account, currency)
+                if line is not None:
+                    yield line
+                # Detach what has been read so memory stays flat however many entries follow.
+                if stmt is not None:
+                    stmt.remove(elem)
+                elem.clear()
+            elif elem.tag == tags["Acct"] and stmt is not None and stmt.find(tags["Acct"]) is elem:
+                account = _findtext(elem, tags["iban"]) or _findtext(elem, tags["other_id"])
+                currency = _findtext(elem, tags["ccy"])
+            elif elem.tag == tags["Stmt"]:
+                if statements is not None:
+                    statements.remove(elem)
+                elem.clear()
+                stmt = None
+
+
+def _camt_paths(ns: str) -> dict[str, tuple[str, ...]]:
+    paths = {
+        "iban": "Id/IBAN",
+        "other_id": "Id/Othr/Id",
+        "ccy": "Ccy",
+        "status_code": "Sts/Cd",
+        "status": "Sts",
+        "amount": "Amt",
+        "indicator": "CdtDbtInd",
+        "booked": "BookgDt/Dt",
+        "booked_time": "BookgDt/DtTm",
+        "value_date": "ValDt/Dt",
+        "servicer_ref": "AcctSvcrRef",
+        "entry_ref": "NtryRef",
+        "info": "AddtlNtryInf",
+        "end_to_end": "NtryDtls/TxDtls/Refs/EndToEndId",
+        "narrative": "NtryDtls/TxDtls/RmtInf/Ustrd",
+    }
+    # Walked one qualified tag at a time: a single-tag find stays in C, a path goes through ElementPath.
+    return {key: tuple(ns + part for part in value.split("/")) for key, value in paths.items()}
+
+
+def _walk(elem, path: tuple[str, ...]):
+    for tag in path:
+        elem = elem.find(tag)
+        if elem is None:
+            return None
+    return elem
+
+
+def _findtext(elem, path: tuple[str, ...]) -> str:
+    found = _walk(elem, path)
+    return (found.text or "").strip() if found is not None else ""
+
+
+def _camt_entry(entry, tags: dict, source: str, index: int, account: str, currency: str) -> dict | None:
+    def text(key: str) -> str:
+        return _findtext(entry, tags[key])
+
+    status = text("status_code") or text("status")
+    if status in SKIPPED_CAMT_STATUS:
+        return None
+    amount = _walk(entry, tags["amount"])
+    if amount is None:
+        raise ValueError(f"{source}: entry {index} has no <Amt>")
+    cents = to_cents(amount.text or "0")
+    if text("indicator") == "DBIT":
+        cents = -cents
+    booked = text("booked") or text("booked_time") or text("value_date")
+    reference = next(
+        (ref for ref in (text("end_to_end"), text("servicer_ref"), text("entry_ref")) if ref and ref != "NOTPROVIDED"),
+        "",
+    )
+    return _line(
+        source,
+        index,
+        booked[:10],
+        cents,
+        reference,
+        text("narrative") or text("info"),
+        currency=amount.get("Ccy", currency),
+        account=account,
+    )
+
+
+def _mt940_date(value: str) -> str:
+    year = int(value[:2])
+    return date(2000 + year if year < 80 else 1900 + year, int(value[2:4]), int(value[4:6])).isoformat()
+
+
+def iter_mt940(path: Path) -> Iterator[dict]:
+    """``:61:`` lines of every statement in an MT940 file, with the following ``:86:`` as narrative."""
+    account = currency = ""
+    pending: dict | None = None
+    tag = ""
+    index = 0
+    with _open(path) as handle:
+        for raw in handle:
+            text = raw.rstrip("\r\n")
+            if text.strip() in ("-", "-}"):
+                # End of a message: flush the last line of the statement.
+                if pending is not None:
+                    yield pending
+                    pending = None
+                tag = ""
+                continue
+            if not text.startswith(":") or text.find(":", 1) < 0:
+                # Continuation of the previous field; only the :86: narrative is kept.
+                if tag == "86" and pending is not None and text.strip():
+                    pending["payment_ref"] = f"{pending['payment_ref']} {text.strip()}".strip()
+                continue
+            tag, _, value = text[1:].partition(":")
+            if tag == "25":
+                account = value.strip()
+            elif tag in ("60F", "60M"):
+                match = MT940_BALANCE.match(value)
+                currency = match.group("currency") if match else currency
+            elif tag == "61":
+                if pending is not None:
+                    yield pending
+                match = MT940_LINE.match(value.strip())
+                if match is None:
+                    raise ValueError(f"{path.name}: unreadable :61: line {value!r}")
+                index += 1
+                cents = to_cents(match.group("amount").replace(",", "."))
+                if match.group("mark") in ("D", "RC"):
+                    cents = -cents
+                reference = (match.group("bank_ref") or match.group("customer_ref") or "").strip()
+                pending = _line(
+                    path.name,
+                    index,
+                    _mt940_date(match.group("value_date")),
+                    cents,
+                    "" if reference == "NONREF" else reference,
+                    "",
+                    currency=currency,
+                    account=account,
+                )
+            elif tag == "86" and pending is not None:
+                pending["payment_ref"] = value.strip()
+            elif tag.startswith("62") and pending is not None:
+                yield pending
+                pending = None
+    if pending is not None:
+        yield pending
+
+
+def _csv_date(value: str) -> str:
+    value = value.strip()[:10]
+    for fmt in CSV_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized statement date: {value!r}")
+
+
+def iter_bank_csv(path: Path) -> Iterator[dict]:
+    """Rows of a bank CSV export; amounts come from an ``amount`` column or ``debit``/``credit`` columns."""
+    import csv
+
+    with _open(path) as handle:
+        sample = handle.read(4096)
+        handle.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(handle, dialect)
+        header = [name.strip().lower() for name in next(reader, [])]
+        columns = {
+            field: next((header.index(name) for name in names if name in header), None)
+            for field, names in CSV_COLUMNS.items()
+        }
+        if columns["date"] is None or (columns["amount"] is None and columns["debit"] is None):
+            raise ValueError(f"{path.name}: CSV needs a date column and an amount or debit/credit columns")
+
+        def cell(row: list[str], field: str) -> str:
+            position = columns[field]
+            return row[position].strip() if position is not None and position < len(row) else ""
+
+        for index, row in enumerate(reader, start=1):
+            if not any(value.strip() for value in row):
+                continue
+            if columns["amount"] is not None:
+                cents = to_cents(cell(row, "amount"))
+            else:
+                cents = to_cents(cell(row, "credit")) - abs(to_cents(cell(row, "debit")))
+            yield _line(
+                path.name,
+                index,
+                _csv_date(cell(row, "date")),
+                cents,
+                cell(row, "reference"),
+                cell(row, "description"),
+                currency=cell(row, "currency"),
+                account="",
+            )
+
+
+PARSERS = {"camt053": iter_camt053, "mt940": iter_mt940, "csv": iter_bank_csv}
+
+
+def iter_statement_file(path: Path, fmt: str | None = None) -> Iterator[dict]:
+    path = Path(path)
+    fmt = fmt or detect_format(path)
+    if fmt not in PARSERS:
+        raise ValueError(f"statement format must be one of {', '.join(FORMATS)}")
+    return PARSERS[fmt](path)
+
+
+def match_imported(file_lines: Iterator[dict], odoo_lines: list[dict]) -> Iterator[dict]:
+    """Pair each file line with an Odoo statement line of the same date and amount.
+
+    A matched line takes Odoo's reconciliation state; a line with no counterpart has not been
+    imported into Odoo yet and is flagged ``in_odoo: False``. Odoo lines left over once the file
+    is exhausted are not on the bank's statement; they follow, flagged ``in_statement: False``.
+    """
+    index: dict[tuple[str, int], list[dict]] = {}
+    for line in odoo_lines:
+        index.setdefault((str(line.get("date") or "")[:10], to_cents(line["amount"])), []).append(line)
+    for line in file_lines:
+        candidates = index.get((line["date"], line["amount_cents"]))
+        if candidates:
+            odoo = candidates.pop(0)
+            line.update(
+                odoo_line_id=odoo.get("id"),
+                is_reconciled=bool(odoo.get("is_reconciled")),
+                move_line_count=int(odoo.get("move_line_count") or 0),
+                in_odoo=True,
+            )
+        else:
+            line["in_odoo"] = False
+        yield line
+    for candidates in index.values():
+        for odoo in candidates:
+            yield {**odoo, "in_statement": False}
+
+
+class StatementFileAdapter:
+    """Serves statement lines for selected journals from files; everything else from ``adapter``.
+
+    ``files`` maps a journal name or code to a statement file. Only lines dated inside the
+    requested periods are kept, so a yearly file costs one month of lines per month reconciled.
+    """
+
+    def __init__(self, adapter, files: dict[str, str | Path], fmt: str | None = None) -> None:
+        self.adapter = adapter
+        self.files = {key: Path(value) for key, value in files.items()}
+        self.fmt = fmt
+
+    def __getattr__(self, name: str):
+        return getattr(self.adapter, name)
+
+    def _file_for(self, journal: dict) -> Path | None:
+        return self.files.get(journal["name"]) or self.files.get(str(journal.get("code", "")))
+
+    def statement_source(self, journal: dict) -> str:
+        path = self._file_for(journal)
+        return path.name if path is not None else "odoo"
+
+    def get_statement_lines(self, journal: dict, period: str) -> list[dict]:
+        return list(self.get_statement_lines_range(journal, period, period))
+
+    def get_statement_lines_range(self, journal: dict, period_from: str, period_to: str) -> Iterator[dict]:
+        """The journal's lines for the range, streamed from its statement file when it has one."""
+        path = self._file_for(journal)
+        odoo_lines = self.adapter.get_statement_lines_range(journal, period_from, period_to)
+        if path is None:
+            return odoo_lines
+        start, end = range_bounds(period_from, period_to)
+        expected = journal.get("currency", "")
+
+        def _in_range() -> Iterator[dict]:
+            for line in iter_statement_file(path, self.fmt):
+                if line["currency"] and expected and line["currency"] != expected:
+                    raise ValueError(
+                        f"{path.name} is a {line['currency']} statement but {journal['name']} is {expected}"
+                    )
+                if start <= line["date"] < end:
+                    yield line
+
+        return match_imported(_in_range(), odoo_lines)
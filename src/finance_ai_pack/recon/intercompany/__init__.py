@@ -0,0 +1 @@
+"""Intercompany matching: open receivables and payables between companies of one database."""
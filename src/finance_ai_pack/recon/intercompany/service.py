@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.factory import build_adapter
+from finance_ai_pack.money import from_cents
+
+
+def _pair(company_id: int, partner_company_id: int) -> tuple[int, int]:
+    return (company_id, partner_company_id) if company_id < partner_company_id else (partner_company_id, company_id)
+
+
+def match_balances(rows: list[dict]) -> dict:
+    """Match open intercompany items through a hash index on ``(company pair, currency, reference)``.
+
+    Each company's side of an item is summed in cents; an item is matched when both companies
+    carry it and their residuals cancel out. One pass over the rows, whatever the number of pairs.
+    """
+    index: dict[tuple[tuple[int, int], str, str], dict[int, int]] = {}
+    for row in rows:
+        key = (_pair(row["company_id"], row["partner_company_id"]), row["currency"], row["reference"])
+        sides = index.setdefault(key, {})
+        sides[row["company_id"]] = sides.get(row["company_id"], 0) + row["amount_cents"]
+
+    pairs: dict[tuple[tuple[int, int], str], dict] = {}
+    mismatches = []
+    unexplained: dict[str, int] = {}
+    matched = 0
+    for (pair, currency, reference), sides in sorted(index.items()):
+        first, second = pair
+        first_cents, second_cents = sides.get(first, 0), sides.get(second, 0)
+        summary = pairs.setdefault(
+            (pair, currency),
+            {"companies": list(pair), "currency": currency, "first": 0, "second": 0, "items": 0, "mismatches": 0},
+        )
+        summary["first"] += first_cents
+        summary["second"] += second_cents
+        summary["items"] += 1
+        if len(sides) == 2 and first_cents + second_cents == 0:
+            matched += 1
+            continue
+        summary["mismatches"] += 1
+        unexplained[currency] = unexplained.get(currency, 0) + abs(first_cents + second_cents)
+        mismatch = {
+            "type": "AMOUNT_MISMATCH" if len(sides) == 2 else "MISSING_COUNTERPART",
+            "companies": list(pair),
+            "currency": currency,
+            "reference": reference,
+            "first_company_amount": from_cents(first_cents),
+            "second_company_amount": from_cents(second_cents),
+            "difference": from_cents(first_cents + second_cents),
+        }
+        if len(sides) == 1:
+            mismatch["booked_by"] = next(iter(sides))
+        mismatches.append(mismatch)
+
+    return {
+        "pairs": [
+            {
+                "companies": summary["companies"],
+                "currency": summary["currency"],
+                "first_company_balance": from_cents(summary["first"]),
+                "second_company_balance": from_cents(summary["second"]),
+                "difference": from_cents(summary["first"] + summary["second"]),
+                "open_items": summary["items"],
+                "mismatch_count": summary["mismatches"],
+            }
+            for summary in pairs.values()
+        ],
+        "mismatches": mismatches,
+        "matched_count": matched,
+        "unexplained_by_currency": {currency: from_cents(cents) for currency, cents in sorted(unexplained.items())},
+    }
+
+
+def reconcile(period: str, fixtures_dir: Path, settings: Settings | None = None) -> dict:
+    """Match intercompany balances across every company; a company-scoped run reports its own pairs."""
+    settings = settings or Settings.from_env()
+    adapter = build_adapter(replace(settings, company_id=None), fixtures_dir)
+    companies = adapter.discover_companies()
+    rows = adapter.get_intercompany_balances(period)
+    if settings.company_id is not None:
+        rows = [row for row in rows if settings.company_id in (row["company_id"], row["partner_company_id"])]
+
+    matched = match_balances(rows)
+    return {
+        "period": period,
+        "mode": "fixture-only" if settings.fixture_mode else "live-odoo",
+        "companies": [{"id": company["id"], "name": company["name"]} for company in companies],
+        "pairs": matched["pairs"],
+        "mismatches": matched["mismatches"],
+        "intercompany_controls_rollup": {
+            "company_count": len(companies),
+            "possible_pairs": len(companies) * (len(companies) - 1) // 2,
+            "pairs_with_balances": len({tuple(pair["companies"]) for pair in matched["pairs"]}),
+            "open_items": sum(pair["open_items"] for pair in matched["pairs"]),
+            "matched_count": matched["matched_count"],
+            "mismatch_count": len(matched["mismatches"]),
+            "unexplained_by_currency": matched["unexplained_by_currency"],
+        },
+        "assumption": "Open items are current residuals on posted lines dated before the period end.",
+    }
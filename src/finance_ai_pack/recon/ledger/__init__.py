@@ -1 +1 @@
-"""Ledger reconciliation placeholder."""
+"""Ledger reconciliation: incremental trial balance and subledger/GL tie-out."""
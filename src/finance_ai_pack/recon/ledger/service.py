@@ -1,5 +1,193 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from pathlib import Path
 
-def reconcile(period: str) -> dict:
-    return {"period": period, "status": "scaffold", "exceptions": []}
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.factory import build_adapter
+from finance_ai_pack.periods import previous_period
+
+CONTROL_ACCOUNT_TYPES = {
+    "asset_receivable": "AR",
+    "liability_payable": "AP",
+    "asset_cash": "bank",
+}
+TOLERANCE = 0.01
+
+
+def state_key(settings: Settings) -> str:
+    """Subdirectory of the state root for one source of ledger data.
+
+    Fixtures, each replay dataset and each live database keep separate closing states, so a
+    fixture run never becomes the opening balance of a live month (or of another database).
+    """
+    if settings.fixture_mode and settings.replay_dir:
+        source = f"replay|{Path(settings.replay_dir).resolve()}"
+        return f"replay_{hashlib.sha1(source.encode()).hexdigest()[:16]}"
+    if settings.fixture_mode:
+        return "fixtures"
+    source = f"{settings.odoo_url.rstrip('/')}/{settings.odoo_db}"
+    return f"live_{hashlib.sha1(source.encode()).hexdigest()[:16]}"
+
+
+def _snapshot_file(state_dir: Path, period: str) -> Path:
+    return state_dir / f"trial_balance_{period}.json"
+
+
+def _load_opening(adapter, period: str, state_dir: Path, rebuild: bool) -> tuple[dict, str]:
+    """Carry forward the previous month's closing state; only a cold start aggregates history."""
+    previous = _snapshot_file(state_dir, previous_period(period))
+    if previous.exists() and not rebuild:
+        state = json.loads(previous.read_text())
+        return state, f"carried_forward:{state['period']}"
+
+    statement_opening: dict[str, float] = {}
+    for row in adapter.get_statement_balances_before(period):
+        statement_opening[row["account_code"]] = statement_opening.get(row["account_code"], 0.0) + float(row["amount"])
+    return (
+        {
+            "closing": adapter.get_balances_before(period),
+            "subledger_closing": adapter.get_balances_before(period, partner_only=True),
+            "statement_closing": statement_opening,
+        },
+        "cold_start",
+    )
+
+
+def reconcile(
+    period: str,
+    fixtures_dir: Path,
+    state_dir: Path,
+    settings: Settings | None = None,
+    rebuild: bool = False,
+) -> dict:
+    """Build the period trial balance and tie subledger control accounts (AR/AP/bank) to the GL.
+
+    Opening balances come from the previous period's stored closing state, so each run only
+    aggregates the new month's move lines. ``rebuild`` forces a cold start, e.g. after back-posting.
+    States live under ``state_dir / state_key(settings)``.
+    """
+    settings = settings or Settings.from_env()
+    state_dir = state_dir / state_key(settings)
+    adapter = build_adapter(settings, fixtures_dir)
+
+    accounts = {account["code"]: account for account in adapter.get_accounts()}
+    opening, opening_source = _load_opening(adapter, period, state_dir, rebuild)
+    movements = adapter.get_period_movements(period)
+    partner_movements = adapter.get_period_movements(period, partner_only=True)
+
+    statement_movements: dict[str, float] = {}
+    statement_journals: dict[str, str] = {}
+    for row in adapter.get_statement_movements(period):
+        code = row["account_code"]
+        statement_movements[code] = statement_movements.get(code, 0.0) + float(row["amount"])
+        statement_journals[code] = row.get("journal", "")
+
+    codes = sorted(set(accounts) | set(opening["closing"]) | set(movements))
+    trial_balance = []
+    closing: dict[str, float] = {}
+    for code in codes:
+        moved = movements.get(code, {"debit": 0.0, "credit": 0.0, "balance": 0.0})
+        opening_balance = float(opening["closing"].get(code, 0.0))
+        closing[code] = round(opening_balance + moved["balance"], 2)
+        account = accounts.get(code, {"name": code, "account_type": ""})
+        trial_balance.append(
+            {
+                "account_code": code,
+                "account_name": account["name"],
+                "account_type": account["account_type"],
+                "opening_balance": round(opening_balance, 2),
+                "debit": round(moved["debit"], 2),
+                "credit": round(moved["credit"], 2),
+                "closing_balance": closing[code],
+            }
+        )
+
+    subledger_closing = {
+        code: round(float(opening["subledger_closing"].get(code, 0.0)) + row["balance"], 2)
+        for code, row in partner_movements.items()
+    }
+    for code, balance in opening["subledger_closing"].items():
+        subledger_closing.setdefault(code, round(float(balance), 2))
+    statement_closing = {
+        code: round(float(opening["statement_closing"].get(code, 0.0)) + statement_movements.get(code, 0.0), 2)
+        for code in sorted(set(opening["statement_closing"]) | set(statement_movements))
+    }
+
+    control_accounts = []
+    exceptions = []
+    for code in codes:
+        kind = CONTROL_ACCOUNT_TYPES.get(accounts.get(code, {}).get("account_type", ""))
+        if not kind:
+            continue
+        subledger = statement_closing.get(code, 0.0) if kind == "bank" else subledger_closing.get(code, 0.0)
+        difference = round(closing[code] - subledger, 2)
+        control_accounts.append(
+            {
+                "account_code": code,
+                "account_name": accounts[code]["name"],
+                "control": kind,
+                "journal": statement_journals.get(code, "") if kind == "bank" else "",
+                "gl_balance": closing[code],
+                "subledger_balance": round(subledger, 2),
+                "difference": difference,
+            }
+        )
+        if abs(difference) > TOLERANCE:
+            exceptions.append(
+                {
+                    "type": "SUBLEDGER_GL_DIFFERENCE",
+                    "account_code": code,
+                    "control": kind,
+                    "message": f"{kind} subledger does not agree with GL control account {code}.",
+                    "difference": difference,
+                }
+            )
+
+    unbalanced_moves = adapter.get_unbalanced_moves(period)
+    exceptions.extend(
+        {
+            "type": "UNBALANCED_MOVE",
+            "move": move["move"],
+            "message": "Posted move debits and credits do not balance.",
+            "difference": move["imbalance"],
+        }
+        for move in unbalanced_moves
+    )
+
+    total_debit = round(sum(row["debit"] for row in trial_balance), 2)
+    total_credit = round(sum(row["credit"] for row in trial_balance), 2)
+    if abs(total_debit - total_credit) > TOLERANCE:
+        exceptions.append(
+            {
+                "type": "TRIAL_BALANCE_OUT_OF_BALANCE",
+                "message": "Period debits and credits do not balance.",
+                "difference": round(total_debit - total_credit, 2),
+            }
+        )
+
+    state_dir.mkdir(parents=True, exist_ok=True)
+    _snapshot_file(state_dir, period).write_text(
+        json.dumps(
+            {
+                "period": period,
+                "closing": closing,
+                "subledger_closing": subledger_closing,
+                "statement_closing": statement_closing,
+            },
+            indent=2,
+        )
+    )
+
+    return {
+        "period": period,
+        "status": "reconciled",
+        "mode": "fixture-only" if settings.fixture_mode else "live-odoo",
+        "opening_source": opening_source,
+        "trial_balance": trial_balance,
+        "totals": {"debit": total_debit, "credit": total_credit, "difference": round(total_debit - total_credit, 2)},
+        "control_accounts": control_accounts,
+        "unbalanced_moves": unbalanced_moves,
+        "exceptions": exceptions,
+    }
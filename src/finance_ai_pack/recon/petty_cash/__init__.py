@@ -1 +1 @@
-"""Petty cash placeholder module."""
+"""Petty cash review: float limits, split transactions and duplicate vouchers."""
@@ -1,5 +1,217 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
 
-def review(period: str) -> dict:
-    return {"period": period, "status": "scaffold"}
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.factory import build_adapter
+
+RULES_FILE = Path(__file__).resolve().parents[2] / "rules" / "petty_cash_rules.yml"
+
+
+@dataclass
+class PettyCashRules:
+    default_float_limit: float = 300000.0
+    approval_limit: float = 150000.0
+    split_window_days: int = 3
+    float_limits: dict[str, float] = field(default_factory=dict)
+
+    def float_limit(self, journal: str) -> float:
+        return float(self.float_limits.get(journal, self.default_float_limit))
+
+
+def load_rules(rules_file: Path = RULES_FILE) -> PettyCashRules:
+    if not rules_file.exists():
+        return PettyCashRules()
+    payload = json.loads(rules_file.read_text() or "{}")
+    return PettyCashRules(
+        default_float_limit=float(payload.get("default_float_limit", 300000.0)),
+        approval_limit=float(payload.get("approval_limit", 150000.0)),
+        split_window_days=int(payload.get("split_window_days", 3)),
+        float_limits={name: float(limit) for name, limit in payload.get("float_limits", {}).items()},
+    )
+
+
+def _voucher_fingerprint(line: dict) -> bytes:
+    payee = " ".join(str(line.get("payee", "")).lower().split())
+    key = f"{round(abs(float(line['amount'])) * 100)}|{line['date']}|{payee}"
+    return hashlib.blake2b(key.encode(), digest_size=8).digest()
+
+
+OPENING_FROM_STATEMENT = "statement_balance"
+OPENING_ASSUMED = "assumed_float_limit"
+
+
+def review_lines(
+    lines: Iterable[dict], journals: list[dict], rules: PettyCashRules, opening: dict[str, float] | None = None
+) -> dict:
+    """Single pass over date-ordered cash lines with memory bounded by branches and the split window.
+
+    - Float: each imprest starts at its opening statement balance (``opening``, by journal name),
+      or is assumed to start at its limit when there is none; disbursements draw it down, top-ups
+      restore it. Each journal row records which basis was used.
+    - Splits: per custodian and payee, disbursements each under the approval limit that together
+      reach it inside ``split_window_days``.
+    - Duplicates: vouchers with the same amount, date and payee. The stream is date-ordered, so
+      only the current day's fingerprints are kept.
+    """
+    opening = opening or {}
+
+    def opening_cash(journal: str) -> float:
+        return opening[journal] if journal in opening else rules.float_limit(journal)
+
+    balances = {journal["name"]: opening_cash(journal["name"]) for journal in journals}
+    summaries = {
+        journal["name"]: {"journal": journal["name"], "line_count": 0, "disbursed": 0.0, "replenished": 0.0}
+        for journal in journals
+    }
+    windows: dict[tuple[str, str], deque] = {}
+    seen_today: dict[bytes, dict] = {}
+    current_day = ""
+    exceptions: list[dict] = []
+    line_count = 0
+
+    for line in lines:
+        line_count += 1
+        journal, amount, line_date = line["journal"], float(line["amount"]), line["date"]
+        if line_date < current_day:
+            raise ValueError("Petty cash lines must be streamed in date order.")
+        if line_date != current_day:
+            current_day = line_date
+            seen_today.clear()
+            # Drop idle windows so memory tracks custodians active in the window, not the whole month.
+            today = date.fromisoformat(line_date)
+            windows = {
+                key: window
+                for key, window in windows.items()
+                if window and (today - window[-1][0]).days <= rules.split_window_days
+            }
+
+        limit = rules.float_limit(journal)
+        if journal not in balances:
+            balances[journal] = opening_cash(journal)
+        summary = summaries.setdefault(
+            journal, {"journal": journal, "line_count": 0, "disbursed": 0.0, "replenished": 0.0}
+        )
+        summary["line_count"] += 1
+        balances[journal] += amount
+
+        if amount >= 0:
+            summary["replenished"] += amount
+            if balances[journal] > limit + 0.005:
+                exceptions.append(
+                    {
+                        "type": "FLOAT_OVERFUNDED",
+                        "journal": journal,
+                        "voucher_ref": line["voucher_ref"],
+                        "date": line_date,
+                        "message": f"Cash on hand {balances[journal]:.2f} exceeds float limit {limit:.2f}.",
+                    }
+                )
+            continue
+
+        spent = -amount
+        summary["disbursed"] += spent
+        if balances[journal] < -0.005:
+            exceptions.append(
+                {
+                    "type": "FLOAT_LIMIT_EXCEEDED",
+                    "journal": journal,
+                    "voucher_ref": line["voucher_ref"],
+                    "date": line_date,
+                    "message": f"Disbursements exceed the {limit:.2f} float by {-balances[journal]:.2f}.",
+                }
+            )
+
+        fingerprint = _voucher_fingerprint(line)
+        original = seen_today.get(fingerprint)
+        if original is not None:
+            exceptions.append(
+                {
+                    "type": "DUPLICATE_VOUCHER",
+                    "journal": journal,
+                    "voucher_ref": line["voucher_ref"],
+                    "date": line_date,
+                    "duplicate_of": f"{original['journal']}:{original['voucher_ref']}",
+                    "message": "Voucher repeats the amount, date and payee of an earlier voucher.",
+                }
+            )
+        else:
+            seen_today[fingerprint] = {"journal": journal, "voucher_ref": line["voucher_ref"]}
+
+        if spent >= rules.approval_limit:
+            continue
+        key = (line.get("custodian", ""), str(line.get("payee", "")).lower())
+        window = windows.setdefault(key, deque())
+        day = date.fromisoformat(line_date)
+        while window and (day - window[0][0]).days > rules.split_window_days:
+            window.popleft()
+        window.append((day, spent, line["voucher_ref"]))
+        window_total = sum(item[1] for item in window)
+        if len(window) > 1 and window_total >= rules.approval_limit:
+            exceptions.append(
+                {
+                    "type": "SPLIT_TRANSACTION",
+                    "journal": journal,
+                    "custodian": key[0],
+                    "payee": line.get("payee", ""),
+                    "voucher_refs": [item[2] for item in window],
+                    "date": line_date,
+                    "amount": round(window_total, 2),
+                    "message": f"Vouchers within {rules.split_window_days} days total {window_total:.2f}, "
+                    f"at or above the {rules.approval_limit:.2f} approval limit.",
+                }
+            )
+            window.clear()
+
+    journal_rows = []
+    for name, summary in summaries.items():
+        journal_rows.append(
+            {
+                **summary,
+                "disbursed": round(summary["disbursed"], 2),
+                "replenished": round(summary["replenished"], 2),
+                "float_limit": rules.float_limit(name),
+                "opening_cash": round(opening_cash(name), 2),
+                "opening_cash_basis": OPENING_FROM_STATEMENT if name in opening else OPENING_ASSUMED,
+                "closing_cash": round(balances[name], 2),
+            }
+        )
+
+    by_type: dict[str, int] = {}
+    for item in exceptions:
+        by_type[item["type"]] = by_type.get(item["type"], 0) + 1
+    return {
+        "journals": journal_rows,
+        "opening_cash_assumption": "Each float opens at its statement balance before the period; journals with "
+        f"opening_cash_basis '{OPENING_ASSUMED}' have none and are assumed to open at their float limit.",
+        "exceptions": exceptions,
+        "metrics": {
+            "journal_count": len(journal_rows),
+            "line_count": line_count,
+            "exception_count": len(exceptions),
+            "exceptions_by_type": by_type,
+        },
+    }
+
+
+def review(period: str, fixtures_dir: Path, settings: Settings | None = None) -> dict:
+    settings = settings or Settings.from_env()
+    adapter = build_adapter(settings, fixtures_dir)
+    result = review_lines(
+        adapter.iter_cash_lines(period),
+        adapter.discover_cash_journals(),
+        load_rules(),
+        adapter.get_cash_opening_balances(period),
+    )
+    return {
+        "period": period,
+        "status": "reviewed",
+        "mode": "fixture-only" if settings.fixture_mode else "live-odoo",
+        **result,
+    }
@@ -2,43 +2,29 @@ from __future__ import annotations
 
 import csv
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
 
 from finance_ai_pack.config import Settings
-from finance_ai_pack.connectors.odoo.client import OdooClient
-from finance_ai_pack.connectors.odoo.fixtures_adapter import FixturesAdapter
-from finance_ai_pack.connectors.odoo.live_adapter import LiveOdooAdapter
+from finance_ai_pack.connectors.odoo.factory import build_adapter
+from finance_ai_pack.connectors.odoo.fixtures_adapter import company_fixtures_dir
+from finance_ai_pack.money import amount_cents, from_cents, sum_cents, to_cents
+from finance_ai_pack.outputs.sink import ExceptionSink
+from finance_ai_pack.periods import iter_periods
 
 
 @dataclass
 class TraMonthlyRow:
     period: str
-    input_vat: float
-    output_vat: float
+    input_vat_cents: int
+    output_vat_cents: int
 
+    @property
+    def input_vat(self) -> float:
+        return from_cents(self.input_vat_cents)
 
-def _iter_periods(period_from: str, period_to: str) -> list[str]:
-    start = datetime.strptime(f"{period_from}-01", "%Y-%m-%d")
-    end = datetime.strptime(f"{period_to}-01", "%Y-%m-%d")
-    if start > end:
-        raise ValueError("period_from must be <= period_to")
-
-    periods = []
-    cursor = start
-    while cursor <= end:
-        periods.append(cursor.strftime("%Y-%m"))
-        if cursor.month == 12:
-            cursor = datetime(cursor.year + 1, 1, 1)
-        else:
-            cursor = datetime(cursor.year, cursor.month + 1, 1)
-    return periods
-
-
-def _build_adapter(settings: Settings, fixtures_dir: Path):
-    if settings.fixture_mode:
-        return FixturesAdapter(fixtures_dir)
-    return LiveOdooAdapter(OdooClient(settings))
+    @property
+    def output_vat(self) -> float:
+        return from_cents(self.output_vat_cents)
 
 
 def _validate_tra_columns(columns: set[str]) -> None:
@@ -59,8 +45,8 @@ def _parse_tra_csv(tra_file: Path) -> dict[str, TraMonthlyRow]:
                 continue
             monthly[period] = TraMonthlyRow(
                 period=period,
-                input_vat=float(row.get("input_vat", 0) or 0),
-                output_vat=float(row.get("output_vat", 0) or 0),
+                input_vat_cents=to_cents(row.get("input_vat")),
+                output_vat_cents=to_cents(row.get("output_vat")),
             )
     return monthly
 
@@ -95,8 +81,8 @@ def _parse_tra_xlsx(tra_file: Path) -> dict[str, TraMonthlyRow]:
         output_value = values[index["output_vat"]] if index["output_vat"] < len(values) else 0
         monthly[period] = TraMonthlyRow(
             period=period,
-            input_vat=float(input_value or 0),
-            output_vat=float(output_value or 0),
+            input_vat_cents=to_cents(input_value),
+            output_vat_cents=to_cents(output_value),
         )
     return monthly
 
@@ -129,6 +115,10 @@ def _categorize_exception(item: dict, period: str) -> str | None:
     return None
 
 
+def _register_order(row: dict) -> tuple:
+    return (row["period"], row["category"], row["document_ref"], row["tax_type"], row["source_period"])
+
+
 def reconcile_vat(
     period_from: str,
     period_to: str,
@@ -136,13 +126,19 @@ def reconcile_vat(
     settings: Settings | None = None,
     tra_file: Path | None = None,
 ) -> dict:
+    """Monthly Odoo-vs-TRA summary plus the categorised exception register.
+
+    ``exception_register`` is an ``ExceptionSink``, not a list: it iterates (repeatedly) in
+    register order and has ``len()``; ``list(...)`` it to compare or serialise it.
+    """
     settings = settings or Settings.from_env()
-    adapter = _build_adapter(settings, fixtures_dir)
+    adapter = build_adapter(settings, fixtures_dir)
 
-    periods = _iter_periods(period_from, period_to)
+    periods = iter_periods(period_from, period_to)
     if not tra_file:
-        default_csv = fixtures_dir / "vat" / f"tra_vat_{period_from}.csv"
-        default_xlsx = fixtures_dir / "vat" / f"tra_vat_{period_from}.xlsx"
+        vat_dir = company_fixtures_dir(fixtures_dir, settings.company_id) / "vat"
+        default_csv = vat_dir / f"tra_vat_{period_from}.csv"
+        default_xlsx = vat_dir / f"tra_vat_{period_from}.xlsx"
         if default_csv.exists():
             tra_file = default_csv
         elif default_xlsx.exists():
@@ -151,37 +147,36 @@ def reconcile_vat(
     tra_by_month = read_tra_file(tra_file) if tra_file else {}
 
     monthly_summary = []
-    exceptions = []
-    net_diff_abs_total = 0.0
+    # A bad month can raise millions of exceptions: past the buffer they spill to sorted runs on disk.
+    exceptions = ExceptionSink(_register_order, max_rows=settings.exception_buffer_rows)
+    net_diff_abs_total = 0
 
     for period in periods:
         input_lines = adapter.get_vat_tax_lines(period=period, vat_type="input")
         output_lines = adapter.get_vat_tax_lines(period=period, vat_type="output")
 
-        odoo_input = round(sum(float(x.get("vat_amount", 0.0)) for x in input_lines), 2)
-        odoo_output = round(sum(float(x.get("vat_amount", 0.0)) for x in output_lines), 2)
+        odoo_input = sum_cents(input_lines, "vat_amount")
+        odoo_output = sum_cents(output_lines, "vat_amount")
 
-        tra_row = tra_by_month.get(period, TraMonthlyRow(period=period, input_vat=0.0, output_vat=0.0))
-        tra_input = round(float(tra_row.input_vat), 2)
-        tra_output = round(float(tra_row.output_vat), 2)
+        tra_row = tra_by_month.get(period)
+        tra_input = tra_row.input_vat_cents if tra_row else 0
+        tra_output = tra_row.output_vat_cents if tra_row else 0
 
-        input_diff = round(odoo_input - tra_input, 2)
-        output_diff = round(odoo_output - tra_output, 2)
-        net_diff = round((odoo_output - odoo_input) - (tra_output - tra_input), 2)
+        net_diff = (odoo_output - odoo_input) - (tra_output - tra_input)
         net_diff_abs_total += abs(net_diff)
 
         control = adapter.get_vat_control_balance(period)
         monthly_summary.append(
             {
                 "period": period,
-                "odoo_input_vat": odoo_input,
-                "tra_input_vat": tra_input,
-                "input_difference": input_diff,
-                "odoo_output_vat": odoo_output,
-                "tra_output_vat": tra_output,
-                "output_difference": output_diff,
-                "net_vat_difference": net_diff,
-                "vat_control_balance": round(float(control.get("closing_balance", 0.0)), 2),
+                "odoo_input_vat": from_cents(odoo_input),
+                "tra_input_vat": from_cents(tra_input),
+                "input_difference": from_cents(odoo_input - tra_input),
+                "odoo_output_vat": from_cents(odoo_output),
+                "tra_output_vat": from_cents(tra_output),
+                "output_difference": from_cents(odoo_output - tra_output),
+                "net_vat_difference": from_cents(net_diff),
+                "vat_control_balance": from_cents(to_cents(control.get("closing_balance"))),
                 "vat_control_assumption": control.get("assumption", "best-effort"),
             }
         )
@@ -190,13 +185,13 @@ def reconcile_vat(
             category = _categorize_exception(item, period=period)
             if not category:
                 continue
-            exceptions.append(
+            exceptions.add(
                 {
                     "period": period,
                     "category": category,
                     "document_ref": item.get("document_ref", ""),
                     "source_period": item.get("source_period", ""),
-                    "vat_amount": round(float(item.get("vat_amount", 0.0)), 2),
+                    "vat_amount": from_cents(amount_cents(item, "vat_amount")),
                     "tax_type": item.get("tax_type", ""),
                     "notes": item.get("notes", ""),
                 }
@@ -220,6 +215,6 @@ def reconcile_vat(
         "metrics": {
             "months": len(monthly_summary),
             "exception_count": len(exceptions),
-            "aggregate_net_vat_difference_abs": round(net_diff_abs_total, 2),
+            "aggregate_net_vat_difference_abs": from_cents(net_diff_abs_total),
         },
     }
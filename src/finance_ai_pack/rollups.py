@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections.abc import Iterable
+from contextlib import contextmanager
+from pathlib import Path
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.periods import iter_periods
+
+# One row per (database, company, period[, bank]); every run upserts, so the latest run wins. A bank
+# run replaces the period's rows outright, so a journal that has left the period drops out.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bank_rollups (
+    database TEXT NOT NULL,
+    company_id INTEGER NOT NULL,
+    period TEXT NOT NULL,
+    bank TEXT NOT NULL,
+    journal TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    line_count INTEGER NOT NULL,
+    reconciled_count INTEGER NOT NULL,
+    reconciled_pct REAL NOT NULL,
+    statement_balance REAL NOT NULL,
+    ledger_balance REAL NOT NULL,
+    difference REAL NOT NULL,
+    exception_count INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (database, company_id, period, bank)
+);
+CREATE INDEX IF NOT EXISTS bank_rollups_bank ON bank_rollups (database, company_id, bank, period);
+CREATE TABLE IF NOT EXISTS vat_rollups (
+    database TEXT NOT NULL,
+    company_id INTEGER NOT NULL,
+    period TEXT NOT NULL,
+    odoo_input_vat REAL NOT NULL,
+    tra_input_vat REAL NOT NULL,
+    input_difference REAL NOT NULL,
+    odoo_output_vat REAL NOT NULL,
+    tra_output_vat REAL NOT NULL,
+    output_difference REAL NOT NULL,
+    net_vat_difference REAL NOT NULL,
+    exception_count INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (database, company_id, period)
+);
+CREATE TABLE IF NOT EXISTS close_rollups (
+    database TEXT NOT NULL,
+    company_id INTEGER NOT NULL,
+    period TEXT NOT NULL,
+    status TEXT NOT NULL,
+    proceed INTEGER NOT NULL,
+    unreconciled_lines INTEGER NOT NULL,
+    max_abs_vat_difference REAL NOT NULL,
+    petty_cash_exceptions INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (database, company_id, period)
+);
+"""
+
+BANK_METRICS = ("reconciled_pct", "difference", "line_count", "reconciled_count", "exception_count")
+VAT_METRICS = ("input_difference", "output_difference", "net_vat_difference", "exception_count")
+METRICS = {
+    **{f"bank_{name}": ("bank_rollups", name) for name in BANK_METRICS},
+    **{f"vat_{name}": ("vat_rollups", name) for name in VAT_METRICS},
+    "close_status": ("close_rollups", "status"),
+}
+
+
+def _entity(settings: Settings) -> tuple[str, int]:
+    from finance_ai_pack.scheduler import database_key
+
+    # company_id is part of the primary key; NULLs never conflict in SQLite, so unscoped runs use 0.
+    return database_key(settings), settings.company_id or 0
+
+
+def months_back(period_to: str, months: int) -> str:
+    if months < 1:
+        raise ValueError("months must be >= 1")
+    year, month = (int(part) for part in period_to.split("-"))
+    index = year * 12 + month - 1 - (months - 1)
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class RollupStore:
+    """Materialized per-period rollups that commands upsert and ``run trends`` reads."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _upsert(self, table: str, keys: tuple[str, ...], rows: list[dict], replace: dict | None = None) -> int:
+        """Upsert ``rows``; with ``replace``, first delete every row matching those column values."""
+        if not rows and replace is None:
+            return 0
+        with self._transaction() as conn:
+            if replace is not None:
+                conn.execute(
+                    f"DELETE FROM {table} WHERE {' AND '.join(f'{column} = ?' for column in replace)}",
+                    tuple(replace.values()),
+                )
+            if rows:
+                conn.executemany(*self._upsert_sql(table, keys, rows))
+        return len(rows)
+
+    @staticmethod
+    def _upsert_sql(table: str, keys: tuple[str, ...], rows: list[dict]) -> tuple[str, list[tuple]]:
+        columns = list(rows[0])
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column not in keys)
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+            f" ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}"
+        )
+        return sql, [tuple(row[column] for column in columns) for row in rows]
+
+    def upsert_bank(self, period: str, banks: list[dict], settings: Settings) -> int:
+        database, company_id = _entity(settings)
+        now = time.time()
+        return self._upsert(
+            "bank_rollups",
+            ("database", "company_id", "period", "bank"),
+            [
+                {
+                    "database": database,
+                    "company_id": company_id,
+                    "period": period,
+                    "bank": bank["display_name"],
+                    "journal": bank["journal"],
+                    "currency": bank["currency"],
+                    "line_count": bank["statement_line_count"],
+                    "reconciled_count": bank["reconciled_count"],
+                    "reconciled_pct": bank["reconciled_pct"],
+                    "statement_balance": bank["tie_out"]["statement_ending_balance"],
+                    "ledger_balance": bank["tie_out"]["ledger_balance"],
+                    "difference": bank["tie_out"]["difference"],
+                    "exception_count": len(bank.get("exceptions", [])),
+                    "updated_at": now,
+                }
+                for bank in banks
+            ],
+            replace={"database": database, "company_id": company_id, "period": period},
+        )
+
+    def upsert_vat(self, monthly_summary: list[dict], exception_register: Iterable[dict], settings: Settings) -> int:
+        database, company_id = _entity(settings)
+        now = time.time()
+        exceptions: dict[str, int] = {}
+        # One pass: a streamed register (ExceptionSink) re-merges its spilled runs on every iteration.
+        for row in exception_register:
+            exceptions[row["period"]] = exceptions.get(row["period"], 0) + 1
+        return self._upsert(
+            "vat_rollups",
+            ("database", "company_id", "period"),
+            [
+                {
+                    "database": database,
+                    "company_id": company_id,
+                    **{
+                        key: row[key]
+                        for key in (
+                            "period",
+                            "odoo_input_vat",
+                            "tra_input_vat",
+                            "input_difference",
+                            "odoo_output_vat",
+                            "tra_output_vat",
+                            "output_difference",
+                            "net_vat_difference",
+                        )
+                    },
+                    "exception_count": exceptions.get(row["period"], 0),
+                    "updated_at": now,
+                }
+                for row in monthly_summary
+            ],
+        )
+
+    def upsert_close(self, result: dict, settings: Settings) -> int:
+        database, company_id = _entity(settings)
+        rollup = result["bank_controls_rollup"]
+        return self._upsert(
+            "close_rollups",
+            ("database", "company_id", "period"),
+            [
+                {
+                    "database": database,
+                    "company_id": company_id,
+                    "period": result["period"],
+                    "status": result["status"],
+                    "proceed": int(bool(result["proceed"])),
+                    "unreconciled_lines": rollup["total_statement_lines"] - rollup["total_reconciled_lines"],
+                    "max_abs_vat_difference": result["vat_controls_rollup"]["max_abs_vat_difference"],
+                    "petty_cash_exceptions": result["petty_cash_controls_rollup"]["exception_count"],
+                    "updated_at": time.time(),
+                }
+            ],
+        )
+
+    def trends(
+        self,
+        metric: str,
+        settings: Settings,
+        months: int = 24,
+        period_to: str | None = None,
+        bank: str | None = None,
+    ) -> dict:
+        """Series of ``metric`` for the ``months`` periods ending at ``period_to`` (default: latest stored)."""
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of: {', '.join(sorted(METRICS))}")
+        table, column = METRICS[metric]
+        database, company_id = _entity(settings)
+        conn = self._connect()
+        try:
+            if period_to is None:
+                latest = conn.execute(
+                    f"SELECT MAX(period) FROM {table} WHERE database = ? AND company_id = ?", (database, company_id)
+                ).fetchone()[0]
+                if latest is None:
+                    return {"metric": metric, "periods": [], "series": []}
+                period_to = latest
+            periods = iter_periods(months_back(period_to, months), period_to)
+            label = "bank" if table == "bank_rollups" else "'all'"
+            sql = (
+                f"SELECT {label} AS label, period, {column} AS value FROM {table}"
+                " WHERE database = ? AND company_id = ? AND period BETWEEN ? AND ?"
+            )
+            params: list = [database, company_id, periods[0], periods[-1]]
+            if bank is not None:
+                if table != "bank_rollups":
+                    raise ValueError("--bank only applies to bank_* metrics")
+                sql += " AND bank = ?"
+                params.append(bank)
+            rows = conn.execute(sql + " ORDER BY label, period", params).fetchall()
+        finally:
+            conn.close()
+
+        series: dict[str, dict[str, object]] = {}
+        for row in rows:
+            series.setdefault(row["label"], {})[row["period"]] = row["value"]
+        return {
+            "metric": metric,
+            "periods": periods,
+            # Months without a stored run are None so every series lines up with ``periods``.
+            "series": [
+                {"label": label, "values": [values.get(period) for period in periods]}
+                for label, values in series.items()
+            ],
+        }
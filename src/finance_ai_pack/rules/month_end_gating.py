@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import copy
 import json
+from functools import lru_cache
 from pathlib import Path
 
 RED = "RED"
@@ -10,21 +12,38 @@ GREEN = "GREEN"
 RULES_FILE = Path(__file__).resolve().parent / "gating_rules.yml"
 
 
-def _load_thresholds() -> dict:
+def load_thresholds() -> dict:
+    """The caller's own copy of the gating thresholds, parsed once per version of ``RULES_FILE``."""
+    mtime_ns = RULES_FILE.stat().st_mtime_ns if RULES_FILE.exists() else 0
+    return copy.deepcopy(_parse_thresholds(str(RULES_FILE), mtime_ns))
+
+
+@lru_cache(maxsize=8)
+def _parse_thresholds(rules_file: str, mtime_ns: int) -> dict:
+    _ = mtime_ns
+    rules_path = Path(rules_file)
     thresholds = {
-        "green": {"max_unmatched_transactions": 0, "max_unexplained_amount": 0.0, "max_vat_monthly_difference": 0.0},
+        "green": {
+            "max_unmatched_transactions": 0,
+            "max_unexplained_amount": 0.0,
+            "max_vat_monthly_difference": 0.0,
+            "max_petty_cash_exceptions": 0,
+            "max_intercompany_mismatches": 0,
+        },
         "amber": {
             "max_unmatched_transactions": 5,
             "max_unexplained_amount": 1000.0,
             "max_vat_monthly_difference": 250.0,
+            "max_petty_cash_exceptions": 5,
+            "max_intercompany_mismatches": 2,
         },
     }
-    if not RULES_FILE.exists():
+    if not rules_path.exists():
         return thresholds
 
     section = None
     level = None
-    for raw in RULES_FILE.read_text().splitlines():
+    for raw in rules_path.read_text().splitlines():
         line = raw.strip()
         if not line or line.startswith("#"):
             continue
@@ -48,9 +67,13 @@ def _load_thresholds() -> dict:
 
 
 def evaluate(
-    unmatched_transactions: int, unexplained_amount: float, vat_monthly_differences: list[float] | None = None
+    unmatched_transactions: int,
+    unexplained_amount: float,
+    vat_monthly_differences: list[float] | None = None,
+    petty_cash_exceptions: int = 0,
+    intercompany_mismatches: int = 0,
 ) -> str:
-    thresholds = _load_thresholds()
+    thresholds = load_thresholds()
     amber = thresholds.get("amber", {})
     green = thresholds.get("green", {})
 
@@ -61,6 +84,8 @@ def evaluate(
         unmatched_transactions > int(amber.get("max_unmatched_transactions", 0))
         or unexplained_amount > float(amber.get("max_unexplained_amount", 0))
         or max_vat_diff > float(amber.get("max_vat_monthly_difference", 0))
+        or petty_cash_exceptions > int(amber.get("max_petty_cash_exceptions", 0))
+        or intercompany_mismatches > int(amber.get("max_intercompany_mismatches", 0))
     ):
         return RED
 
@@ -68,6 +93,8 @@ def evaluate(
         unmatched_transactions > int(green.get("max_unmatched_transactions", 0))
         or unexplained_amount > float(green.get("max_unexplained_amount", 0))
         or max_vat_diff > float(green.get("max_vat_monthly_difference", 0))
+        or petty_cash_exceptions > int(green.get("max_petty_cash_exceptions", 0))
+        or intercompany_mismatches > int(green.get("max_intercompany_mismatches", 0))
     ):
         return AMBER
 
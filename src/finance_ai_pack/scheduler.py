@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+
+from finance_ai_pack.config import Settings
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+IN_FLIGHT = (QUEUED, RUNNING)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    dedupe_key TEXT NOT NULL,
+    command TEXT NOT NULL,
+    params TEXT NOT NULL,
+    companies TEXT,
+    company_id INTEGER,
+    odoo_db TEXT NOT NULL,
+    status TEXT NOT NULL,
+    requests INTEGER NOT NULL DEFAULT 1,
+    not_before REAL NOT NULL,
+    lease_until REAL,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, status);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, not_before, created_at);
+CREATE INDEX IF NOT EXISTS jobs_db ON jobs (odoo_db, status);
+"""
+
+
+class JobTimeout(TimeoutError):
+    """Raised when waiting on a job exceeds the caller's timeout."""
+
+
+def database_key(settings: Settings) -> str:
+    if settings.fixture_mode:
+        return "fixtures"
+    return f"{settings.odoo_url.rstrip('/')}/{settings.odoo_db}"
+
+
+def dedupe_key(command: str, params: dict, companies: str | None, settings: Settings) -> str:
+    canonical = json.dumps(
+        {
+            "command": command,
+            "params": {k: str(v) for k, v in params.items() if v is not None},
+            "companies": companies,
+            "database": database_key(settings),
+            "company_id": settings.company_id,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class JobScheduler:
+    """SQLite-backed job queue shared by every CLI process pointing at the same database file.
+
+    Identical requests (same command, params, companies and Odoo database) attach to the job
+    already queued or running instead of starting another extraction. New jobs wait
+    ``coalesce_seconds`` before they become claimable so a burst collapses into one run.
+    """
+
+    def __init__(self, db_path: Path, coalesce_seconds: float = 5.0, lease_seconds: float = 3600.0) -> None:
+        self.db_path = db_path
+        self.coalesce_seconds = coalesce_seconds
+        self.lease_seconds = lease_seconds
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            # Queues created before jobs carried their company gain the column (NULL: unscoped).
+            if "company_id" not in {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}:
+                conn.execute("ALTER TABLE jobs ADD COLUMN company_id INTEGER")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def submit(self, command: str, params: dict, settings: Settings, companies: str | None = None) -> dict:
+        key = dedupe_key(command, params, companies, settings)
+        now = time.time()
+        with self._transaction() as conn:
+            existing = conn.execute(
+                "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN (?, ?) ORDER BY created_at LIMIT 1",
+                (key, *IN_FLIGHT),
+            ).fetchone()
+            if existing:
+                conn.execute("UPDATE jobs SET requests = requests + 1 WHERE id = ?", (existing["id"],))
+                job_id, deduplicated = existing["id"], True
+            else:
+                job_id, deduplicated = uuid.uuid4().hex, False
+                conn.execute(
+                    "INSERT INTO jobs"
+                    " (id, dedupe_key, command, params, companies, company_id, odoo_db, status, not_before, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        job_id,
+                        key,
+                        command,
+                        json.dumps({k: str(v) if isinstance(v, Path) else v for k, v in params.items()}),
+                        companies,
+                        settings.company_id,
+                        database_key(settings),
+                        QUEUED,
+                        now + self.coalesce_seconds,
+                        now,
+                    ),
+                )
+        return {**self.get(job_id), "deduplicated": deduplicated}
+
+    def claim(self, worker: str, max_per_database: int = 1, job_id: str | None = None) -> dict | None:
+        """Move the oldest claimable job to ``running``, honouring the per-database concurrency limit.
+
+        Running jobs whose lease expired (their worker died) are claimable again.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            candidates = conn.execute(
+                "SELECT id, odoo_db FROM jobs"
+                " WHERE ((status = ? AND not_before <= ?) OR (status = ? AND lease_until < ?))"
+                " AND (? IS NULL OR id = ?)"
+                " ORDER BY created_at",
+                (QUEUED, now, RUNNING, now, job_id, job_id),
+            ).fetchall()
+            for candidate in candidates:
+                running = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE odoo_db = ? AND status = ? AND lease_until >= ?",
+                    (candidate["odoo_db"], RUNNING, now),
+                ).fetchone()[0]
+                if running >= max_per_database:
+                    continue
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, started_at = ?, lease_until = ? WHERE id = ?",
+                    (RUNNING, worker, now, now + self.lease_seconds, candidate["id"]),
+                )
+                claimed = candidate["id"]
+                break
+            else:
+                return None
+        return self.get(claimed)
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """Extend ``worker``'s lease on a running job; ``False`` once the lease is lost."""
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = ?",
+                (time.time() + self.lease_seconds, job_id, worker, RUNNING),
+            ).rowcount
+        return bool(updated)
+
+    def complete(self, job_id: str, worker: str, result: dict) -> bool:
+        return self._finish(job_id, worker, SUCCEEDED, result=json.dumps(result, default=str))
+
+    def fail(self, job_id: str, worker: str, error: str) -> bool:
+        return self._finish(job_id, worker, FAILED, error=error)
+
+    def _finish(
+        self, job_id: str, worker: str, status: str, result: str | None = None, error: str | None = None
+    ) -> bool:
+        # Only the lease holder may finish a job: a worker whose job was re-claimed must not
+        # overwrite the new run's outcome.
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ?, lease_until = NULL"
+                " WHERE id = ? AND worker = ? AND status = ?",
+                (status, time.time(), result, error, job_id, worker, RUNNING),
+            ).rowcount
+        return bool(updated)
+
+    def get(self, job_id: str) -> dict:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            raise ValueError(f"Unknown job id: {job_id}")
+        return _row_to_job(row)
+
+    def list_jobs(self, limit: int = 20) -> list[dict]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        finally:
+            conn.close()
+        return [_row_to_job(row, include_result=False) for row in rows]
+
+    def wait(self, job_id: str, timeout: float | None = None, poll_interval: float = 0.5) -> dict:
+        """Attach to a job and block until it finishes."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job["status"] not in IN_FLIGHT:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                raise JobTimeout(f"Timed out waiting for job {job_id} ({job['status']}).")
+            time.sleep(poll_interval)
+
+
+def _row_to_job(row: sqlite3.Row, include_result: bool = True) -> dict:
+    job = {
+        "job_id": row["id"],
+        "command": row["command"],
+        "params": json.loads(row["params"]),
+        "companies": row["companies"],
+        "company_id": row["company_id"],
+        "odoo_db": row["odoo_db"],
+        "status": row["status"],
+        "requests": row["requests"],
+        "worker": row["worker"],
+        "created_at": row["created_at"],
+        "started_at": row["started_at"],
+        "finished_at": row["finished_at"],
+        "error": row["error"],
+    }
+    if include_result and row["result"] is not None:
+        job["result"] = json.loads(row["result"])
+    return job
+
+
+def execute_job(job: dict, settings: Settings) -> dict:
+    from finance_ai_pack import cli
+
+    # The job runs for the company it was submitted for, whatever company the worker is scoped to.
+    settings = replace(settings, company_id=job["company_id"])
+    params = dict(job["params"])
+    if params.get("tra_file"):
+        params["tra_file"] = Path(params["tra_file"])
+    if job["companies"]:
+        return cli.run_group(job["command"], companies=job["companies"], settings=settings, **params)
+    return cli.runner_for(job["command"], params)(settings=settings, **params)
+
+
+class LeaseHeartbeat:
+    """Calls ``renew`` every ``interval`` seconds on a daemon thread while the block runs.
+
+    Stops early when ``renew`` returns ``False`` (the lease was lost); ``lost`` records that.
+    """
+
+    def __init__(self, renew: Callable[[], bool], interval: float) -> None:
+        self.renew = renew
+        self.interval = interval
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                renewed = self.renew()
+            except sqlite3.Error:
+                continue  # a busy database is retried on the next beat
+            if not renewed:
+                self.lost = True
+                return
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def process_job(scheduler: JobScheduler, job: dict, settings: Settings) -> dict:
+    job_id, worker = job["job_id"], job["worker"]
+    # Renew well inside the lease so a long job is never re-claimed and run twice.
+    with LeaseHeartbeat(lambda: scheduler.heartbeat(job_id, worker), scheduler.lease_seconds / 3):
+        try:
+            scheduler.complete(job_id, worker, execute_job(job, settings))
+        except Exception as exc:
+            scheduler.fail(job_id, worker, f"{type(exc).__name__}: {exc}")
+    return scheduler.get(job_id)
+
+
+def run_worker(
+    scheduler: JobScheduler,
+    settings: Settings,
+    concurrency: int = 2,
+    max_per_database: int = 1,
+    once: bool = False,
+    poll_interval: float = 1.0,
+) -> int:
+    """Claim and run jobs on ``concurrency`` threads; with ``once`` stop when nothing is claimable."""
+    processed = 0
+    lock = threading.Lock()
+    worker_prefix = f"worker-{uuid.uuid4().hex[:8]}"
+
+    def loop(idx: int) -> None:
+        nonlocal processed
+        while True:
+            job = scheduler.claim(f"{worker_prefix}-{idx}", max_per_database=max_per_database)
+            if job is None:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+            process_job(scheduler, job, settings)
+            with lock:
+                processed += 1
+
+    threads = [threading.Thread(target=loop, args=(idx,), daemon=True) for idx in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return processed
+
+
+def run_or_attach(
+    scheduler: JobScheduler,
+    command: str,
+    params: dict,
+    settings: Settings,
+    companies: str | None = None,
+    max_per_database: int = 1,
+    timeout: float | None = None,
+    poll_interval: float = 0.5,
+) -> dict:
+    """Submit a job and either run it in this process or attach to the identical job already in flight."""
+    job = scheduler.submit(command, params, settings, companies=companies)
+    worker = f"inline-{uuid.uuid4().hex[:8]}"
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while job["status"] in IN_FLIGHT:
+        if job["status"] == QUEUED:
+            claimed = scheduler.claim(worker, max_per_database=max_per_database, job_id=job["job_id"])
+            if claimed is not None:
+                return {**process_job(scheduler, claimed, settings), "deduplicated": job.get("deduplicated", False)}
+        if deadline is not None and time.monotonic() >= deadline:
+            raise JobTimeout(f"Timed out waiting for job {job['job_id']} ({job['status']}).")
+        time.sleep(poll_interval)
+        job = {**scheduler.get(job["job_id"]), "deduplicated": job.get("deduplicated", False)}
+    return job
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from finance_ai_pack import cli
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.cache import extract_cache
+from finance_ai_pack.connectors.odoo.client import OdooConnectionError
+from finance_ai_pack.connectors.odoo.pool import shared_pool
+from finance_ai_pack.recon.bank.service import REGISTRY_FILE, load_registry
+from finance_ai_pack.rules.month_end_gating import load_thresholds
+
+JOB_PARAMS = {
+    "bank_recon": {"period", "period_from", "period_to"},
+    "vat_pack": {"period_from", "period_to", "tra_file"},
+    "month_end": {"period", "tra_file"},
+}
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when the bounded job queue cannot accept more work."""
+
+
+@dataclass
+class Job:
+    id: str
+    command: str
+    params: dict
+    companies: str | None = None
+    status: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: dict | None = None
+    error: str | None = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_dict(self, include_result: bool = True) -> dict:
+        payload = {
+            "job_id": self.id,
+            "command": self.command,
+            "params": {k: str(v) if isinstance(v, Path) else v for k, v in self.params.items()},
+            "companies": self.companies,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+        if include_result and self.result is not None:
+            payload["result"] = self.result
+        return payload
+
+
+def parse_job_request(body: dict) -> tuple[str, dict, str | None]:
+    command = body.get("command")
+    if command not in JOB_PARAMS:
+        raise ValueError(f"command must be one of: {', '.join(sorted(JOB_PARAMS))}")
+    params = dict(body.get("params") or {})
+    unknown = set(params) - JOB_PARAMS[command]
+    if unknown:
+        raise ValueError(f"Unsupported params for {command}: {', '.join(sorted(unknown))}")
+    if params.get("tra_file"):
+        params["tra_file"] = Path(params["tra_file"])
+    if command == "bank_recon" and "period_from" in params:
+        params.setdefault("period_to", params["period_from"])
+    companies = body.get("companies")
+    return command, params, str(companies) if companies else None
+
+
+class JobRunner:
+    """Bounded job queue drained by a fixed pool of long-lived worker threads.
+
+    Workers keep their thread-local Odoo proxies between jobs, so only the first job on each
+    worker pays for creating one; authentication happens once per database for the process.
+    """
+
+    def __init__(self, settings: Settings, workers: int = 4, queue_size: int = 32, retain: int = 256) -> None:
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers and queue_size must be >= 1")
+        self.settings = settings
+        self.workers = workers
+        self.retain = retain
+        self._queue: queue.Queue[Job | None] = queue.Queue(maxsize=queue_size)
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def warm_up(self) -> None:
+        load_registry(REGISTRY_FILE)
+        load_thresholds()
+        if not self.settings.fixture_mode:
+            shared_pool(self.settings).client()
+
+    def start(self) -> None:
+        for idx in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{idx}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def submit(self, command: str, params: dict, companies: str | None = None) -> Job:
+        job = Job(id=uuid.uuid4().hex, command=command, params=params, companies=companies)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full as exc:
+            raise JobQueueFull("Job queue is full; retry later.") from exc
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "running": statuses.count("running"),
+            "tracked_jobs": len(statuses),
+            "extract_cache": (
+                extract_cache(self.settings.extract_cache_ttl).stats() if self.settings.extract_cache_ttl > 0 else None
+            ),
+        }
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done.is_set()]
+        for job_id in finished[: max(0, len(self._jobs) - self.retain)]:
+            del self._jobs[job_id]
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                job.result = self._execute(job)
+                job.status = "succeeded"
+            except (ValueError, OdooConnectionError) as exc:
+                job.error = str(exc)
+                job.status = "failed"
+            except Exception as exc:  # pragma: no cover - keep the worker alive on unexpected errors
+                job.error = f"{type(exc).__name__}: {exc}"
+                job.status = "failed"
+            finally:
+                job.finished_at = time.time()
+                job.done.set()
+
+    def _execute(self, job: Job) -> dict:
+        if job.companies:
+            return cli.run_group(job.command, companies=job.companies, settings=self.settings, **job.params)
+        return cli.runner_for(job.command, job.params)(settings=self.settings, **job.params)
+
+
+def _handler_for(runner: JobRunner) -> type[BaseHTTPRequestHandler]:
+    class JobRequestHandler(BaseHTTPRequestHandler):
+        server_version = "finance-ai-pack"
+
+        def _send_json(self, status: HTTPStatus, payload: dict) -> None:
+            body = json.dumps(payload, default=str).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            path = urlparse(self.path).path.rstrip("/")
+            if path == "/health":
+                self._send_json(HTTPStatus.OK, {"status": "ok", **runner.stats()})
+                return
+            if path.startswith("/jobs/"):
+                job = runner.get(path.split("/", 2)[2])
+                if job is None:
+                    self._send_json(HTTPStatus.NOT_FOUND, {"error": "unknown job"})
+                else:
+                    self._send_json(HTTPStatus.OK, job.to_dict())
+                return
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+        def do_POST(self) -> None:
+            parsed = urlparse(self.path)
+            if parsed.path.rstrip("/") != "/jobs":
+                self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                command, params, companies = parse_job_request(body)
+            except (ValueError, TypeError) as exc:
+                self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+                return
+            try:
+                job = runner.submit(command, params, companies)
+            except JobQueueFull as exc:
+                self._send_json(HTTPStatus.TOO_MANY_REQUESTS, {"error": str(exc)})
+                return
+
+            query = parse_qs(parsed.query)
+            if query.get("wait", ["0"])[0] in {"1", "true", "yes"}:
+                job.done.wait(timeout=float(query.get("timeout", ["300"])[0]))
+                status = HTTPStatus.OK if job.done.is_set() else HTTPStatus.ACCEPTED
+                self._send_json(status, job.to_dict())
+                return
+            self._send_json(HTTPStatus.ACCEPTED, job.to_dict(include_result=False))
+
+    return JobRequestHandler
+
+
+def build_server(
+    host: str, port: int, settings: Settings, workers: int = 4, queue_size: int = 32
+) -> tuple[ThreadingHTTPServer, JobRunner]:
+    runner = JobRunner(settings, workers=workers, queue_size=queue_size)
+    runner.warm_up()
+    runner.start()
+    return ThreadingHTTPServer((host, port), _handler_for(runner)), runner
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    settings: Settings | None = None,
+    workers: int = 4,
+    queue_size: int = 32,
+    cache_ttl: float = 300.0,
+) -> None:
+    settings = replace(settings or Settings.from_env(), extract_cache_ttl=cache_ttl)
+    server, runner = build_server(host, port, settings, workers=workers, queue_size=queue_size)
+    print(f"serving on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        runner.stop()
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import calendar
+import csv
+import json
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+
+from finance_ai_pack.periods import previous_period
+
+CURRENCIES = ("TZS", "USD", "KES")
+COMPANY = {"id": 1, "name": "Synthetic Company", "currency_id": [1, "TZS"], "partner_id": [90, "Synthetic Company"]}
+ACCOUNTS = [
+    {"id": 1, "code": "1010", "name": "Bank", "account_type": "asset_cash"},
+    {"id": 2, "code": "1100", "name": "Accounts Receivable", "account_type": "asset_receivable"},
+    {"id": 3, "code": "2100", "name": "Accounts Payable", "account_type": "liability_payable"},
+    {"id": 4, "code": "2200", "name": "VAT Control", "account_type": "liability_current"},
+]
+TAXES = [
+    {"id": 1, "name": "VAT 18% Purchases", "type_tax_use": "purchase"},
+    {"id": 2, "name": "VAT 18% Sales", "type_tax_use": "sale"},
+]
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """Shape of a generated dataset; the same spec and seed always produce the same records."""
+
+    lines: int = 10_000
+    journals: int = 10
+    vat_lines: int | None = None
+    period: str = "2025-01"
+    seed: int = 42
+    reconciled_ratio: float = 0.97
+
+    @property
+    def vat_line_count(self) -> int:
+        return self.lines if self.vat_lines is None else self.vat_lines
+
+    def lines_for_journal(self, index: int) -> int:
+        base, extra = divmod(self.lines, self.journals)
+        return base + (1 if index < extra else 0)
+
+
+def _rng(spec: SyntheticSpec, stream: str) -> random.Random:
+    # String seeds hash deterministically, unlike tuples under PYTHONHASHSEED.
+    return random.Random(f"{spec.seed}:{stream}")
+
+
+def _period_dates(period: str, count: int) -> Iterator[str]:
+    year, month = (int(part) for part in period.split("-"))
+    first = date(year, month, 1)
+    days = calendar.monthrange(year, month)[1]
+    for idx in range(count):
+        yield (first + timedelta(days=idx * days // max(count, 1))).isoformat()
+
+
+def synthetic_journals(spec: SyntheticSpec) -> list[dict]:
+    """Bank journals in the ``banks.json`` fixture format."""
+    return [
+        {
+            "code": f"syn{idx + 1:03d}_{CURRENCIES[idx % len(CURRENCIES)].lower()}",
+            "currency": CURRENCIES[idx % len(CURRENCIES)],
+            "journal": f"Synthetic Bank {idx + 1:03d}",
+        }
+        for idx in range(spec.journals)
+    ]
+
+
+def iter_statement_lines(spec: SyntheticSpec, journal_index: int) -> Iterator[dict]:
+    """Statement lines for one journal in the per-bank fixture format, in date order."""
+    rng = _rng(spec, f"bank:{journal_index}")
+    count = spec.lines_for_journal(journal_index)
+    for idx, line_date in enumerate(_period_dates(spec.period, count)):
+        cents = rng.randint(1_000, 250_000_000)
+        yield {
+            "date": line_date,
+            "amount": (cents if rng.random() < 0.6 else -cents) / 100,
+            "reference": f"SYN{journal_index + 1:03d}-{idx + 1:07d}",
+            "is_reconciled": rng.random() < spec.reconciled_ratio,
+            "move_line_count": 2,
+        }
+
+
+def iter_vat_lines(spec: SyntheticSpec) -> Iterator[dict]:
+    """VAT tax lines in the ``odoo_vat_lines_<period>.json`` fixture format.
+
+    About 3% carry an exception: missing document reference, late posting or a credit note.
+    """
+    rng = _rng(spec, "vat")
+    earlier = previous_period(spec.period)
+    for idx in range(spec.vat_line_count):
+        tax_type = "input" if rng.random() < 0.45 else "output"
+        row = {
+            "tax_type": tax_type,
+            "vat_amount": rng.randint(100, 5_000_000) / 100,
+            "document_ref": f"{'BILL' if tax_type == 'input' else 'INV'}-{idx + 1:07d}",
+            "move_type": "in_invoice" if tax_type == "input" else "out_invoice",
+            "source_period": spec.period,
+            "exception_hint": "",
+            "notes": "Synthetic",
+        }
+        roll = rng.random()
+        if roll < 0.01:
+            row.update(document_ref="", exception_hint="missing")
+        elif roll < 0.02:
+            row.update(source_period=earlier, exception_hint="timing")
+        elif roll < 0.03:
+            row["move_type"] = "in_refund" if tax_type == "input" else "out_refund"
+        yield row
+
+
+def _write_json_array(rows: Iterator[dict], output_file: Path) -> int:
+    count = 0
+    with output_file.open("w") as handle:
+        handle.write("[")
+        for row in rows:
+            handle.write(",\n" if count else "\n")
+            handle.write(json.dumps(row))
+            count += 1
+        handle.write("\n]\n")
+    return count
+
+
+def write_fixtures(spec: SyntheticSpec, target_dir: Path) -> dict:
+    """Write a fixture tree that ``FixturesAdapter`` reads exactly like ``fixtures/``."""
+    bank_dir = target_dir / "odoo_statement_lines"
+    vat_dir = target_dir / "vat"
+    bank_dir.mkdir(parents=True, exist_ok=True)
+    vat_dir.mkdir(parents=True, exist_ok=True)
+
+    journals = synthetic_journals(spec)
+    (bank_dir / "banks.json").write_text(json.dumps(journals, indent=2))
+    statement_lines = sum(
+        _write_json_array(iter_statement_lines(spec, idx), bank_dir / f"{journal['code']}_{spec.period}.json")
+        for idx, journal in enumerate(journals)
+    )
+
+    totals = {"input": 0, "output": 0}
+
+    def _tracked() -> Iterator[dict]:
+        for row in iter_vat_lines(spec):
+            totals[row["tax_type"]] += round(row["vat_amount"] * 100)
+            yield row
+
+    vat_lines = _write_json_array(_tracked(), vat_dir / f"odoo_vat_lines_{spec.period}.json")
+    with (vat_dir / f"tra_vat_{spec.period}.csv").open("w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["period", "input_vat", "output_vat"])
+        writer.writerow([spec.period, f"{totals['input'] / 100:.2f}", f"{totals['output'] / 100:.2f}"])
+
+    return {
+        "fixtures_dir": str(target_dir),
+        "period": spec.period,
+        "journals": len(journals),
+        "statement_lines": statement_lines,
+        "vat_lines": vat_lines,
+    }
+
+
+def iter_odoo_records(spec: SyntheticSpec) -> Iterator[tuple[str, dict]]:
+    """The same dataset as Odoo records, ``(model, values)`` with many2one fields as ``[id, name]``.
+
+    Every statement line and VAT line gets a posted two-line move so journal balances, tax line
+    queries and grouped ledger totals all have something realistic to aggregate.
+    """
+    company = [COMPANY["id"], COMPANY["name"]]
+    yield "res.company", dict(COMPANY)
+    for account in ACCOUNTS:
+        yield "account.account", {**account, "company_id": company}
+    for tax in TAXES:
+        yield "account.tax", {**tax, "company_id": company}
+
+    bank_account = [1, "1010 Bank"]
+    journals = synthetic_journals(spec)
+    # Move lines book statement amounts unconverted, so par rates keep bank and ledger tie-outs exact.
+    foreign = sorted({journal["currency"] for journal in journals} - {COMPANY["currency_id"][1]})
+    for idx, currency in enumerate(foreign, start=1):
+        yield "res.currency.rate", {
+            "id": idx,
+            "name": f"{spec.period}-01",
+            "rate": 1.0,
+            "currency_id": [CURRENCIES.index(currency) + 1, currency],
+            "company_id": False,
+        }
+    for idx, journal in enumerate(journals, start=1):
+        yield "account.journal", {
+            "id": idx,
+            "name": journal["journal"],
+            "code": journal["code"],
+            "type": "bank",
+            "active": True,
+            "currency_id": [CURRENCIES.index(journal["currency"]) + 1, journal["currency"]],
+            "default_account_id": bank_account,
+            "company_id": company,
+        }
+    misc_journal = [len(journals) + 1, "Miscellaneous Operations"]
+    yield "account.journal", {
+        "id": misc_journal[0],
+        "name": misc_journal[1],
+        "code": "MISC",
+        "type": "general",
+        "active": True,
+        "currency_id": False,
+        "default_account_id": False,
+        "company_id": company,
+    }
+
+    move_id = 0
+    move_line_id = 0
+
+    vat_account = [4, "2200 VAT Control"]
+
+    def _move_lines(move: list, journal: list, line_date: str, amount: float, account: list, counterpart: list, tax):
+        nonlocal move_line_id
+        for line_account, balance, tax_line in ((account, amount, tax), (counterpart, -amount, False)):
+            move_line_id += 1
+            yield "account.move.line", {
+                "id": move_line_id,
+                "move_id": move,
+                "name": move[1],
+                "ref": move[1],
+                "journal_id": journal,
+                "account_id": line_account,
+                "date": line_date,
+                "balance": balance,
+                "debit": max(balance, 0.0),
+                "credit": max(-balance, 0.0),
+                "parent_state": "posted",
+                "partner_id": [1, "Synthetic Partner"] if line_account[0] in (2, 3) else False,
+                "tax_line_id": tax_line,
+                "move_type": "entry",
+                "company_id": company,
+            }
+
+    statement_line_id = 0
+    for idx, journal in enumerate(journals):
+        journal_ref = [idx + 1, journal["journal"]]
+        for row in iter_statement_lines(spec, idx):
+            move_id += 1
+            statement_line_id += 1
+            move = [move_id, f"BNK{idx + 1}/{spec.period.replace('-', '/')}/{statement_line_id:07d}"]
+            yield "account.bank.statement.line", {
+                "id": statement_line_id,
+                "journal_id": journal_ref,
+                "date": row["date"],
+                "amount": row["amount"],
+                "payment_ref": row["reference"],
+                "ref": row["reference"],
+                "is_reconciled": row["is_reconciled"],
+                "move_id": move,
+                "move_name": move[1],
+                "partner_id": False,
+                "create_uid": [2, "Synthetic User"],
+                "company_id": company,
+            }
+            yield from _move_lines(
+                move, journal_ref, row["date"], row["amount"], bank_account, [2, "1100 Accounts Receivable"], False
+            )
+
+    vat_dates = _period_dates(spec.period, spec.vat_line_count)
+    for row, line_date in zip(iter_vat_lines(spec), vat_dates, strict=True):
+        move_id += 1
+        move = [move_id, row["document_ref"] or f"MISC/{move_id:07d}"]
+        is_input = row["tax_type"] == "input"
+        amount = row["vat_amount"] if is_input else -row["vat_amount"]
+        tax = [1, TAXES[0]["name"]] if is_input else [2, TAXES[1]["name"]]
+        counterpart = [3, "2100 Accounts Payable"] if is_input else [2, "1100 Accounts Receivable"]
+        for model, values in _move_lines(move, misc_journal, line_date, amount, vat_account, counterpart, tax):
+            yield model, {**values, "move_type": row["move_type"]}
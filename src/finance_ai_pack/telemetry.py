@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from finance_ai_pack.config import Settings
+
+MAX_SPANS = 20_000
+
+_CURRENT: contextvars.ContextVar[Telemetry | None] = contextvars.ContextVar("finance_ai_pack_telemetry", default=None)
+_NOOP = nullcontext()
+
+
+class Telemetry:
+    """Spans and per-RPC counters for one command run.
+
+    The active collector lives in a context variable, so instrumentation points cost a single
+    lookup when telemetry is off. Work handed to thread pools must run in a copied context
+    (``contextvars.copy_context().run``) to report into the same collector.
+    """
+
+    def __init__(self, max_spans: int = MAX_SPANS) -> None:
+        self.max_spans = max_spans
+        self.started_ns = time.perf_counter_ns()
+        self.spans: list[dict] = []
+        self.dropped_spans = 0
+        self.rpc: dict[str, dict] = {}
+        self.concurrency: dict[str, int] = {}
+        self.throttle_events: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, category: str, start_ns: int, end_ns: int, args: dict | None = None) -> None:
+        span = {
+            "name": name,
+            "cat": category,
+            "start_us": (start_ns - self.started_ns) // 1000,
+            "dur_us": (end_ns - start_ns) // 1000,
+            "tid": threading.get_ident(),
+            "thread": threading.current_thread().name,
+        }
+        if args:
+            span["args"] = args
+        with self._lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(span)
+            else:
+                self.dropped_spans += 1
+
+    def record_rpc(
+        self,
+        model: str,
+        method: str,
+        start_ns: int,
+        end_ns: int,
+        request_bytes: int,
+        response_bytes: int,
+        error: bool = False,
+    ) -> None:
+        key = f"{model}.{method}"
+        elapsed_ms = (end_ns - start_ns) / 1_000_000
+        with self._lock:
+            entry = self.rpc.get(key)
+            if entry is None:
+                entry = self.rpc[key] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "request_bytes": 0,
+                    "response_bytes": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                }
+            entry["calls"] += 1
+            entry["errors"] += int(error)
+            entry["request_bytes"] += request_bytes
+            entry["response_bytes"] += response_bytes
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        self.add_span(key, "rpc", start_ns, end_ns, {"request_bytes": request_bytes, "response_bytes": response_bytes})
+
+    def record_concurrency(self, limit: int, in_flight: int, event: str | None = None) -> None:
+        """Sample the adaptive Odoo concurrency limit and count throttle events (retry, throttled, ...)."""
+        with self._lock:
+            if not self.concurrency:
+                self.concurrency = {"limit": limit, "min_limit": limit, "max_limit": limit, "peak_in_flight": 0}
+            self.concurrency["limit"] = limit
+            self.concurrency["min_limit"] = min(self.concurrency["min_limit"], limit)
+            self.concurrency["max_limit"] = max(self.concurrency["max_limit"], limit)
+            self.concurrency["peak_in_flight"] = max(self.concurrency["peak_in_flight"], in_flight)
+            if event is not None:
+                self.throttle_events[event] = self.throttle_events.get(event, 0) + 1
+
+    def summary(self) -> dict:
+        """Aggregate spans by name and category; raw spans are only kept for trace export."""
+        with self._lock:
+            spans = list(self.spans)
+            rpc = {key: dict(entry) for key, entry in self.rpc.items()}
+            concurrency = dict(self.concurrency)
+            throttle_events = dict(sorted(self.throttle_events.items()))
+        grouped: dict[tuple[str, str], dict] = {}
+        for span in spans:
+            if span["cat"] == "rpc":
+                continue
+            entry = grouped.setdefault((span["cat"], span["name"]), {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += span["dur_us"] / 1000
+        for entry in rpc.values():
+            entry["total_ms"] = round(entry["total_ms"], 3)
+            entry["max_ms"] = round(entry["max_ms"], 3)
+        return {
+            "wall_ms": round((time.perf_counter_ns() - self.started_ns) / 1_000_000, 3),
+            "spans": [
+                {"category": cat, "name": name, "count": entry["count"], "total_ms": round(entry["total_ms"], 3)}
+                for (cat, name), entry in sorted(grouped.items(), key=lambda item: -item[1]["total_ms"])
+            ],
+            "rpc": dict(sorted(rpc.items())),
+            "rpc_totals": {
+                "calls": sum(entry["calls"] for entry in rpc.values()),
+                "errors": sum(entry["errors"] for entry in rpc.values()),
+                "request_bytes": sum(entry["request_bytes"] for entry in rpc.values()),
+                "response_bytes": sum(entry["response_bytes"] for entry in rpc.values()),
+                "total_ms": round(sum(entry["total_ms"] for entry in rpc.values()), 3),
+            },
+            "concurrency": concurrency,
+            "throttle_events": throttle_events,
+            "dropped_spans": self.dropped_spans,
+        }
+
+    def export(self, output_file: Path) -> Path:
+        """Write a Chrome trace (``chrome://tracing`` / Perfetto) or, for ``.jsonl``, one span per line."""
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            spans = list(self.spans)
+        if output_file.suffix == ".jsonl":
+            with output_file.open("w") as handle:
+                for span in spans:
+                    handle.write(json.dumps(span) + "\n")
+            return output_file
+        pid = os.getpid()
+        events = [
+            {
+                "name": span["name"],
+                "cat": span["cat"],
+                "ph": "X",
+                "ts": span["start_us"],
+                "dur": span["dur_us"],
+                "pid": pid,
+                "tid": span["tid"],
+                "args": span.get("args", {}),
+            }
+            for span in spans
+        ]
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in {span["tid"]: span["thread"] for span in spans}.items()
+        )
+        output_file.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        return output_file
+
+
+def current() -> Telemetry | None:
+    return _CURRENT.get()
+
+
+class _Span:
+    __slots__ = ("collector", "name", "category", "args", "start_ns")
+
+    def __init__(self, collector: Telemetry, name: str, category: str, args: dict) -> None:
+        self.collector = collector
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self) -> "_Span":
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.collector.add_span(self.name, self.category, self.start_ns, time.perf_counter_ns(), self.args)
+
+
+def span(name: str, category: str = "stage", **args):
+    collector = _CURRENT.get()
+    if collector is None:
+        return _NOOP
+    return _Span(collector, name, category, args)
+
+
+class InstrumentedAdapter:
+    """Wraps an adapter so every extract call is recorded as an ``adapter`` span."""
+
+    def __init__(self, adapter) -> None:
+        self.adapter = adapter
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.adapter, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        if name.startswith("iter_"):
+
+            def streamed(*args, **kwargs):
+                # Span covers consumption, which is when a streaming extract does its work.
+                with span(name, "adapter"):
+                    yield from attr(*args, **kwargs)
+
+            return streamed
+
+        def timed(*args, **kwargs):
+            with span(name, "adapter"):
+                return attr(*args, **kwargs)
+
+        return timed
+
+
+def trace_path(settings: Settings) -> Path | None:
+    if not settings.trace_file:
+        return None
+    path = Path(settings.trace_file)
+    if settings.company_id is None:
+        return path
+    return path.with_name(f"{path.stem}_company_{settings.company_id}{path.suffix}")
+
+
+@contextmanager
+def collect(settings: Settings):
+    """Open a collector for a command run when telemetry is enabled.
+
+    Yields the collector only to the outermost run (which attaches the summary to its result);
+    nested runs such as month_end's bank stage report into the outer collector and get ``None``.
+    """
+    if not (settings.telemetry or settings.trace_file) or _CURRENT.get() is not None:
+        yield None
+        return
+    collector = Telemetry()
+    token = _CURRENT.set(collector)
+    try:
+        yield collector
+    finally:
+        _CURRENT.reset(token)
+        trace_file = trace_path(settings)
+        if trace_file is not None:
+            collector.export(trace_file)
@@ -0,0 +1,173 @@
+"""Rerun month-end as its inputs change, re-executing only the stages that read them.
+
+``run watch`` polls the fixture tree (or a replay dataset), the TRA file, the bank registry, the
+gating and petty cash rules and the overrides file. Each changed path maps to the stages that read it. Those
+stages rerun and every other stage's result is reused from the previous run, so a threshold or
+override edit only re-gates. Polling needs no extra dependency and also works on network shares,
+where file-system events are unreliable.
+"""
+
+from __future__ import annotations
+
+import stat
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+STAGES = ("bank_recon", "vat_pack", "petty_cash", "intercompany")
+GATING = "gating"
+
+# Top-level entries of the fixture tree (or of a company's subtree) and the stages that read them.
+# Anything else there (ledger snapshots, statement files) is not a month-end input.
+FIXTURE_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    "companies.json": ("bank_recon", "intercompany"),
+    "odoo_statement_lines": ("bank_recon",),
+    "fx": ("bank_recon",),
+    "vat": ("vat_pack",),
+    "petty_cash": ("petty_cash",),
+    "intercompany": ("intercompany",),
+    "store": STAGES,
+    "overrides": (GATING,),
+}
+
+
+@dataclass(frozen=True)
+class WatchInputs:
+    fixtures_dir: Path
+    registry_file: Path
+    rules_file: Path
+    overrides_file: Path
+    tra_file: Path | None = None
+    replay_dir: Path | None = None
+    petty_cash_rules_file: Path | None = None
+
+    def roots(self) -> list[Path]:
+        roots = [self.replay_dir or self.fixtures_dir, self.registry_file, self.rules_file, self.overrides_file]
+        for optional in (self.tra_file, self.petty_cash_rules_file):
+            if optional is not None:
+                roots.append(optional)
+        return roots
+
+    def stages_for(self, path: Path) -> set[str]:
+        """Stages whose results ``path`` feeds (``gating`` for rules and overrides); empty if none."""
+        if path == self.registry_file:
+            return {"bank_recon"}
+        if path == self.tra_file:
+            return {"vat_pack"}
+        if path == self.petty_cash_rules_file:
+            return {"petty_cash"}
+        if path in (self.rules_file, self.overrides_file):
+            return {GATING}
+        if self.replay_dir is not None and path.is_relative_to(self.replay_dir):
+            return set(STAGES)
+        if not path.is_relative_to(self.fixtures_dir):
+            return set()
+        parts = path.relative_to(self.fixtures_dir).parts
+        if parts[0] == "companies" and len(parts) > 2:
+            parts = parts[2:]
+        return set(FIXTURE_DEPENDENCIES.get(parts[0], ()))
+
+
+def snapshot(roots: Iterable[Path]) -> dict[Path, tuple[int, int]]:
+    """``(mtime_ns, size)`` of every file under ``roots``, skipping hidden files and editor backups."""
+    files = {}
+    for root in roots:
+        for path in root.rglob("*") if root.is_dir() else (root,):
+            if path.name.startswith(".") or path.name.endswith("~"):
+                continue
+            try:
+                info = path.stat()
+            except FileNotFoundError:
+                continue
+            if stat.S_ISREG(info.st_mode):
+                files[path] = (info.st_mtime_ns, info.st_size)
+    return files
+
+
+def changed_paths(before: dict[Path, tuple[int, int]], after: dict[Path, tuple[int, int]]) -> set[Path]:
+    return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+
+class Watcher:
+    """Debounced polling loop around ``run(stage_results)``, i.e. ``run_month_end`` bound to a period.
+
+    ``stage_results`` is the cache ``run_month_end`` reuses: a stage is dropped from it when one of
+    its inputs changes, and the run stores the fresh result back.
+    """
+
+    def __init__(
+        self,
+        inputs: WatchInputs,
+        run: Callable[[dict], dict],
+        debounce: float = 0.5,
+        poll_interval: float = 0.25,
+        before_run: Callable[[], None] | None = None,
+    ) -> None:
+        self.inputs = inputs
+        self.run = run
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.before_run = before_run
+        self.stage_results: dict = {}
+        self._snapshot = snapshot(inputs.roots())
+
+    def rerun(self, changed: set[Path] | None = None) -> dict | None:
+        """Rerun the stages ``changed`` feeds (all of them when ``changed`` is None) and re-gate.
+
+        Returns None when none of the changed paths is a month-end input.
+        """
+        if changed is None:
+            stale = set(STAGES)
+        else:
+            stale = set().union(*(self.inputs.stages_for(path) for path in changed))
+            if not stale:
+                return None
+        for stage in stale:
+            self.stage_results.pop(stage, None)
+        reused = sorted(self.stage_results)
+        summary = {
+            "changed": sorted(str(path) for path in changed or ()),
+            "rerun_stages": [stage for stage in STAGES if stage not in self.stage_results],
+            "reused_stages": reused,
+        }
+        if self.before_run is not None:
+            self.before_run()
+        try:
+            result = self.run(self.stage_results)
+        except Exception as exc:
+            # A half-saved fixture must not stop the watch. Failed stages stay out of the cache,
+            # so the next change retries them.
+            return {**summary, "error": f"{type(exc).__name__}: {exc}"}
+        return {
+            **summary,
+            "status": result["status"],
+            "proceed": result["proceed"],
+            "timings_ms": result["timings_ms"],
+        }
+
+    def wait_for_changes(self) -> set[Path]:
+        """Block until inputs changed and then stayed quiet for ``debounce`` seconds."""
+        pending: set[Path] = set()
+        last_change = 0.0
+        while True:
+            time.sleep(self.poll_interval)
+            current = snapshot(self.inputs.roots())
+            delta = changed_paths(self._snapshot, current)
+            self._snapshot = current
+            if delta:
+                pending |= delta
+                last_change = time.monotonic()
+            elif pending and time.monotonic() - last_change >= self.debounce:
+                return pending
+
+    def watch(self, emit: Callable[[dict], None], max_runs: int | None = None) -> int:
+        """Run everything once, then rerun on every debounced change; returns the number of runs."""
+        emit(self.rerun())
+        runs = 1
+        while max_runs is None or runs < max_runs:
+            summary = self.rerun(self.wait_for_changes())
+            if summary is not None:
+                emit(summary)
+                runs += 1
+        return runs
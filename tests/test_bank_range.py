@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from finance_ai_pack.cli import run_bank_recon_range
+from finance_ai_pack.config import Settings
+from finance_ai_pack.recon.bank import service
+
+
+class CountingAdapter:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def discover_companies(self) -> list[dict]:
+        self.calls.append("companies")
+        return [{"id": 1, "name": "Fixture Company", "currency": "TZS"}]
+
+    def get_currency_rates(self) -> list[dict]:
+        self.calls.append("rates")
+        return []
+
+    def discover_bank_journals(self) -> list[dict]:
+        self.calls.append("discover")
+        return [{"id": 7, "name": "NMB Main", "type": "bank", "currency": "TZS", "code": "nmb_tzs"}]
+
+    def get_statement_lines_range(self, journal: dict, period_from: str, period_to: str) -> list[dict]:
+        self.calls.append(f"lines:{period_from}:{period_to}")
+        return [
+            {"id": 1, "date": "2025-01-05", "amount": 100.0, "reference": "OLD", "is_reconciled": False},
+            {"id": 2, "date": "2025-02-10", "amount": 50.0, "reference": "OK", "is_reconciled": True},
+            {"id": 3, "date": "2025-03-20", "amount": 25.0, "reference": "NEW", "is_reconciled": False},
+        ]
+
+    def get_journal_balances(self, journal: dict, periods: list[str]) -> dict[str, float]:
+        self.calls.append("balances")
+        return {"2025-01": 100.0, "2025-02": 50.0, "2025-03": 25.0}
+
+
+def test_range_mode_discovers_once_and_rolls_forward(monkeypatch):
+    adapter = CountingAdapter()
+    monkeypatch.setattr(service, "build_adapter", lambda settings, fixtures_dir: adapter)
+
+    payload = service.reconcile_range("2025-01", "2025-03", fixtures_dir=Path("fixtures"), settings=Settings())
+
+    assert adapter.calls == ["companies", "rates", "discover", "lines:2025-01:2025-03", "balances"]
+    assert [m["period"] for m in payload["months"]] == ["2025-01", "2025-02", "2025-03"]
+    march = payload["roll_forward"][-1]
+    assert march["opening_unreconciled_count"] == 1
+    assert march["closing_unreconciled_count"] == 2
+    assert march["closing_unreconciled_amount"] == 125.0
+    # The January line is still open at the end of March, so it ages past 60 days.
+    assert payload["months"][2]["banks"][0]["unreconciled_aging_buckets"]["61_plus"] == 1
+
+
+def test_range_mode_cli_artifacts():
+    payload = run_bank_recon_range("2025-01", "2025-02")
+    assert payload["bank_controls_rollup"]["months"] == 2
+    assert payload["bank_controls_rollup"]["closing_unreconciled_count"] == 2
+    for artifact in payload["artifacts"].values():
+        assert Path(artifact).exists()
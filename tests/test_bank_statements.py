@@ -0,0 +1,118 @@
+import gzip
+import shutil
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from finance_ai_pack.cli import run_bank_recon, run_bank_recon_range
+from finance_ai_pack.config import Settings
+from finance_ai_pack.recon.bank.service import BankProfile, _bank_payload, reconcile
+from finance_ai_pack.recon.bank.statements import (
+    StatementFileAdapter,
+    detect_format,
+    iter_camt053,
+    iter_statement_file,
+)
+
+SAMPLES = Path("fixtures/bank_statements")
+EXPECTED = [("2025-01-11", 120055, "NBC-001"), ("2025-01-31", -4510, "NBC-002"), ("2025-02-03", -8000, "PAY-7781")]
+
+
+@pytest.mark.parametrize(
+    ("name", "fmt"),
+    [("nbc_usd_2025.camt053.xml", "camt053"), ("nbc_usd_2025.mt940", "mt940"), ("nbc_usd_2025.csv", "csv")],
+)
+def test_formats_parse_to_the_same_lines(name, fmt, tmp_path):
+    assert detect_format(SAMPLES / name) == fmt
+    compressed = tmp_path / f"{name}.gz"
+    with (SAMPLES / name).open("rb") as source, gzip.open(compressed, "wb") as target:
+        shutil.copyfileobj(source, target)
+
+    for path in (SAMPLES / name, compressed):
+        lines = list(iter_statement_file(path))
+        assert [(line["date"], line["amount_cents"], line["reference"]) for line in lines] == EXPECTED
+        assert lines[0]["payment_ref"] == "Customer receipt INV-0042" and lines[0]["currency"] == "USD"
+
+
+def test_statement_file_feeds_reconcile_and_flags_lines_missing_from_odoo():
+    settings = Settings(fixture_mode=True)
+    files = {"NBC USD": str(SAMPLES / "nbc_usd_2025.mt940")}
+    bank = next(
+        b
+        for b in reconcile("2025-01", Path("fixtures"), settings, statement_files=files)["banks"]
+        if b["code"] == "nbc_usd"
+    )
+    assert bank["statement_line_count"] == 2
+    assert bank["tie_out"]["statement_ending_balance"] == 1155.45
+    missing = next(e for e in bank["exceptions"] if e["type"] == "NOT_IMPORTED")
+    assert missing["sample_refs"] == ["NBC-002"]
+
+    payload = run_bank_recon_range(
+        "2025-01", "2025-02", settings=settings, statements={"nbc_usd": str(SAMPLES / "nbc_usd_2025.csv")}
+    )
+    february = {b["code"]: b for b in payload["months"][1]["banks"]}["nbc_usd"]
+    assert february["statement_line_count"] == 1 and february["carried_forward_unreconciled_count"] == 2
+    assert payload["statement_sources"]["NBC USD"] == "nbc_usd_2025.csv"
+    assert payload["notes"] == (
+        "No PDF parsing in v1; statement files used for NBC USD from nbc_usd_2025.csv; "
+        "Odoo statement lines for the rest."
+    )
+    assert run_bank_recon("2025-01", settings=settings)["notes"] == "No PDF parsing in v1; Odoo statement lines only."
+
+    with pytest.raises(ValueError, match="is a USD statement but NMB Main is TZS"):
+        reconcile("2025-01", Path("fixtures"), settings, statement_files={"nmb_tzs": str(SAMPLES / "nbc_usd_2025.csv")})
+
+
+def test_odoo_lines_missing_from_the_statement_file_are_reported():
+    class Adapter:
+        def get_statement_lines_range(self, journal, period_from, period_to):
+            return [
+                {"id": 1, "date": "2025-01-11", "amount": 1200.55, "reference": "NBC-001", "is_reconciled": True},
+                {"id": 2, "date": "2025-01-20", "amount": 99.0, "reference": "ODOO-ONLY", "is_reconciled": False},
+            ]
+
+    adapter = StatementFileAdapter(Adapter(), {"NBC USD": SAMPLES / "nbc_usd_2025.csv"})
+    lines = adapter.get_statement_lines_range({"name": "NBC USD", "currency": "USD"}, "2025-01", "2025-01")
+    assert not isinstance(lines, list)
+    assert [(line["reference"], line.get("in_odoo"), line.get("in_statement")) for line in lines] == [
+        ("NBC-001", True, None),
+        ("NBC-002", False, None),
+        ("ODOO-ONLY", None, False),
+    ]
+
+    bank = _bank_payload(
+        {"id": 7, "name": "NBC USD", "currency": "USD"},
+        BankProfile("nbc_usd", "NBC USD", "USD"),
+        adapter.get_statement_lines({"name": "NBC USD", "currency": "USD"}, "2025-01"),
+        115545,
+        "2025-01",
+    )
+    assert bank["statement_line_count"] == 2 and bank["tie_out"]["difference"] == 0.0
+    missing = next(e for e in bank["exceptions"] if e["type"] == "NOT_IN_STATEMENT")
+    assert missing["sample_refs"] == ["ODOO-ONLY"]
+
+
+def test_camt_parser_memory_does_not_grow_with_the_file(tmp_path):
+    entry = (
+        '<Ntry><Amt Ccy="USD">{amount}</Amt><CdtDbtInd>CRDT</CdtDbtInd><Sts>BOOK</Sts>'
+        "<BookgDt><Dt>2025-01-10</Dt></BookgDt><AcctSvcrRef>R{index}</AcctSvcrRef>"
+        "<AddtlNtryInf>Narrative for entry {index}</AddtlNtryInf></Ntry>\n"
+    )
+    path = tmp_path / "year.xml"
+    with path.open("w") as handle:
+        handle.write('<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.08"><BkToCstmrStmt>')
+        for _ in range(4):
+            handle.write("<Stmt><Acct><Id><IBAN>TZ59</IBAN></Id><Ccy>USD</Ccy></Acct>")
+            handle.write("".join(entry.format(amount=f"{i}.25", index=i) for i in range(2500)))
+            handle.write("</Stmt>")
+        handle.write("</BkToCstmrStmt></Document>")
+
+    tracemalloc.start()
+    try:
+        total = sum(line["amount_cents"] for line in iter_camt053(path))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert total == 4 * sum(i * 100 + 25 for i in range(2500))
+    assert peak < path.stat().st_size / 4
@@ -1,3 +1,7 @@
+from pathlib import Path
+
+import pytest
+
 from finance_ai_pack.cli import run_bank_recon, run_month_end, run_vat_pack
 
 
@@ -21,14 +25,18 @@ def test_cli_month_end_payload():
 
 
 def test_month_end_uses_input_output_differences_for_vat_gating(monkeypatch):
-    def fake_bank(period, settings=None):
+    def fake_bank(period, settings=None, writer=None):
         return {
             "mode": "fixture-only",
             "banks": [{"tie_out": {"difference": 0.0}}],
-            "bank_controls_rollup": {"total_statement_lines": 0, "total_reconciled_lines": 0},
+            "bank_controls_rollup": {
+                "total_statement_lines": 0,
+                "total_reconciled_lines": 0,
+                "unexplained_amount": 0.0,
+            },
         }
 
-    def fake_vat(period_from, period_to=None, settings=None, tra_file=None):
+    def fake_vat(period_from, period_to=None, settings=None, tra_file=None, writer=None):
         return {
             "monthly_summary": [
                 {
@@ -39,6 +47,7 @@ def test_month_end_uses_input_output_differences_for_vat_gating(monkeypatch):
                 }
             ],
             "exception_register": [],
+            "metrics": {"exception_count": 0},
         }
 
     monkeypatch.setattr("finance_ai_pack.cli.run_bank_recon", fake_bank)
@@ -49,3 +58,31 @@ def test_month_end_uses_input_output_differences_for_vat_gating(monkeypatch):
     payload = run_month_end("2025-01")
     assert payload["vat_controls_rollup"]["max_abs_vat_difference"] == 500.0
     assert payload["status"] == "RED"
+
+
+def test_month_end_reports_stage_timings_and_flushed_artifacts():
+    payload = run_month_end("2025-01")
+    timings = payload["timings_ms"]
+    assert set(timings) == {"bank_recon", "vat_pack", "petty_cash", "intercompany", "gating", "artifact_flush", "total"}
+    assert timings["total"] >= max(timings["bank_recon"], timings["vat_pack"])
+    for stage_artifacts in payload["artifacts"].values():
+        for artifact in stage_artifacts.values():
+            assert Path(artifact).exists()
+
+
+def test_artifact_writer_surfaces_write_failures_on_close():
+    from finance_ai_pack.outputs.writers import ArtifactWriter
+
+    def failing_write():
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        with ArtifactWriter() as writer:
+            writer.submit(failing_write)
+
+    # A failing block keeps its own exception; the write failure is attached as a note.
+    with pytest.raises(RuntimeError, match="gating failed") as excinfo:
+        with ArtifactWriter() as writer:
+            writer.submit(failing_write)
+            raise RuntimeError("gating failed")
+    assert excinfo.value.__notes__ == ["artifact write also failed: OSError: disk full"]
@@ -0,0 +1,73 @@
+import gzip
+import json
+from dataclasses import replace
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from finance_ai_pack import cli
+from finance_ai_pack.cli import run_vat_pack
+from finance_ai_pack.config import Settings
+from finance_ai_pack.outputs.columnar import SCHEMAS, export_rows
+
+LINES = [
+    {"bank": "nmb_tzs", "line_id": str(i), "date": f"2025-01-{i + 1:02d}", "reference": f"NMB-{i}", "amount": 0.1 * i}
+    for i in range(5)
+]
+
+
+def _ndjson(path: str) -> list[dict]:
+    with gzip.open(path, "rt") as handle:
+        return [json.loads(line) for line in handle]
+
+
+def test_ndjson_export_is_typed_partitioned_and_replaced_on_rerun(tmp_path):
+    files = export_rows(
+        SCHEMAS["bank_lines"], LINES, tmp_path, "ndjson", "company_1", periods=["2025-01"], row_group_rows=2
+    )
+    assert files == [str(tmp_path / "bank_lines" / "period=2025-01" / "entity=company_1" / "part-00000.ndjson.gz")]
+    rows = _ndjson(files[0])
+    assert [row["amount"] for row in rows] == ["0.00", "0.10", "0.20", "0.30", "0.40"]
+    assert rows[0] == {
+        "bank": "nmb_tzs",
+        "line_id": "0",
+        "date": "2025-01-01",
+        "reference": "NMB-0",
+        "amount": "0.00",
+        "aging_bucket": None,
+    }
+    schema = json.loads((tmp_path / "bank_lines" / "_schema.json").read_text())
+    assert schema["partition_by"] == ["period", "entity"]
+    assert {"name": "amount", "type": "decimal"} in schema["columns"]
+
+    export_rows(SCHEMAS["bank_lines"], LINES[:1], tmp_path, "ndjson", "company_1", periods=["2025-01"])
+    assert len(_ndjson(files[0])) == 1
+    # A month that is now clean must not keep last run's rows.
+    assert export_rows(SCHEMAS["bank_lines"], [], tmp_path, "ndjson", "company_1", periods=["2025-01"]) == []
+    assert not list((tmp_path / "bank_lines" / "period=2025-01" / "entity=company_1").iterdir())
+
+
+def test_vat_pack_exports_periods_as_partitions():
+    settings = replace(Settings.from_env(), fixture_mode=True, columnar_export="ndjson")
+    payload = run_vat_pack(period_from="2025-01", period_to="2025-02", settings=settings)
+    warehouse = cli.OUTPUTS_DIR / "warehouse"
+    summary_dir = Path(payload["artifacts"]["vat_monthly_summary_ndjson"])
+    assert summary_dir == warehouse / "vat_monthly_summary"
+    jan = _ndjson(summary_dir / "period=2025-01" / "entity=default" / "part-00000.ndjson.gz")
+    assert jan[0]["input_difference"] == "100.00" and "period" not in jan[0]
+    register = warehouse / "vat_exception_register" / "period=2025-01" / "entity=default" / "part-00000.ndjson.gz"
+    assert len(_ndjson(register)) == payload["metrics"]["exception_count"]
+
+
+def test_parquet_export_streams_row_groups_with_the_declared_schema(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    files = export_rows(
+        SCHEMAS["bank_lines"], LINES, tmp_path, "parquet", "default", periods=["2025-01"], row_group_rows=2
+    )
+    parquet_file = pq.ParquetFile(files[0])
+    assert parquet_file.metadata.num_row_groups == 3
+    table = parquet_file.read()
+    assert str(table.schema.field("amount").type) == "decimal128(18, 2)"
+    assert str(table.schema.field("date").type) == "date32[day]"
+    assert table.column("amount").to_pylist()[1] == Decimal("0.10")
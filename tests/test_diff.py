@@ -0,0 +1,78 @@
+import csv
+import json
+import shutil
+from pathlib import Path
+
+from finance_ai_pack.cli import run_bank_recon, run_diff
+from finance_ai_pack.config import Settings
+from finance_ai_pack.diff import diff_runs
+
+FIELDS = ["category", "document_ref", "notes", "period", "source_period", "tax_type", "vat_amount"]
+
+
+def _register(path: Path, rows: list[tuple]) -> Path:
+    path.mkdir(parents=True, exist_ok=True)
+    with (path / "vat_exception_register.csv").open("w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+    return path / "vat_exception_register.csv"
+
+
+def test_vat_register_diff_is_the_same_whether_or_not_it_spills(tmp_path):
+    before = [("missing documents", "", "no ref", "2025-01", "2025-01", "input", f"{i}.0") for i in range(10)]
+    before += [("rate mismatch", f"INV-{i}", "", "2025-01", "2025-01", "output", "18.0") for i in range(20)]
+    after = list(reversed(before[:-1]))
+    after[after.index(before[10])] = ("rate mismatch", "INV-0", "", "2025-01", "2025-01", "output", "36.0")
+    after.append(("rate mismatch", "INV-99", "", "2025-02", "2025-02", "output", "1.0"))
+    left, right = _register(tmp_path / "a", before), _register(tmp_path / "b", after)
+
+    in_memory = diff_runs(left, right, tmp_path / "memory.jsonl")
+    spilled = diff_runs(left, right, tmp_path / "spilled.jsonl", max_rows=4)
+    assert spilled["registers"][0]["spilled_runs"] > 2 and in_memory["registers"][0]["spilled_runs"] == 0
+    assert (tmp_path / "memory.jsonl").read_text() == (tmp_path / "spilled.jsonl").read_text()
+
+    summary = in_memory["registers"][0]
+    assert (summary["unchanged"], summary["changed"], summary["added"], summary["removed"]) == (28, 1, 1, 1)
+    assert summary["changed_fields"] == {"vat_amount": 1}
+    deltas = [json.loads(line) for line in (tmp_path / "memory.jsonl").read_text().splitlines()]
+    by_change = {delta["change"]: delta for delta in deltas}
+    assert by_change["changed"]["key"] == {"document_ref": "INV-0", "period": "2025-01"}
+    assert by_change["changed"]["fields"] == {"vat_amount": ["18.0", "36.0"]}
+    assert by_change["removed"]["key"]["document_ref"] == "INV-19"
+    assert by_change["added"]["key"] == {"document_ref": "INV-99", "period": "2025-02"}
+
+
+def test_run_directories_diff_bank_lines_and_rollups(tmp_path):
+    payload = run_bank_recon("2025-01", settings=Settings(fixture_mode=True))
+    run_a, run_b = tmp_path / "run_a", tmp_path / "run_b"
+    for run in (run_a, run_b):
+        run.mkdir()
+        for artifact in (payload["artifacts"]["json"], payload["artifacts"]["lines_csv"]):
+            shutil.copy(artifact, run)
+
+    lines_file = run_b / "bank_recon_2025-01_lines.csv"
+    rows = list(csv.DictReader(lines_file.open()))
+    assert [row["reference"] for row in rows] == ["NMB-001", "NBC-001"]
+    with lines_file.open("w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerow(rows[1])
+    report = json.loads((run_b / "bank_recon_2025-01.json").read_text())
+    report["banks"][0]["reconciled_count"] = 1
+    (run_b / "bank_recon_2025-01.json").write_text(json.dumps(report))
+
+    summary = run_diff(run_a, run_b, output=tmp_path / "delta")
+    by_artifact = {register["artifact"]: register for register in summary["registers"]}
+    assert by_artifact["bank_lines"]["removed"] == 1 and by_artifact["bank_lines"]["unchanged"] == 1
+    assert by_artifact["bank_rollup"]["changed_fields"] == {"reconciled_count": 1}
+    assert summary["totals"] == {"added": 0, "removed": 1, "changed": 1}
+    assert Path(summary["artifacts"]["json"]).exists()
+
+
+def test_clean_runs_with_header_only_registers_diff_to_nothing(tmp_path):
+    left, right = _register(tmp_path / "a", []), _register(tmp_path / "b", [])
+    summary = diff_runs(left, right, tmp_path / "delta.jsonl")
+    assert summary["totals"] == {"added": 0, "removed": 0, "changed": 0}
+    assert summary["registers"][0]["unchanged"] == 0
+    assert (tmp_path / "delta.jsonl").read_text() == ""
@@ -0,0 +1,95 @@
+import json
+import time
+from pathlib import Path
+
+from finance_ai_pack.cli import run_distributed, run_group
+from finance_ai_pack.config import Settings
+from finance_ai_pack.distributed import ShardQueue, merge_run, run_shard_worker
+from finance_ai_pack.scheduler import FAILED, QUEUED, RUNNING, SUCCEEDED, database_key
+
+SETTINGS = Settings(fixture_mode=True)
+COMPANIES = [{"id": 1, "name": "Tanzania", "currency": "TZS"}, {"id": 2, "name": "Kenya", "currency": "KES"}]
+
+
+def test_failed_shards_are_retried_then_marked_failed(tmp_path):
+    queue = ShardQueue(tmp_path / "shards.sqlite3", retry_delay=0)
+    run_id = queue.create_run("bank_recon", ["2025-01"], COMPANIES[:1], SETTINGS, max_attempts=2)
+    assert queue.claim("w1", "another-db") is None
+
+    shard = queue.claim("w1", database_key(SETTINGS))
+    assert shard["status"] == RUNNING and shard["attempts"] == 1
+    queue.fail(shard["shard_id"], "w1", "OdooConnectionError: timed out")
+    assert queue.get(shard["shard_id"])["status"] == QUEUED
+
+    shard = queue.claim("w2", database_key(SETTINGS))
+    assert shard["attempts"] == 2
+    queue.fail(shard["shard_id"], "w2", "OdooConnectionError: timed out")
+    run = queue.get_run(run_id)
+    assert run["done"] and run["shards"][FAILED] == 1
+    assert merge_run(queue, run_id)["failed_shards"][0]["error"] == "OdooConnectionError: timed out"
+
+
+def test_expired_lease_is_reclaimed_and_the_stale_worker_cannot_complete(tmp_path):
+    queue = ShardQueue(tmp_path / "shards.sqlite3", lease_seconds=0)
+    queue.create_run("bank_recon", ["2025-01"], COMPANIES[:1], SETTINGS)
+    first = queue.claim("w1", database_key(SETTINGS))
+    second = queue.claim("w2", database_key(SETTINGS))
+    assert second["shard_id"] == first["shard_id"] and second["attempts"] == 2
+    assert queue.complete(first["shard_id"], "w1", {}) is False
+    assert queue.heartbeat(first["shard_id"], "w1") is False
+    assert queue.fail(first["shard_id"], "w1", "late error") is False
+    assert queue.complete(second["shard_id"], "w2", {"bank_controls_rollup": {}}) is True
+
+
+def test_heartbeat_keeps_a_long_shard_from_being_run_twice(tmp_path, monkeypatch):
+    from finance_ai_pack import distributed
+
+    queue = ShardQueue(tmp_path / "shards.sqlite3", lease_seconds=0.3)
+    run_id = queue.create_run("bank_recon", ["2025-01"], COMPANIES[:1], SETTINGS)
+    reclaimed = []
+
+    def slow(shard, settings):
+        for _ in range(8):
+            time.sleep(0.1)
+            reclaimed.append(queue.claim("other", database_key(SETTINGS)))
+        return {"bank_controls_rollup": {}}
+
+    monkeypatch.setattr(distributed, "execute_shard", slow)
+    assert run_shard_worker(queue.db_path, SETTINGS, run_id=run_id, lease_seconds=0.3, poll_interval=0.01) == 1
+    assert reclaimed == [None] * 8
+    assert queue.shards(run_id)[0]["attempts"] == 1 and queue.get_run(run_id)["shards"][SUCCEEDED] == 1
+
+
+def test_worker_retries_a_flaky_shard(tmp_path, monkeypatch):
+    from finance_ai_pack import distributed
+
+    real, calls = distributed.execute_shard, []
+
+    def flaky(shard, settings):
+        calls.append(shard["shard_id"])
+        if len(calls) == 1:
+            raise ConnectionResetError("peer reset")
+        return real(shard, settings)
+
+    monkeypatch.setattr(distributed, "execute_shard", flaky)
+    queue = ShardQueue(tmp_path / "shards.sqlite3")
+    run_id = queue.create_run("bank_recon", ["2025-01"], COMPANIES, SETTINGS)
+    processed = run_shard_worker(queue.db_path, SETTINGS, run_id=run_id, poll_interval=0.01, retry_delay=0)
+    assert processed == 3
+    merged = merge_run(queue, run_id)
+    assert merged["failed_shards"] == []
+    assert [r["company"]["id"] for r in merged["periods"]["2025-01"]] == [1, 2]
+
+
+def test_worker_processes_merge_the_same_group_rollup_as_a_single_process_run(tmp_path):
+    payload = run_distributed(
+        "bank_recon", "2025-01", "2025-02", settings=SETTINGS, workers=2, db_path=tmp_path / "q.sqlite3", timeout=120
+    )
+    assert payload["shards"] == {"queued": 0, "running": 0, "succeeded": 4, "failed": 0}
+    assert [group["period"] for group in payload["groups"]] == ["2025-01", "2025-02"]
+
+    for group in payload["groups"]:
+        single = run_group("bank_recon", companies="all", settings=SETTINGS, period=group["period"])
+        assert group["complete"] is True
+        assert group["group_rollup"] == single["group_rollup"]
+        assert json.loads(Path(group["artifacts"]["json"]).read_text())["group_rollup"] == single["group_rollup"]
@@ -0,0 +1,86 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.fixture_store import (
+    FixtureStore,
+    IndexedFixturesAdapter,
+    SliceWriter,
+    convert_fixtures,
+)
+from finance_ai_pack.connectors.odoo.fixtures_adapter import FixturesAdapter
+from finance_ai_pack.recon.bank.service import reconcile
+from finance_ai_pack.recon.vat.service import reconcile_vat
+from finance_ai_pack.synthetic import SyntheticSpec, write_fixtures
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures"
+
+
+def test_indexed_adapter_matches_json_fixtures(tmp_path):
+    fixtures_dir = tmp_path / "fixtures"
+    shutil.copytree(FIXTURES, fixtures_dir)
+    summary = convert_fixtures(fixtures_dir)
+    assert summary["statement_lines"]["slices"] == 2
+    assert summary["vat_lines"]["rows"] > 0
+
+    json_adapter = FixturesAdapter(fixtures_dir)
+    indexed = IndexedFixturesAdapter(fixtures_dir)
+    for journal in json_adapter.discover_bank_journals():
+        assert indexed.get_statement_lines(journal, "2025-01") == json_adapter.get_statement_lines(journal, "2025-01")
+        assert indexed.get_statement_lines(journal, "2024-12") == []
+    for period in ("2025-01", "2025-02"):
+        for vat_type in ("input", "output"):
+            expected = json_adapter.get_vat_tax_lines(period, vat_type)
+            assert indexed.get_vat_tax_lines(period, vat_type) == expected
+    assert indexed.get_vat_control_balance("2025-01") == json_adapter.get_vat_control_balance("2025-01")
+
+    mappings = [mapped for _, mapped in indexed.store._datasets.values()]
+    indexed.close()
+    assert mappings and all(mapped.closed for mapped in mappings)
+    with IndexedFixturesAdapter(fixtures_dir) as reopened:
+        assert reopened.get_vat_tax_lines("2025-01", "input") == json_adapter.get_vat_tax_lines("2025-01", "input")
+    assert not reopened.store._datasets
+
+
+def test_slice_read_only_decodes_its_own_bytes(tmp_path):
+    with SliceWriter(tmp_path, "statement_lines") as writer:
+        writer.write_slice(("a", "2025-01"), [{"amount": 1}, {"amount": 2}])
+        writer.write_slice(("b", "2025-01"), [{"amount": 3}])
+        with pytest.raises(ValueError):
+            writer.write_slice(("a", "2025-01"), [])
+
+    # Corrupt slice "b"; reading "a" must not touch it.
+    offset, length, _ = json.loads((tmp_path / "statement_lines.idx.json").read_text())["slices"]["b|2025-01"]
+    data = bytearray((tmp_path / "statement_lines.jsonl").read_bytes())
+    data[offset : offset + length - 1] = b"x" * (length - 1)
+    (tmp_path / "statement_lines.jsonl").write_bytes(bytes(data))
+
+    with FixtureStore(tmp_path) as store:
+        assert list(store.iter_slice("statement_lines", "a", "2025-01")) == [{"amount": 1}, {"amount": 2}]
+        assert list(store.iter_slice("statement_lines", "missing", "2025-01")) == []
+        with pytest.raises(json.JSONDecodeError):
+            list(store.iter_slice("statement_lines", "b", "2025-01"))
+        _, mapped = store._datasets["statement_lines"]
+    assert mapped.closed and not store._datasets
+
+
+def test_indexed_store_reconciles_like_json(tmp_path):
+    spec = SyntheticSpec(lines=500, journals=3, vat_lines=200)
+    write_fixtures(spec, tmp_path)
+    convert_fixtures(tmp_path)
+
+    json_settings = Settings(fixture_mode=True)
+    indexed_settings = Settings(fixture_mode=True, fixture_store="indexed")
+    assert reconcile("2025-01", tmp_path, indexed_settings) == reconcile("2025-01", tmp_path, json_settings)
+    indexed_vat = reconcile_vat("2025-01", "2025-01", tmp_path, indexed_settings)
+    json_vat = reconcile_vat("2025-01", "2025-01", tmp_path, json_settings)
+    assert list(indexed_vat.pop("exception_register")) == list(json_vat.pop("exception_register"))
+    assert indexed_vat == json_vat
+
+    unconverted = tmp_path / "unconverted"
+    write_fixtures(SyntheticSpec(lines=10, journals=1), unconverted)
+    with pytest.raises(ValueError):
+        reconcile("2025-01", unconverted, indexed_settings)
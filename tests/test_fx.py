@@ -0,0 +1,91 @@
+import os
+import time
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.fx import RateTable, cache_file, convert_cents, load_rate_table
+from finance_ai_pack.group import consolidate_bank
+from finance_ai_pack.recon.bank.service import BankProfile, _bank_payload
+
+ROWS = [
+    {"currency": "USD", "date": "2025-01-15", "rate": 0.000396, "company_id": None},
+    {"currency": "USD", "date": "2025-01-01", "rate": 0.0004, "company_id": None},
+    {"currency": "USD", "date": "2025-01-01", "rate": 0.0005, "company_id": 1},
+    {"currency": "KES", "date": "2025-01-01", "rate": 0.0, "company_id": None},
+]
+
+
+class RatesAdapter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def discover_companies(self) -> list[dict]:
+        return [{"id": 1, "name": "Chezhira Tanzania Ltd", "currency": "TZS"}]
+
+    def get_currency_rates(self) -> list[dict]:
+        self.calls += 1
+        return ROWS
+
+
+def test_rate_lookup_uses_latest_rate_on_or_before_the_date():
+    table = RateTable.from_rows("TZS", ROWS)
+    assert table.rates["USD"] == (["2025-01-01", "2025-01-15"], [0.0005, 0.000396])
+    assert not table.has("KES")
+    assert table.rate_on("USD", "2024-12-31") == 0.0005
+    assert table.rate_on("USD", "2025-01-14") == 0.0005
+    assert table.rate_on("USD", "2025-01-15") == 0.000396
+    assert convert_cents(100, 0.0004) == 250_000 and convert_cents(-1, 0.3) == -3
+
+    lines = [
+        {"date": "2025-01-10", "amount_cents": 100},
+        {"date": "2025-01-10", "amount_cents": 100},
+        {"date": "2025-01-20", "amount": 0.99},
+    ]
+    assert table.convert_lines("USD", lines) == 200_000 + 200_000 + 250_000
+    assert table.convert_lines("TZS", lines) == 299
+
+
+def test_payload_ties_out_in_company_currency_and_flags_missing_rates():
+    table = RateTable.from_rows("TZS", ROWS)
+    lines = [{"date": "2025-01-20", "amount_cents": 120_055, "is_reconciled": True}]
+    journal = {"id": 2, "name": "NBC USD", "currency": "USD"}
+    payload = _bank_payload(journal, BankProfile("nbc_usd", "NBC USD", "USD"), lines, 303_169_192, "2025-01", fx=table)
+    tie_out = payload["tie_out"]
+    assert tie_out["statement_ending_balance"] == 1200.55 and tie_out["statement_balance_company"] == 3031691.92
+    assert tie_out["difference"] == 0.0 and tie_out["company_currency"] == "TZS"
+    assert payload["exceptions"] == []
+
+    kes = {"id": 3, "name": "KCB KES", "currency": "KES"}
+    payload = _bank_payload(kes, BankProfile("kcb_kes", "KCB KES", "KES"), lines, 120_055, "2025-01", fx=table)
+    assert [e["type"] for e in payload["exceptions"]] == ["FX_RATE_MISSING"]
+    assert payload["tie_out"]["difference"] == 0.0
+
+    results = [
+        {"bank_controls_rollup": {"company_currency": currency, "unexplained_amount": amount, **totals}}
+        for currency, amount in (("TZS", 10.5), ("KES", 2.25), ("TZS", 0.25))
+        for totals in [{"total_statement_lines": 1, "total_reconciled_lines": 1, "bank_count": 1, "exception_count": 0}]
+    ]
+    assert consolidate_bank(results)["unexplained_amount_by_currency"] == {"KES": 2.25, "TZS": 10.75}
+
+
+def test_live_rate_table_is_cached_on_disk_until_the_ttl(tmp_path):
+    adapter = RatesAdapter()
+    live = Settings(fixture_mode=False, odoo_url="http://odoo", odoo_db="prod", company_id=1)
+    first = load_rate_table(adapter, live, tmp_path)
+    second = load_rate_table(adapter, live, tmp_path)
+    assert adapter.calls == 1 and second.rates == first.rates and second.company_currency == "TZS"
+    assert cache_file(tmp_path, live).exists()
+
+    load_rate_table(
+        adapter, Settings(fixture_mode=False, odoo_url="http://odoo", odoo_db="prod", fx_cache_ttl=0), tmp_path
+    )
+    load_rate_table(adapter, Settings(), tmp_path)
+    assert adapter.calls == 3
+
+
+def test_rate_table_cache_prunes_expired_files(tmp_path):
+    expired = tmp_path / "rates_0123456789abcdef.json"
+    expired.write_text("{}")
+    os.utime(expired, (time.time() - 7200, time.time() - 7200))
+    live = Settings(fixture_mode=False, odoo_url="http://odoo", odoo_db="prod", fx_cache_ttl=3600)
+    load_rate_table(RatesAdapter(), live, tmp_path)
+    assert sorted(tmp_path.iterdir()) == [cache_file(tmp_path, live)]
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import pytest
+
+from finance_ai_pack.cli import FIXTURES, run_group
+from finance_ai_pack.config import Settings
+from finance_ai_pack.group import resolve_companies, worst_status
+
+
+def test_resolve_companies_all_and_subset():
+    settings = Settings(fixture_mode=True)
+    assert [c["id"] for c in resolve_companies("all", settings, FIXTURES)] == [1, 2]
+    assert [c["id"] for c in resolve_companies("2", settings, FIXTURES)] == [2]
+    with pytest.raises(ValueError, match="Unknown company ids: 99"):
+        resolve_companies("1,99", settings, FIXTURES)
+
+
+def test_group_month_end_writes_per_company_and_group_artifacts():
+    payload = run_group("month_end", companies="all", settings=Settings(fixture_mode=True), period="2025-01")
+    assert payload["scope"] == "group"
+    assert [c["company"]["id"] for c in payload["companies"]] == [1, 2]
+    kenya = payload["companies"][1]
+    assert kenya["bank_controls_rollup"]["total_statement_lines"] == 2
+    assert "company_2" in kenya["artifacts"]["bank_recon"]["json"]
+    assert payload["group_rollup"]["status"] == worst_status([c["status"] for c in payload["companies"]])
+    for artifact in payload["artifacts"].values():
+        assert Path(artifact).exists()
+
+
+def test_group_bank_recon_consolidates_line_counts():
+    payload = run_group("bank_recon", companies="all", settings=Settings(fixture_mode=True), period="2025-01")
+    assert payload["group_rollup"]["total_statement_lines"] == 4
+    assert payload["group_rollup"]["total_reconciled_lines"] == 1
@@ -0,0 +1,84 @@
+from itertools import combinations
+from pathlib import Path
+
+from finance_ai_pack.cli import run_intercompany
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.live_adapter import LiveOdooAdapter
+from finance_ai_pack.recon.intercompany.service import match_balances, reconcile
+from finance_ai_pack.rules.month_end_gating import AMBER, GREEN, RED, evaluate
+
+
+class GroupClient:
+    """Fifteen companies, each carrying one open invoice against every other company."""
+
+    def __init__(self, count: int = 15) -> None:
+        self.count = count
+        self.calls: list[str] = []
+
+    def search_read(self, model, domain, fields=None, order=None, limit=None, offset=0, context=None):
+        self.calls.append(model)
+        return [{"id": i, "partner_id": [100 + i, f"Company {i}"]} for i in range(1, self.count + 1)]
+
+    def read_group(self, model, domain, fields, groupby, context=None, lazy=False):
+        self.calls.append(model)
+        groups = []
+        for first, second in combinations(range(1, self.count + 1), 2):
+            reference = f"INV/{first}/{second}"
+            groups.append(
+                {
+                    "company_id": [first, f"Company {first}"],
+                    "partner_id": [100 + second, f"Company {second}"],
+                    "currency_id": [1, "USD"],
+                    "account_type": "asset_receivable",
+                    "move_name": reference,
+                    "ref": False,
+                    "amount_residual_currency": 100.0,
+                }
+            )
+            groups.append(
+                {
+                    "company_id": [second, f"Company {second}"],
+                    "partner_id": [100 + first, f"Company {first}"],
+                    "currency_id": [1, "USD"],
+                    "account_type": "liability_payable",
+                    "move_name": f"BILL/{second}/{first}",
+                    "ref": reference,
+                    "amount_residual_currency": -100.0 if (first, second) != (1, 2) else -90.0,
+                }
+            )
+        return groups
+
+
+def test_fixture_balances_match_and_report_mismatches():
+    result = reconcile("2025-01", Path("fixtures"), Settings(fixture_mode=True))
+    rollup = result["intercompany_controls_rollup"]
+    assert rollup["matched_count"] == 1 and rollup["mismatch_count"] == 2
+    assert rollup["unexplained_by_currency"] == {"KES": 150000.0, "USD": 50.0}
+
+    by_reference = {m["reference"]: m for m in result["mismatches"]}
+    assert by_reference["INV/2025/0011"]["type"] == "AMOUNT_MISMATCH"
+    assert by_reference["INV/2025/0011"]["difference"] == 50.0
+    assert by_reference["KE/MGMT/2025/001"]["type"] == "MISSING_COUNTERPART"
+    assert by_reference["KE/MGMT/2025/001"]["booked_by"] == 2
+
+    payload = run_intercompany("2025-01", settings=Settings(fixture_mode=True))
+    assert Path(payload["artifacts"]["mismatches_csv"]).exists()
+
+
+def test_fifteen_companies_are_matched_from_one_grouped_query():
+    client = GroupClient()
+    rows = LiveOdooAdapter(client).get_intercompany_balances("2025-01")
+    assert client.calls == ["res.company", "account.move.line"]
+    assert len(rows) == 2 * 105
+    assert rows[1]["reference"] == "INV/1/2" and rows[1]["amount_cents"] == -9000
+
+    matched = match_balances(rows)
+    assert len(matched["pairs"]) == 105
+    assert matched["matched_count"] == 104
+    assert [m["reference"] for m in matched["mismatches"]] == ["INV/1/2"]
+
+
+def test_intercompany_mismatches_gate_month_end():
+    assert evaluate(0, 0, [0], intercompany_mismatches=0) == GREEN
+    assert evaluate(0, 0, [0], intercompany_mismatches=2) == AMBER
+    assert evaluate(0, 0, [0], intercompany_mismatches=3) == RED
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.recon.ledger.service import reconcile, state_key
+
+FIXTURES = Path("fixtures")
+
+
+def test_ledger_trial_balance_and_control_accounts(tmp_path):
+    payload = reconcile("2025-01", fixtures_dir=FIXTURES, state_dir=tmp_path, settings=Settings())
+    assert payload["opening_source"] == "cold_start"
+
+    tb = {row["account_code"]: row for row in payload["trial_balance"]}
+    assert tb["1100"]["opening_balance"] == 2000000.0
+    assert tb["1100"]["closing_balance"] == 751180.0
+
+    controls = {row["account_code"]: row for row in payload["control_accounts"]}
+    assert controls["1010"]["difference"] == 0.0
+    assert controls["2100"]["difference"] == -90.0
+    assert controls["1020"]["difference"] == -1200.55
+
+    types = [item["type"] for item in payload["exceptions"]]
+    assert "UNBALANCED_MOVE" in types
+    assert payload["unbalanced_moves"][0]["move"] == "MISC/2025/0003"
+
+
+def test_ledger_carries_forward_previous_closing(tmp_path):
+    reconcile("2025-01", fixtures_dir=FIXTURES, state_dir=tmp_path, settings=Settings())
+    february = reconcile("2025-02", fixtures_dir=FIXTURES, state_dir=tmp_path, settings=Settings())
+
+    assert february["opening_source"] == "carried_forward:2025-01"
+    tb = {row["account_code"]: row for row in february["trial_balance"]}
+    assert tb["1100"]["opening_balance"] == 751180.0
+    assert tb["1100"]["closing_balance"] == 751180.0
+
+    rebuilt = reconcile("2025-02", fixtures_dir=FIXTURES, state_dir=tmp_path, settings=Settings(), rebuild=True)
+    assert rebuilt["opening_source"] == "cold_start"
+
+
+def test_ledger_state_is_kept_per_mode_and_database(tmp_path):
+    reconcile("2025-01", fixtures_dir=FIXTURES, state_dir=tmp_path, settings=Settings())
+    assert (tmp_path / "fixtures" / "trial_balance_2025-01.json").exists()
+
+    prod = Settings(fixture_mode=False, odoo_url="https://odoo/", odoo_db="prod")
+    assert state_key(prod) == state_key(Settings(fixture_mode=False, odoo_url="https://odoo", odoo_db="prod"))
+    assert len({state_key(Settings()), state_key(prod), state_key(Settings(fixture_mode=False, odoo_db="test"))}) == 3
+    assert state_key(Settings(replay_dir=str(tmp_path / "a"))) != state_key(Settings(replay_dir=str(tmp_path / "b")))
@@ -0,0 +1,47 @@
+from decimal import Decimal
+
+import pytest
+
+from finance_ai_pack.money import amount_cents, format_cents, from_cents, to_cents
+from finance_ai_pack.recon.bank.service import BankProfile, _bank_payload
+
+
+@pytest.mark.parametrize(
+    ("value", "cents"),
+    [
+        (0.1, 10),
+        (1.005, 101),
+        (-1.005, -101),
+        (-0.29, -29),
+        (12345678901.23, 1234567890123),
+        (7, 700),
+        ("1,234.565", 123457),
+        (" -0.5 ", -50),
+        (Decimal("2.675"), 268),
+        (None, 0),
+        (False, 0),
+    ],
+)
+def test_to_cents(value, cents):
+    assert to_cents(value) == cents
+
+
+def test_round_trip_and_formatting():
+    assert from_cents(123450) == 1234.5 and repr(from_cents(-1)) == "-0.01"
+    assert format_cents(-123405) == "-1234.05" and format_cents(7) == "0.07"
+    assert amount_cents({"amount": 0.3}) == 30 and amount_cents({"amount": 0.3, "amount_cents": 31}) == 31
+    with pytest.raises(ValueError, match="Not a money amount"):
+        to_cents("twelve")
+
+
+def test_tie_out_is_exact_over_many_lines():
+    lines = [{"amount": 0.1, "amount_cents": 10, "is_reconciled": True}] * 3
+    journal = {"id": 1, "name": "NMB"}
+    payload = _bank_payload(journal, BankProfile("nmb", "NMB", "TZS"), lines, to_cents(0.29), "2025-01")
+    # 0.1 + 0.1 + 0.1 - 0.29 is 0.010000000000000064 in floats, which used to exceed the 0.01 tolerance.
+    assert payload["tie_out"]["difference"] == 0.01
+    assert not [e for e in payload["exceptions"] if e["type"] == "TIE_OUT_DIFFERENCE"]
+
+    million = [{"amount_cents": 1}] * 1_000_000
+    payload = _bank_payload(journal, BankProfile("nmb", "NMB", "TZS"), million, 1_000_000, "2025-01")
+    assert payload["tie_out"]["statement_ending_balance"] == 10000.0 and payload["tie_out"]["difference"] == 0.0
@@ -0,0 +1,64 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.recon.petty_cash.service import PettyCashRules, review, review_lines
+from finance_ai_pack.rules.month_end_gating import evaluate
+
+FIXTURES = Path("fixtures")
+
+
+def test_petty_cash_review_flags_float_split_and_duplicate():
+    payload = review("2025-01", fixtures_dir=FIXTURES, settings=Settings())
+
+    assert payload["metrics"]["journal_count"] == 2
+    by_type = payload["metrics"]["exceptions_by_type"]
+    assert by_type["SPLIT_TRANSACTION"] == 1
+    assert by_type["FLOAT_LIMIT_EXCEEDED"] == 2
+    assert by_type["DUPLICATE_VOUCHER"] == 1
+
+    split = next(item for item in payload["exceptions"] if item["type"] == "SPLIT_TRANSACTION")
+    assert split["voucher_refs"] == ["ARU-PCV-002", "ARU-PCV-003"]
+
+
+def test_review_lines_requires_date_order():
+    rules = PettyCashRules(default_float_limit=1000.0, approval_limit=500.0)
+    lines = [
+        {"journal": "PC", "date": "2025-01-05", "amount": -10.0, "voucher_ref": "A", "payee": "x"},
+        {"journal": "PC", "date": "2025-01-04", "amount": -10.0, "voucher_ref": "B", "payee": "x"},
+    ]
+    with pytest.raises(ValueError, match="date order"):
+        review_lines(lines, [{"name": "PC"}], rules)
+
+
+def test_petty_cash_exceptions_drive_gating():
+    assert evaluate(0, 0.0, [0.0], petty_cash_exceptions=0) == "GREEN"
+    assert evaluate(0, 0.0, [0.0], petty_cash_exceptions=2) == "AMBER"
+    assert evaluate(0, 0.0, [0.0], petty_cash_exceptions=6) == "RED"
+
+
+def test_float_opens_at_the_statement_balance_when_there_is_one(tmp_path):
+    rules = PettyCashRules(default_float_limit=1000.0, approval_limit=500.0)
+    lines = [{"journal": "PC", "date": "2025-01-05", "amount": -150.0, "voucher_ref": "A", "payee": "x"}]
+
+    assumed = review_lines(lines, [{"name": "PC"}], rules)
+    assert assumed["exceptions"] == []
+    assert assumed["journals"][0]["opening_cash"] == 1000.0
+    assert assumed["journals"][0]["opening_cash_basis"] == "assumed_float_limit"
+
+    actual = review_lines(lines, [{"name": "PC"}], rules, opening={"PC": 100.0})
+    assert [item["type"] for item in actual["exceptions"]] == ["FLOAT_LIMIT_EXCEEDED"]
+    assert actual["journals"][0]["opening_cash_basis"] == "statement_balance"
+    assert actual["journals"][0]["closing_cash"] == -50.0
+
+    fixtures = tmp_path / "fixtures"
+    shutil.copytree(FIXTURES / "petty_cash", fixtures / "petty_cash")
+    (fixtures / "petty_cash" / "opening_balances_2025-01.json").write_text(json.dumps({"pc_arusha": 250000}))
+    journals = {
+        row["journal"]: row for row in review("2025-01", fixtures_dir=fixtures, settings=Settings())["journals"]
+    }
+    assert journals["Petty Cash Arusha"]["opening_cash"] == 250000.0
+    assert journals["Petty Cash Mwanza"]["opening_cash_basis"] == "assumed_float_limit"
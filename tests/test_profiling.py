@@ -0,0 +1,65 @@
+import pstats
+
+import pytest
+
+from finance_ai_pack.cli import run_month_end
+from finance_ai_pack.config import Settings
+from finance_ai_pack.profiling import PER_THREAD_CPROFILE, profile
+
+
+@pytest.mark.skipif(not PER_THREAD_CPROFILE, reason="3.12+ uses one process-wide profiler; nothing to merge")
+def test_cprofile_merges_stage_threads(tmp_path):
+    with profile("cprofile", tmp_path / "month_end_2025-01", top=50) as report:
+        run_month_end("2025-01", settings=Settings(fixture_mode=True))
+    artifact = tmp_path / "month_end_2025-01_profile.pstats"
+    assert report["artifacts"] == [str(artifact)]
+    # Bank reconciliation runs on a stage thread, so it is only visible if per-thread stats merged.
+    functions = {name for _, _, name in pstats.Stats(str(artifact)).stats}
+    assert {"run_month_end", "reconcile", "reconcile_vat"} <= functions
+    assert len(report["top_functions"]) <= 50
+    assert report["wall_ms"] > 0
+
+
+def test_cprofile_single_profiler_does_not_break_stage_threads(tmp_path, monkeypatch):
+    from finance_ai_pack import profiling
+
+    # The 3.12+ path: no per-thread hook, so stage threads run unprofiled rather than dying.
+    monkeypatch.setattr(profiling, "PER_THREAD_CPROFILE", False)
+    with profile("cprofile", tmp_path / "month_end_2025-01") as report:
+        payload = run_month_end("2025-01", settings=Settings(fixture_mode=True))
+    assert payload["status"] and report["top_functions"]
+    assert "run_month_end" in {name for _, _, name in pstats.Stats(report["artifacts"][0]).stats}
+
+
+def test_tracemalloc_reports_peak_and_allocation_sites(tmp_path):
+    with profile("tracemalloc", tmp_path / "alloc", top=5) as report:
+        retained = [bytearray(64 * 1024) for _ in range(16)]
+    assert retained
+    assert report["peak_memory_bytes"] >= 16 * 64 * 1024
+    assert len(report["top_allocations"]) <= 5
+    assert report["top_allocations"][0]["file"] == "test_profiling.py"
+    header = (tmp_path / "alloc_allocations.csv").read_text().splitlines()[0]
+    assert set(header.split(",")) == {"file", "line", "size_bytes", "count"}
+
+
+def test_sampling_writes_collapsed_stacks(tmp_path):
+    def spin(seconds):
+        import time
+
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pass
+
+    with profile("sampling", tmp_path / "busy", interval=0.001) as report:
+        spin(0.1)
+    lines = (tmp_path / "busy_stacks.folded").read_text().splitlines()
+    assert report["samples"] > 0 and lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+    assert any("(spin)" in row["function"] for row in report["top_functions"])
+
+
+def test_unknown_profile_mode(tmp_path):
+    with pytest.raises(ValueError):
+        with profile("perf", tmp_path / "x"):
+            pass
@@ -0,0 +1,100 @@
+import gzip
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.pool import reset_pools
+from finance_ai_pack.connectors.odoo.recording import Recorder, RecordingAdapter, ReplayAdapter, close_recorders
+from finance_ai_pack.connectors.odoo.standin import OdooStandin
+from finance_ai_pack.recon.bank.service import reconcile
+from finance_ai_pack.recon.vat.service import reconcile_vat
+from finance_ai_pack.synthetic import SyntheticSpec
+
+
+class _Source:
+    def get_total(self, period: str) -> dict:
+        return {"period": period, "total": 12.5}
+
+    def iter_rows(self, period: str):
+        for idx in range(5):
+            yield {"period": period, "idx": idx}
+
+    def get_moves(self, period: str) -> list[dict]:
+        return [
+            {
+                "journal_id": (7, "NMB Main"),
+                "date": date(2025, 1, 31),
+                "amount": Decimal("-150.25"),
+                "balances": {2025: 1.5, (1, "USD"): [2.0]},
+                "tags": [],
+            }
+        ]
+
+
+def test_record_then_replay_values_and_streams(tmp_path):
+    recorder = Recorder(tmp_path, queue_size=1)
+    adapter = RecordingAdapter(_Source(), recorder, company_id=3)
+    assert adapter.get_total("2025-01") == {"period": "2025-01", "total": 12.5}
+    assert list(adapter.iter_rows(period="2025-01"))[-1] == {"period": "2025-01", "idx": 4}
+    recorder.close()
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["stats"]["calls"] == 2 and manifest["stats"]["items"] == 5
+    assert {entry["kind"] for entry in manifest["calls"].values()} == {"value", "stream"}
+    recorded = next(tmp_path.glob("get_total/*.jsonl.gz"))
+    with gzip.open(recorded, "rt") as handle:
+        assert json.loads(handle.readline())["args"] == ["2025-01"]
+
+    replay = ReplayAdapter(tmp_path, company_id=3)
+    assert replay.get_total("2025-01") == {"period": "2025-01", "total": 12.5}
+    assert [row["idx"] for row in replay.iter_rows(period="2025-01")] == [0, 1, 2, 3, 4]
+    with pytest.raises(ValueError):
+        replay.get_total("2025-02")
+    with pytest.raises(ValueError):
+        ReplayAdapter(tmp_path, company_id=4).get_total("2025-01")
+
+
+def test_replay_restores_the_recorded_types(tmp_path):
+    recorder = Recorder(tmp_path)
+    live = RecordingAdapter(_Source(), recorder).get_moves("2025-01")
+    recorder.close()
+
+    replayed = ReplayAdapter(tmp_path).get_moves("2025-01")
+    assert replayed == live
+    assert type(replayed[0]["journal_id"]) is tuple and type(replayed[0]["amount"]) is Decimal
+    assert list(replayed[0]["balances"]) == [2025, (1, "USD")]
+
+
+def test_live_run_replays_offline_without_odoo(tmp_path):
+    server = OdooStandin.from_spec(SyntheticSpec(lines=80, journals=2, vat_lines=30), db_path=tmp_path / "odoo.db")
+    server.start()
+    dataset = tmp_path / "recorded"
+    live = Settings(
+        fixture_mode=False,
+        odoo_url=server.url,
+        odoo_db="bench",
+        odoo_username="u",
+        odoo_password="x",
+        record_dir=str(dataset),
+    )
+    try:
+        bank_live = reconcile("2025-01", tmp_path, live)
+        vat_live = reconcile_vat("2025-01", "2025-01", tmp_path, live)
+    finally:
+        server.stop()
+        reset_pools()
+        close_recorders()
+
+    replay = Settings(fixture_mode=True, replay_dir=str(dataset))
+    bank_replay = reconcile("2025-01", tmp_path, replay)
+    vat_replay = reconcile_vat("2025-01", "2025-01", tmp_path, replay)
+    # Only the mode label differs between a live run and its replay.
+    assert bank_live.pop("mode") == "live-odoo" and bank_replay.pop("mode") == "fixture-only"
+    assert bank_replay == bank_live
+    assert vat_replay.pop("mode") == "fixture-only"
+    vat_live.pop("mode")
+    assert list(vat_replay.pop("exception_register")) == list(vat_live.pop("exception_register"))
+    assert vat_replay == vat_live
@@ -0,0 +1,76 @@
+import sqlite3
+
+import pytest
+
+from finance_ai_pack import cli
+from finance_ai_pack.cli import run_bank_recon_range, run_month_end
+from finance_ai_pack.config import Settings
+from finance_ai_pack.rollups import RollupStore, months_back
+
+
+def _bank(name: str, pct: float, difference: float = 0.0) -> dict:
+    return {
+        "display_name": name,
+        "journal": name.upper(),
+        "currency": "TZS",
+        "statement_line_count": 10,
+        "reconciled_count": int(pct / 10),
+        "reconciled_pct": pct,
+        "tie_out": {"statement_ending_balance": 100.0, "ledger_balance": 100.0 - difference, "difference": difference},
+        "exceptions": [],
+    }
+
+
+def test_upserts_replace_rows_and_trends_fill_missing_months(tmp_path):
+    store = RollupStore(tmp_path / "rollups.sqlite3")
+    settings = Settings(fixture_mode=True)
+    store.upsert_bank("2024-11", [_bank("NMB", 50.0), _bank("CRDB", 80.0)], settings)
+    store.upsert_bank("2025-01", [_bank("NMB", 70.0)], settings)
+    store.upsert_bank("2025-01", [_bank("NMB", 90.0)], settings)
+    store.upsert_bank("2025-01", [_bank("NMB", 10.0)], Settings(fixture_mode=True, company_id=2))
+
+    trends = store.trends("bank_reconciled_pct", settings, months=3)
+    assert trends["periods"] == ["2024-11", "2024-12", "2025-01"]
+    assert trends["series"] == [
+        {"label": "CRDB", "values": [80.0, None, None]},
+        {"label": "NMB", "values": [50.0, None, 90.0]},
+    ]
+    assert store.trends("bank_reconciled_pct", settings, months=1, bank="CRDB")["series"] == []
+
+    # A rerun replaces the period's banks: one that has left the period drops out.
+    store.upsert_bank("2024-11", [_bank("NMB", 60.0)], settings)
+    assert [s["label"] for s in store.trends("bank_reconciled_pct", settings, months=3)["series"]] == ["NMB"]
+    store.upsert_bank("2024-11", [], settings)
+    assert store.trends("bank_reconciled_pct", settings, months=3)["series"][0]["values"] == [None, None, 90.0]
+    assert store.trends("bank_reconciled_pct", Settings(fixture_mode=True, company_id=2))["series"] != []
+
+    with sqlite3.connect(store.db_path) as conn:
+        plan = " ".join(
+            row[-1]
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT period FROM bank_rollups WHERE database = ? AND company_id = ? AND bank = ?",
+                ("fixtures", 0, "NMB"),
+            )
+        )
+    assert "bank_rollups_bank" in plan
+
+    with pytest.raises(ValueError, match="metric must be one of"):
+        store.trends("nope", settings)
+    assert months_back("2025-01", 24) == "2023-02"
+
+
+def test_commands_materialize_rollups(tmp_path, monkeypatch):
+    monkeypatch.setattr(cli, "OUTPUTS_DIR", tmp_path)
+    settings = Settings(fixture_mode=True)
+    bank = run_bank_recon_range("2024-12", "2025-02", settings=settings)
+    month_end = run_month_end("2025-01", settings=settings)
+
+    store = RollupStore(tmp_path / ".rollups" / "rollups.sqlite3")
+    reconciled = store.trends("bank_reconciled_pct", settings, months=24)
+    assert reconciled["periods"][-1] == "2025-02" and len(reconciled["periods"]) == 24
+    expected = {b["display_name"]: b["reconciled_pct"] for b in bank["months"][0]["banks"]}
+    assert {s["label"]: s["values"][-3] for s in reconciled["series"]} == expected
+
+    vat = store.trends("vat_net_vat_difference", settings, months=1)
+    assert vat["periods"] == ["2025-01"] and len(vat["series"]) == 1
+    assert store.trends("close_status", settings, months=1)["series"][0]["values"] == [month_end["status"]]
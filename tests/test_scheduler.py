@@ -0,0 +1,99 @@
+import time
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.scheduler import RUNNING, SUCCEEDED, JobScheduler, process_job, run_or_attach, run_worker
+
+SETTINGS = Settings(fixture_mode=True)
+
+
+def test_identical_requests_attach_to_in_flight_job(tmp_path):
+    scheduler = JobScheduler(tmp_path / "jobs.sqlite3", coalesce_seconds=0)
+    first = scheduler.submit("month_end", {"period": "2025-01"}, SETTINGS)
+    second = scheduler.submit("month_end", {"period": "2025-01"}, SETTINGS)
+    other = scheduler.submit("month_end", {"period": "2025-02"}, SETTINGS)
+
+    assert second["job_id"] == first["job_id"]
+    assert second["deduplicated"] is True
+    assert second["requests"] == 2
+    assert other["job_id"] != first["job_id"]
+
+
+def test_coalescing_window_delays_claim(tmp_path):
+    scheduler = JobScheduler(tmp_path / "jobs.sqlite3", coalesce_seconds=60)
+    scheduler.submit("month_end", {"period": "2025-01"}, SETTINGS)
+    assert scheduler.claim("w1") is None
+
+
+def test_claim_respects_per_database_limit(tmp_path):
+    scheduler = JobScheduler(tmp_path / "jobs.sqlite3", coalesce_seconds=0)
+    scheduler.submit("month_end", {"period": "2025-01"}, SETTINGS)
+    scheduler.submit("month_end", {"period": "2025-02"}, SETTINGS)
+
+    first = scheduler.claim("w1", max_per_database=1)
+    assert first["status"] == RUNNING
+    assert scheduler.claim("w2", max_per_database=1) is None
+    assert scheduler.claim("w2", max_per_database=2) is not None
+
+
+def test_worker_runs_jobs_and_callers_can_attach(tmp_path):
+    scheduler = JobScheduler(tmp_path / "jobs.sqlite3", coalesce_seconds=0)
+    job = scheduler.submit("bank_recon", {"period": "2025-01"}, SETTINGS)
+    assert run_worker(scheduler, SETTINGS, concurrency=1, once=True) == 1
+
+    finished = scheduler.wait(job["job_id"], timeout=5)
+    assert finished["status"] == SUCCEEDED
+    assert finished["result"]["command"] == "bank_recon"
+
+
+def test_run_or_attach_executes_inline_when_nothing_in_flight(tmp_path):
+    scheduler = JobScheduler(tmp_path / "jobs.sqlite3", coalesce_seconds=0)
+    job = run_or_attach(scheduler, "vat_pack", {"period_from": "2025-01", "period_to": "2025-01"}, SETTINGS)
+    assert job["status"] == SUCCEEDED
+    assert job["deduplicated"] is False
+    assert job["result"]["command"] == "vat_pack"
+
+
+def test_heartbeat_keeps_a_long_job_from_being_reclaimed(tmp_path, monkeypatch):
+    from finance_ai_pack import scheduler as scheduler_module
+
+    scheduler = JobScheduler(tmp_path / "jobs.sqlite3", coalesce_seconds=0, lease_seconds=0.3)
+    scheduler.submit("month_end", {"period": "2025-01"}, SETTINGS)
+    job = scheduler.claim("w1")
+    reclaimed = []
+
+    def slow_job(job, settings):
+        # Runs for several lease lengths while another worker keeps trying to claim.
+        for _ in range(8):
+            time.sleep(0.1)
+            reclaimed.append(scheduler.claim("w2"))
+        return {"command": "month_end"}
+
+    monkeypatch.setattr(scheduler_module, "execute_job", slow_job)
+    finished = process_job(scheduler, job, SETTINGS)
+    assert reclaimed == [None] * 8
+    assert finished["status"] == SUCCEEDED and finished["worker"] == "w1"
+
+
+def test_only_the_lease_holder_can_finish_a_job(tmp_path):
+    scheduler = JobScheduler(tmp_path / "jobs.sqlite3", coalesce_seconds=0, lease_seconds=0)
+    job = scheduler.submit("month_end", {"period": "2025-01"}, SETTINGS)
+    scheduler.claim("w1")
+    assert scheduler.claim("w2")["worker"] == "w2"
+    assert scheduler.complete(job["job_id"], "w1", {"stale": True}) is False
+    assert scheduler.heartbeat(job["job_id"], "w1") is False
+    assert scheduler.get(job["job_id"])["status"] == RUNNING
+    assert scheduler.complete(job["job_id"], "w2", {}) is True
+
+
+def test_a_job_runs_for_the_company_it_was_submitted_for(tmp_path, monkeypatch):
+    from finance_ai_pack import cli
+
+    seen = []
+    monkeypatch.setattr(cli, "runner_for", lambda command, params: lambda settings, **kw: seen.append(settings) or {})
+    scheduler = JobScheduler(tmp_path / "jobs.sqlite3", coalesce_seconds=0)
+    scoped = scheduler.submit("month_end", {"period": "2025-01"}, Settings(fixture_mode=True, company_id=2))
+    unscoped = scheduler.submit("month_end", {"period": "2025-01"}, SETTINGS)
+    assert scoped["job_id"] != unscoped["job_id"] and scoped["company_id"] == 2
+
+    assert run_worker(scheduler, Settings(fixture_mode=True, company_id=1), concurrency=1, once=True) == 2
+    assert sorted(settings.company_id or 0 for settings in seen) == [0, 2]
@@ -0,0 +1,82 @@
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.cache import CachingAdapter, ExtractCache
+from finance_ai_pack.server import JobQueueFull, JobRunner, build_server, parse_job_request
+
+
+@pytest.fixture
+def api():
+    server, runner = build_server("127.0.0.1", 0, Settings(fixture_mode=True, extract_cache_ttl=60), workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    runner.stop()
+
+
+def _post(url: str, payload: dict) -> tuple[int, dict]:
+    request = Request(url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"})
+    try:
+        with urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_serve_runs_month_end_job_and_reports_status(api):
+    status, job = _post(f"{api}/jobs?wait=1", {"command": "month_end", "params": {"period": "2025-01"}})
+    assert status == 200
+    assert job["status"] == "succeeded"
+    assert job["result"]["command"] == "month_end"
+
+    with urlopen(f"{api}/jobs/{job['job_id']}") as response:
+        assert json.loads(response.read())["status"] == "succeeded"
+    with urlopen(f"{api}/health") as response:
+        health = json.loads(response.read())
+    assert health["workers"] == 2
+    assert health["extract_cache"]["misses"] >= 1
+
+
+def test_serve_rejects_bad_requests(api):
+    status, body = _post(f"{api}/jobs", {"command": "month_end", "params": {"bogus": 1}})
+    assert status == 400
+    assert "bogus" in body["error"]
+
+
+def test_parse_job_request_defaults_bank_range_end():
+    command, params, companies = parse_job_request(
+        {"command": "bank_recon", "params": {"period_from": "2025-01"}, "companies": "all"}
+    )
+    assert (command, params, companies) == ("bank_recon", {"period_from": "2025-01", "period_to": "2025-01"}, "all")
+
+
+def test_job_queue_is_bounded():
+    runner = JobRunner(Settings(fixture_mode=True), workers=1, queue_size=1)
+    runner.submit("month_end", {"period": "2025-01"})
+    with pytest.raises(JobQueueFull):
+        runner.submit("month_end", {"period": "2025-01"})
+
+
+def test_caching_adapter_reuses_extracts():
+    calls = []
+
+    class Adapter:
+        def get_statement_lines(self, journal, period):
+            calls.append(period)
+            return [{"id": 1}]
+
+    adapter = CachingAdapter(Adapter(), ExtractCache(ttl_seconds=60), namespace=("test",))
+    assert adapter.get_statement_lines({"id": 1}, "2025-01") == adapter.get_statement_lines({"id": 1}, "2025-01")
+    adapter.get_statement_lines({"id": 1}, "2025-02")
+    assert calls == ["2025-01", "2025-02"]
+
+    # Callers get copies: mutating one result must not leak into the cache.
+    adapter.get_statement_lines({"id": 1}, "2025-01")[0]["matched"] = True
+    assert adapter.get_statement_lines({"id": 1}, "2025-01") == [{"id": 1}]
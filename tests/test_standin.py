@@ -0,0 +1,103 @@
+from functools import partial
+
+import pytest
+
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.client import OdooClient, OdooConnectionError
+from finance_ai_pack.connectors.odoo.live_adapter import LiveOdooAdapter
+from finance_ai_pack.connectors.odoo.pool import reset_pools
+from finance_ai_pack.connectors.odoo.standin import OdooStandin, StandinConfig
+from finance_ai_pack.recon.ledger.service import reconcile as ledger_reconcile
+from finance_ai_pack.synthetic import SyntheticSpec
+
+SPEC = SyntheticSpec(lines=120, journals=2, vat_lines=60)
+
+
+@pytest.fixture
+def standin(tmp_path):
+    server = OdooStandin.from_spec(SPEC, db_path=tmp_path / "odoo.sqlite3", config=StandinConfig(password="secret"))
+    server.start()
+    yield server
+    server.stop()
+    reset_pools()
+
+
+def _client(standin, password="secret") -> OdooClient:
+    settings = Settings(
+        fixture_mode=False, odoo_url=standin.url, odoo_db="bench", odoo_username="u", odoo_password=password
+    )
+    return OdooClient(settings)
+
+
+def test_standin_search_read_domains_and_read(standin):
+    client = _client(standin)
+    rows = client.search_read(
+        "account.bank.statement.line",
+        ["|", ["journal_id", "=", 1], ["journal_id", "=", 2], ["is_reconciled", "=", False]],
+        fields=["journal_id", "amount", "is_reconciled"],
+        order="date desc,id asc",
+        limit=5,
+    )
+    assert rows and all(row["is_reconciled"] is False for row in rows)
+    assert rows[0]["journal_id"][1].startswith("Synthetic Bank")
+    assert client.read("account.journal", [1], fields=["name", "type"]) == [
+        {"id": 1, "name": "Synthetic Bank 001", "type": "bank"}
+    ]
+    taxes = client.search_read("account.move.line", [["tax_line_id.type_tax_use", "=", "sale"]], fields=["balance"])
+    assert taxes and all(row["balance"] < 0 for row in taxes)
+
+
+def test_live_vat_reads_page_through_every_tax_line(standin):
+    client = _client(standin)
+    domain = [["tax_line_id", "!=", False], ["date", ">=", "2025-01-01"], ["date", "<", "2025-02-01"]]
+    expected = client.search_read("account.move.line", domain, fields=["balance"])
+    client.search_read_paged = partial(OdooClient.search_read_paged, client, page_size=7)
+    adapter = LiveOdooAdapter(client)
+
+    lines = adapter.get_vat_tax_lines("2025-01", "input") + adapter.get_vat_tax_lines("2025-01", "output")
+    assert len(expected) > 7 and len(lines) == len(expected)
+    control = adapter.get_vat_control_balance("2025-01")
+    assert control["closing_balance"] == round(sum(row["balance"] for row in expected), 2)
+
+
+def test_standin_read_group_backs_the_live_ledger_engine(standin, tmp_path):
+    client = _client(standin)
+    groups = client.read_group("account.move.line", [], ["balance:sum"], ["move_id"])
+    assert all(abs(group["balance"]) < 0.005 for group in groups)
+
+    settings = Settings(
+        fixture_mode=False, odoo_url=standin.url, odoo_db="bench", odoo_username="u", odoo_password="secret"
+    )
+    payload = ledger_reconcile("2025-01", fixtures_dir=tmp_path, state_dir=tmp_path / "state", settings=settings)
+    assert payload["totals"]["difference"] == 0.0
+    assert payload["unbalanced_moves"] == []
+
+
+def test_standin_counts_calls_and_injects_faults(standin):
+    client = _client(standin)
+    client.search_read("account.journal", [], fields=["name"])
+    standin.fail_next(kind="fault", method="search_read")
+    with pytest.raises(OdooConnectionError, match="Injected fault"):
+        client.search_read("account.journal", [], fields=["name"])
+
+    stats = standin.stats()["account.journal.search_read"]
+    assert stats["calls"] == 2
+    assert stats["injected_faults"] == 1
+    assert stats["rows"] == 3
+    assert stats["response_bytes"] > 0
+
+    with pytest.raises(OdooConnectionError, match="authentication failed"):
+        _client(standin, password="wrong").connect()
+
+
+def test_standin_latency_and_random_faults(tmp_path):
+    config = StandinConfig(latency_ms=20, jitter_ms=5, fault_rate=1.0, fault_methods=frozenset({"read_group"}))
+    with OdooStandin.from_spec(SPEC, db_path=tmp_path / "odoo.sqlite3", config=config) as standin:
+        client = _client(standin)
+        client.search_read("res.company", [], fields=["name"])
+        with pytest.raises(OdooConnectionError):
+            client.read_group("account.move.line", [], ["balance:sum"], ["account_id"])
+
+        stats = standin.stats()
+        assert stats["res.company.search_read"]["total_ms"] >= 15
+        assert stats["account.move.line.read_group"]["injected_faults"] == 1
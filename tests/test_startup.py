@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+# Modules a fixture-mode command must not pay for at import time.
+DEFERRED = {
+    "xmlrpc.client",
+    "http.client",
+    "ssl",
+    "openpyxl",
+    "csv",
+    "zipfile",
+    "concurrent.futures",
+    "finance_ai_pack.connectors.odoo.client",
+    "finance_ai_pack.recon.bank.service",
+    "finance_ai_pack.recon.vat.service",
+    "finance_ai_pack.group",
+}
+# Cumulative import time of finance_ai_pack.cli itself, not interpreter start-up. Generous so
+# slow CI boxes pass; eager imports of the engines and the live connector cost well over this.
+IMPORT_BUDGET_US = 150_000
+
+
+def _python(code: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(SRC), "FIXTURE_MODE": "true"}
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def _imported(stderr: str) -> dict[str, int]:
+    modules = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_cli_import_defers_engines_and_live_connector():
+    modules = _imported(_python("import finance_ai_pack.cli").stderr)
+    assert not DEFERRED & modules.keys()
+    assert modules["finance_ai_pack.cli"] < IMPORT_BUDGET_US
+
+
+def test_fixture_runs_never_import_the_live_connector():
+    code = (
+        "import sys\n"
+        "from finance_ai_pack.cli import run_month_end\n"
+        "run_month_end('2025-01')\n"
+        "print(','.join(sorted(sys.modules)))\n"
+    )
+    loaded = set(_python(code).stdout.strip().split(","))
+    assert "finance_ai_pack.recon.vat.service" in loaded
+    assert not {"xmlrpc.client", "http.client", "ssl", "openpyxl", "finance_ai_pack.connectors.odoo.client"} & loaded
@@ -0,0 +1,66 @@
+from benchmarks.run import compare, parse_scales, run_benchmarks
+from finance_ai_pack import cli
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.pool import reset_pools
+from finance_ai_pack.connectors.odoo.standin import OdooStandin
+from finance_ai_pack.recon.bank.service import reconcile
+from finance_ai_pack.recon.vat.service import reconcile_vat
+from finance_ai_pack.synthetic import SyntheticSpec, iter_odoo_records, iter_statement_lines, write_fixtures
+
+SPEC = SyntheticSpec(lines=300, journals=3, vat_lines=200)
+
+
+def test_generator_is_deterministic_and_round_trips_through_fixtures(tmp_path):
+    assert list(iter_statement_lines(SPEC, 1)) == list(iter_statement_lines(SPEC, 1))
+    assert list(iter_statement_lines(SPEC, 1)) != list(iter_statement_lines(SyntheticSpec(lines=300, seed=7), 1))
+
+    manifest = write_fixtures(SPEC, tmp_path)
+    assert manifest["statement_lines"] == 300
+
+    bank = reconcile("2025-01", tmp_path, Settings())
+    assert bank["bank_controls_rollup"]["total_statement_lines"] == 300
+    vat = reconcile_vat("2025-01", "2025-01", tmp_path, Settings())
+    assert vat["monthly_summary"][0]["net_vat_difference"] == 0.0
+
+
+def test_standin_serves_the_same_dataset_to_the_live_adapter(tmp_path):
+    write_fixtures(SPEC, tmp_path / "fixtures")
+    fixture_result = reconcile("2025-01", tmp_path / "fixtures", Settings())
+
+    with OdooStandin.from_spec(SPEC, db_path=tmp_path / "odoo.sqlite3") as standin:
+        live = Settings(fixture_mode=False, odoo_url=standin.url, odoo_db="bench", odoo_username="u", odoo_password="p")
+        try:
+            live_result = reconcile("2025-01", tmp_path, live)
+        finally:
+            reset_pools()
+
+    for key in ("total_statement_lines", "total_reconciled_lines"):
+        assert live_result["bank_controls_rollup"][key] == fixture_result["bank_controls_rollup"][key]
+    assert sum(1 for model, _ in iter_odoo_records(SPEC) if model == "account.bank.statement.line") == 300
+
+
+def test_benchmark_compare_flags_slowdowns_over_threshold():
+    assert parse_scales("10k,1m,2500") == [("10k", 10_000), ("1m", 1_000_000), ("2500", 2500)]
+    baseline = {"results": [{"case": "bank_reconcile", "scale": "10k", "median_ms": 100.0}]}
+    current = {"results": [{"case": "bank_reconcile", "scale": "10k", "median_ms": 130.0}]}
+
+    assert compare(current, baseline, threshold=0.5) == []
+    regressions = compare(current, baseline, threshold=0.2)
+    assert regressions[0]["case"] == "bank_reconcile"
+    assert regressions[0]["slowdown_pct"] == 30.0
+
+    setup = [{"case": case, "scale": "10k", "median_ms": 100.0} for case in ("generate_fixtures", "convert_fixtures")]
+    slow_setup = [{**row, "median_ms": 500.0, "single_run": True} for row in setup]
+    assert compare({"results": slow_setup}, {"results": setup}, threshold=0.2) == []
+
+
+def _stat(path):
+    return (path.stat().st_mtime_ns, path.stat().st_size) if path.exists() else None
+
+
+def test_benchmark_month_end_keeps_rollups_out_of_the_repo_outputs(tmp_path):
+    repo_rollups = cli.OUTPUTS_DIR / ".rollups" / "rollups.sqlite3"
+    before = _stat(repo_rollups)
+    report = run_benchmarks([("xs", 60)], journals=2, repeat=1, workdir=tmp_path, only={"run_month_end"})
+    assert [row["case"] for row in report["results"] if not row.get("single_run")] == ["run_month_end"]
+    assert _stat(repo_rollups) == before
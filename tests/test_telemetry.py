@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from finance_ai_pack import telemetry
+from finance_ai_pack.cli import run_bank_recon, run_month_end
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.pool import reset_pools
+from finance_ai_pack.connectors.odoo.standin import OdooStandin
+from finance_ai_pack.synthetic import SyntheticSpec
+
+
+def _span_names(payload: dict) -> set[tuple[str, str]]:
+    return {(span["category"], span["name"]) for span in payload["telemetry"]["spans"]}
+
+
+def test_spans_are_noops_without_a_collector():
+    assert telemetry.current() is None
+    assert telemetry.span("anything") is telemetry.span("else")
+    assert "telemetry" not in run_bank_recon("2025-01", settings=Settings(fixture_mode=True))
+
+
+def test_month_end_telemetry_covers_stages_adapter_and_writers():
+    payload = run_month_end("2025-01", settings=Settings(fixture_mode=True, telemetry=True))
+    names = _span_names(payload)
+    assert {("command", "month_end"), ("command", "bank_recon"), ("command", "vat_pack")} <= names
+    assert {("stage", "bank_reconcile"), ("stage", "vat_reconcile"), ("stage", "gating")} <= names
+    assert ("adapter", "get_statement_lines") in names
+    assert ("writer", "write_json") in names
+    assert payload["telemetry"]["rpc_totals"]["calls"] == 0
+    assert telemetry.current() is None
+
+
+@pytest.mark.parametrize("suffix", [".json", ".jsonl"])
+def test_trace_export_formats(tmp_path, suffix):
+    trace_file = tmp_path / f"trace{suffix}"
+    payload = run_bank_recon("2025-01", settings=Settings(fixture_mode=True, trace_file=str(trace_file)))
+    assert payload["telemetry"]["trace_file"] == str(trace_file)
+    if suffix == ".json":
+        events = json.loads(trace_file.read_text())["traceEvents"]
+        assert any(event["ph"] == "X" and event["name"] == "bank_reconcile" for event in events)
+    else:
+        spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+        assert {"bank_recon", "bank_reconcile"} <= {span["name"] for span in spans}
+
+
+def test_live_rpc_counters_against_standin(tmp_path):
+    server = OdooStandin.from_spec(SyntheticSpec(lines=60, journals=2, vat_lines=10), db_path=tmp_path / "odoo.db")
+    server.start()
+    try:
+        settings = Settings(
+            fixture_mode=False,
+            odoo_url=server.url,
+            odoo_db="bench",
+            odoo_username="u",
+            odoo_password="x",
+            telemetry=True,
+            fx_cache_dir=str(tmp_path / "fx"),
+        )
+        payload = run_bank_recon("2025-01", settings=settings)
+    finally:
+        server.stop()
+        reset_pools()
+    rpc = payload["telemetry"]["rpc"]
+    assert rpc["account.bank.statement.line.search_read"]["calls"] >= 2
+    totals = payload["telemetry"]["rpc_totals"]
+    assert totals["errors"] == 0
+    assert totals["request_bytes"] > 0 and totals["response_bytes"] > totals["request_bytes"]
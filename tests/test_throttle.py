@@ -0,0 +1,106 @@
+from xmlrpc.client import ProtocolError
+
+import pytest
+
+from finance_ai_pack import telemetry
+from finance_ai_pack.config import Settings
+from finance_ai_pack.connectors.odoo.client import OdooClient, OdooConnectionError
+from finance_ai_pack.connectors.odoo.standin import OdooStandin
+from finance_ai_pack.connectors.odoo.throttle import AdaptiveLimiter, CallController, CircuitBreaker
+from finance_ai_pack.synthetic import SyntheticSpec
+
+
+def _unavailable():
+    raise ProtocolError("odoo", 503, "Service Unavailable", {})
+
+
+def test_reads_retry_transient_errors_against_standin(tmp_path):
+    delays = []
+    with OdooStandin.from_spec(SyntheticSpec(lines=20, journals=1, vat_lines=5), db_path=tmp_path / "o.db") as server:
+        settings = Settings(fixture_mode=False, odoo_url=server.url, odoo_db="b", odoo_username="u", odoo_password="x")
+        client = OdooClient(settings, controller=CallController(sleep=delays.append))
+        server.fail_next(count=2, kind="unavailable", method="search_read")
+        with telemetry.collect(Settings(telemetry=True)) as collector:
+            rows = client.search_read("account.journal", [], fields=["name"])
+        assert rows and server.stats()["account.journal.search_read"]["injected_faults"] == 2
+
+        server.fail_next(kind="fault", method="search_read")
+        with pytest.raises(OdooConnectionError, match="Injected fault"):
+            client.search_read("account.journal", [], fields=["name"])
+
+    assert len(delays) == 2 and all(0 <= delay <= 0.4 for delay in delays)
+    summary = collector.summary()
+    assert summary["throttle_events"]["retry"] == 2
+    assert summary["rpc"]["account.journal.search_read"]["errors"] == 2
+    assert summary["concurrency"]["peak_in_flight"] == 1
+    assert client.controller.snapshot()["retries"] == 2
+
+
+def test_writes_are_not_retried_and_breaker_fails_fast():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10, clock=lambda: now[0])
+    controller = CallController(max_retries=5, breaker=breaker, sleep=lambda _: None)
+
+    with pytest.raises(OdooConnectionError, match="after 1 attempt"):
+        controller.call("account.move", "write", _unavailable)
+    with pytest.raises(OdooConnectionError, match="after 1 attempt"):
+        controller.call("account.move", "search_read", _unavailable)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    calls = []
+    with pytest.raises(OdooConnectionError, match="circuit breaker is open"):
+        controller.call("account.move", "search_read", lambda: calls.append(1))
+    assert calls == [] and controller.snapshot()["breaker_rejected"] == 1
+
+    now[0] = 10
+    assert controller.call("account.move", "search_read", lambda: "ok") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_limiter_grows_additively_and_halves_on_errors():
+    limiter = AdaptiveLimiter(max_limit=8, initial=2)
+    for _ in range(12):
+        limiter.acquire(), limiter.acquire()
+        limiter.release("m.read", 0.01, ok=True)
+        limiter.release("m.read", 0.01, ok=True)
+    assert int(limiter.limit) > 2
+
+    grown = limiter.limit
+    limiter.acquire()
+    assert limiter.release("m.read", 0.01, ok=False) == "decrease"
+    assert limiter.limit == pytest.approx(grown / 2)
+
+    slow = AdaptiveLimiter(max_limit=8, initial=8)
+    slow.acquire()
+    slow.release("m.read", 0.01, ok=True)
+    events = set()
+    for _ in range(10):
+        slow.acquire()
+        events.add(slow.release("m.read", 0.2, ok=True))
+    assert "decrease" in events and slow.limit < 8
+
+
+def test_a_probe_that_raises_any_error_releases_the_half_open_breaker():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=lambda: now[0])
+    controller = CallController(breaker=breaker, sleep=lambda _: None)
+    with pytest.raises(OdooConnectionError):
+        controller.call("account.move", "write", _unavailable)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    now[0] = 10
+    with pytest.raises(KeyboardInterrupt):
+        controller.call("account.move", "search_read", interrupted)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    def bad_payload():
+        raise ValueError("unexpected response")
+
+    # The next call may probe again; a non-transport error means the server answered.
+    with pytest.raises(ValueError):
+        controller.call("account.move", "search_read", bad_payload)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert controller.call("account.move", "search_read", lambda: "ok") == "ok"
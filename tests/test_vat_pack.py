@@ -1,8 +1,13 @@
+import json
+import random
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
 
 from finance_ai_pack.cli import run_month_end, run_vat_pack
+from finance_ai_pack.config import Settings
+from finance_ai_pack.outputs.sink import ExceptionSink
 from finance_ai_pack.recon.vat.service import read_tra_file
 from finance_ai_pack.rules.month_end_gating import AMBER, GREEN, RED, evaluate
 
@@ -33,6 +38,47 @@ def test_exception_categorization_for_timing_credit_missing_document():
     assert "missing documents" in categories
 
 
+def _key(row):
+    return row["period"], row["document_ref"]
+
+
+def test_exception_sink_streams_the_same_order_whether_or_not_it_spills():
+    rows = [{"period": f"2025-{i % 12 + 1:02d}", "document_ref": f"INV-{i % 37}", "seq": i} for i in range(500)]
+    random.Random(7).shuffle(rows)
+    in_memory, spilled = ExceptionSink(_key), ExceptionSink(_key, max_rows=16)
+    for row in rows:
+        in_memory.add(row)
+        spilled.add(row)
+
+    assert in_memory.spilled_runs == 0 and spilled.spilled_runs == 31 and len(spilled) == 500
+    expected = sorted(rows, key=_key)
+    assert list(spilled) == list(in_memory) == expected
+    assert spilled.spilled_runs > 0
+    assert spilled.head(3) == expected[:3]
+
+
+def test_vat_pack_writes_the_whole_register_when_it_spills():
+    full = run_vat_pack(period_from="2025-01", period_to="2025-02")
+    register = Path(full["artifacts"]["vat_exception_register_csv"]).read_text()
+    assert full["exception_register_truncated"] is False
+
+    settings = replace(Settings.from_env(), fixture_mode=True, exception_buffer_rows=2)
+    spilled = run_vat_pack(period_from="2025-01", period_to="2025-02", settings=settings)
+    assert Path(spilled["artifacts"]["vat_exception_register_csv"]).read_text() == register
+    assert spilled["exception_register_truncated"] is True
+    assert spilled["exception_register"] == full["exception_register"][:2]
+    exported = json.loads(Path(spilled["artifacts"]["vat_exception_register_json"]).read_text())
+    assert exported["exception_register"] == full["exception_register"]
+
+    # Filling the buffer exactly spills a run but keeps every row in the payload.
+    count = full["metrics"]["exception_count"]
+    exact = run_vat_pack(
+        period_from="2025-01", period_to="2025-02", settings=replace(settings, exception_buffer_rows=count)
+    )
+    assert exact["exception_register_truncated"] is False
+    assert exact["exception_register"] == full["exception_register"]
+
+
 def test_gating_status_changes_with_vat_thresholds(tmp_path):
     assert evaluate(0, 0, [0]) == GREEN
     assert evaluate(0, 0, [25]) == AMBER
@@ -0,0 +1,84 @@
+from finance_ai_pack.cli import run_month_end
+from finance_ai_pack.watch import STAGES, Watcher, WatchInputs
+
+
+def _inputs(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    for name in ("vat", "petty_cash", "ledger", "overrides", "companies/2/odoo_statement_lines"):
+        (fixtures / name).mkdir(parents=True)
+    files = {
+        "vat": fixtures / "vat" / "odoo_vat_lines_2025-01.json",
+        "ledger": fixtures / "ledger" / "ledger_snapshot_2025-01.json",
+        "company_bank": fixtures / "companies" / "2" / "odoo_statement_lines" / "banks.json",
+        "overrides": fixtures / "overrides" / "month_end_overrides.json",
+        "rules": tmp_path / "gating_rules.yml",
+        "petty_cash_rules": tmp_path / "petty_cash_rules.yml",
+        "registry": tmp_path / "bank_registry.yml",
+        "tra": tmp_path / "tra_vat_2025-01.csv",
+    }
+    for path in files.values():
+        path.write_text("{}")
+    inputs = WatchInputs(
+        fixtures_dir=fixtures,
+        registry_file=files["registry"],
+        rules_file=files["rules"],
+        overrides_file=files["overrides"],
+        tra_file=files["tra"],
+        petty_cash_rules_file=files["petty_cash_rules"],
+    )
+    return inputs, files
+
+
+def test_changed_inputs_map_to_the_stages_that_read_them(tmp_path):
+    inputs, files = _inputs(tmp_path)
+    assert inputs.stages_for(files["rules"]) == {"gating"}
+    assert inputs.stages_for(files["overrides"]) == {"gating"}
+    assert inputs.stages_for(files["petty_cash_rules"]) == {"petty_cash"}
+    assert inputs.stages_for(files["registry"]) == {"bank_recon"}
+    assert inputs.stages_for(files["company_bank"]) == {"bank_recon"}
+    assert inputs.stages_for(files["tra"]) == inputs.stages_for(files["vat"]) == {"vat_pack"}
+    assert inputs.stages_for(files["ledger"]) == set()
+
+
+def test_watcher_reruns_only_the_stages_whose_inputs_changed(tmp_path):
+    inputs, files = _inputs(tmp_path)
+    runs = []
+
+    def run(stage_results):
+        runs.append([stage for stage in STAGES if stage not in stage_results])
+        for stage in STAGES:
+            stage_results.setdefault(stage, ({}, 1.0))
+        return {"status": "GREEN", "proceed": True, "timings_ms": {}}
+
+    watcher = Watcher(inputs, run, debounce=0, poll_interval=0.01)
+    assert watcher.rerun()["rerun_stages"] == list(STAGES)
+
+    files["rules"].write_text("amber:\n  max_unmatched_transactions: 9\n")
+    summary = watcher.rerun(watcher.wait_for_changes())
+    assert summary["rerun_stages"] == [] and summary["reused_stages"] == sorted(STAGES)
+
+    files["tra"].write_text("period,input_vat,output_vat\n")
+    files["vat"].write_text("[]\n")
+    summary = watcher.rerun(watcher.wait_for_changes())
+    assert summary["changed"] == sorted([str(files["tra"]), str(files["vat"])])
+    assert summary["rerun_stages"] == ["vat_pack"]
+
+    files["petty_cash_rules"].write_text('{"approval_limit": 50000}\n')
+    assert watcher.rerun(watcher.wait_for_changes())["rerun_stages"] == ["petty_cash"]
+
+    files["ledger"].write_text("[]\n")
+    assert watcher.rerun(watcher.wait_for_changes()) is None
+    assert runs == [list(STAGES), [], ["vat_pack"], ["petty_cash"]]
+
+
+def test_month_end_reuses_cached_stage_results():
+    stage_results = {}
+    first = run_month_end("2025-01", stage_results=stage_results)
+    assert sorted(stage_results) == sorted(STAGES)
+    cached = dict(stage_results)
+
+    second = run_month_end("2025-01", stage_results=stage_results)
+    assert stage_results == cached
+    assert second["status"] == first["status"]
+    assert second["bank_controls_rollup"] == first["bank_controls_rollup"]
+    assert all(second["timings_ms"][stage] == 0.0 for stage in STAGES)